@@ -1,21 +1,70 @@
 """Database client wrapping SQLAlchemy operations for document status management."""
 
-from typing import List
+from datetime import datetime, timezone
+import hashlib
+from typing import Dict, List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.shared.constants import DocumentStatus, SetDocumentResult
 from src.shared.exceptions import DocumentHashConflictException
-from src.shared.models import DMSDocument
+from src.shared.models import DMSDocument, GetDocumentStatusResponse
 from src.document_management_service.models import DBDMSDocument
 from sqlalchemy.orm import Session
 
 
+def completed_documents_fingerprint(count: int, last_updated, version_total) -> str:
+    """Return a stable hash of the COMPLETED documents' count, latest update and summed versions.
+
+    Every status write bumps a record's version and updated_at, so a document
+    entering, leaving or being rewritten in COMPLETED changes at least one of
+    them.
+    """
+    return hashlib.sha256(
+        f"{count}\n{last_updated}\n{version_total or 0}".encode()
+    ).hexdigest()
+
+
+# Dialects with INSERT ... ON CONFLICT; others look the record up before writing.
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def upsert_documents_statement(dialect_name: str, documents: List[DMSDocument]):
+    """Return one INSERT ... ON CONFLICT (doc_hash) DO UPDATE for the given records.
+
+    A hash registered under another name is left unchanged and missing from
+    the returned (doc_hash, version) rows; a returned version of 1 means the
+    record was created. Hashes must be unique within `documents`.
+    """
+    now = datetime.now(timezone.utc)
+    statement = _UPSERT_INSERTS[dialect_name](DBDMSDocument).values(
+        [
+            {**document.model_dump(), "version": 1, "updated_at": now}
+            for document in documents
+        ]
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[DBDMSDocument.doc_hash],
+        set_={
+            "status": statement.excluded.status,
+            "version": DBDMSDocument.version + 1,
+            "updated_at": statement.excluded.updated_at,
+        },
+        where=DBDMSDocument.doc_name == statement.excluded.doc_name,
+    ).returning(DBDMSDocument.doc_hash, DBDMSDocument.version)
+
+
 class DBClient:
     """Provides CRUD operations for document records using a SQLAlchemy session."""
 
     def __init__(self, session: Session):
         self.session: Session = session
 
+    def close(self) -> None:
+        """Close the session, returning its connection to the pool."""
+        self.session.close()
+
     def get_document_name(self, doc_hash) -> str | None:
         """Return the document name for the given hash, or None if not found."""
         return self.session.execute(
@@ -31,22 +80,108 @@ class DBClient:
             return None
         return DocumentStatus(result)
 
-    def get_documents(self) -> List[DMSDocument] | None:
-        """Return all document records as Pydantic models, or None if the table is empty."""
-        rows = self.session.execute(select(DBDMSDocument)).scalars().all()
+    def get_document(self, doc_hash) -> GetDocumentStatusResponse | None:
+        """Return the name, status, version and update time of a hash in one query, or None."""
+        row = self.session.execute(
+            select(
+                DBDMSDocument.doc_name,
+                DBDMSDocument.status,
+                DBDMSDocument.version,
+                DBDMSDocument.updated_at,
+            ).where(DBDMSDocument.doc_hash == doc_hash)
+        ).first()
+        if row is None:
+            return None
+        return GetDocumentStatusResponse.model_construct(**row._mapping)
+
+    def get_documents(
+        self,
+        status: Optional[DocumentStatus] = None,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[DMSDocument] | None:
+        """Return document records ordered by hash, or None if none match.
+
+        `status` filters by status; `after` and `limit` select a keyset page:
+        the first `limit` documents whose hash sorts after `after`. Rows come
+        from typed columns, so they are not validated again.
+        """
+        rows = self.get_document_rows(
+            ("doc_hash", "doc_name", "status"), status, after, limit
+        )
         if not rows:
             return None
-        return [DMSDocument.model_validate(row, from_attributes=True) for row in rows]
+        return [DMSDocument.model_construct(**row) for row in rows]
+
+    def get_document_rows(
+        self,
+        fields: Sequence[str],
+        status: Optional[DocumentStatus] = None,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """Return only the given columns of the documents get_documents would return."""
+        query = select(*(getattr(DBDMSDocument, name) for name in fields)).order_by(
+            DBDMSDocument.doc_hash
+        )
+        if status is not None:
+            query = query.where(DBDMSDocument.status == status)
+        if after is not None:
+            query = query.where(DBDMSDocument.doc_hash > after)
+        if limit is not None:
+            query = query.limit(limit)
+        return [dict(row._mapping) for row in self.session.execute(query)]
+
+    def get_document_summary(self) -> tuple[Dict[DocumentStatus, int], str]:
+        """Return the document count per status and the COMPLETED documents' fingerprint.
+
+        Both come from one aggregate query, so no document rows are returned.
+        """
+        counts = {}
+        completed = (0, None, None)
+        for status, count, last_updated, version_total in self.session.execute(
+            select(
+                DBDMSDocument.status,
+                func.count(),
+                func.max(DBDMSDocument.updated_at),
+                func.sum(DBDMSDocument.version),
+            ).group_by(DBDMSDocument.status)
+        ):
+            counts[DocumentStatus(status)] = count
+            if status == DocumentStatus.COMPLETED:
+                completed = (count, last_updated, version_total)
+        return counts, completed_documents_fingerprint(*completed)
 
     def set_document_status(
         self, doc_hash, doc_name, status
     ) -> tuple[DMSDocument, SetDocumentResult]:
-        """Insert or update a document record; raise DocumentHashConflictException on name mismatch."""
+        """Insert or update a document record; raise DocumentHashConflictException on name mismatch.
+
+        On PostgreSQL and SQLite this is one upsert statement, so concurrent
+        writers of the same hash neither fail on the primary key nor skip
+        the name check.
+        """
+        if self._dialect_name() not in _UPSERT_INSERTS:
+            return self._set_document_status_by_lookup(doc_hash, doc_name, status)
+        document = DMSDocument(doc_hash=doc_hash, doc_name=doc_name, status=status)
+        versions = self._upsert([document])
+        self.session.commit()
+        if doc_hash not in versions:
+            raise DocumentHashConflictException()
+        if versions[doc_hash] == 1:
+            return document, SetDocumentResult.CREATED
+        return document, SetDocumentResult.UPDATED
+
+    def _set_document_status_by_lookup(
+        self, doc_hash, doc_name, status
+    ) -> tuple[DMSDocument, SetDocumentResult]:
         row = self.session.query(DBDMSDocument).filter_by(doc_hash=doc_hash).first()
         if row:
             if row.doc_name != doc_name:
                 raise DocumentHashConflictException()
             row.status = status
+            row.version = DBDMSDocument.version + 1
+            row.updated_at = datetime.now(timezone.utc)
             self.session.commit()
             return (
                 DMSDocument.model_validate(row, from_attributes=True),
@@ -59,3 +194,136 @@ class DBClient:
         self.session.commit()
         dms_document = DMSDocument.model_validate(db_dms_document, from_attributes=True)
         return dms_document, SetDocumentResult.CREATED
+
+    def get_documents_by_hash(self, doc_hashes: List[str]) -> List[DMSDocument]:
+        """Return the records of the given hashes in one query; unknown hashes are left out."""
+        rows = (
+            self.session.execute(
+                select(DBDMSDocument).where(DBDMSDocument.doc_hash.in_(set(doc_hashes)))
+            )
+            .scalars()
+            .all()
+        )
+        return [DMSDocument.model_validate(row, from_attributes=True) for row in rows]
+
+    def set_document_statuses(
+        self, documents: List[DMSDocument]
+    ) -> List[SetDocumentResult]:
+        """Insert or update many records in one transaction, returning each one's result.
+
+        A record whose name does not match the registered one is left
+        unchanged and reported as CONFLICT; a hash repeated in the batch keeps
+        its last status. On PostgreSQL and SQLite all records are written by
+        one multi-row upsert, and a repeat of a hash under a name other than
+        its first one in the batch is reported as CONFLICT.
+        """
+        if self._dialect_name() not in _UPSERT_INSERTS:
+            return self._set_document_statuses_by_lookup(documents)
+        first: Dict[str, DMSDocument] = {}
+        latest: Dict[str, DMSDocument] = {}
+        for document in documents:
+            if first.setdefault(document.doc_hash, document).doc_name == (
+                document.doc_name
+            ):
+                latest[document.doc_hash] = document
+        versions = self._upsert(list(latest.values())) if latest else {}
+        self.session.commit()
+        results = []
+        seen = set()
+        for document in documents:
+            if (
+                document.doc_hash not in versions
+                or document.doc_name != first[document.doc_hash].doc_name
+            ):
+                results.append(SetDocumentResult.CONFLICT)
+            elif document.doc_hash in seen or versions[document.doc_hash] != 1:
+                results.append(SetDocumentResult.UPDATED)
+            else:
+                results.append(SetDocumentResult.CREATED)
+            seen.add(document.doc_hash)
+        return results
+
+    def _set_document_statuses_by_lookup(
+        self, documents: List[DMSDocument]
+    ) -> List[SetDocumentResult]:
+        """Read the existing names once, then insert new records and update per status."""
+        names: Dict[str, str] = dict(
+            self.session.execute(
+                select(DBDMSDocument.doc_hash, DBDMSDocument.doc_name).where(
+                    DBDMSDocument.doc_hash.in_({doc.doc_hash for doc in documents})
+                )
+            ).all()
+        )
+        results = []
+        inserts: Dict[str, DMSDocument] = {}
+        updates: Dict[str, DocumentStatus] = {}
+        for document in documents:
+            registered_name = names.get(document.doc_hash)
+            if registered_name is not None and registered_name != document.doc_name:
+                results.append(SetDocumentResult.CONFLICT)
+            elif document.doc_hash in inserts:
+                inserts[document.doc_hash] = document
+                results.append(SetDocumentResult.UPDATED)
+            elif registered_name is None:
+                inserts[document.doc_hash] = document
+                names[document.doc_hash] = document.doc_name
+                results.append(SetDocumentResult.CREATED)
+            else:
+                updates[document.doc_hash] = document.status
+                results.append(SetDocumentResult.UPDATED)
+        if inserts:
+            self.session.execute(
+                insert(DBDMSDocument),
+                [document.model_dump() for document in inserts.values()],
+            )
+        by_status: Dict[DocumentStatus, List[str]] = {}
+        for doc_hash, status in updates.items():
+            by_status.setdefault(status, []).append(doc_hash)
+        for status, doc_hashes in by_status.items():
+            self.session.execute(
+                update(DBDMSDocument)
+                .where(DBDMSDocument.doc_hash.in_(doc_hashes))
+                .values(
+                    status=status,
+                    version=DBDMSDocument.version + 1,
+                    updated_at=datetime.now(timezone.utc),
+                )
+            )
+        self.session.commit()
+        return results
+
+    def _dialect_name(self) -> str:
+        return self.session.get_bind().dialect.name
+
+    def _upsert(self, documents: List[DMSDocument]) -> Dict[str, int]:
+        """Run upsert_documents_statement and return each written hash's new version."""
+        return dict(
+            self.session.execute(
+                upsert_documents_statement(self._dialect_name(), documents)
+            ).all()
+        )
+
+
+class AsyncDBClient:
+    """DBClient for an AsyncSession: the same public methods, as coroutines.
+
+    Each call runs the DBClient method through AsyncSession.run_sync, so its
+    queries go through the async driver on the event loop rather than a
+    worker thread.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session: AsyncSession = session
+
+    def __getattr__(self, name):
+        """Return DBClient's public method `name` as a coroutine function."""
+        method = getattr(DBClient, name, None)
+        if name.startswith("_") or not callable(method):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            return await self.session.run_sync(
+                lambda session: method(DBClient(session), *args, **kwargs)
+            )
+
+        return call
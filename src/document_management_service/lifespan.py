@@ -3,23 +3,121 @@
 from contextlib import asynccontextmanager
 import logging
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, make_url, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.orm import sessionmaker
 
 from src.shared.env_loader import load_environment
-from src.document_management_service.models import Base
+from src.shared.exceptions import ConfigurationException
+from src.document_management_service.models import Base, DBDMSDocument
 
 logger = logging.getLogger(__name__)
 
 
 load_environment()
 DMS_DATABASE_URL = os.getenv("DMS_DATABASE_URL", "sqlite:///:memory:")
+# Connections kept open, and extra ones opened under load; requests wait up
+# to DMS_DB_POOL_TIMEOUT seconds for one before failing with 503.
+DMS_DB_POOL_SIZE = int(os.getenv("DMS_DB_POOL_SIZE", "10"))
+DMS_DB_MAX_OVERFLOW = int(os.getenv("DMS_DB_MAX_OVERFLOW", "20"))
+DMS_DB_POOL_TIMEOUT = float(os.getenv("DMS_DB_POOL_TIMEOUT", "30"))
+DMS_DB_POOL_PRE_PING = os.getenv("DMS_DB_POOL_PRE_PING", "true").lower() == "true"
+# Seconds after which a connection is replaced; -1 keeps connections forever.
+DMS_DB_POOL_RECYCLE = int(os.getenv("DMS_DB_POOL_RECYCLE", "1800"))
+# Serve queries through asyncpg/aiosqlite on the event loop instead of the threadpool.
+DMS_ASYNC_ENGINE = os.getenv("DMS_ASYNC_ENGINE", "false").lower() == "true"
+
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def engine_options(database_url: str) -> dict:
+    """Return the pool arguments for an engine from the DMS_DB_POOL_* settings."""
+    options = {
+        "pool_pre_ping": DMS_DB_POOL_PRE_PING,
+        "pool_recycle": DMS_DB_POOL_RECYCLE,
+    }
+    url = make_url(database_url)
+    # In-memory SQLite uses a connection per thread (or one shared), not a sized pool.
+    if url.get_backend_name() != "sqlite" or url.database not in (None, "", ":memory:"):
+        options.update(
+            pool_size=DMS_DB_POOL_SIZE,
+            max_overflow=DMS_DB_MAX_OVERFLOW,
+            pool_timeout=DMS_DB_POOL_TIMEOUT,
+        )
+    return options
+
+
+def async_database_url(database_url: str):
+    """Return the URL with its async driver: asyncpg for PostgreSQL, aiosqlite for SQLite."""
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ConfigurationException(
+            f"DMS_ASYNC_ENGINE supports {', '.join(ASYNC_DRIVERS)} databases"
+        )
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}")
+
+
+def upgrade_schema(connection) -> None:
+    """Add the columns, indexes and status values introduced since the documents table was created.
+
+    create_all skips tables and types that already exist, so these are added here.
+    """
+    table = DBDMSDocument.__table__
+    if connection.dialect.name == "postgresql":
+        # PostgreSQL stores the status as a native enum type.
+        status_type = table.c.status.type
+        for value in status_type.enums:
+            connection.execute(
+                text(f"ALTER TYPE {status_type.name} ADD VALUE IF NOT EXISTS '{value}'")
+            )
+    existing = {
+        column["name"] for column in inspect(connection).get_columns(table.name)
+    }
+    for column in table.columns:
+        if column.name not in existing:
+            logger.info(f"Adding column {column.name} to {table.name}")
+            definition = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.execute(
+                text(f"ALTER TABLE {table.name} ADD COLUMN {definition}")
+            )
+    for index in table.indexes:
+        index.create(connection, checkfirst=True)
+
+
+def create_schema(connection) -> None:
+    """Create the tables if they don't exist, then upgrade them."""
+    Base.metadata.create_all(connection)
+    upgrade_schema(connection)
 
 
 @asynccontextmanager
 async def lifespan(app):
-    """Initialize the database engine and session factory on application startup."""
-    engine = create_engine(DMS_DATABASE_URL)
-    Base.metadata.create_all(engine)  # Create tables if they don't exist
+    """Initialize the database engine and session factory on application startup.
+
+    With DMS_ASYNC_ENGINE, the engine and sessions are async, and
+    app.state.async_engine tells get_db_client to hand out AsyncDBClients.
+    """
+    app.state.async_engine = DMS_ASYNC_ENGINE
+    if DMS_ASYNC_ENGINE:
+        url = async_database_url(DMS_DATABASE_URL)
+        try:
+            engine = create_async_engine(url, **engine_options(DMS_DATABASE_URL))
+        except ImportError as e:
+            raise ConfigurationException(
+                f"DMS_ASYNC_ENGINE needs the {url.get_driver_name()} package"
+            ) from e
+        async with engine.begin() as connection:
+            await connection.run_sync(create_schema)
+        app.state.Session = async_sessionmaker(engine)
+        logger.info(f"DMS using async driver {url.get_driver_name()}")
+        yield
+        await engine.dispose()
+        return
+    engine = create_engine(DMS_DATABASE_URL, **engine_options(DMS_DATABASE_URL))
+    with engine.begin() as connection:
+        create_schema(connection)
     app.state.Session = sessionmaker(bind=engine)
     yield
+    engine.dispose()
@@ -1,33 +1,95 @@
 """FastAPI application for the Document Management Service."""
 
-from typing import List
-from fastapi import Depends, FastAPI, HTTPException, Response
+import inspect
+from typing import Annotated, List, Optional
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import ValidationError
-from starlette.status import HTTP_201_CREATED, HTTP_204_NO_CONTENT
+from starlette.status import (
+    HTTP_201_CREATED,
+    HTTP_204_NO_CONTENT,
+    HTTP_304_NOT_MODIFIED,
+)
 from src.document_management_service.lifespan import lifespan
-from src.shared.constants import SetDocumentResult
+from src.shared.constants import (
+    DOCUMENT_FIELDS,
+    MAX_DOCUMENT_PAGE_SIZE,
+    DocumentStatus,
+    SetDocumentResult,
+)
 from src.shared.exceptions import DocumentHashConflictException
 from sqlalchemy.exc import SQLAlchemyError
 from src.shared.models import (
+    BatchGetDocumentStatusRequest,
+    BatchGetDocumentStatusResponse,
+    BatchSetDocumentStatusRequest,
+    BatchSetDocumentStatusResponse,
     DMSDocument,
+    DocumentSummaryResponse,
     GetDocumentStatusResponse,
     SetDocumentStatusRequest,
+    SetDocumentStatusResult,
 )
 import logging
-from src.document_management_service.db_client import DBClient
+from src.document_management_service.db_client import AsyncDBClient, DBClient
 
 logger = logging.getLogger(__name__)
 
 app = FastAPI(lifespan=lifespan)
 
 
-def get_db_client():
-    """Fast API dependency that yields a DBClient backed by a new SQLAlchemy session."""
-    session = app.state.Session()
+async def get_db_client():
+    """Fast API dependency that yields a DBClient backed by a new SQLAlchemy session.
+
+    With the async engine it yields an AsyncDBClient over an AsyncSession.
+    """
+    if app.state.async_engine:
+        async with app.state.Session() as session:
+            yield AsyncDBClient(session)
+        return
+    db_client = DBClient(app.state.Session())
+    try:
+        yield db_client
+    finally:
+        # call_db already gave the connection back, so this does no I/O.
+        db_client.close()
+
+
+async def call_db(method, *args):
+    """Await a database call: AsyncDBClient's natively, DBClient's on the threadpool."""
+    if inspect.iscoroutinefunction(method):
+        return await method(*args)
+    return await run_in_threadpool(_call_and_release, method, *args)
+
+
+def _call_and_release(method, *args):
+    """Run a DBClient method, then give its connection back from the same thread.
+
+    Otherwise a read keeps its connection until the request ends, and with
+    the pool exhausted the threadpool fills with requests waiting for one.
+    """
     try:
-        yield DBClient(session)
+        return method(*args)
     finally:
-        session.close()
+        owner = getattr(method, "__self__", None)
+        if isinstance(owner, DBClient):
+            owner.close()
+
+
+def document_status_etag(document: GetDocumentStatusResponse) -> str:
+    """Return the ETag of a status record; it changes whenever the record is written."""
+    if document.updated_at is None:
+        return f'"{document.version}"'
+    return f'"{document.version}-{document.updated_at:%Y%m%d%H%M%S%f}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
 
 
 @app.get("/health")
@@ -36,28 +98,92 @@ def health():
     return {"status": "ok"}
 
 
-@app.get("/documents/{doc_hash}/status/", response_model=GetDocumentStatusResponse)
-def get_document_status(doc_hash, db_client: DBClient = Depends(get_db_client)):
-    """Retrieve the current processing status of a document by its hash."""
+@app.post("/documents/status:batchGet", response_model=BatchGetDocumentStatusResponse)
+async def batch_get_document_status(
+    request: BatchGetDocumentStatusRequest,
+    db_client: DBClient = Depends(get_db_client),
+):
+    """Return the records of many document hashes in one query; unknown hashes are left out."""
+    logger.info(
+        f"Processing batch get document status request for {len(request.doc_hashes)}"
+        " documents..."
+    )
+    try:
+        documents = await call_db(db_client.get_documents_by_hash, request.doc_hashes)
+    except (SQLAlchemyError, ValidationError) as e:
+        logger.error(e)
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    except Exception as e:
+        logger.error(e)
+        raise HTTPException(status_code=500, detail="Processing failed")
+    return BatchGetDocumentStatusResponse(documents=documents)
+
+
+@app.put("/documents/status:batch", response_model=BatchSetDocumentStatusResponse)
+async def batch_put_document_status(
+    request: BatchSetDocumentStatusRequest,
+    db_client: DBClient = Depends(get_db_client),
+):
+    """Create or update many document records in one transaction.
+
+    Returns one result per document, in request order: created, updated, or
+    conflict for a hash registered under another name, which is left unchanged.
+    """
+    logger.info(
+        f"Processing batch put document status request for {len(request.documents)}"
+        " documents..."
+    )
+    try:
+        results = await call_db(db_client.set_document_statuses, request.documents)
+    except (SQLAlchemyError, ValidationError) as e:
+        logger.error(e)
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    except Exception as e:
+        logger.error(e)
+        raise HTTPException(status_code=500, detail="Processing failed")
+    return BatchSetDocumentStatusResponse(
+        results=[
+            SetDocumentStatusResult(doc_hash=document.doc_hash, result=result)
+            for document, result in zip(request.documents, results)
+        ]
+    )
+
+
+@app.get(
+    "/documents/{doc_hash}/status/",
+    response_model=GetDocumentStatusResponse,
+    responses={304: {"description": "Not modified since the given ETag"}},
+)
+async def get_document_status(
+    doc_hash,
+    db_client: DBClient = Depends(get_db_client),
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    """Retrieve the current processing status of a document by its hash.
+
+    Read in one query. The response carries an ETag; a request whose
+    If-None-Match holds the current one gets an empty 304.
+    """
     logger.info("Processing get document status request...")
     try:
-        doc_name = db_client.get_document_name(doc_hash)
-        if not doc_name:
-            raise HTTPException(status_code=404)
-        status = db_client.get_document_status(doc_hash)
-        return GetDocumentStatusResponse(doc_name=doc_name, status=status)
-    except HTTPException:
-        raise
+        document = await call_db(db_client.get_document, doc_hash)
     except SQLAlchemyError as e:
         logger.error(e)
         raise HTTPException(status_code=503, detail="Database unavailable")
     except Exception as e:
         logger.error(e)
         raise HTTPException(status_code=500, detail="Processing failed")
+    if document is None:
+        raise HTTPException(status_code=404)
+    etag = document_status_etag(document)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+    return JSONResponse(content=jsonable_encoder(document), headers=headers)
 
 
 @app.put("/documents/{doc_hash}/status/", response_model=DMSDocument | None)
-def put_document_status(
+async def put_document_status(
     doc_hash,
     request: SetDocumentStatusRequest,
     db_client: DBClient = Depends(get_db_client),
@@ -65,8 +191,8 @@ def put_document_status(
     """Create or update a document record with the given status; returns 201 on create, 204 on update."""
     logger.info("Processing put document status request...")
     try:
-        document, result = db_client.set_document_status(
-            doc_hash, request.doc_name, request.status
+        document, result = await call_db(
+            db_client.set_document_status, doc_hash, request.doc_name, request.status
         )
     except DocumentHashConflictException as e:
         logger.error(e)
@@ -86,18 +212,76 @@ def put_document_status(
     )
 
 
+@app.get("/documents/summary", response_model=DocumentSummaryResponse)
+async def get_documents_summary(db_client: DBClient = Depends(get_db_client)):
+    """Return the document count per status and a fingerprint of the COMPLETED hashes."""
+    logger.info("Processing get documents summary request...")
+    try:
+        counts, completed_fingerprint = await call_db(db_client.get_document_summary)
+    except (SQLAlchemyError, ValidationError) as e:
+        logger.error(e)
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    except Exception as e:
+        logger.error(e)
+        raise HTTPException(status_code=500, detail="Processing failed")
+    return DocumentSummaryResponse(
+        total=sum(counts.values()),
+        counts={status: counts.get(status, 0) for status in DocumentStatus},
+        completed_fingerprint=completed_fingerprint,
+    )
+
+
 @app.get("/documents/", response_model=List[DMSDocument])
-def get_documents(db_client: DBClient = Depends(get_db_client)):
-    """Return all registered documents, or 204 No Content if none exist."""
+async def get_documents(
+    db_client: DBClient = Depends(get_db_client),
+    status: Optional[DocumentStatus] = None,
+    limit: Annotated[Optional[int], Query(ge=1, le=MAX_DOCUMENT_PAGE_SIZE)] = None,
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """Return registered documents ordered by hash, or 204 No Content if none match.
+
+    `status` filters by status. `limit` and `after` page through the results:
+    when a page is full, the X-Next-After header holds the `after` value of
+    the next one. `fields` is a comma-separated subset of doc_hash, doc_name
+    and status to return.
+    """
     logger.info("Processing get documents request...")
+    columns = None
+    if fields is not None:
+        columns = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = set(columns) - set(DOCUMENT_FIELDS)
+        if not columns or unknown:
+            raise HTTPException(
+                status_code=422,
+                detail=f"fields must be a subset of {', '.join(DOCUMENT_FIELDS)}",
+            )
     try:
-        docs = db_client.get_documents()
-        if not docs:
-            return Response(status_code=HTTP_204_NO_CONTENT)
-        return docs
+        if columns is None:
+            docs = await call_db(db_client.get_documents, status, after, limit)
+            last_hash = docs[-1].doc_hash if docs else None
+        else:
+            # The page cursor needs doc_hash even when it is not returned.
+            rows = await call_db(
+                db_client.get_document_rows,
+                list(dict.fromkeys(columns + ["doc_hash"])),
+                status,
+                after,
+                limit,
+            )
+            last_hash = rows[-1]["doc_hash"] if rows else None
+            docs = [{name: row[name] for name in columns} for row in rows]
     except (SQLAlchemyError, ValidationError) as e:
         logger.error(e)
         raise HTTPException(status_code=503, detail="Database unavailable")
     except Exception as e:
         logger.error(e)
         raise HTTPException(status_code=500, detail="Processing failed")
+    if not docs:
+        return Response(status_code=HTTP_204_NO_CONTENT)
+    headers = {}
+    if limit is not None and len(docs) == limit:
+        headers["X-Next-After"] = last_hash
+    if columns is None and not headers:
+        return docs
+    return JSONResponse(content=jsonable_encoder(docs), headers=headers)
@@ -1,6 +1,8 @@
 """SQLAlchemy ORM models for the Document Management Service."""
 
-from sqlalchemy import Enum, Column, String
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Enum, Column, Index, Integer, String
 from sqlalchemy.orm import declarative_base
 
 from src.shared.constants import DocumentStatus
@@ -9,6 +11,10 @@ from src.shared.constants import DocumentStatus
 Base = declarative_base()
 
 
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class DBDMSDocument(Base):
     """ORM model representing a document record in the DMS database."""
 
@@ -16,3 +22,10 @@ class DBDMSDocument(Base):
     doc_hash = Column(String, primary_key=True)
     doc_name = Column(String, nullable=False)
     status = Column(Enum(DocumentStatus), nullable=False)
+    # Bumped on every status write; with updated_at it makes the status ETag.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Nullable so it can be added to existing tables; NULL for rows from before.
+    updated_at = Column(DateTime(timezone=True), default=_utc_now)
+
+    # Serves status filters, per-status counts and keyset pages within a status.
+    __table_args__ = (Index("ix_documents_status_doc_hash", "status", "doc_hash"),)
@@ -0,0 +1,141 @@
+"""Semantic answer cache: reuse answers to standalone questions that embed close to earlier ones."""
+
+import os
+import threading
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.shared.env_loader import load_environment
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+load_environment()
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+ANSWER_CACHE_SIMILARITY_THRESHOLD = float(
+    os.getenv("ANSWER_CACHE_SIMILARITY_THRESHOLD", "0.95")
+)
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "512"))
+
+
+class SemanticAnswerCache:
+    """Bounded cache of (question embedding, answer) pairs looked up by cosine similarity.
+
+    Embeddings are L2-normalized and kept in one matrix, so a lookup is a single
+    matrix-vector product over the most recent ANSWER_CACHE_MAX_ENTRIES questions;
+    once full, the oldest entry is overwritten. The cache is cleared whenever
+    corpus_version_fn (typically the readiness snapshot's version) returns a new
+    version, or None when the version is unknown.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        corpus_version_fn: Optional[Callable[[], Optional[str]]] = None,
+        similarity_threshold: float = ANSWER_CACHE_SIMILARITY_THRESHOLD,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+    ):
+        if max_entries < 1:
+            raise ValueError("ANSWER_CACHE_MAX_ENTRIES must be at least 1")
+        self.embeddings = embeddings
+        self.corpus_version_fn = corpus_version_fn
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.corpus_version: Optional[str] = None
+        self._matrix: Optional[np.ndarray] = None
+        self._answers: List[Optional[str]] = [None] * max_entries
+        self._latencies = np.zeros(max_entries)
+        self._size = 0
+        self._next_slot = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.saved_latency_seconds = 0.0
+
+    def embed(self, question: str) -> np.ndarray:
+        """Return the normalized embedding of a standalone question."""
+        vector = np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, embedding: np.ndarray) -> Tuple[Optional[str], Optional[str]]:
+        """Return (answer of the most similar question above the threshold or None, corpus version)."""
+        version = self.corpus_version_fn() if self.corpus_version_fn else None
+        with self._lock:
+            self._refresh_corpus_version(version)
+            if self._size:
+                similarities = self._matrix[: self._size] @ embedding
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.similarity_threshold:
+                    self.hits += 1
+                    self.saved_latency_seconds += float(self._latencies[best])
+                    return self._answers[best], version
+            self.misses += 1
+            return None, version
+
+    def store(
+        self,
+        embedding: np.ndarray,
+        answer: str,
+        latency_seconds: float,
+        version: Optional[str] = None,
+    ) -> None:
+        """Cache an answer and the LLM latency it took to produce it.
+
+        version is the one lookup returned; the answer is dropped if the
+        corpus changed (or became unknown) while it was being generated.
+        """
+        with self._lock:
+            if self.corpus_version_fn is not None and (
+                version is None or version != self.corpus_version
+            ):
+                return
+            if self._matrix is None:
+                self._matrix = np.zeros(
+                    (self.max_entries, embedding.shape[0]), dtype=np.float32
+                )
+            slot = self._next_slot
+            self._matrix[slot] = embedding
+            self._answers[slot] = answer
+            self._latencies[slot] = latency_seconds
+            self._next_slot = (slot + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
+
+    def clear(self) -> None:
+        """Drop every cached answer."""
+        with self._lock:
+            self._clear()
+
+    def get_stats(self) -> dict:
+        """Return hit/miss counts and rate, entry count and LLM latency saved by hits."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._size,
+            "max_entries": self.max_entries,
+            "similarity_threshold": self.similarity_threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "saved_latency_seconds": round(self.saved_latency_seconds, 3),
+        }
+
+    def _clear(self) -> None:
+        self._answers = [None] * self.max_entries
+        self._size = 0
+        self._next_slot = 0
+
+    def _refresh_corpus_version(self, version: Optional[str]) -> None:
+        if self.corpus_version_fn is None:
+            return
+        # Without a known corpus version cached answers may be stale.
+        if version is None or version != self.corpus_version:
+            if self._size:
+                self.invalidations += 1
+                logger.info("Document set changed; clearing answer cache")
+            self._clear()
+            self.corpus_version = version
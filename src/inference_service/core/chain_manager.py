@@ -1,6 +1,8 @@
 """Chain manager for building and running LangChain retrieval-augmented generation chains."""
 
 import os
+import threading
+from typing import Iterator, List, Optional, Tuple
 from langchain_community.vectorstores import Chroma
 from langchain_classic.memory import ConversationBufferMemory
 from langchain_together import Together
@@ -8,11 +10,22 @@ from langchain_community.llms import Ollama
 from langchain_core.language_models.llms import LLM
 from langchain_classic.chains import RetrievalQA
 from langchain_classic.chains import ConversationalRetrievalChain
+from langchain_classic.chains.conversational_retrieval.base import _get_chat_history
 from langchain_core.prompts import PromptTemplate
 from langchain_classic.chains.base import Chain
-from langchain_core.vectorstores import VectorStoreRetriever
-import re
+from langchain_core.retrievers import BaseRetriever
 import logging
+from src.inference_service.core.retrieval_cache import (
+    CachingRetriever,
+    RetrievalCache,
+)
+from src.inference_service.core.response_stream import (
+    ANSWER_TAG,
+    AnswerStreamHandler,
+    StreamCancellation,
+    StreamingResponseCleaner,
+    clean_response_text,
+)
 from src.shared.env_loader import load_environment
 
 logger = logging.getLogger(__name__)
@@ -34,7 +47,7 @@ class ChainManager:
     temperature: float
     max_tokens: int
     together_api_key: str
-    retriever: VectorStoreRetriever
+    retriever: BaseRetriever
 
     def __init__(
         self,
@@ -42,6 +55,7 @@ class ChainManager:
         temperature: float = TEMPERATURE,
         max_tokens: int = MAX_TOKENS,
         retrieval_k: int = RETRIEVAL_K,
+        retrieval_cache: Optional[RetrievalCache] = None,
     ):
         if vectordb is None:
             raise ValueError("vectordb cannot be None")
@@ -62,6 +76,10 @@ class ChainManager:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.retriever = vectordb.as_retriever(search_kwargs={"k": retrieval_k})
+        if retrieval_cache is not None:
+            self.retriever = CachingRetriever(
+                retriever=self.retriever, cache=retrieval_cache
+            )
 
     def get_llm(self) -> LLM:
         """Instantiate and return the configured LLM (Together AI or Ollama)."""
@@ -98,24 +116,31 @@ class ChainManager:
         prompt: dict,
         condense_question_prompt: PromptTemplate = None,
         verbose: bool = False,
+        use_memory: bool = True,
     ) -> ConversationalRetrievalChain:
-        """Build a ConversationalRetrievalChain with in-memory chat history."""
+        """Build a ConversationalRetrievalChain.
+
+        With use_memory=False the chain is stateless and can be shared across
+        sessions; callers pass their own chat_history on every invocation.
+        """
         try:
-            memory = ConversationBufferMemory(
-                memory_key="chat_history", return_messages=True, output_key="answer"
-            )
             kwargs = {
                 "llm": llm,
                 "retriever": self.retriever,
-                "memory": memory,
                 "combine_docs_chain_kwargs": prompt,
                 "verbose": verbose,
             }
+            if use_memory:
+                kwargs["memory"] = ConversationBufferMemory(
+                    memory_key="chat_history", return_messages=True, output_key="answer"
+                )
 
             if condense_question_prompt is not None:
                 kwargs["condense_question_prompt"] = condense_question_prompt
 
-            return ConversationalRetrievalChain.from_llm(**kwargs)
+            chain = ConversationalRetrievalChain.from_llm(**kwargs)
+            chain.combine_docs_chain.tags = [ANSWER_TAG]
+            return chain
 
         except Exception as exception:
             raise Exception(f"❌ Error setting up Chain: {exception}") from exception
@@ -146,23 +171,136 @@ class ChainManager:
     @staticmethod
     def _clean_response(text: str) -> str:
         """Strip trailing artifacts that some models emit after the answer."""
-        # Remove <think>…</think> blocks (chain-of-thought reasoning)
-        text = re.sub(r"<think>.*?</think>", "", text, flags=re.DOTALL)
-        # Remove stray </think> and everything after it
-        text = re.split(r"</think>", text, maxsplit=1)[0]
-        # Remove anything from the first remaining XML-like tag onward
-        text = re.split(r"<\w+", text, maxsplit=1)[0]
-        # Remove trailing markdown section headers (### …)
-        text = re.split(r"\n#{1,4}\s", text, maxsplit=1)[0]
-        return text.strip()
-
-    def ask_question(self, question: str, qa_chain: Chain) -> str:
-        """Invoke the chain with a question and return the answer as a string."""
+        return clean_response_text(text)
+
+    @staticmethod
+    def _condense_inputs(
+        question: str,
+        qa_chain: ConversationalRetrievalChain,
+        chat_history: List[Tuple[str, str]],
+    ) -> dict:
+        get_chat_history = qa_chain.get_chat_history or _get_chat_history
+        return {"question": question, "chat_history": get_chat_history(chat_history)}
+
+    def condense_question(
+        self,
+        question: str,
+        qa_chain: ConversationalRetrievalChain,
+        chat_history: Optional[List[Tuple[str, str]]] = None,
+    ) -> str:
+        """Rephrase a follow-up into a standalone question with the chain's condense step.
+
+        Without history the question is already standalone and no LLM call is made.
+        """
+        if not chat_history:
+            return question
+        try:
+            response = qa_chain.question_generator.invoke(
+                self._condense_inputs(question, qa_chain, chat_history)
+            )
+            return str(response["text"]).strip()
+        except Exception as exception:
+            raise Exception(f"❌ Error invoking LLM: {exception}") from exception
+
+    async def acondense_question(
+        self,
+        question: str,
+        qa_chain: ConversationalRetrievalChain,
+        chat_history: Optional[List[Tuple[str, str]]] = None,
+    ) -> str:
+        """Asynchronously rephrase a follow-up into a standalone question."""
+        if not chat_history:
+            return question
+        try:
+            response = await qa_chain.question_generator.ainvoke(
+                self._condense_inputs(question, qa_chain, chat_history)
+            )
+            return str(response["text"]).strip()
+        except Exception as exception:
+            raise Exception(f"❌ Error invoking LLM: {exception}") from exception
+
+    def ask_question(
+        self,
+        question: str,
+        qa_chain: Chain,
+        chat_history: Optional[List[Tuple[str, str]]] = None,
+    ) -> str:
+        """Invoke the chain with a question and return the answer as a string.
+
+        chat_history is required for chains built without memory and is
+        ignored by RetrievalQA chains.
+        """
         try:
             if isinstance(qa_chain, RetrievalQA):
                 response = qa_chain.invoke({"query": question})
                 return self._clean_response(str(response["result"]))
-            response = qa_chain.invoke({"question": question})
+            inputs = {"question": question}
+            if chat_history is not None:
+                inputs["chat_history"] = chat_history
+            response = qa_chain.invoke(inputs)
+            return self._clean_response(str(response["answer"]))
+        except Exception as exception:
+            raise Exception(f"❌ Error invoking LLM: {exception}") from exception
+
+    async def aask_question(
+        self,
+        question: str,
+        qa_chain: Chain,
+        chat_history: Optional[List[Tuple[str, str]]] = None,
+    ) -> str:
+        """Asynchronously invoke the chain (async retrieval and LLM call) and return the answer."""
+        try:
+            if isinstance(qa_chain, RetrievalQA):
+                response = await qa_chain.ainvoke({"query": question})
+                return self._clean_response(str(response["result"]))
+            inputs = {"question": question}
+            if chat_history is not None:
+                inputs["chat_history"] = chat_history
+            response = await qa_chain.ainvoke(inputs)
             return self._clean_response(str(response["answer"]))
         except Exception as exception:
             raise Exception(f"❌ Error invoking LLM: {exception}") from exception
+
+    def stream_question(
+        self,
+        question: str,
+        qa_chain: Chain,
+        chat_history: Optional[List[Tuple[str, str]]] = None,
+        cancellation: Optional[StreamCancellation] = None,
+    ) -> Iterator[str]:
+        """Invoke a ConversationalRetrievalChain and yield cleaned answer text as it is generated.
+
+        The chain runs on a producer thread. Cancelling `cancellation` makes
+        it abort at the next LLM event; its wait_finished() returns once the
+        thread is done.
+        """
+        cancellation = cancellation or StreamCancellation()
+        handler = AnswerStreamHandler(cancellation)
+        inputs = {"question": question}
+        if chat_history is not None:
+            inputs["chat_history"] = chat_history
+
+        def _run_chain():
+            try:
+                qa_chain.invoke(inputs, config={"callbacks": [handler]})
+            except Exception as exception:
+                if not cancellation.cancelled:
+                    handler.fail(exception)
+            finally:
+                handler.close()
+                cancellation.finish()
+
+        if not cancellation.start():
+            return
+        threading.Thread(target=_run_chain, daemon=True).start()
+        cleaner = StreamingResponseCleaner()
+        try:
+            for token in handler:
+                delta = cleaner.feed(token)
+                if delta:
+                    yield delta
+        except Exception as exception:
+            raise Exception(f"❌ Error invoking LLM: {exception}") from exception
+        tail = cleaner.finish()
+        if tail:
+            yield tail
@@ -0,0 +1,132 @@
+"""Decide per turn whether a follow-up question needs the condense-question LLM call."""
+
+import os
+import re
+import threading
+from typing import List, Tuple
+
+from src.shared.env_loader import load_environment
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+load_environment()
+CONDENSE_HEURISTIC_ENABLED = (
+    os.getenv("CONDENSE_HEURISTIC_ENABLED", "true").lower() == "true"
+)
+
+# Words that usually point back at something said earlier in the conversation.
+_REFERRING_WORDS = frozenset(
+    {
+        "it",
+        "its",
+        "it's",
+        "they",
+        "them",
+        "their",
+        "theirs",
+        "this",
+        "that",
+        "these",
+        "those",
+        "he",
+        "him",
+        "his",
+        "she",
+        "her",
+        "hers",
+        "there",
+        "former",
+        "latter",
+        "above",
+        "aforementioned",
+        "previous",
+        "same",
+    }
+)
+# Openings that continue the previous turn rather than start a new topic.
+_CONTINUATION_OPENINGS = (
+    "and",
+    "but",
+    "or",
+    "so",
+    "also",
+    "then",
+    "why",
+    "what about",
+    "how about",
+    "what else",
+    "tell me more",
+    "more",
+    "another",
+    "elaborate",
+    "explain further",
+    "go on",
+    "continue",
+    "example",
+    "examples",
+)
+_MIN_SELF_CONTAINED_WORDS = 4
+_WORD_RE = re.compile(r"[a-z']+")
+
+CONDENSE_DECISIONS = ("skipped_empty_history", "skipped_self_contained", "performed")
+
+
+def is_self_contained(question: str) -> bool:
+    """Return True if the question can be answered without rewriting it against history.
+
+    Conservative on purpose: short questions, questions opening with a
+    continuation and questions with pronouns or demonstratives are sent to
+    the condense step.
+    """
+    words = _WORD_RE.findall(question.lower())
+    if len(words) < _MIN_SELF_CONTAINED_WORDS:
+        return False
+    opening = " ".join(words[:3])
+    if any(
+        opening == phrase or opening.startswith(f"{phrase} ")
+        for phrase in _CONTINUATION_OPENINGS
+    ):
+        return False
+    return not _REFERRING_WORDS.intersection(words)
+
+
+class CondensePolicy:
+    """Chooses the chat history to send to the chain and counts condense decisions.
+
+    Returning an empty history makes the chain skip its condense-question call;
+    the answer prompt does not use history, so the answer is unaffected.
+    """
+
+    def __init__(self, heuristic_enabled: bool = CONDENSE_HEURISTIC_ENABLED):
+        self.heuristic_enabled = heuristic_enabled
+        self.counts = {decision: 0 for decision in CONDENSE_DECISIONS}
+        self._lock = threading.Lock()
+
+    def history_for_turn(
+        self, question: str, chat_history: List[Tuple[str, str]]
+    ) -> List[Tuple[str, str]]:
+        """Return chat_history if the question needs condensing, otherwise an empty list."""
+        if not chat_history:
+            decision = "skipped_empty_history"
+        elif self.heuristic_enabled and is_self_contained(question):
+            decision = "skipped_self_contained"
+        else:
+            decision = "performed"
+        with self._lock:
+            self.counts[decision] += 1
+        logger.debug(f"Condense question: {decision}")
+        return chat_history if decision == "performed" else []
+
+    def get_stats(self) -> dict:
+        """Return per-turn counts of skipped and performed condense calls."""
+        with self._lock:
+            counts = dict(self.counts)
+        turns = sum(counts.values())
+        skipped = turns - counts["performed"]
+        return {
+            **counts,
+            "turns": turns,
+            "skip_rate": skipped / turns if turns else 0.0,
+        }
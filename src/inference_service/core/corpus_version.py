@@ -0,0 +1,10 @@
+"""Corpus version tracking: detect when ingestion changes what the inference service can retrieve."""
+
+
+def corpus_version(collection_count: int, completed_fingerprint: str) -> str:
+    """Combine the vector store chunk count and the DMS COMPLETED fingerprint into one version.
+
+    completed_fingerprint is DMS's hash of the COMPLETED document hashes (see
+    GET /documents/summary), so no document list is needed.
+    """
+    return f"{collection_count}:{completed_fingerprint}"
@@ -1,7 +1,14 @@
 """Domain expert core: assembles the chain manager and handles question answering."""
 
+import asyncio
+import time
+from typing import Iterator, List, Optional, Tuple
 from langchain_community.vectorstores import Chroma
+from src.inference_service.core.answer_cache import SemanticAnswerCache
 from src.inference_service.core.chain_manager import ChainManager
+from src.inference_service.core.condense_policy import CondensePolicy
+from src.inference_service.core.response_stream import StreamCancellation
+from src.inference_service.core.retrieval_cache import RetrievalCache
 from src.shared.prompts import domain_expert_condense_prompt, domain_expert_prompt
 from src.shared.exceptions import DomainExpertSetupException
 import logging
@@ -10,11 +17,31 @@ logger = logging.getLogger(__name__)
 
 
 class DomainExpertCore:
-    """Orchestrates LLM chain setup and exposes a question-answering interface."""
+    """Orchestrates LLM chain setup and exposes a question-answering interface.
 
-    def __init__(self, vectordb: Chroma):
+    The LLM client, retriever and chain are stateless and meant to be shared by
+    every session in the process; conversation state is passed in per call.
+
+    With an answer_cache, the question is first condensed to a standalone
+    question; a cached answer to a semantically equivalent question is returned
+    without calling the chain, otherwise the chain answers the standalone
+    question and the result is cached.
+
+    Each turn first goes through the CondensePolicy, which drops the history
+    (so no condense-question LLM call is made) when there is none or the
+    question is already self-contained.
+    """
+
+    def __init__(
+        self,
+        vectordb: Chroma,
+        answer_cache: Optional[SemanticAnswerCache] = None,
+        retrieval_cache: Optional[RetrievalCache] = None,
+    ):
+        self.answer_cache = answer_cache
+        self.condense_policy = CondensePolicy()
         try:
-            self.chain_manager = ChainManager(vectordb)
+            self.chain_manager = ChainManager(vectordb, retrieval_cache=retrieval_cache)
         except ValueError as exception:
             logger.error(f"Error instantiating Chain Manager: {exception}")
             raise DomainExpertSetupException(
@@ -31,17 +58,130 @@ class DomainExpertCore:
                 llm,
                 {"prompt": domain_expert_prompt},
                 condense_question_prompt=domain_expert_condense_prompt,
+                use_memory=False,
             )
 
         except Exception as exception:
             logger.error(f"Failed to create QA chain: {exception}")
             raise DomainExpertSetupException("Error setting up QA chain") from exception
 
-    def ask_question(self, question: str) -> str:
-        """Submit a question to the QA chain and return the generated answer."""
+    def ask_question(
+        self, question: str, chat_history: Optional[List[Tuple[str, str]]] = None
+    ) -> str:
+        """Submit a question with the caller's chat history and return the answer."""
         try:
-            answer = self.chain_manager.ask_question(question, self.qa_chain)
+            chat_history = self.condense_policy.history_for_turn(
+                question, chat_history or []
+            )
+            if self.answer_cache is not None:
+                return self._ask_question_cached(question, chat_history)
+            answer = self.chain_manager.ask_question(
+                question, self.qa_chain, chat_history
+            )
+        except Exception as exception:
+            logger.error(f"Error retrieving answer: {exception}")
+            raise DomainExpertSetupException("Error retrieving answer") from exception
+        return answer
+
+    async def aask_question(
+        self, question: str, chat_history: Optional[List[Tuple[str, str]]] = None
+    ) -> str:
+        """Asynchronously answer a question with the caller's chat history."""
+        try:
+            chat_history = self.condense_policy.history_for_turn(
+                question, chat_history or []
+            )
+            if self.answer_cache is not None:
+                return await self._aask_question_cached(question, chat_history)
+            answer = await self.chain_manager.aask_question(
+                question, self.qa_chain, chat_history
+            )
         except Exception as exception:
             logger.error(f"Error retrieving answer: {exception}")
             raise DomainExpertSetupException("Error retrieving answer") from exception
         return answer
+
+    def stream_question(
+        self,
+        question: str,
+        chat_history: Optional[List[Tuple[str, str]]] = None,
+        cancellation: Optional[StreamCancellation] = None,
+    ) -> Iterator[str]:
+        """Submit a question with the caller's chat history and yield the answer as it is generated."""
+        try:
+            chat_history = self.condense_policy.history_for_turn(
+                question, chat_history or []
+            )
+            if self.answer_cache is not None:
+                yield from self._stream_question_cached(
+                    question, chat_history, cancellation
+                )
+                return
+            yield from self.chain_manager.stream_question(
+                question, self.qa_chain, chat_history, cancellation
+            )
+        except Exception as exception:
+            logger.error(f"Error streaming answer: {exception}")
+            raise DomainExpertSetupException("Error retrieving answer") from exception
+
+    # The cached paths run the chain on the standalone question with an empty
+    # history: the answer prompt only sees context and question, so this is what
+    # the chain would do after its own condense step.
+
+    def _ask_question_cached(
+        self, question: str, chat_history: List[Tuple[str, str]]
+    ) -> str:
+        standalone_question = self.chain_manager.condense_question(
+            question, self.qa_chain, chat_history
+        )
+        embedding = self.answer_cache.embed(standalone_question)
+        answer, version = self.answer_cache.lookup(embedding)
+        if answer is not None:
+            return answer
+        start = time.perf_counter()
+        answer = self.chain_manager.ask_question(standalone_question, self.qa_chain, [])
+        self.answer_cache.store(embedding, answer, time.perf_counter() - start, version)
+        return answer
+
+    async def _aask_question_cached(
+        self, question: str, chat_history: List[Tuple[str, str]]
+    ) -> str:
+        standalone_question = await self.chain_manager.acondense_question(
+            question, self.qa_chain, chat_history
+        )
+        # Embedding runs the model synchronously; the lookup itself is cheap.
+        embedding = await asyncio.to_thread(
+            self.answer_cache.embed, standalone_question
+        )
+        answer, version = self.answer_cache.lookup(embedding)
+        if answer is not None:
+            return answer
+        start = time.perf_counter()
+        answer = await self.chain_manager.aask_question(
+            standalone_question, self.qa_chain, []
+        )
+        self.answer_cache.store(embedding, answer, time.perf_counter() - start, version)
+        return answer
+
+    def _stream_question_cached(
+        self,
+        question: str,
+        chat_history: List[Tuple[str, str]],
+        cancellation: Optional[StreamCancellation] = None,
+    ) -> Iterator[str]:
+        standalone_question = self.chain_manager.condense_question(
+            question, self.qa_chain, chat_history
+        )
+        embedding = self.answer_cache.embed(standalone_question)
+        answer, version = self.answer_cache.lookup(embedding)
+        if answer is not None:
+            yield answer
+            return
+        start = time.perf_counter()
+        answer = ""
+        for token in self.chain_manager.stream_question(
+            standalone_question, self.qa_chain, [], cancellation
+        ):
+            answer += token
+            yield token
+        self.answer_cache.store(embedding, answer, time.perf_counter() - start, version)
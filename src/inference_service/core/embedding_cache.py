@@ -0,0 +1,138 @@
+"""Process-wide LRU cache for query embeddings used by the inference retriever."""
+
+from collections import OrderedDict
+import os
+import threading
+import unicodedata
+from typing import List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.shared.env_loader import load_environment
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+load_environment()
+QUERY_EMBEDDING_CACHE_MAX_BYTES = int(
+    os.getenv("QUERY_EMBEDDING_CACHE_MAX_BYTES", str(16 * 1024 * 1024))
+)
+
+# Approximate per-entry bookkeeping (OrderedDict node, key tuple, array header).
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+def normalize_query(text: str) -> str:
+    """Normalize a query for cache lookups: NFC, collapsed whitespace, stripped.
+
+    Case is preserved because not every embedding model is uncased.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class QueryEmbeddingCache:
+    """LRU map of (model name, normalized query) to float32 embedding, bounded in bytes."""
+
+    def __init__(self, max_bytes: int = QUERY_EMBEDDING_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, model_name: str, query: str) -> Optional[np.ndarray]:
+        """Return the cached embedding and mark it recently used, or None."""
+        key = (model_name, query)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, model_name: str, query: str, vector: np.ndarray) -> None:
+        """Cache an embedding, evicting least-recently-used entries over the byte bound."""
+        key = (model_name, query)
+        size = self._entry_bytes(key, vector)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= self._entry_bytes(key, previous)
+            self._entries[key] = vector
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old_key, old_vector = self._entries.popitem(last=False)
+                self._bytes -= self._entry_bytes(old_key, old_vector)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached embedding."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> dict:
+        """Return hit/miss counts and rate, entry count and memory use."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    @staticmethod
+    def _entry_bytes(key: Tuple[str, str], vector: np.ndarray) -> int:
+        return (
+            vector.nbytes + len(key[0]) + len(key[1].encode()) + _ENTRY_OVERHEAD_BYTES
+        )
+
+
+_query_embedding_cache = QueryEmbeddingCache()
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Return the query embedding cache shared by the whole process."""
+    return _query_embedding_cache
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """Embeddings wrapper that serves embed_query from the shared QueryEmbeddingCache.
+
+    Document embedding is passed through unchanged; only query embeddings
+    (one per retrieval) are cached.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_name: str,
+        cache: Optional[QueryEmbeddingCache] = None,
+    ):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.cache = cache or get_query_embedding_cache()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents with the wrapped model (not cached)."""
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Return the query embedding from the cache, computing it on a miss."""
+        query = normalize_query(text)
+        vector = self.cache.get(self.model_name, query)
+        if vector is None:
+            vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+            self.cache.put(self.model_name, query, vector)
+        return vector.tolist()
@@ -0,0 +1,52 @@
+"""Concurrency limiter bounding outstanding LLM calls in the inference service."""
+
+import asyncio
+import os
+import logging
+from src.shared.env_loader import load_environment
+
+logger = logging.getLogger(__name__)
+
+load_environment()
+MAX_CONCURRENT_LLM_CALLS = int(os.getenv("MAX_CONCURRENT_LLM_CALLS", "16"))
+
+
+class LLMConcurrencyLimiter:
+    """Async semaphore that caps in-flight LLM calls and queues the rest.
+
+    Used as an async context manager around each chain invocation; the number
+    of requests waiting for a slot is exposed as the queue depth.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_LLM_CALLS):
+        if max_concurrent < 1:
+            raise ValueError("MAX_CONCURRENT_LLM_CALLS must be at least 1")
+        self.max_concurrent = max_concurrent
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.queued = 0
+
+    async def __aenter__(self) -> "LLMConcurrencyLimiter":
+        """Wait for a free slot, counting the request as queued meanwhile."""
+        self.queued += 1
+        if self._semaphore.locked():
+            logger.info(f"LLM capacity reached; {self.queued} request(s) queued")
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        """Release the slot held by the current request."""
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def get_stats(self) -> dict:
+        """Return capacity, in-flight and queued request counts."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+        }
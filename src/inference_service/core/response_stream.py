@@ -0,0 +1,205 @@
+"""Streaming helpers: capture answer tokens from LangChain callbacks and clean them incrementally."""
+
+import queue
+import re
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Set
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+# Tag placed on the combine-documents chain so its LLM call can be told apart
+# from the condense-question call when streaming.
+ANSWER_TAG = "domain_expert_answer"
+
+_THINK_BLOCK_RE = re.compile(r"<think>.*?</think>", flags=re.DOTALL)
+_STRAY_THINK_CLOSE_RE = re.compile(r"</think>")
+_XML_TAG_RE = re.compile(r"<\w+")
+_SECTION_HEADER_RE = re.compile(r"\n#{1,4}\s")
+# Tails that could still grow into one of the patterns above.
+_PENDING_TAG_RE = re.compile(r"</?\w*$")
+_PENDING_HEADER_RE = re.compile(r"\n#{0,4}$")
+
+_END_OF_STREAM = object()
+
+
+def clean_response_text(text: str, final: bool = True) -> str:
+    """Apply the ChainManager response cleanup rules to text.
+
+    With final=False the result is the part of text that is guaranteed to
+    survive cleanup no matter what tokens arrive next, so it can be emitted.
+    """
+    # Remove <think>…</think> blocks (chain-of-thought reasoning)
+    text = _THINK_BLOCK_RE.sub("", text)
+    # Remove stray </think> and everything after it
+    text = _STRAY_THINK_CLOSE_RE.split(text, maxsplit=1)[0]
+    # Remove anything from the first remaining XML-like tag onward
+    text = _XML_TAG_RE.split(text, maxsplit=1)[0]
+    # Remove trailing markdown section headers (### …)
+    text = _SECTION_HEADER_RE.split(text, maxsplit=1)[0]
+    if final:
+        return text.strip()
+    for pending in (_PENDING_TAG_RE, _PENDING_HEADER_RE):
+        match = pending.search(text)
+        if match:
+            text = text[: match.start()]
+    return text.strip()
+
+
+class StreamingResponseCleaner:
+    """Incrementally clean streamed tokens, emitting only text that is final."""
+
+    def __init__(self):
+        self._raw = ""
+        self._emitted = ""
+
+    def feed(self, token: str) -> str:
+        """Add a token and return the newly emittable text (possibly empty)."""
+        self._raw += token
+        return self._advance(clean_response_text(self._raw, final=False))
+
+    def finish(self) -> str:
+        """Flush the remaining text once the stream has ended."""
+        return self._advance(clean_response_text(self._raw, final=True))
+
+    @property
+    def text(self) -> str:
+        """Return the cleaned text emitted so far."""
+        return self._emitted
+
+    def _advance(self, stable: str) -> str:
+        if not stable.startswith(self._emitted):
+            return ""
+        delta = stable[len(self._emitted) :]
+        self._emitted = stable
+        return delta
+
+
+class StreamCancelled(Exception):
+    """Raised inside a streaming chain once its consumer has gone away."""
+
+
+class StreamCancellation:
+    """Shared between the consumer of a streamed answer and the thread producing it.
+
+    The consumer calls cancel() when it stops reading (e.g. the client
+    disconnected); the producer's callbacks then abort the chain at the next
+    LLM event. wait_finished() blocks until the producer thread has returned,
+    so the caller can keep its LLM slot until the LLM call is really over.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._finished = threading.Event()
+        self._finished.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Return whether the consumer has stopped reading."""
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """Ask the producer to stop; a producer not yet started will not start."""
+        with self._lock:
+            self._cancelled = True
+
+    def start(self) -> bool:
+        """Register a producer thread; return False if already cancelled."""
+        with self._lock:
+            if self._cancelled:
+                return False
+            self._finished.clear()
+            return True
+
+    def finish(self) -> None:
+        """Mark the producer thread as done."""
+        self._finished.set()
+
+    def wait_finished(self, timeout: Optional[float] = None) -> bool:
+        """Block until the producer thread is done; return False on timeout."""
+        return self._finished.wait(timeout)
+
+
+class AnswerStreamHandler(BaseCallbackHandler):
+    """Callback handler that queues tokens of the answer-generating LLM call.
+
+    LLM runs descending from a chain tagged with ANSWER_TAG are streamed; the
+    condense-question call is ignored. LLMs that do not stream tokens have
+    their full generation queued once on completion. Once the cancellation
+    is set, the next chain, LLM or token event raises StreamCancelled.
+    """
+
+    raise_error = True
+
+    def __init__(self, cancellation: Optional[StreamCancellation] = None):
+        self._cancellation = cancellation
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._answer_runs: Set[UUID] = set()
+        self._streamed_runs: Set[UUID] = set()
+
+    def on_chain_start(
+        self,
+        serialized: Dict[str, Any],
+        inputs: Dict[str, Any],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        tags: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Track chain runs that belong to the answer-generating branch."""
+        self._check_cancelled()
+        if ANSWER_TAG in (tags or []) or parent_run_id in self._answer_runs:
+            self._answer_runs.add(run_id)
+
+    def on_llm_start(
+        self,
+        serialized: Dict[str, Any],
+        prompts: List[str],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Mark LLM runs started by the answer-generating chain."""
+        self._check_cancelled()
+        if parent_run_id in self._answer_runs:
+            self._answer_runs.add(run_id)
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        """Queue a streamed token from the answer LLM run."""
+        self._check_cancelled()
+        if run_id in self._answer_runs:
+            self._streamed_runs.add(run_id)
+            self._queue.put(token)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        """Queue the full generation when the answer LLM did not stream tokens."""
+        if run_id in self._answer_runs and run_id not in self._streamed_runs:
+            for generations in response.generations:
+                for generation in generations:
+                    self._queue.put(generation.text)
+
+    def _check_cancelled(self) -> None:
+        if self._cancellation is not None and self._cancellation.cancelled:
+            raise StreamCancelled("Answer stream cancelled by its consumer")
+
+    def fail(self, exception: BaseException) -> None:
+        """Propagate an exception raised while running the chain to the consumer."""
+        self._queue.put(exception)
+
+    def close(self) -> None:
+        """Signal that no more tokens will be produced."""
+        self._queue.put(_END_OF_STREAM)
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield queued tokens until close() is called; re-raise failures."""
+        while True:
+            item = self._queue.get()
+            if item is _END_OF_STREAM:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
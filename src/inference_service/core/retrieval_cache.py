@@ -0,0 +1,137 @@
+"""Retrieval result cache and the retriever wrapper that consults it."""
+
+from collections import OrderedDict
+import os
+import threading
+from typing import Callable, List, Optional, Tuple
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStoreRetriever
+
+from src.inference_service.core.embedding_cache import normalize_query
+from src.shared.env_loader import load_environment
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+load_environment()
+RETRIEVAL_CACHE_ENABLED = os.getenv("RETRIEVAL_CACHE_ENABLED", "true").lower() == "true"
+RETRIEVAL_CACHE_MAX_ENTRIES = int(os.getenv("RETRIEVAL_CACHE_MAX_ENTRIES", "1024"))
+
+RetrievalKey = Tuple[str, Optional[int]]
+
+
+class RetrievalCache:
+    """LRU cache of retrieved documents keyed by (normalized query, k).
+
+    All entries belong to one corpus version; when corpus_version_fn reports a
+    different version (e.g. after ingestion completes) the cache is cleared,
+    and while the version is unknown (None) the cache is bypassed.
+    """
+
+    def __init__(
+        self,
+        corpus_version_fn: Callable[[], Optional[str]],
+        max_entries: int = RETRIEVAL_CACHE_MAX_ENTRIES,
+    ):
+        if max_entries < 1:
+            raise ValueError("RETRIEVAL_CACHE_MAX_ENTRIES must be at least 1")
+        self.corpus_version_fn = corpus_version_fn
+        self.max_entries = max_entries
+        self.corpus_version: Optional[str] = None
+        self._entries: "OrderedDict[RetrievalKey, List[Document]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: RetrievalKey) -> Tuple[Optional[List[Document]], Optional[str]]:
+        """Return (documents or None, corpus version the lookup was made against)."""
+        version = self.corpus_version_fn()
+        with self._lock:
+            if version is None or version != self.corpus_version:
+                if self._entries:
+                    self.invalidations += 1
+                    logger.info("Corpus version changed; clearing retrieval cache")
+                self._entries.clear()
+                self.corpus_version = version
+            documents = self._entries.get(key) if version is not None else None
+            if documents is None:
+                self.misses += 1
+                return None, version
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return [document.model_copy(deep=True) for document in documents], version
+
+    def put(
+        self, key: RetrievalKey, documents: List[Document], version: Optional[str]
+    ) -> None:
+        """Cache documents retrieved against the given corpus version."""
+        with self._lock:
+            # Skip results of a lookup that raced with a corpus change.
+            if version is None or version != self.corpus_version:
+                return
+            self._entries[key] = [
+                document.model_copy(deep=True) for document in documents
+            ]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        """Return hit/miss counts and rate, entries and invalidations."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "corpus_version": self.corpus_version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+class CachingRetriever(BaseRetriever):
+    """Retriever wrapper serving repeated queries from a RetrievalCache."""
+
+    retriever: BaseRetriever
+    cache: RetrievalCache
+
+    def _cache_key(self, query: str) -> RetrievalKey:
+        k = None
+        if isinstance(self.retriever, VectorStoreRetriever):
+            k = self.retriever.search_kwargs.get("k")
+        return normalize_query(query), k
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        key = self._cache_key(query)
+        documents, version = self.cache.get(key)
+        if documents is not None:
+            return documents
+        documents = self.retriever.invoke(
+            query, config={"callbacks": run_manager.get_child()}
+        )
+        self.cache.put(key, documents, version)
+        return documents
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        key = self._cache_key(query)
+        documents, version = self.cache.get(key)
+        if documents is not None:
+            return documents
+        documents = await self.retriever.ainvoke(
+            query, config={"callbacks": run_manager.get_child()}
+        )
+        self.cache.put(key, documents, version)
+        return documents
@@ -5,6 +5,7 @@ import chromadb
 from langchain_community.vectorstores import Chroma
 from langchain_huggingface import HuggingFaceEmbeddings
 import logging
+from src.inference_service.core.embedding_cache import CachedQueryEmbeddings
 from src.shared.env_loader import load_environment
 
 logger = logging.getLogger(__name__)
@@ -13,6 +14,8 @@ load_environment()
 EMBEDDING_MODEL = os.getenv(
     "EMBEDDING_MODEL", "sentence-transformers/paraphrase-MiniLM-L3-v2"
 )
+# Must match the ingestion service so queries and chunks share one vector space.
+EMBEDDING_NORMALIZE = os.getenv("EMBEDDING_NORMALIZE", "false").lower() == "true"
 CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "500"))
 CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "50"))
 RAG_PREPROCESSOR = os.getenv("RAG_PREPROCESSOR", "legacy")
@@ -46,8 +49,18 @@ class VectorStoreLoader:
             return 0
 
     def load_vector_store(self, model_name: str = EMBEDDING_MODEL) -> Chroma:
-        """Instantiate and return a Chroma vector store backed by HuggingFace embeddings."""
-        embeddings = HuggingFaceEmbeddings(model_name=model_name)
+        """Instantiate and return a Chroma vector store backed by HuggingFace embeddings.
+
+        Query embeddings go through the process-wide LRU cache, so repeated
+        questions are not re-encoded on every retrieval.
+        """
+        embeddings = CachedQueryEmbeddings(
+            HuggingFaceEmbeddings(
+                model_name=model_name,
+                encode_kwargs={"normalize_embeddings": EMBEDDING_NORMALIZE},
+            ),
+            model_name,
+        )
         vectordb = Chroma(
             embedding_function=embeddings,
             client=self.chroma_client,
@@ -1,15 +1,16 @@
 """HTTP client for the Document Management Service used by the inference service."""
 
 import logging
-from typing import List
+from typing import List, Optional, Tuple
 import requests
-from src.shared.models import DMSDocument
+from src.shared.constants import DocumentStatus
+from src.shared.models import DMSDocument, DocumentSummaryResponse
 
 logger = logging.getLogger(__name__)
 
 
 class DocumentManagementClient:
-    """Client for querying document listings from the Document Management Service."""
+    """Client for querying document listings and counts from the Document Management Service."""
 
     def __init__(self, base_url: str):
         self.base_url = base_url
@@ -25,3 +26,28 @@ class DocumentManagementClient:
             raise
         response.raise_for_status()
         return [DMSDocument(**item) for item in response.json()]
+
+    def get_documents_page(
+        self,
+        limit: int,
+        after: Optional[str] = None,
+        status: Optional[DocumentStatus] = None,
+    ) -> Tuple[List[DMSDocument], Optional[str]]:
+        """Fetch one page of documents ordered by hash, and the `after` value of the next page."""
+        params = {"limit": limit}
+        if after is not None:
+            params["after"] = after
+        if status is not None:
+            params["status"] = status.value
+        response = requests.get(f"{self.base_url}/documents/", params=params, timeout=5)
+        if response.status_code == 204:
+            return [], None
+        response.raise_for_status()
+        documents = [DMSDocument(**item) for item in response.json()]
+        return documents, response.headers.get("X-Next-After")
+
+    def get_summary(self) -> DocumentSummaryResponse:
+        """Fetch the document count per status and the COMPLETED hashes' fingerprint."""
+        response = requests.get(f"{self.base_url}/documents/summary", timeout=5)
+        response.raise_for_status()
+        return DocumentSummaryResponse(**response.json())
@@ -5,8 +5,18 @@ import os
 
 from src.inference_service.document_management_client import DocumentManagementClient
 from src.inference_service.session_manager import SessionManager
+from src.inference_service.readiness import ReadinessMonitor
 from src.inference_service.bootstrap import prepare_vector_store
 from src.inference_service.core.vector_store_loader import get_vector_store_loader
+from src.inference_service.core.llm_limiter import LLMConcurrencyLimiter
+from src.inference_service.core.answer_cache import (
+    ANSWER_CACHE_ENABLED,
+    SemanticAnswerCache,
+)
+from src.inference_service.core.retrieval_cache import (
+    RETRIEVAL_CACHE_ENABLED,
+    RetrievalCache,
+)
 from src.shared.env_loader import load_environment
 from src.shared.exceptions import (
     ChromaException,
@@ -60,12 +70,42 @@ async def lifespan(app):
         raise ServerSetupException()
     logger.info("Vector store loaded")
 
+    # Chroma and DMS are polled off the request path; handlers read the snapshot.
+    app.state.readiness = ReadinessMonitor(
+        app.state.vector_store_loader.get_collection_count,
+        app.state.dms_client.get_summary,
+    )
+    app.state.readiness.refresh()
+    app.state.readiness.start()
+
+    # Cached answers and retrievals are dropped when ingestion changes the corpus.
+    def current_corpus_version():
+        return app.state.readiness.snapshot().corpus_version()
+
+    app.state.answer_cache = None
+    if ANSWER_CACHE_ENABLED:
+        app.state.answer_cache = SemanticAnswerCache(
+            vectordb.embeddings,
+            corpus_version_fn=current_corpus_version,
+        )
+    app.state.retrieval_cache = None
+    if RETRIEVAL_CACHE_ENABLED:
+        app.state.retrieval_cache = RetrievalCache(current_corpus_version)
     try:
-        app.state.session_manager: SessionManager = SessionManager(vectordb)
+        app.state.session_manager: SessionManager = SessionManager(
+            vectordb,
+            answer_cache=app.state.answer_cache,
+            retrieval_cache=app.state.retrieval_cache,
+        )
     except Exception:
         logger.error(Error.EXCEPTION)
+        app.state.readiness.stop()
         raise ServerSetupException()
+    app.state.session_manager.start_sweeper()
+    app.state.llm_limiter = LLMConcurrencyLimiter()
     yield
 
     # Shutdown
     logger.info("Cleaning up...")
+    app.state.session_manager.close()
+    app.state.readiness.stop()
@@ -1,12 +1,18 @@
 """FastAPI application for the inference service."""
 
-from typing import List, Union
+from typing import Annotated, AsyncIterator, Optional, Union
+import json
 import logging
-from fastapi import Depends, FastAPI, HTTPException
+import anyio
+from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 from pydantic import BaseModel, Field
 
+from src.inference_service.core.embedding_cache import get_query_embedding_cache
+from src.inference_service.core.response_stream import StreamCancellation
 from src.inference_service.lifespan import lifespan
-from src.shared.models import DMSDocument
+from src.shared.constants import MAX_DOCUMENT_PAGE_SIZE, DocumentStatus
 
 logger = logging.getLogger(__name__)
 
@@ -28,31 +34,77 @@ class DomainExpertResponse(BaseModel):
     system_message: Union[str, None] = None
 
 
-def get_vectordb_collection_count() -> int:
-    """Return the number of documents currently stored in the vector store."""
-    return app.state.vector_store_loader.get_collection_count()
-
-
-def get_documents() -> List[DMSDocument]:
-    """Fetch all documents registered in the Document Management Service."""
-    return app.state.dms_client.get_documents()
-
-
 def ensure_vector_store_ready():
-    """Raise HTTP 503 if the vector store contains no documents."""
-    if get_vectordb_collection_count() == 0:
-        raise HTTPException(503, "No documents have been ingested yet. Please ingest at least one document before chatting.")
+    """Raise HTTP 503 if the vector store contained no documents at the last readiness refresh."""
+    if not app.state.readiness.snapshot().collection_count:
+        raise HTTPException(
+            503,
+            "No documents have been ingested yet. Please ingest at least one document before chatting.",
+        )
 
 
 @app.get("/health")
 def health():
-    """Return service health status including vector store and DMS document counts."""
-    documents = [doc.model_dump() for doc in get_documents()]
+    """Return service health status including vector store and DMS document counts.
+
+    Counts come from the background readiness snapshot; `readiness` reports
+    its age and whether it is stale. Documents themselves are listed by
+    GET /documents, a page at a time.
+    """
+    snapshot = app.state.readiness.snapshot()
+    summary = snapshot.dms_summary
 
     return {
         "status": "ok",
-        "documents_loaded_in_vector_store": f"{get_vectordb_collection_count()}",
-        "documents_loaded_in_dms": documents,
+        "documents_loaded_in_vector_store": f"{snapshot.collection_count or 0}",
+        "documents_in_dms": (
+            {"total": summary.total, "counts": summary.counts}
+            if summary is not None
+            else None
+        ),
+        "readiness": app.state.readiness.get_status(),
+    }
+
+
+@app.get("/documents")
+def documents(
+    limit: Annotated[int, Query(ge=1, le=MAX_DOCUMENT_PAGE_SIZE)] = 50,
+    after: Optional[str] = None,
+    status: Optional[DocumentStatus] = None,
+):
+    """Return one page of DMS documents ordered by hash.
+
+    `next_after` is the `after` value of the next page, or None on the last one.
+    """
+    try:
+        page, next_after = app.state.dms_client.get_documents_page(limit, after, status)
+    except Exception as e:
+        logger.error(e)
+        raise HTTPException(
+            status_code=503, detail="Document Management Service unavailable"
+        )
+    return {
+        "documents": [document.model_dump() for document in page],
+        "next_after": next_after,
+    }
+
+
+@app.get("/metrics")
+def metrics():
+    """Return runtime counters for the inference service."""
+    return {
+        "llm_concurrency": app.state.llm_limiter.get_stats(),
+        "sessions": app.state.session_manager.get_stats(),
+        "condense": (
+            app.state.session_manager.domain_expert_core.condense_policy.get_stats()
+        ),
+        "answer_cache": (
+            app.state.answer_cache.get_stats() if app.state.answer_cache else None
+        ),
+        "query_embedding_cache": get_query_embedding_cache().get_stats(),
+        "retrieval_cache": (
+            app.state.retrieval_cache.get_stats() if app.state.retrieval_cache else None
+        ),
     }
 
 
@@ -62,14 +114,19 @@ def health():
     response_model_exclude_none=True,
     dependencies=[Depends(ensure_vector_store_ready)],
 )
-def ask_question(request: DomainExpertRequest):
-    """Submit a question to the domain expert and return the answer with session context."""
+async def ask_question(request: DomainExpertRequest):
+    """Submit a question to the domain expert and return the answer with session context.
+
+    The chain runs on the event loop (async retrieval and LLM call); at most
+    MAX_CONCURRENT_LLM_CALLS requests invoke the LLM at once, the rest queue.
+    Session store reads and writes run on the threadpool.
+    """
     try:
-        (
-            domain_expert_session,
-            system_message,
-        ) = app.state.session_manager.get_domain_expert_session(request.session_id)
-        answer = domain_expert_session.domain_expert_core.ask_question(request.question)
+        domain_expert_session, system_message = await run_in_threadpool(
+            app.state.session_manager.get_domain_expert_session, request.session_id
+        )
+        async with app.state.llm_limiter:
+            answer = await domain_expert_session.aask_question(request.question)
         return DomainExpertResponse(
             answer=answer,
             session_id=domain_expert_session.session_id,
@@ -78,3 +135,62 @@ def ask_question(request: DomainExpertRequest):
     except Exception as e:
         logger.error(e)
         raise HTTPException(status_code=500, detail="Processing failed")
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format a single Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post(
+    "/chat/domain-expert/stream/",
+    dependencies=[Depends(ensure_vector_store_ready)],
+)
+async def stream_question(request: DomainExpertRequest):
+    """Submit a question to the domain expert and stream the answer as Server-Sent Events.
+
+    Emits a `session` event first, then one `token` event per chunk of cleaned
+    answer text, and finally `done` with the full answer (or `error`).
+    """
+    try:
+        domain_expert_session, system_message = await run_in_threadpool(
+            app.state.session_manager.get_domain_expert_session, request.session_id
+        )
+    except Exception as e:
+        logger.error(e)
+        raise HTTPException(status_code=500, detail="Processing failed")
+
+    async def _events() -> AsyncIterator[str]:
+        session_data = {"session_id": domain_expert_session.session_id}
+        if system_message:
+            session_data["system_message"] = system_message
+        yield _sse_event("session", session_data)
+        answer = ""
+        cancellation = StreamCancellation()
+        try:
+            async with app.state.llm_limiter:
+                try:
+                    async for token in iterate_in_threadpool(
+                        domain_expert_session.stream_question(
+                            request.question, cancellation=cancellation
+                        )
+                    ):
+                        answer += token
+                        yield _sse_event("token", {"text": token})
+                finally:
+                    # On disconnect, stop the producer thread and keep the
+                    # LLM slot until its chain has actually returned.
+                    cancellation.cancel()
+                    with anyio.CancelScope(shield=True):
+                        await run_in_threadpool(cancellation.wait_finished)
+        except Exception as e:
+            logger.error(e)
+            yield _sse_event("error", {"detail": "Processing failed"})
+            return
+        yield _sse_event("done", {"answer": answer})
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,137 @@
+"""Background-refreshed readiness state of the vector store and DMS."""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from src.inference_service.core.corpus_version import corpus_version
+from src.shared.env_loader import load_environment
+from src.shared.models import DocumentSummaryResponse
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+load_environment()
+READINESS_REFRESH_SECONDS = float(os.getenv("READINESS_REFRESH_SECONDS", "5"))
+
+
+@dataclass(frozen=True)
+class ReadinessSnapshot:
+    """Vector store and DMS state as of the last refresh.
+
+    collection_count and dms_summary keep their last successfully fetched
+    values; errors lists the sources whose latest refresh failed.
+    """
+
+    collection_count: Optional[int] = None
+    dms_summary: Optional[DocumentSummaryResponse] = None
+    refreshed_at: Optional[float] = None
+    errors: dict = field(default_factory=dict)
+
+    def corpus_version(self) -> Optional[str]:
+        """Return the corpus version, or None if either source is unknown or failing."""
+        if self.collection_count is None or self.dms_summary is None or self.errors:
+            return None
+        return corpus_version(
+            self.collection_count, self.dms_summary.completed_fingerprint
+        )
+
+
+class ReadinessMonitor:
+    """Refreshes the Chroma collection count and DMS summary off the request path.
+
+    Request handlers read snapshot() in O(1); a daemon thread calls refresh()
+    every READINESS_REFRESH_SECONDS. A snapshot is reported stale once it is
+    older than twice the refresh interval or its latest refresh failed.
+    """
+
+    def __init__(
+        self,
+        collection_count_fn: Callable[[], int],
+        dms_summary_fn: Callable[[], DocumentSummaryResponse],
+        refresh_seconds: float = READINESS_REFRESH_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.collection_count_fn = collection_count_fn
+        self.dms_summary_fn = dms_summary_fn
+        self.refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._snapshot = ReadinessSnapshot()
+        self._refresher: Optional[threading.Thread] = None
+        self._stop_refresher = threading.Event()
+
+    def snapshot(self) -> ReadinessSnapshot:
+        """Return the latest snapshot without contacting Chroma or DMS."""
+        return self._snapshot
+
+    def refresh(self) -> ReadinessSnapshot:
+        """Fetch the collection count and DMS summary and publish a new snapshot."""
+        previous = self._snapshot
+        collection_count = previous.collection_count
+        dms_summary = previous.dms_summary
+        errors = {}
+        try:
+            collection_count = self.collection_count_fn()
+        except Exception as exception:
+            logger.warning(f"Readiness refresh of vector store failed: {exception}")
+            errors["vector_store"] = str(exception)
+        try:
+            dms_summary = self.dms_summary_fn()
+        except Exception as exception:
+            logger.warning(f"Readiness refresh of DMS summary failed: {exception}")
+            errors["dms"] = str(exception)
+        # Snapshots are immutable and swapped atomically, so readers need no lock.
+        self._snapshot = ReadinessSnapshot(
+            collection_count=collection_count,
+            dms_summary=dms_summary,
+            refreshed_at=self._clock(),
+            errors=errors,
+        )
+        return self._snapshot
+
+    def get_status(self) -> dict:
+        """Return when the snapshot was refreshed, its age and whether it is stale."""
+        snapshot = self._snapshot
+        if snapshot.refreshed_at is None:
+            return {
+                "refreshed_at": None,
+                "age_seconds": None,
+                "stale": True,
+                "refresh_interval_seconds": self.refresh_seconds,
+                "errors": snapshot.errors,
+            }
+        age_seconds = max(0.0, self._clock() - snapshot.refreshed_at)
+        return {
+            "refreshed_at": datetime.fromtimestamp(
+                snapshot.refreshed_at, tz=timezone.utc
+            ).isoformat(),
+            "age_seconds": round(age_seconds, 3),
+            "stale": bool(snapshot.errors) or age_seconds > 2 * self.refresh_seconds,
+            "refresh_interval_seconds": self.refresh_seconds,
+            "errors": snapshot.errors,
+        }
+
+    def start(self) -> None:
+        """Start a daemon thread that refreshes the snapshot every interval."""
+        if self._refresher and self._refresher.is_alive():
+            return
+        self._stop_refresher.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop, name="readiness-refresher", daemon=True
+        )
+        self._refresher.start()
+
+    def stop(self) -> None:
+        """Stop the background refresher thread, if running."""
+        self._stop_refresher.set()
+        if self._refresher:
+            self._refresher.join()
+            self._refresher = None
+
+    def _refresh_loop(self) -> None:
+        while not self._stop_refresher.wait(self.refresh_seconds):
+            self.refresh()
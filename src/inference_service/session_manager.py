@@ -1,53 +1,125 @@
 """Session manager for tracking domain expert conversation sessions."""
 
-from typing import Dict, Tuple, Optional
+import asyncio
+import os
+import threading
+from typing import Callable, Iterator, List, Tuple, Optional
 import uuid
 
 from langchain_core.vectorstores import VectorStore
 
+from src.inference_service.core.answer_cache import SemanticAnswerCache
 from src.inference_service.core.domain_expert_core import DomainExpertCore
+from src.inference_service.core.response_stream import StreamCancellation
+from src.inference_service.core.retrieval_cache import RetrievalCache
+from src.inference_service.session_store import SessionStore, get_session_store
+from src.shared.env_loader import load_environment
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+load_environment()
+SESSION_SWEEP_INTERVAL_SECONDS = float(
+    os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "60")
+)
 
-class DomainExpertSession:
-    """Represents a single user conversation session with a DomainExpertCore instance."""
 
-    def __init__(self, vectordb: VectorStore):
-        self.session_id = str(uuid.uuid4())
-        self.domain_expert_core = DomainExpertCore(vectordb)
+class DomainExpertSession:
+    """Represents a single user conversation: its ID and chat history bound to the shared DomainExpertCore."""
+
+    def __init__(
+        self,
+        domain_expert_core: DomainExpertCore,
+        session_id: Optional[str] = None,
+        chat_history: Optional[List[Tuple[str, str]]] = None,
+        on_exchange: Optional[Callable[[str, str, str], None]] = None,
+    ):
+        self.session_id = session_id or str(uuid.uuid4())
+        self.domain_expert_core = domain_expert_core
+        self.chat_history: List[Tuple[str, str]] = chat_history or []
+        self._on_exchange = on_exchange
+
+    def _record_exchange(self, question: str, answer: str) -> None:
+        self.chat_history.append((question, answer))
+        if self._on_exchange:
+            self._on_exchange(self.session_id, question, answer)
+
+    def ask_question(self, question: str) -> str:
+        """Answer a question using this session's history, then record the exchange."""
+        answer = self.domain_expert_core.ask_question(question, self.chat_history)
+        self._record_exchange(question, answer)
+        return answer
+
+    async def aask_question(self, question: str) -> str:
+        """Asynchronously answer a question using this session's history, then record the exchange."""
+        answer = await self.domain_expert_core.aask_question(
+            question, self.chat_history
+        )
+        # The session store may be SQLite; keep its write off the event loop.
+        await asyncio.to_thread(self._record_exchange, question, answer)
+        return answer
+
+    def stream_question(
+        self, question: str, cancellation: Optional[StreamCancellation] = None
+    ) -> Iterator[str]:
+        """Yield the answer as it is generated, recording the exchange once it completes."""
+        answer = ""
+        for token in self.domain_expert_core.stream_question(
+            question, self.chat_history, cancellation
+        ):
+            answer += token
+            yield token
+        self._record_exchange(question, answer)
 
 
 class SessionManager:
-    """Manages the lifecycle of DomainExpertSession instances keyed by session ID."""
-
-    def __init__(self, vectordb: VectorStore):
-        self.sessions: Dict[str, DomainExpertSession] = {}
+    """Manages the lifecycle of DomainExpertSession instances keyed by session ID.
+
+    A single DomainExpertCore (LLM client, retriever and chain) is built once and
+    shared by all sessions, so creating a session only allocates its history.
+
+    Histories live in a bounded SessionStore (in-process by default, or SQLite
+    shared by several workers); DomainExpertSession objects are rebuilt from the
+    store per request and write each exchange back to it. A background sweeper
+    thread expires idle sessions.
+    """
+
+    def __init__(
+        self,
+        vectordb: VectorStore,
+        session_store: Optional[SessionStore] = None,
+        answer_cache: Optional[SemanticAnswerCache] = None,
+        retrieval_cache: Optional[RetrievalCache] = None,
+    ):
         self.vectordb = vectordb
-
-    def get_sessions(self) -> Dict[str, DomainExpertSession]:
-        """Return the current mapping of session IDs to DomainExpertSession objects."""
-        return self.sessions
+        self.domain_expert_core = DomainExpertCore(
+            vectordb, answer_cache=answer_cache, retrieval_cache=retrieval_cache
+        )
+        self.session_store = session_store or get_session_store()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_sweeper = threading.Event()
 
     def create_domain_expert_session(self):
         """Create and register a new DomainExpertSession, then return it."""
-        session = DomainExpertSession(self.vectordb)
-        self.sessions[session.session_id] = session
+        session = self._build_session()
+        self.session_store.create_session(session.session_id)
         return session
 
     def remove_session(self, session: DomainExpertSession):
-        """Remove a session from the registry by its session object."""
-        self.sessions.pop(session.session_id, None)
+        """Remove a session from the store by its session object."""
+        self.session_store.delete_session(session.session_id)
 
     def get_session_by_id(self, session_id: str):
-        """Look up and return a session by ID, or None if not found."""
-        return self.sessions.get(session_id)
+        """Look up and return a session by ID, or None if not found or expired."""
+        chat_history = self.session_store.get_history(session_id)
+        if chat_history is None:
+            return None
+        return self._build_session(session_id, chat_history)
 
     def remove_session_by_id(self, session_id: str):
-        """Remove a session from the registry by its session ID."""
-        self.sessions.pop(session_id, None)
+        """Remove a session from the store by its session ID."""
+        self.session_store.delete_session(session_id)
 
     def get_domain_expert_session(
         self, session_id: str = None
@@ -57,10 +129,67 @@ class SessionManager:
             # If no session id, create session.
             logger.info("No session id provided. Creating new Domain Expert session.")
             return self.create_domain_expert_session(), None
-        session = self.sessions.get(session_id)
+        session = self.get_session_by_id(session_id)
         if not session:
-            # The client might have a stale id - generate a new session
+            # The client might have a stale or evicted id - generate a new session
             system_message = "Session id not found. Creating new Domain Expert session. Chat history will be lost"
             logger.warning(system_message)
             return self.create_domain_expert_session(), system_message
         return session, None
+
+    def expire_idle_sessions(self) -> int:
+        """Evict sessions idle for longer than the TTL and return how many were evicted."""
+        expired = self.session_store.expire_idle_sessions()
+        if expired:
+            logger.info(f"Expired {expired} idle session(s)")
+        return expired
+
+    def start_sweeper(
+        self, interval_seconds: float = SESSION_SWEEP_INTERVAL_SECONDS
+    ) -> None:
+        """Start a daemon thread that expires idle sessions every interval."""
+        if self._sweeper and self._sweeper.is_alive():
+            return
+        self._stop_sweeper.clear()
+        self._sweeper = threading.Thread(
+            target=self._sweep_loop,
+            args=(interval_seconds,),
+            name="session-sweeper",
+            daemon=True,
+        )
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        """Stop the background sweeper thread, if running."""
+        self._stop_sweeper.set()
+        if self._sweeper:
+            self._sweeper.join()
+            self._sweeper = None
+
+    def close(self) -> None:
+        """Stop the sweeper and release the session store."""
+        self.stop_sweeper()
+        self.session_store.close()
+
+    def get_stats(self) -> dict:
+        """Return live session, retained history and eviction counters."""
+        return self.session_store.get_stats()
+
+    def _build_session(
+        self,
+        session_id: Optional[str] = None,
+        chat_history: Optional[List[Tuple[str, str]]] = None,
+    ) -> DomainExpertSession:
+        return DomainExpertSession(
+            self.domain_expert_core,
+            session_id=session_id,
+            chat_history=chat_history,
+            on_exchange=self.session_store.append_exchange,
+        )
+
+    def _sweep_loop(self, interval_seconds: float) -> None:
+        while not self._stop_sweeper.wait(interval_seconds):
+            try:
+                self.expire_idle_sessions()
+            except Exception as exception:
+                logger.error(f"Session sweep failed: {exception}")
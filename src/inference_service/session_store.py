@@ -0,0 +1,442 @@
+"""Session stores holding domain expert chat history: in-process or shared SQLite."""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.shared.env_loader import load_environment
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+load_environment()
+SESSION_STORE = os.getenv("SESSION_STORE", "memory")
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH", "data/sessions.sqlite3")
+SESSION_MAX_COUNT = int(os.getenv("SESSION_MAX_COUNT", "1000"))
+SESSION_IDLE_TTL_SECONDS = float(os.getenv("SESSION_IDLE_TTL_SECONDS", "1800"))
+SESSION_MAX_HISTORY_CHARS = int(os.getenv("SESSION_MAX_HISTORY_CHARS", "20000000"))
+
+EVICTION_REASONS = ("idle_ttl", "max_sessions", "max_history")
+
+ChatHistory = List[Tuple[str, str]]
+
+
+class SessionStore(ABC):
+    """Bounded mapping of session IDs to chat history.
+
+    Stores enforce SESSION_MAX_COUNT, SESSION_IDLE_TTL_SECONDS and
+    SESSION_MAX_HISTORY_CHARS, evicting least-recently-used sessions first.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = SESSION_MAX_COUNT,
+        idle_ttl_seconds: float = SESSION_IDLE_TTL_SECONDS,
+        max_history_chars: int = SESSION_MAX_HISTORY_CHARS,
+    ):
+        if max_sessions < 1:
+            raise ValueError("SESSION_MAX_COUNT must be at least 1")
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_history_chars = max_history_chars
+        self.evictions: Dict[str, int] = {reason: 0 for reason in EVICTION_REASONS}
+
+    @abstractmethod
+    def create_session(self, session_id: str) -> None:
+        """Register an empty session, evicting others if the store is full."""
+
+    @abstractmethod
+    def get_history(self, session_id: str) -> Optional[ChatHistory]:
+        """Return a session's history and mark it used, or None if missing or expired."""
+
+    @abstractmethod
+    def append_exchange(self, session_id: str, question: str, answer: str) -> None:
+        """Append one exchange to a live session; ignored if it was evicted meanwhile."""
+
+    @abstractmethod
+    def delete_session(self, session_id: str) -> None:
+        """Remove a session if present."""
+
+    @abstractmethod
+    def expire_idle_sessions(self) -> int:
+        """Evict sessions idle for longer than the TTL and return how many were evicted."""
+
+    @abstractmethod
+    def __contains__(self, session_id: str) -> bool:
+        """Return whether a session is stored, without touching its last access."""
+
+    @abstractmethod
+    def _usage(self) -> Tuple[int, int]:
+        """Return the live session count and retained history characters."""
+
+    def get_stats(self) -> dict:
+        """Return live session, retained history and eviction counters."""
+        live_sessions, history_chars = self._usage()
+        return {
+            "backend": type(self).__name__,
+            "live_sessions": live_sessions,
+            "max_sessions": self.max_sessions,
+            "history_chars": history_chars,
+            "max_history_chars": self.max_history_chars,
+            "evictions": dict(self.evictions),
+        }
+
+    def close(self) -> None:
+        """Release resources held by the store."""
+
+
+def _exchange_chars(exchange: Tuple[str, str]) -> int:
+    question, answer = exchange
+    return len(question) + len(answer)
+
+
+class _StoredSession:
+    __slots__ = ("history", "history_chars", "last_access")
+
+    def __init__(self, last_access: float):
+        self.history: ChatHistory = []
+        self.history_chars = 0
+        self.last_access = last_access
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local store; sessions are kept in an OrderedDict in LRU order.
+
+    LRU order equals last-access order, so idle expiry and capacity eviction
+    both pop from the front in O(1) per evicted session.
+    """
+
+    def __init__(self, *args, clock: Callable[[], float] = time.monotonic, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sessions: "OrderedDict[str, _StoredSession]" = OrderedDict()
+        self._history_chars = 0
+        self._clock = clock
+        self._lock = threading.RLock()
+
+    def create_session(self, session_id: str) -> None:
+        """Register an empty session, evicting others if the store is full."""
+        with self._lock:
+            self.expire_idle_sessions()
+            while len(self._sessions) >= self.max_sessions:
+                self._evict_oldest("max_sessions")
+            self._sessions[session_id] = _StoredSession(self._clock())
+
+    def get_history(self, session_id: str) -> Optional[ChatHistory]:
+        """Return a session's history and mark it used, or None if missing or expired."""
+        with self._lock:
+            stored = self._sessions.get(session_id)
+            if stored is None:
+                return None
+            now = self._clock()
+            if now - stored.last_access > self.idle_ttl_seconds:
+                self._evict(session_id, "idle_ttl")
+                return None
+            stored.last_access = now
+            self._sessions.move_to_end(session_id)
+            return list(stored.history)
+
+    def append_exchange(self, session_id: str, question: str, answer: str) -> None:
+        """Append one exchange, then evict or trim until under the history cap."""
+        with self._lock:
+            stored = self._sessions.get(session_id)
+            if stored is None:
+                # Evicted while answering; its history is no longer retained.
+                return
+            added_chars = _exchange_chars((question, answer))
+            stored.history.append((question, answer))
+            stored.history_chars += added_chars
+            self._history_chars += added_chars
+            while self._history_chars > self.max_history_chars:
+                oldest_id = next(iter(self._sessions))
+                if oldest_id != session_id:
+                    self._evict_oldest("max_history")
+                elif stored.history:
+                    # Only the active session is left: trim its oldest turns.
+                    freed_chars = _exchange_chars(stored.history.pop(0))
+                    stored.history_chars -= freed_chars
+                    self._history_chars -= freed_chars
+                else:
+                    break
+
+    def delete_session(self, session_id: str) -> None:
+        """Remove a session if present."""
+        with self._lock:
+            stored = self._sessions.pop(session_id, None)
+            if stored is not None:
+                self._history_chars -= stored.history_chars
+
+    def expire_idle_sessions(self) -> int:
+        """Evict sessions idle for longer than the TTL and return how many were evicted."""
+        expired = 0
+        with self._lock:
+            cutoff = self._clock() - self.idle_ttl_seconds
+            while self._sessions:
+                oldest = next(iter(self._sessions.values()))
+                if oldest.last_access > cutoff:
+                    break
+                self._evict_oldest("idle_ttl")
+                expired += 1
+        return expired
+
+    def __contains__(self, session_id: str) -> bool:
+        """Return whether a session is stored, without touching its last access."""
+        return session_id in self._sessions
+
+    def _usage(self) -> Tuple[int, int]:
+        with self._lock:
+            return len(self._sessions), self._history_chars
+
+    def _evict_oldest(self, reason: str) -> None:
+        self._evict(next(iter(self._sessions)), reason)
+
+    def _evict(self, session_id: str, reason: str) -> None:
+        stored = self._sessions.pop(session_id)
+        self._history_chars -= stored.history_chars
+        self.evictions[reason] += 1
+        logger.debug(f"Evicted session {session_id} ({reason})")
+
+
+class SQLiteSessionStore(SessionStore):
+    """File-backed store shared by every worker process pointing at the same path.
+
+    History is serialized as compact JSON (a list of [question, answer] pairs)
+    in one row per session. Writes run in BEGIN IMMEDIATE transactions so
+    concurrent workers serialize on the database lock; WAL mode lets readers
+    proceed meanwhile. Last access uses wall-clock time so it is comparable
+    across processes. Eviction counters are per process.
+    """
+
+    def __init__(
+        self,
+        path: str = SESSION_STORE_PATH,
+        *args,
+        clock: Callable[[], float] = time.time,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS chat_sessions ("
+            "session_id TEXT PRIMARY KEY, "
+            "history TEXT NOT NULL, "
+            "history_chars INTEGER NOT NULL, "
+            "last_access REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_chat_sessions_last_access "
+            "ON chat_sessions (last_access)"
+        )
+        with self._transaction() as cursor:
+            self._create_history_total(cursor)
+
+    @staticmethod
+    def _create_history_total(cursor: sqlite3.Cursor) -> None:
+        """Keep the total of history_chars in a one-row table, maintained by triggers.
+
+        The triggers run inside the writing statement's transaction, so the
+        total never drifts from the rows; the first run seeds it from them.
+        """
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS chat_sessions_meta ("
+            "id INTEGER PRIMARY KEY CHECK (id = 1), "
+            "history_chars INTEGER NOT NULL)"
+        )
+        cursor.execute(
+            "INSERT OR IGNORE INTO chat_sessions_meta "
+            "SELECT 1, COALESCE(SUM(history_chars), 0) FROM chat_sessions"
+        )
+        for name, event, change in (
+            ("insert", "INSERT", "NEW.history_chars"),
+            ("delete", "DELETE", "-OLD.history_chars"),
+            (
+                "update",
+                "UPDATE OF history_chars",
+                "NEW.history_chars - OLD.history_chars",
+            ),
+        ):
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS chat_sessions_history_chars_{name} "
+                f"AFTER {event} ON chat_sessions BEGIN "
+                f"UPDATE chat_sessions_meta SET history_chars = history_chars + {change}; "
+                "END"
+            )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Run a BEGIN IMMEDIATE transaction, serialized with other threads."""
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            else:
+                cursor.execute("COMMIT")
+            finally:
+                cursor.close()
+
+    def create_session(self, session_id: str) -> None:
+        """Register an empty session, evicting others if the store is full."""
+        with self._transaction() as cursor:
+            self._expire_idle(cursor)
+            (count,) = cursor.execute("SELECT COUNT(*) FROM chat_sessions").fetchone()
+            overflow = count - self.max_sessions + 1
+            if overflow > 0:
+                self._evict_oldest(cursor, overflow, "max_sessions")
+            cursor.execute(
+                "INSERT INTO chat_sessions VALUES (?, '[]', 0, ?) "
+                "ON CONFLICT (session_id) DO UPDATE SET history = '[]', "
+                "history_chars = 0, last_access = excluded.last_access",
+                (session_id, self._clock()),
+            )
+
+    def get_history(self, session_id: str) -> Optional[ChatHistory]:
+        """Return a session's history and mark it used, or None if missing or expired."""
+        with self._transaction() as cursor:
+            row = cursor.execute(
+                "SELECT history, last_access FROM chat_sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            history, last_access = row
+            now = self._clock()
+            if now - last_access > self.idle_ttl_seconds:
+                cursor.execute(
+                    "DELETE FROM chat_sessions WHERE session_id = ?", (session_id,)
+                )
+                self.evictions["idle_ttl"] += 1
+                return None
+            cursor.execute(
+                "UPDATE chat_sessions SET last_access = ? WHERE session_id = ?",
+                (now, session_id),
+            )
+        return [tuple(exchange) for exchange in json.loads(history)]
+
+    def append_exchange(self, session_id: str, question: str, answer: str) -> None:
+        """Append one exchange, then evict or trim until under the history cap."""
+        with self._transaction() as cursor:
+            row = cursor.execute(
+                "SELECT history, history_chars FROM chat_sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                # Evicted while answering; its history is no longer retained.
+                return
+            history = json.loads(row[0])
+            history.append([question, answer])
+            others_chars = self._total_history_chars(cursor) - row[1]
+            history_chars = sum(_exchange_chars(exchange) for exchange in history)
+            while others_chars + history_chars > self.max_history_chars:
+                oldest = cursor.execute(
+                    "SELECT session_id, history_chars FROM chat_sessions "
+                    "WHERE session_id != ? ORDER BY last_access LIMIT 1",
+                    (session_id,),
+                ).fetchone()
+                if oldest is not None:
+                    cursor.execute(
+                        "DELETE FROM chat_sessions WHERE session_id = ?", (oldest[0],)
+                    )
+                    others_chars -= oldest[1]
+                    self.evictions["max_history"] += 1
+                elif history:
+                    # Only the active session is left: trim its oldest turns.
+                    history_chars -= _exchange_chars(history.pop(0))
+                else:
+                    break
+            cursor.execute(
+                "UPDATE chat_sessions SET history = ?, history_chars = ?, "
+                "last_access = ? WHERE session_id = ?",
+                (
+                    json.dumps(history, separators=(",", ":")),
+                    history_chars,
+                    self._clock(),
+                    session_id,
+                ),
+            )
+
+    def delete_session(self, session_id: str) -> None:
+        """Remove a session if present."""
+        with self._transaction() as cursor:
+            cursor.execute(
+                "DELETE FROM chat_sessions WHERE session_id = ?", (session_id,)
+            )
+
+    def expire_idle_sessions(self) -> int:
+        """Evict sessions idle for longer than the TTL and return how many were evicted."""
+        with self._transaction() as cursor:
+            return self._expire_idle(cursor)
+
+    def __contains__(self, session_id: str) -> bool:
+        """Return whether a session is stored, without touching its last access."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM chat_sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row is not None
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _usage(self) -> Tuple[int, int]:
+        with self._lock:
+            cursor = self._connection.cursor()
+            try:
+                (count,) = cursor.execute(
+                    "SELECT COUNT(*) FROM chat_sessions"
+                ).fetchone()
+                return count, self._total_history_chars(cursor)
+            finally:
+                cursor.close()
+
+    @staticmethod
+    def _total_history_chars(cursor: sqlite3.Cursor) -> int:
+        (total,) = cursor.execute(
+            "SELECT history_chars FROM chat_sessions_meta"
+        ).fetchone()
+        return total
+
+    def _expire_idle(self, cursor: sqlite3.Cursor) -> int:
+        cutoff = self._clock() - self.idle_ttl_seconds
+        expired = cursor.execute(
+            "DELETE FROM chat_sessions WHERE last_access <= ?", (cutoff,)
+        ).rowcount
+        self.evictions["idle_ttl"] += expired
+        return expired
+
+    def _evict_oldest(self, cursor: sqlite3.Cursor, count: int, reason: str) -> None:
+        evicted = cursor.execute(
+            "DELETE FROM chat_sessions WHERE session_id IN ("
+            "SELECT session_id FROM chat_sessions ORDER BY last_access LIMIT ?)",
+            (count,),
+        ).rowcount
+        self.evictions[reason] += evicted
+
+
+def get_session_store(backend: str = SESSION_STORE) -> SessionStore:
+    """Instantiate the session store selected by SESSION_STORE (memory or sqlite)."""
+    if backend == "memory":
+        return InMemorySessionStore()
+    if backend == "sqlite":
+        return SQLiteSessionStore(SESSION_STORE_PATH)
+    raise ValueError(f"Unsupported SESSION_STORE: {backend}")
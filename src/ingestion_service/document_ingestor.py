@@ -1,16 +1,27 @@
 """Document ingestor orchestrating DMS registration and vector store population."""
 
-import hashlib
 import os
+import threading
 from dataclasses import dataclass
 from urllib.parse import urlparse
-from typing import List
-from src.ingestion_service.bootstrap import ProgressCallback, process_document
+from typing import Callable, Iterable, List, Optional, Tuple, Union
 from src.ingestion_service.document_management_client import DocumentManagementClient
 from src.ingestion_service.file_loader import FileLoader
+from src.ingestion_service.ingestion_pipeline import (
+    IngestionPipeline,
+    PipelineConfig,
+    parse_document,
+)
+from src.ingestion_service.progress import (
+    IngestionStage,
+    ProgressCallback,
+    ProgressEvent,
+)
+from src.ingestion_service.source_index import SourceIndex
 from src.ingestion_service.vector_store_builder import VectorStoreBuilder
 import logging
-from src.shared.constants import DocumentStatus
+from src.shared.constants import DocumentStatus, SetDocumentResult
+from src.shared.models import GetDocumentStatusResponse
 from src.shared.exceptions import (
     DocumentHashConflictException,
     IngestionRequestException,
@@ -39,73 +50,423 @@ class DocumentIngestor:
         vector_store_builder: VectorStoreBuilder,
         file_loader: FileLoader,
         progress: ProgressCallback,
+        pipeline_config: Optional[PipelineConfig] = None,
+        source_index: Optional[SourceIndex] = None,
     ):
         self.dms_client = dms_client
         self.vector_store_builder = vector_store_builder
         self.file_loader = file_loader
         self.progress = progress
+        self.source_index = source_index
+        self.pipeline = IngestionPipeline(self, pipeline_config or PipelineConfig())
 
     def ingest_documents(
         self,
         doc_list: List[str],
+        progress: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
     ) -> List[DocumentIngestionResult]:
-        """Ingest multiple documents, returning per-document success or failure results."""
+        """Ingest multiple documents, returning per-document success or failure results.
+
+        Documents go through the staged IngestionPipeline, so downloads, parsing
+        and embedding of different documents overlap; results keep input order.
+        Progress events go to `progress` instead of the ingestor's callback if
+        given. Once `cancel_event` is set, documents not started yet fail with
+        IngestionCancelledException; started ones are finished.
+        """
         try:
             clean_pdf_paths = [p.strip() for p in doc_list if p.strip()]
         except Exception:
             raise IngestionRequestException("Error when reading PDFs provided.")
         results = []
-        for document in clean_pdf_paths:
-            try:
-                self.ingest_document(document)
+        errors = self.pipeline.run(clean_pdf_paths, progress, cancel_event)
+        for document, error in zip(clean_pdf_paths, errors):
+            if error is None:
                 results.append(DocumentIngestionResult(document=document, success=True))
-            except Exception as e:
+            else:
                 logger.error(f"Could not ingest {document}.")
-                logger.exception(e)
+                logger.exception(error)
                 results.append(
                     DocumentIngestionResult(
-                        document=document, success=False, error=str(e)
+                        document=document, success=False, error=str(error)
                     )
                 )
         return results
 
+    def close(self) -> None:
+        """Release the pipeline's parse worker processes."""
+        self.pipeline.close()
+
     def ingest_document(
         self,
         document: str,
     ) -> None:
-        """Ingest a single document into the vector store, skipping already-completed ones."""
-        doc_hash = hashlib.md5(document.encode()).hexdigest()
-        doc_name = self._extract_doc_name(document)
+        """Ingest a single document into the vector store, skipping already-completed content."""
+        try:
+            doc_hash, file_path = self.fetch_document(document)
+        except FileNotFoundError:
+            logger.error(f"Error processing {document}: No documents!")
+            raise NoDocumentsException()
+        if file_path is None:
+            return
         try:
-            doc_status = self.dms_client.get_document_status(doc_hash)
+            started = self.start_document(document, doc_hash)
         except Exception:
-            logger.error(f"Could not get status for {document}, skipping processing")
+            self.file_loader.release_local_file(file_path)
             raise
-        if doc_status != DocumentStatus.COMPLETED:
+        if started is None:
+            self.file_loader.release_local_file(file_path)
+            return
+        doc_hash, doc_name = started
+        try:
+            self.report(
+                document,
+                IngestionStage.PARSING,
+                f"✀ Splitting text to docs for {file_path}",
+            )
             try:
-                self.dms_client.update_document_status(
-                    doc_hash, doc_name, DocumentStatus.PENDING
+                docs = parse_document(self.vector_store_builder, file_path)
+            finally:
+                self.file_loader.release_local_file(file_path)
+            if not docs:
+                logger.error(f"Error processing {document}: No documents!")
+                raise NoDocumentsException()
+            else:
+                self.report(
+                    document,
+                    IngestionStage.WRITING,
+                    f"🏭 Adding docs from {document} to vector store.",
+                    chunks=len(docs),
                 )
-                docs = process_document(
-                    document, self.file_loader, self.vector_store_builder, self.progress
+                plan = self.vector_store_builder.upsert_document(
+                    doc_hash, document, docs, sources_of=self.sources_with_hash
                 )
-                if not docs:
-                    logger.error(f"Error processing {document}: No documents!")
-                    raise NoDocumentsException()
-                else:
-                    self.progress(f"🏭 Adding docs from {document} to vector store.")
-                    self.vector_store_builder.add_documents_to_vector_store(docs)
-                    self.progress(f"✅ Docs from {document} saved.")
-                    self.dms_client.update_document_status(
-                        doc_hash, doc_name, DocumentStatus.COMPLETED
-                    )
-            except DocumentHashConflictException as hash_exception:
-                logger.error(f"Failed to ingest {document}: {hash_exception}")
-                raise
-            except Exception as e:
-                logger.error(f"Failed to ingest {document}: {e}")
-                self._try_set_error_status(doc_hash, doc_name, document)
-                raise
+                logger.info(f"{document}: {plan.summary()}")
+                self.complete_document(doc_hash, doc_name, plan.replaced_doc_hashes)
+                self.report(
+                    document,
+                    IngestionStage.COMPLETED,
+                    f"✅ Docs from {document} saved.",
+                    chunks=len(docs),
+                    embedded=len(plan.texts_to_embed),
+                )
+        except Exception as e:
+            self.fail_document(doc_hash, doc_name, document, e)
+            self.report(
+                document,
+                IngestionStage.FAILED,
+                f"❌ Could not ingest {document}: {e}",
+                error=str(e),
+            )
+            raise
+
+    def report(
+        self,
+        document: str,
+        stage: IngestionStage,
+        message: str,
+        progress: Optional[ProgressCallback] = None,
+        **details,
+    ) -> None:
+        """Emit a ProgressEvent to `progress`, or to the ingestor's callback."""
+        (progress or self.progress)(ProgressEvent(document, stage, message, **details))
+
+    def fetch_document(
+        self, document: str, progress: Optional[ProgressCallback] = None
+    ) -> Tuple[str, Optional[str]]:
+        """Return (doc_hash, local_path), doc_hash being the SHA-256 of the contents.
+
+        A downloaded local_path is a temporary copy: the caller hands it to
+        FileLoader.release_local_file once the document is parsed or dropped.
+        With a source index, a source whose version tag (S3 ETag and size, or
+        local mtime and size) is unchanged since it was last hashed, and whose
+        content is COMPLETED in DMS, is not downloaded: local_path is None.
+        """
+        version = None
+        if self.source_index is not None:
+            version = self.file_loader.get_source_version(document)
+            known_hash = self.source_index.get(document, version) if version else None
+            if (
+                known_hash
+                and self.dms_client.get_document_status(known_hash)
+                == DocumentStatus.COMPLETED
+            ):
+                self.report(
+                    document,
+                    IngestionStage.SKIPPED,
+                    f"⏭️ {document} is unchanged since it was ingested.",
+                    progress,
+                )
+                return known_hash, None
+        return self.download_document(document, version, progress)
+
+    def check_sources(
+        self,
+        documents: List[str],
+        progress: Optional[ProgressCallback] = None,
+        map_function: Callable = map,
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Batch counterpart of fetch_document's source index check.
+
+        Returns (version, unchanged_hash) per document, looking up the
+        version tags through `map_function` (e.g. a thread pool's map) and
+        the statuses of all known hashes in one DMS request. unchanged_hash
+        is set, and the document reported SKIPPED, when the source is
+        unchanged and its content COMPLETED; other documents are to be
+        downloaded with download_document(document, version).
+        """
+        if self.source_index is None:
+            return [(None, None)] * len(documents)
+        versions = list(map_function(self._get_source_version, documents))
+        known_hashes = {}
+        for document, version in zip(documents, versions):
+            known_hash = self.source_index.get(document, version) if version else None
+            if known_hash:
+                known_hashes[document] = known_hash
+        completed = set()
+        if known_hashes:
+            try:
+                records = self.dms_client.get_documents_batch(known_hashes.values())
+            except Exception:
+                logger.warning("Could not check unchanged sources in DMS, downloading")
+            else:
+                completed = {
+                    doc_hash
+                    for doc_hash, record in records.items()
+                    if record.status == DocumentStatus.COMPLETED
+                }
+        sources = []
+        for document, version in zip(documents, versions):
+            known_hash = known_hashes.get(document)
+            if known_hash in completed:
+                self.report(
+                    document,
+                    IngestionStage.SKIPPED,
+                    f"⏭️ {document} is unchanged since it was ingested.",
+                    progress,
+                )
+                sources.append((version, known_hash))
+            else:
+                sources.append((version, None))
+        return sources
+
+    def download_document(
+        self,
+        document: str,
+        version: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Tuple[str, str]:
+        """Download and hash a document; return (doc_hash, local_path).
+
+        With a version tag, the hash is recorded for it in the source index.
+        """
+        self.report(
+            document, IngestionStage.DOWNLOADING, f"📥 Fetching {document}", progress
+        )
+        file_path, doc_hash = self.file_loader.load_pdf_file_hashed(document)
+        if version:
+            self.source_index.put(document, version, doc_hash)
+        return doc_hash, file_path
+
+    def sources_with_hash(self, doc_hash: str) -> List[str]:
+        """Return the sources the source index last saw with these contents.
+
+        Without a source index no other source is known to share them.
+        """
+        if self.source_index is None:
+            return []
+        return self.source_index.sources(doc_hash)
+
+    def _get_source_version(self, document: str) -> Optional[str]:
+        try:
+            return self.file_loader.get_source_version(document)
+        except Exception:
+            # The download reports the missing or unsupported file.
+            return None
+
+    def start_document(
+        self,
+        document: str,
+        doc_hash: str,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Optional[Tuple[str, str]]:
+        """Mark content PENDING in DMS and return (doc_hash, doc_name).
+
+        Returns None if the content is already COMPLETED, whichever source it
+        was ingested from. Content already registered keeps its registered
+        name. A failed status lookup is raised as is; a failed PENDING update
+        goes through fail_document first.
+        """
+        try:
+            record = self.dms_client.get_document(doc_hash)
+        except Exception:
+            logger.error(f"Could not get status for {document}, skipping processing")
+            raise
+        if record is not None and record.status == DocumentStatus.COMPLETED:
+            self._report_completed(document, record, progress)
+            return None
+        doc_name = record.doc_name if record else self._extract_doc_name(document)
+        try:
+            self.dms_client.update_document_status(
+                doc_hash, doc_name, DocumentStatus.PENDING
+            )
+        except Exception as e:
+            self.fail_document(doc_hash, doc_name, document, e)
+            raise
+        return doc_hash, doc_name
+
+    def start_documents(
+        self,
+        documents: List[Tuple[str, str]],
+        progress: Optional[ProgressCallback] = None,
+    ) -> List[Union[Tuple[str, str], None, Exception]]:
+        """Batch counterpart of start_document for (document, doc_hash) pairs.
+
+        Looks up every hash in one DMS request and sets the new ones PENDING
+        in another. Returns, per pair, (doc_hash, doc_name), None if the
+        content is already COMPLETED, or the exception that failed it. The
+        hashes must be distinct. If a batch request fails, the documents go
+        through start_document one at a time, so only a bad one fails.
+        """
+        try:
+            records = self.dms_client.get_documents_batch(
+                doc_hash for _, doc_hash in documents
+            )
+        except Exception:
+            logger.warning("Batch status lookup failed, starting documents one by one")
+            return [
+                self._try(self.start_document, document, doc_hash, progress)
+                for document, doc_hash in documents
+            ]
+        outcomes: List[Union[Tuple[str, str], None, Exception]] = []
+        for document, doc_hash in documents:
+            record = records.get(doc_hash)
+            if record is not None and record.status == DocumentStatus.COMPLETED:
+                self._report_completed(document, record, progress)
+                outcomes.append(None)
+            else:
+                doc_name = (
+                    record.doc_name if record else self._extract_doc_name(document)
+                )
+                outcomes.append((doc_hash, doc_name))
+        pending = [outcome for outcome in outcomes if outcome is not None]
+        if not pending:
+            return outcomes
+        try:
+            results = self.dms_client.update_document_statuses(
+                (doc_hash, doc_name, DocumentStatus.PENDING)
+                for doc_hash, doc_name in pending
+            )
+        except Exception:
+            logger.warning("Batch PENDING update failed, updating documents one by one")
+            results = {
+                doc_hash: self._try(
+                    self.dms_client.update_document_status,
+                    doc_hash,
+                    doc_name,
+                    DocumentStatus.PENDING,
+                )
+                for doc_hash, doc_name in pending
+            }
+        for position, ((document, _), outcome) in enumerate(zip(documents, outcomes)):
+            if outcome is None:
+                continue
+            doc_hash, doc_name = outcome
+            result = results.get(doc_hash)
+            if result == SetDocumentResult.CONFLICT:
+                result = DocumentHashConflictException()
+            if isinstance(result, Exception):
+                self.fail_document(doc_hash, doc_name, document, result)
+                outcomes[position] = result
+        return outcomes
+
+    def complete_document(
+        self,
+        doc_hash: str,
+        doc_name: str,
+        replaced_doc_hashes: Iterable[str] = (),
+    ) -> None:
+        """Mark a document COMPLETED in DMS once its chunks are in the vector store.
+
+        Previous versions of the same source, whose chunks the write removed,
+        are set to SUPERSEDED. Their contents are then no longer COMPLETED,
+        so a source that serves them again is downloaded and ingested anew.
+        """
+        self.dms_client.update_document_status(
+            doc_hash, doc_name, DocumentStatus.COMPLETED
+        )
+        for replaced_doc_hash in replaced_doc_hashes:
+            self._retire_document(replaced_doc_hash)
+
+    def complete_documents(
+        self, documents: List[Tuple[str, str, Iterable[str]]]
+    ) -> List[Optional[Exception]]:
+        """Batch counterpart of complete_document for (doc_hash, doc_name, replaced) triples.
+
+        Sets every document COMPLETED in one DMS request and retires all
+        replaced versions in two more. Returns, per document, None or the
+        exception that kept it from being marked COMPLETED. If the batch
+        update fails, the documents go through complete_document one at a time.
+        """
+        try:
+            results = self.dms_client.update_document_statuses(
+                (doc_hash, doc_name, DocumentStatus.COMPLETED)
+                for doc_hash, doc_name, _ in documents
+            )
+        except Exception:
+            logger.warning(
+                "Batch COMPLETED update failed, updating documents one by one"
+            )
+            return [
+                self._try(self.complete_document, *document) for document in documents
+            ]
+        errors: List[Optional[Exception]] = []
+        replaced = set()
+        for doc_hash, _, replaced_doc_hashes in documents:
+            if results.get(doc_hash) == SetDocumentResult.CONFLICT:
+                errors.append(DocumentHashConflictException())
+            else:
+                errors.append(None)
+                replaced.update(replaced_doc_hashes)
+        if replaced:
+            self._retire_documents(replaced)
+        return errors
+
+    def _retire_documents(self, doc_hashes: Iterable[str]) -> None:
+        """Set SUPERSEDED on many replaced documents in two requests; log a warning on failure."""
+        try:
+            records = self.dms_client.get_documents_batch(doc_hashes)
+            for doc_hash, record in records.items():
+                logger.info(f"{record.doc_name} ({doc_hash}) replaced by a new version")
+            if records:
+                self.dms_client.update_document_statuses(
+                    (doc_hash, record.doc_name, DocumentStatus.SUPERSEDED)
+                    for doc_hash, record in records.items()
+                )
+        except Exception:
+            logger.warning(
+                f"Could not set SUPERSEDED status for replaced {set(doc_hashes)}"
+            )
+
+    def _retire_document(self, doc_hash: str) -> None:
+        """Set SUPERSEDED on a document whose chunks were replaced; log a warning on failure."""
+        try:
+            record = self.dms_client.get_document(doc_hash)
+            if record is not None:
+                logger.info(f"{record.doc_name} ({doc_hash}) replaced by a new version")
+                self.dms_client.update_document_status(
+                    doc_hash, record.doc_name, DocumentStatus.SUPERSEDED
+                )
+        except Exception:
+            logger.warning(f"Could not set SUPERSEDED status for replaced {doc_hash}")
+
+    def fail_document(
+        self, doc_hash: str, doc_name: str, document: str, exception: Exception
+    ) -> None:
+        """Log a failed ingestion and set ERROR status, unless it was a hash conflict."""
+        logger.error(f"Failed to ingest {document}: {exception}")
+        if not isinstance(exception, DocumentHashConflictException):
+            self._try_set_error_status(doc_hash, doc_name, document)
 
     def _try_set_error_status(self, doc_hash: str, doc_name: str, document: str):
         """Attempt to mark a document as ERROR in DMS; log a warning on failure."""
@@ -116,6 +477,26 @@ class DocumentIngestor:
         except Exception:
             logger.warning(f"Could not set ERROR status for {document}")
 
+    def _report_completed(
+        self,
+        document: str,
+        record: GetDocumentStatusResponse,
+        progress: Optional[ProgressCallback],
+    ) -> None:
+        if record.doc_name != self._extract_doc_name(document):
+            message = f"⏭️ {document} has the same contents as {record.doc_name}."
+        else:
+            message = f"⏭️ {document} is already ingested."
+        self.report(document, IngestionStage.SKIPPED, message, progress)
+
+    @staticmethod
+    def _try(function: Callable, *args):
+        """Return function's result, or the exception it raised."""
+        try:
+            return function(*args)
+        except Exception as exception:
+            return exception
+
     def _extract_doc_name(self, document: str) -> str:
         """Extract the base filename from a local path or URL."""
         parsed = urlparse(document)
@@ -1,33 +1,82 @@
 """HTTP client for the Document Management Service used by the ingestion service."""
 
-from typing import List
+from collections import OrderedDict
+import threading
+from typing import Dict, Iterable, Tuple
 import requests
 from src.shared.exceptions import DocumentHashConflictException
 from src.shared.models import (
+    BatchGetDocumentStatusRequest,
+    BatchGetDocumentStatusResponse,
+    BatchSetDocumentStatusRequest,
+    BatchSetDocumentStatusResponse,
     GetDocumentStatusResponse,
     SetDocumentStatusRequest,
     DMSDocument,
+    DocumentSummaryResponse,
+)
+from src.shared.constants import (
+    MAX_DOCUMENT_BATCH_SIZE,
+    DocumentStatus,
+    SetDocumentResult,
 )
-from src.shared.constants import DocumentStatus
 
 
 class DocumentManagementClient:
-    """Client for interacting with the Document Management Service REST API."""
+    """Client for interacting with the Document Management Service REST API.
+
+    Status lookups are conditional: the last STATUS_CACHE_SIZE responses are
+    kept with their ETags, and a 304 reuses the kept one.
+    """
+
+    STATUS_CACHE_SIZE = 1024
 
     def __init__(self, base_url: str):
         self.base_url = base_url
+        self._status_cache: "OrderedDict[str, Tuple[str, GetDocumentStatusResponse]]" = (
+            OrderedDict()
+        )
+        self._status_cache_lock = threading.Lock()
 
-    def get_document_status(self, doc_hash: str) -> DocumentStatus | None:
-        """Retrieve the processing status for a document by its hash, or None if not found."""
+    def get_document(self, doc_hash: str) -> GetDocumentStatusResponse | None:
+        """Retrieve the registered name and status for a document hash, or None if not found."""
+        with self._status_cache_lock:
+            cached = self._status_cache.get(doc_hash)
+        headers = {"If-None-Match": cached[0]} if cached else {}
         try:
-            response = requests.get(f"{self.base_url}/documents/{doc_hash}/status/")
+            response = requests.get(
+                f"{self.base_url}/documents/{doc_hash}/status/", headers=headers
+            )
             if response.status_code == 404:
+                self._forget_status(doc_hash)
                 return None
         except Exception:
             raise
+        if response.status_code == 304 and cached:
+            with self._status_cache_lock:
+                self._status_cache.move_to_end(doc_hash)
+            return cached[1]
         response.raise_for_status()
-        parsed_response = GetDocumentStatusResponse(**response.json())
-        return DocumentStatus(parsed_response.status)
+        document = GetDocumentStatusResponse(**response.json())
+        etag = response.headers.get("ETag")
+        if etag:
+            with self._status_cache_lock:
+                self._status_cache[doc_hash] = (etag, document)
+                self._status_cache.move_to_end(doc_hash)
+                while len(self._status_cache) > self.STATUS_CACHE_SIZE:
+                    self._status_cache.popitem(last=False)
+        return document
+
+    def _forget_status(self, doc_hash: str) -> None:
+        with self._status_cache_lock:
+            self._status_cache.pop(doc_hash, None)
+
+    def get_document_status(self, doc_hash: str) -> DocumentStatus | None:
+        """Retrieve the processing status for a document by its hash, or None if not found."""
+        document = self.get_document(doc_hash)
+        if document is None:
+            return None
+        return DocumentStatus(document.status)
 
     def update_document_status(
         self, doc_hash: str, doc_name: str, document_status: DocumentStatus
@@ -47,13 +96,59 @@ class DocumentManagementClient:
             raise
         response.raise_for_status()
 
-    def get_documents(self) -> List[DMSDocument]:
-        """Fetch all documents registered in the Document Management Service."""
-        try:
-            response = requests.get(f"{self.base_url}/documents/")
-            if response.status_code == 204:
-                return []
-        except Exception:
-            raise
+    def get_documents_batch(
+        self, doc_hashes: Iterable[str]
+    ) -> Dict[str, GetDocumentStatusResponse]:
+        """Retrieve the registered name and status of many hashes; unknown ones are left out.
+
+        Takes one request per MAX_DOCUMENT_BATCH_SIZE hashes.
+        """
+        doc_hashes = list(dict.fromkeys(doc_hashes))
+        documents = {}
+        for start in range(0, len(doc_hashes), MAX_DOCUMENT_BATCH_SIZE):
+            request_body = BatchGetDocumentStatusRequest(
+                doc_hashes=doc_hashes[start : start + MAX_DOCUMENT_BATCH_SIZE]
+            )
+            response = requests.post(
+                f"{self.base_url}/documents/status:batchGet",
+                json=request_body.model_dump(mode="json"),
+            )
+            response.raise_for_status()
+            for document in BatchGetDocumentStatusResponse(**response.json()).documents:
+                documents[document.doc_hash] = GetDocumentStatusResponse(
+                    doc_name=document.doc_name, status=document.status
+                )
+        return documents
+
+    def update_document_statuses(
+        self, updates: Iterable[Tuple[str, str, DocumentStatus]]
+    ) -> Dict[str, SetDocumentResult]:
+        """Create or update many (doc_hash, doc_name, status) records in DMS.
+
+        Returns each hash's result; CONFLICT means the hash is registered under
+        another name and was left unchanged. Takes one request per
+        MAX_DOCUMENT_BATCH_SIZE records.
+        """
+        documents = [
+            DMSDocument(doc_hash=doc_hash, doc_name=doc_name, status=status)
+            for doc_hash, doc_name, status in updates
+        ]
+        results = {}
+        for start in range(0, len(documents), MAX_DOCUMENT_BATCH_SIZE):
+            request_body = BatchSetDocumentStatusRequest(
+                documents=documents[start : start + MAX_DOCUMENT_BATCH_SIZE]
+            )
+            response = requests.put(
+                f"{self.base_url}/documents/status:batch",
+                json=request_body.model_dump(mode="json"),
+            )
+            response.raise_for_status()
+            for item in BatchSetDocumentStatusResponse(**response.json()).results:
+                results[item.doc_hash] = item.result
+        return results
+
+    def get_summary(self) -> DocumentSummaryResponse:
+        """Fetch the document count per status and the COMPLETED documents' fingerprint."""
+        response = requests.get(f"{self.base_url}/documents/summary", timeout=5)
         response.raise_for_status()
-        return [DMSDocument(**item) for item in response.json()]
+        return DocumentSummaryResponse(**response.json())
@@ -0,0 +1,282 @@
+"""On-disk cache of chunk embeddings, shared by ingestion runs and evals."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.shared.env_loader import load_environment
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+load_environment()
+# Empty disables the cache: every new chunk is encoded.
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "data/embedding_cache")
+EMBEDDING_CACHE_MAX_BYTES = int(
+    os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(1024 * 1024 * 1024))
+)
+EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float32")
+
+# SQLite's default limit on host parameters is 999.
+_QUERY_BATCH = 500
+# Encode options that only affect throughput, not the vectors produced.
+_THROUGHPUT_OPTIONS = ("batch_size", "show_progress_bar")
+
+
+def encoder_id(
+    model_name: str, encode_options: Optional[Mapping[str, Any]] = None
+) -> str:
+    """Return the identity of a model encoding with the given options.
+
+    Options that change the vectors (e.g. normalize_embeddings) are part of
+    it, so vectors are only reused for the same model and options.
+    """
+    options = {
+        name: value
+        for name, value in (encode_options or {}).items()
+        if name not in _THROUGHPUT_OPTIONS
+    }
+    if not options:
+        return model_name
+    return f"{model_name} {json.dumps(options, sort_keys=True)}"
+
+
+def embedding_cache_key(encoder: str, text: str) -> str:
+    """Return the SHA-256 identifying a chunk text embedded by an encoder (see encoder_id)."""
+    return hashlib.sha256(f"{encoder}\0{text}".encode()).hexdigest()
+
+
+class ChunkEmbeddingCache:
+    """Maps (encoder, chunk text) to the chunk's embedding, kept on disk.
+
+    The encoder is encoder_id(): the model name plus the encode options that
+    change its vectors. Each encoder's vectors are rows of one memory-mapped
+    file of `dtype` (float32, or float16 for half the size), named after it;
+    `index.sqlite3` maps each key to its row and records when it was last
+    used. An encoder's file holds at most `max_bytes` of vectors: once full,
+    the least recently used rows are reused for new vectors.
+    """
+
+    def __init__(
+        self,
+        directory: str = EMBEDDING_CACHE_DIR,
+        max_bytes: int = EMBEDDING_CACHE_MAX_BYTES,
+        dtype: str = EMBEDDING_CACHE_DTYPE,
+    ):
+        if dtype not in ("float32", "float16"):
+            raise ValueError("EMBEDDING_CACHE_DTYPE must be float32 or float16")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.dtype = np.dtype(dtype)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._maps: Dict[str, np.memmap] = {}
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(
+            os.path.join(directory, "index.sqlite3"),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS models ("
+            "model TEXT PRIMARY KEY, "
+            "dimension INTEGER NOT NULL, "
+            "dtype TEXT NOT NULL, "
+            "rows INTEGER NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, "
+            "model TEXT NOT NULL, "
+            "row INTEGER NOT NULL, "
+            "last_used REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_lru ON embeddings (model, last_used)"
+        )
+
+    def get_many(
+        self, encoder: str, texts: Sequence[str]
+    ) -> List[Optional[List[float]]]:
+        """Return the cached embedding of each text, or None where there is none."""
+        keys = [embedding_cache_key(encoder, text) for text in texts]
+        with self._lock:
+            model = self._get_model(encoder)
+            rows = self._find_rows(keys) if model is not None else {}
+            if not rows:
+                self.misses += len(keys)
+                return [None] * len(keys)
+            self._touch(list(rows))
+            found = [index for index, key in enumerate(keys) if key in rows]
+            vectors = self._map(encoder, model)[[rows[keys[i]] for i in found]]
+            result: List[Optional[List[float]]] = [None] * len(keys)
+            for index, vector in zip(found, vectors.astype(np.float32).tolist()):
+                result[index] = vector
+            hits = len(found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return result
+
+    def put_many(
+        self, encoder: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]
+    ) -> None:
+        """Store the embeddings of texts, reusing the least recently used rows when full."""
+        if len(texts) != len(vectors):
+            raise ValueError(f"Got {len(vectors)} embeddings for {len(texts)} texts")
+        if not texts:
+            return
+        new = dict(
+            zip(
+                (embedding_cache_key(encoder, text) for text in texts),
+                np.asarray(vectors, dtype=self.dtype),
+            )
+        )
+        dimension = len(next(iter(new.values())))
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                model = self._get_model(encoder)
+                if model is None or model != (dimension, self.dtype.name, model[2]):
+                    model = self._reset_model(encoder, dimension)
+                for key in self._find_rows(list(new)):
+                    del new[key]
+                capacity = max(self.max_bytes // (dimension * self.dtype.itemsize), 0)
+                # Only the last `capacity` vectors of an oversized batch fit.
+                keys = list(new)[-capacity:] if capacity else []
+                rows, model = self._allocate_rows(encoder, model, len(keys), capacity)
+                if keys:
+                    vectors_file = self._map(encoder, model)
+                    for key, row in zip(keys, rows):
+                        vectors_file[row] = new[key]
+                    vectors_file.flush()
+                    now = time.time()
+                    self._connection.executemany(
+                        "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)",
+                        [(key, encoder, row, now) for key, row in zip(keys, rows)],
+                    )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def get_stats(self) -> dict:
+        """Return hit, miss and eviction counts since the cache was opened."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def close(self) -> None:
+        """Release the vector files and close the SQLite connection."""
+        with self._lock:
+            self._maps.clear()
+            self._connection.close()
+
+    def _get_model(self, encoder: str) -> Optional[Tuple[int, str, int]]:
+        return self._connection.execute(
+            "SELECT dimension, dtype, rows FROM models WHERE model = ?", (encoder,)
+        ).fetchone()
+
+    def _reset_model(self, encoder: str, dimension: int) -> Tuple[int, str, int]:
+        """Start an empty vector file for a new encoder, dimension or dtype."""
+        logger.info(f"Starting embedding cache for {encoder} ({dimension} dims)")
+        self._connection.execute("DELETE FROM embeddings WHERE model = ?", (encoder,))
+        self._connection.execute(
+            "INSERT OR REPLACE INTO models VALUES (?, ?, ?, 0)",
+            (encoder, dimension, self.dtype.name),
+        )
+        self._maps.pop(encoder, None)
+        path = self._path(encoder)
+        if os.path.exists(path):
+            os.truncate(path, 0)
+        return dimension, self.dtype.name, 0
+
+    def _allocate_rows(
+        self, encoder: str, model: Tuple[int, str, int], count: int, capacity: int
+    ) -> Tuple[List[int], Tuple[int, str, int]]:
+        """Return `count` rows to write, growing the file up to capacity, then evicting."""
+        dimension, dtype, allocated = model
+        if allocated > capacity:
+            # The size cap was lowered: drop the rows past it.
+            self._connection.execute(
+                "DELETE FROM embeddings WHERE model = ? AND row >= ?",
+                (encoder, capacity),
+            )
+            allocated = capacity
+        fresh = min(count, capacity - allocated)
+        rows = list(range(allocated, allocated + fresh))
+        if count > fresh:
+            evicted = self._connection.execute(
+                "SELECT key, row FROM embeddings WHERE model = ? "
+                "ORDER BY last_used LIMIT ?",
+                (encoder, count - fresh),
+            ).fetchall()
+            self._connection.executemany(
+                "DELETE FROM embeddings WHERE key = ?", [(key,) for key, _ in evicted]
+            )
+            rows.extend(row for _, row in evicted)
+            self.evictions += len(evicted)
+        if allocated + fresh != model[2]:
+            allocated += fresh
+            self._connection.execute(
+                "UPDATE models SET rows = ? WHERE model = ?", (allocated, encoder)
+            )
+            self._maps.pop(encoder, None)
+            with open(self._path(encoder), "ab") as vectors_file:
+                vectors_file.truncate(allocated * dimension * self.dtype.itemsize)
+        return rows, (dimension, dtype, allocated)
+
+    def _find_rows(self, keys: List[str]) -> Dict[str, int]:
+        rows = {}
+        for start in range(0, len(keys), _QUERY_BATCH):
+            batch = keys[start : start + _QUERY_BATCH]
+            rows.update(
+                self._connection.execute(
+                    "SELECT key, row FROM embeddings WHERE key IN "
+                    f"({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+            )
+        return rows
+
+    def _touch(self, keys: List[str]) -> None:
+        now = time.time()
+        self._connection.executemany(
+            "UPDATE embeddings SET last_used = ? WHERE key = ?",
+            [(now, key) for key in keys],
+        )
+
+    def _map(self, encoder: str, model: Tuple[int, str, int]) -> np.memmap:
+        """Return the encoder's vector file mapped as a rows x dimension array."""
+        dimension, dtype, rows = model
+        vectors = self._maps.get(encoder)
+        if vectors is None or vectors.shape[0] != rows:
+            vectors = np.memmap(
+                self._path(encoder), dtype=dtype, mode="r+", shape=(rows, dimension)
+            )
+            self._maps[encoder] = vectors
+        return vectors
+
+    def _path(self, encoder: str) -> str:
+        name = hashlib.sha256(encoder.encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f"{name}.vectors")
+
+
+def get_embedding_cache() -> Optional[ChunkEmbeddingCache]:
+    """Return the configured ChunkEmbeddingCache, or None if EMBEDDING_CACHE_DIR is empty."""
+    if not EMBEDDING_CACHE_DIR:
+        return None
+    return ChunkEmbeddingCache(EMBEDDING_CACHE_DIR)
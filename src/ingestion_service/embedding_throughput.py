@@ -0,0 +1,98 @@
+"""Throughput accounting for document embedding during ingestion."""
+
+import threading
+import time
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingThroughput:
+    """Accumulates embedded chunks, tokens and encode time across ingestion calls."""
+
+    def __init__(self):
+        self.chunks = 0
+        self.tokens = 0
+        self.seconds = 0.0
+        self.last_batch: dict = {}
+        self._lock = threading.Lock()
+
+    def record(self, chunks: int, tokens: int, seconds: float) -> dict:
+        """Add one embed call to the totals and return its own throughput."""
+        batch = {
+            "chunks": chunks,
+            "tokens": tokens,
+            "seconds": round(seconds, 3),
+            "chunks_per_second": round(chunks / seconds, 1) if seconds else 0.0,
+            "tokens_per_second": round(tokens / seconds, 1) if seconds else 0.0,
+        }
+        with self._lock:
+            self.chunks += chunks
+            self.tokens += tokens
+            self.seconds += seconds
+            self.last_batch = batch
+        return batch
+
+    def get_stats(self) -> dict:
+        """Return cumulative chunks/sec and tokens/sec plus the most recent call."""
+        with self._lock:
+            seconds = self.seconds
+            return {
+                "chunks": self.chunks,
+                "tokens": self.tokens,
+                "seconds": round(seconds, 3),
+                "chunks_per_second": (
+                    round(self.chunks / seconds, 1) if seconds else 0.0
+                ),
+                "tokens_per_second": (
+                    round(self.tokens / seconds, 1) if seconds else 0.0
+                ),
+                "last_batch": dict(self.last_batch),
+            }
+
+
+def count_tokens(embeddings: Embeddings, texts: List[str]) -> int:
+    """Count model tokens in texts, falling back to whitespace words without a tokenizer."""
+    # HuggingFaceEmbeddings keeps its SentenceTransformer in _client.
+    tokenizer = getattr(getattr(embeddings, "_client", None), "tokenizer", None)
+    if tokenizer is not None:
+        try:
+            return sum(len(ids) for ids in tokenizer(texts)["input_ids"])
+        except Exception as exception:
+            logger.debug(f"Tokenizer failed, counting words instead: {exception}")
+    return sum(len(text.split()) for text in texts)
+
+
+class ThroughputTrackingEmbeddings(Embeddings):
+    """Embeddings wrapper that times embed_documents and records it in EmbeddingThroughput.
+
+    Tokens are counted outside the timed section, so the reported rates cover
+    model encoding only.
+    """
+
+    def __init__(self, embeddings: Embeddings, throughput: EmbeddingThroughput):
+        self.embeddings = embeddings
+        self.throughput = throughput
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents with the wrapped model and record the throughput."""
+        start = time.perf_counter()
+        vectors = self.embeddings.embed_documents(texts)
+        seconds = time.perf_counter() - start
+        batch = self.throughput.record(
+            len(texts), count_tokens(self.embeddings, texts), seconds
+        )
+        logger.info(
+            f"Embedded {batch['chunks']} chunks in {batch['seconds']}s "
+            f"({batch['chunks_per_second']} chunks/s, "
+            f"{batch['tokens_per_second']} tokens/s)"
+        )
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query with the wrapped model (not tracked)."""
+        return self.embeddings.embed_query(text)
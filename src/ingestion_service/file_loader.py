@@ -1,12 +1,16 @@
 """File loader that resolves local paths and downloads from S3 as needed."""
 
+import hashlib
 import os
 import logging
 import shutil
-from typing import Tuple
+import threading
+from typing import BinaryIO, Optional, Tuple
 from src.shared.exceptions import ConfigurationException
 from src.shared.env_loader import load_environment
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 import uuid
 from urllib.parse import urlparse
 
@@ -18,12 +22,31 @@ AWS_REGION = os.getenv("AWS_REGION")
 AWS_ENDPOINT_URL = os.getenv("AWS_ENDPOINT_URL")
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID", "")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY", "")
+# Objects larger than the threshold are fetched as ranged parts, up to
+# AWS_S3_MAX_CONCURRENCY at a time per object.
+AWS_S3_MULTIPART_THRESHOLD = int(
+    os.getenv("AWS_S3_MULTIPART_THRESHOLD", str(8 * 1024 * 1024))
+)
+AWS_S3_MULTIPART_CHUNKSIZE = int(
+    os.getenv("AWS_S3_MULTIPART_CHUNKSIZE", str(8 * 1024 * 1024))
+)
+AWS_S3_MAX_CONCURRENCY = int(os.getenv("AWS_S3_MAX_CONCURRENCY", "10"))
+# Shared by all concurrent downloads: at least download workers x concurrency.
+AWS_S3_MAX_POOL_CONNECTIONS = int(os.getenv("AWS_S3_MAX_POOL_CONNECTIONS", "50"))
+
+HASH_BLOCK_SIZE = 1024 * 1024
 
 logger = logging.getLogger(__name__)
 
 
 class FileLoader:
-    """Loads PDF files from local paths or downloads them from S3."""
+    """Loads PDF files from local paths or downloads them from S3.
+
+    One S3 client, with a connection pool of AWS_S3_MAX_POOL_CONNECTIONS, is
+    created on first use and shared by every download, so concurrent
+    downloads reuse connections instead of opening new ones. Downloaded
+    copies live in AWS_TEMP_FOLDER until release_local_file is called.
+    """
 
     def __init__(self):
         if not AWS_TEMP_FOLDER:
@@ -33,13 +56,17 @@ class FileLoader:
         # Ensure a clean temporary directory for S3 downloads
         if os.path.exists(AWS_TEMP_FOLDER):
             shutil.rmtree(AWS_TEMP_FOLDER)
+        self.transfer_config = TransferConfig(
+            multipart_threshold=AWS_S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=AWS_S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=AWS_S3_MAX_CONCURRENCY,
+        )
+        self._s3_client = None
+        self._s3_client_lock = threading.Lock()
 
     def load_pdf_file(self, file_path: str) -> str:
         """Return the local path to the PDF, downloading from S3 if necessary."""
-        if not file_path.endswith(".pdf"):
-            raise ValueError(f"Unsupported file type: {file_path}")
-        if file_path.startswith("https://") or file_path.startswith("http://"):
-            file_path = self._convert_https_to_s3_uri(file_path)
+        file_path = self._normalize_source(file_path)
         if file_path.startswith(
             "s3://"
         ):  # If file is an S3 URL, download the file and store locally
@@ -54,29 +81,121 @@ class FileLoader:
             return file_path
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    def _download_file_from_s3(self, file_path: str) -> str:
-        """Download a file from S3 to a local temp directory and return its path."""
+    def load_pdf_file_hashed(self, file_path: str) -> Tuple[str, str]:
+        """Return the local path to the PDF and the SHA-256 of its contents.
+
+        S3 objects are hashed while they download; local files are read once.
+        """
+        source = self._normalize_source(file_path)
+        digest = hashlib.sha256()
+        if source.startswith("s3://"):
+            try:
+                local_path = self._download_file_from_s3(source, digest)
+            except Exception as e:
+                logger.error(f"Error downloading file from S3: {e}")
+                raise
+            return local_path, digest.hexdigest()
+        local_path = self.load_pdf_file(source)
+        with open(local_path, "rb") as file:
+            while block := file.read(HASH_BLOCK_SIZE):
+                digest.update(block)
+        return local_path, digest.hexdigest()
+
+    def get_source_version(self, file_path: str) -> Optional[str]:
+        """Return a cheap tag that changes whenever the source's contents change.
+
+        ETag and size for S3 objects (one HEAD request), mtime and size for
+        local files. Returns None if an S3 object can't be inspected, so the
+        caller falls back to downloading it.
+        """
+        source = self._normalize_source(file_path)
+        if source.startswith("s3://"):
+            bucket, key = self._extract_S3_bucket_and_key(source)
+            try:
+                head = self._create_s3_client().head_object(Bucket=bucket, Key=key)
+            except Exception as e:
+                logger.warning(f"Could not get S3 metadata for {source}: {e}")
+                return None
+            return f"etag={head['ETag']};size={head['ContentLength']}"
         try:
-            s3_client = boto3.client(
-                "s3",
-                region_name=AWS_REGION,
-                aws_access_key_id=AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-                endpoint_url=AWS_ENDPOINT_URL,
-            )
+            stat = os.stat(source)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {source}")
+        return f"mtime_ns={stat.st_mtime_ns};size={stat.st_size}"
+
+    def release_local_file(self, local_path: Optional[str]) -> None:
+        """Delete a copy downloaded to AWS_TEMP_FOLDER; local sources are left alone."""
+        if not local_path or os.path.dirname(
+            os.path.abspath(local_path)
+        ) != os.path.abspath(AWS_TEMP_FOLDER):
+            return
+        try:
+            os.remove(local_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete downloaded file {local_path}: {e}")
+
+    def _normalize_source(self, file_path: str) -> str:
+        """Validate the file type and convert S3 HTTPS URLs to s3:// URIs."""
+        if not file_path.endswith(".pdf"):
+            raise ValueError(f"Unsupported file type: {file_path}")
+        if file_path.startswith("https://") or file_path.startswith("http://"):
+            file_path = self._convert_https_to_s3_uri(file_path)
+        return file_path
+
+    def _create_s3_client(self):
+        """Return the loader's S3 client, creating it on first use.
+
+        boto3 clients are thread-safe, so one client serves every download.
+        """
+        with self._s3_client_lock:
+            if self._s3_client is None:
+                self._s3_client = boto3.client(
+                    "s3",
+                    region_name=AWS_REGION,
+                    aws_access_key_id=AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+                    endpoint_url=AWS_ENDPOINT_URL,
+                    config=Config(max_pool_connections=AWS_S3_MAX_POOL_CONNECTIONS),
+                )
+            return self._s3_client
+
+    def _download_file_from_s3(self, file_path: str, digest=None) -> str:
+        """Download a file from S3 to a local temp directory and return its path.
+
+        With a hashlib digest, the object is streamed through it as it is
+        written. Large objects are downloaded as concurrent ranged parts
+        (see transfer_config). A partial file is deleted if the download fails.
+        """
+        temp_file_path = None
+        try:
+            s3_client = self._create_s3_client()
             # Download the file to the temporary directory
             if not os.path.exists(AWS_TEMP_FOLDER):
-                os.makedirs(AWS_TEMP_FOLDER)
+                os.makedirs(AWS_TEMP_FOLDER, exist_ok=True)
 
             temp_file_path = self._generate_random_local_filename(file_path)
             bucket, key = self._extract_S3_bucket_and_key(file_path)
-            s3_client.download_file(
-                bucket,
-                key,
-                temp_file_path,
-            )
+            if digest is None:
+                s3_client.download_file(
+                    bucket,
+                    key,
+                    temp_file_path,
+                    Config=self.transfer_config,
+                )
+            else:
+                with open(temp_file_path, "wb") as file:
+                    # Parts still download concurrently; they are written in order.
+                    s3_client.download_fileobj(
+                        bucket,
+                        key,
+                        _HashingWriter(file, digest),
+                        Config=self.transfer_config,
+                    )
             return temp_file_path
         except Exception as e:
+            self.release_local_file(temp_file_path)
             raise Exception(f"Error downloading file from S3: {e}")
 
     def _extract_S3_bucket_and_key(self, file_path: str) -> Tuple[str, str]:
@@ -116,3 +235,20 @@ class FileLoader:
             key = parts[1] if len(parts) > 1 else ""
 
         return f"s3://{bucket}/{key}"
+
+
+class _HashingWriter:
+    """Write-only file wrapper that feeds every written block to a hashlib digest.
+
+    It has no seek(), so boto3 treats it as a non-seekable stream and writes
+    the object's parts in order, which keeps the running hash correct.
+    """
+
+    def __init__(self, file: BinaryIO, digest):
+        self.file = file
+        self.digest = digest
+
+    def write(self, data: bytes) -> int:
+        """Hash and write one block."""
+        self.digest.update(data)
+        return self.file.write(data)
@@ -0,0 +1,268 @@
+"""Background ingestion jobs submitted through the ingestion API."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from enum import Enum
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional
+import uuid
+
+from src.ingestion_service.progress import (
+    FINAL_STAGES,
+    IngestionStage,
+    ProgressCallback,
+    ProgressEvent,
+)
+from src.shared.env_loader import load_environment
+
+import logging
+
+if TYPE_CHECKING:
+    from src.ingestion_service.document_ingestor import DocumentIngestor
+
+logger = logging.getLogger(__name__)
+
+load_environment()
+# Jobs run one after another by default; each job is already concurrent.
+INGESTION_JOB_WORKERS = int(os.getenv("INGESTION_JOB_WORKERS", "1"))
+INGESTION_JOB_HISTORY = int(os.getenv("INGESTION_JOB_HISTORY", "100"))
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of an ingestion job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATUSES = frozenset(
+    {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
+)
+
+
+@dataclass
+class DocumentProgress:
+    """Latest stage reported for one document of a job."""
+
+    document: str
+    stage: IngestionStage = IngestionStage.QUEUED
+    message: str = ""
+    chunks: Optional[int] = None
+    embedded: Optional[int] = None
+    error: Optional[str] = None
+    updated_at: Optional[float] = None
+
+
+class IngestionJob:
+    """A batch of documents ingested in the background, fed by ProgressEvents.
+
+    A job is COMPLETED once every document reached a final stage, whether it
+    succeeded or not; FAILED means the batch itself could not run.
+    """
+
+    def __init__(
+        self, documents: List[str], progress: Optional[ProgressCallback] = None
+    ):
+        self.job_id = uuid.uuid4().hex
+        self.status = JobStatus.QUEUED
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.documents: List[str] = documents
+        self.cancel_event = threading.Event()
+        self._progress = progress
+        self._lock = threading.Lock()
+        self._documents: Dict[str, DocumentProgress] = {
+            document: DocumentProgress(document) for document in documents
+        }
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has stopped, successfully or not."""
+        return self.status in FINISHED_STATUSES
+
+    def record(self, event: ProgressEvent) -> None:
+        """Apply a progress event to its document, then forward it."""
+        with self._lock:
+            progress = self._documents.get(event.document)
+            if progress is not None:
+                progress.stage = event.stage
+                progress.message = event.message
+                if event.chunks is not None:
+                    progress.chunks = event.chunks
+                if event.embedded is not None:
+                    progress.embedded = event.embedded
+                progress.error = event.error
+                progress.updated_at = time.time()
+        if self._progress is not None:
+            self._progress(event)
+
+    def cancel(self) -> bool:
+        """Ask the job to stop; returns False if it had already finished.
+
+        A queued job is cancelled at once. A running job stops starting new
+        documents and finishes the ones in flight.
+        """
+        with self._lock:
+            if self.status in FINISHED_STATUSES:
+                return False
+            self.cancel_event.set()
+            if self.status == JobStatus.QUEUED:
+                self._finish(JobStatus.CANCELLED)
+            return True
+
+    def start(self) -> bool:
+        """Mark the job RUNNING; returns False if it was cancelled while queued."""
+        with self._lock:
+            if self.status != JobStatus.QUEUED:
+                return False
+            self.status = JobStatus.RUNNING
+            self.started_at = time.time()
+            return True
+
+    def finish(self, results, error: Optional[Exception] = None) -> None:
+        """Record the final per-document results, or the error that stopped the batch."""
+        with self._lock:
+            for result in results:
+                progress = self._documents[result.document]
+                if result.success and progress.stage not in FINAL_STAGES:
+                    progress.stage = IngestionStage.COMPLETED
+                    progress.updated_at = time.time()
+                elif not result.success and progress.stage not in (
+                    IngestionStage.FAILED,
+                    IngestionStage.CANCELLED,
+                ):
+                    # Shares the result of a failed document with the same contents.
+                    progress.stage = IngestionStage.FAILED
+                    progress.error = result.error
+                    progress.updated_at = time.time()
+            if error is not None:
+                self.error = str(error)
+                self._finish(JobStatus.FAILED)
+            elif self.cancel_event.is_set():
+                self._finish(JobStatus.CANCELLED)
+            else:
+                self._finish(JobStatus.COMPLETED)
+
+    def snapshot(self) -> dict:
+        """Return the job's state, per-document stages, chunk counts and throughput."""
+        with self._lock:
+            documents = [asdict(progress) for progress in self._documents.values()]
+            status = self.status
+            started_at, finished_at = self.started_at, self.finished_at
+        stages = [document["stage"] for document in documents]
+        chunks = sum(
+            document["chunks"] or 0
+            for document in documents
+            if document["stage"] == IngestionStage.COMPLETED
+        )
+        embedded = sum(
+            document["embedded"] or 0
+            for document in documents
+            if document["stage"] == IngestionStage.COMPLETED
+        )
+        elapsed = None
+        if started_at is not None:
+            elapsed = (finished_at or time.time()) - started_at
+        return {
+            "job_id": self.job_id,
+            "status": status.value,
+            "error": self.error,
+            "total": len(documents),
+            "succeeded": sum(
+                stage in (IngestionStage.COMPLETED, IngestionStage.SKIPPED)
+                for stage in stages
+            ),
+            "failed": stages.count(IngestionStage.FAILED),
+            "cancelled": stages.count(IngestionStage.CANCELLED),
+            "in_progress": sum(stage not in FINAL_STAGES for stage in stages),
+            "chunks": chunks,
+            "embedded": embedded,
+            "created_at": self.created_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "elapsed_seconds": elapsed,
+            "chunks_per_second": chunks / elapsed if elapsed else None,
+            "documents": [
+                {**document, "stage": document["stage"].value} for document in documents
+            ],
+        }
+
+    def _finish(self, status: JobStatus) -> None:
+        self.status = status
+        self.finished_at = time.time()
+
+
+class IngestionJobManager:
+    """Runs IngestionJobs on background threads and keeps recent ones for polling.
+
+    At most `history` finished jobs are kept; the oldest are forgotten first.
+    """
+
+    def __init__(
+        self,
+        doc_ingestor: "DocumentIngestor",
+        workers: int = INGESTION_JOB_WORKERS,
+        history: int = INGESTION_JOB_HISTORY,
+    ):
+        if workers < 1:
+            raise ValueError("INGESTION_JOB_WORKERS must be at least 1")
+        self.doc_ingestor = doc_ingestor
+        self.history = history
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="ingestion-job"
+        )
+
+    def submit(self, documents: List[str]) -> IngestionJob:
+        """Queue a batch of documents and return its job right away."""
+        clean_documents = list(dict.fromkeys(d.strip() for d in documents if d.strip()))
+        job = IngestionJob(clean_documents, self.doc_ingestor.progress)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._evict()
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        """Return a job by ID, or None if unknown or forgotten."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self) -> None:
+        """Cancel unfinished jobs and wait for running ones to stop."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel()
+        self._executor.shutdown(wait=True)
+
+    def _run(self, job: IngestionJob) -> None:
+        if not job.start():
+            return
+        logger.info(f"Ingestion job {job.job_id}: {len(job.documents)} documents")
+        try:
+            results = self.doc_ingestor.ingest_documents(
+                job.documents, job.record, job.cancel_event
+            )
+        except Exception as exception:
+            logger.exception(f"Ingestion job {job.job_id} failed")
+            job.finish([], exception)
+            return
+        job.finish(results)
+        logger.info(f"Ingestion job {job.job_id} {job.status.value}")
+
+    def _evict(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(len(finished) - self.history, 0)]:
+            del self._jobs[job_id]
@@ -0,0 +1,611 @@
+"""Staged, concurrent pipeline behind DocumentIngestor.ingest_documents."""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+import multiprocessing
+import os
+import queue
+import threading
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set
+
+from langchain_core.documents import Document
+
+from src.ingestion_service.progress import (
+    IngestionStage,
+    ProgressCallback,
+    ProgressEvent,
+)
+from src.ingestion_service.vector_store_builder import VectorStoreBuilder
+from src.shared.env_loader import load_environment
+from src.shared.exceptions import IngestionCancelledException, NoDocumentsException
+
+import logging
+
+if TYPE_CHECKING:
+    from src.ingestion_service.document_ingestor import DocumentIngestor
+
+logger = logging.getLogger(__name__)
+
+load_environment()
+INGESTION_DOWNLOAD_WORKERS = int(os.getenv("INGESTION_DOWNLOAD_WORKERS", "4"))
+# 0 parses in a thread of the ingestion process instead of a process pool.
+INGESTION_PARSE_WORKERS = int(os.getenv("INGESTION_PARSE_WORKERS", "2"))
+INGESTION_EMBED_BATCH_SIZE = int(os.getenv("INGESTION_EMBED_BATCH_SIZE", "256"))
+INGESTION_QUEUE_SIZE = int(os.getenv("INGESTION_QUEUE_SIZE", "4"))
+INGESTION_DMS_BATCH_SIZE = int(os.getenv("INGESTION_DMS_BATCH_SIZE", "100"))
+
+_DONE = object()
+
+
+@dataclass
+class PipelineConfig:
+    """Concurrency settings of the ingestion pipeline stages."""
+
+    download_workers: int = INGESTION_DOWNLOAD_WORKERS
+    parse_workers: int = INGESTION_PARSE_WORKERS
+    embed_batch_size: int = INGESTION_EMBED_BATCH_SIZE
+    queue_size: int = INGESTION_QUEUE_SIZE
+    dms_batch_size: int = INGESTION_DMS_BATCH_SIZE
+
+    def __post_init__(self):
+        """Reject settings the pipeline cannot run with."""
+        if self.download_workers < 1:
+            raise ValueError("INGESTION_DOWNLOAD_WORKERS must be at least 1")
+        if self.parse_workers < 0:
+            raise ValueError("INGESTION_PARSE_WORKERS must not be negative")
+        if self.embed_batch_size < 1:
+            raise ValueError("INGESTION_EMBED_BATCH_SIZE must be at least 1")
+        if self.queue_size < 1:
+            raise ValueError("INGESTION_QUEUE_SIZE must be at least 1")
+        if self.dms_batch_size < 1:
+            raise ValueError("INGESTION_DMS_BATCH_SIZE must be at least 1")
+
+
+@dataclass
+class _Job:
+    """One document moving through the pipeline."""
+
+    index: int
+    document: str
+    doc_hash: str
+    doc_name: str
+    chunks: Optional[List[Document]] = None
+    completed: bool = False
+
+
+@dataclass
+class _Run:
+    """State of one IngestionPipeline.run call."""
+
+    progress: ProgressCallback
+    cancel_event: threading.Event
+    errors: List[Optional[Exception]]
+    # Position of a duplicate -> position of the document ingesting its content.
+    duplicates: Dict[int, int] = field(default_factory=dict)
+
+    def report(
+        self, document: str, stage: IngestionStage, message: str, **details
+    ) -> None:
+        self.progress(ProgressEvent(document, stage, message, **details))
+
+    def fail(self, index: int, document: str, exception: Exception) -> None:
+        self.errors[index] = exception
+        self.report(
+            document,
+            IngestionStage.FAILED,
+            f"❌ Could not ingest {document}: {exception}",
+            error=str(exception),
+        )
+
+    def cancel(self, index: int, document: str) -> None:
+        self.errors[index] = IngestionCancelledException(
+            f"Ingestion of {document} was cancelled"
+        )
+        self.report(document, IngestionStage.CANCELLED, f"🛑 {document} was cancelled.")
+
+    def abandon(self, index: int, document: str, exception: Exception) -> None:
+        """Record a failure left by a stage error, even if reporting it fails too."""
+        try:
+            self.fail(index, document, exception)
+        except Exception:
+            self.errors[index] = exception
+
+
+# The builder of a parse worker process, set once by _init_parse_worker.
+_worker_builder: Optional[VectorStoreBuilder] = None
+
+
+def parse_document(
+    vector_store_builder: VectorStoreBuilder, file_path: str
+) -> List[Document]:
+    """Load and split one PDF; runs in a parse worker process.
+
+    Pages are split as they are read, so a builder with a streaming splitter
+    never holds the whole document's text.
+    """
+    pages = vector_store_builder.iter_pdf_pages(file_path)
+    return vector_store_builder.split_text_to_docs(pages)
+
+
+def _init_parse_worker(vector_store_builder: VectorStoreBuilder) -> None:
+    """Keep one builder per parse worker process, with its parsing models loaded."""
+    global _worker_builder
+    _worker_builder = vector_store_builder
+    try:
+        vector_store_builder.warm_up()
+    except Exception:
+        # load_pdf_text retries, so the error is reported against a document.
+        logger.exception("Could not warm up parse worker")
+
+
+def _parse_in_worker(file_path: str) -> List[Document]:
+    return parse_document(_worker_builder, file_path)
+
+
+class IngestionPipeline:
+    """Runs download, parse and embed/write as concurrent stages over a document list.
+
+    - download: for each window of `dms_batch_size` documents, unchanged
+      sources are skipped with one DMS lookup (DocumentIngestor.check_sources),
+      then `download_workers` threads run DocumentIngestor.download_document,
+      which hashes each document's contents as it downloads.
+    - start: one thread, in input order, skips content that is COMPLETED or
+      already in this batch, and sets PENDING for the rest. Downloads that
+      are ready together are started with two DMS requests
+      (DocumentIngestor.start_documents), up to `dms_batch_size` at a time.
+    - parse: `parse_workers` processes run iter_pdf_pages and split_text_to_docs,
+      each with its own copy of the builder, warmed once (see
+      VectorStoreBuilder.warm_up).
+    - embed/write: chunks of consecutive documents are embedded together in
+      micro-batches of about `embed_batch_size`, then each document is written
+      to Chroma, and the micro-batch is marked COMPLETED in one DMS request.
+      Chunks Chroma already holds a vector for (see
+      VectorStoreBuilder.plan_document_write) are not embedded.
+
+    Stages are connected by queues bounded at `queue_size`, so at most that
+    many documents wait between two stages. Every failure is recorded against
+    its own document, which gets ERROR status exactly as in
+    DocumentIngestor.ingest_document. A document with the same contents as an
+    earlier one in the batch shares that document's result. Each stage a
+    document enters is reported as a ProgressEvent.
+
+    Cancellation is checked before a document is downloaded and before it is
+    set PENDING: documents past that point are finished, so none is left
+    PENDING in DMS. A stage hit by an unexpected error keeps draining its
+    input and fails every document still in it, so the stages before it
+    never block on a full queue. A parse pool broken by a crashed worker
+    is replaced. Downloaded copies are deleted once a document is parsed
+    or dropped (see FileLoader.release_local_file).
+    """
+
+    def __init__(self, ingestor: "DocumentIngestor", config: PipelineConfig):
+        self.ingestor = ingestor
+        self.config = config
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._parse_pool_lock = threading.Lock()
+
+    def run(
+        self,
+        documents: List[str],
+        progress: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> List[Optional[Exception]]:
+        """Ingest documents and return, per input position, the error or None on success.
+
+        Progress events go to `progress`, by default the ingestor's callback.
+        """
+        run = _Run(
+            progress=progress or self.ingestor.progress,
+            cancel_event=cancel_event or threading.Event(),
+            errors=[None] * len(documents),
+        )
+        downloads: "queue.Queue" = queue.Queue(maxsize=self.config.queue_size)
+        parsed: "queue.Queue" = queue.Queue(maxsize=self.config.queue_size)
+        with ThreadPoolExecutor(
+            max_workers=self.config.download_workers,
+            thread_name_prefix="ingestion-download",
+        ) as download_pool:
+            stages = [
+                threading.Thread(
+                    target=self._download_stage,
+                    args=(documents, download_pool, downloads, run),
+                    name="ingestion-download",
+                ),
+                threading.Thread(
+                    target=self._start_stage,
+                    args=(downloads, parsed, run),
+                    name="ingestion-start",
+                ),
+            ]
+            for stage in stages:
+                stage.start()
+            self._embed_stage(parsed, run)
+            for stage in stages:
+                stage.join()
+        for duplicate, original in run.duplicates.items():
+            run.errors[duplicate] = run.errors[original]
+        return run.errors
+
+    def close(self) -> None:
+        """Shut down the parse worker processes, if started."""
+        with self._parse_pool_lock:
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown()
+                self._parse_pool = None
+
+    def _download_stage(
+        self,
+        documents: List[str],
+        download_pool: ThreadPoolExecutor,
+        downloads: "queue.Queue",
+        run: _Run,
+    ) -> None:
+        queued = 0
+        try:
+            size = self.config.dms_batch_size
+            for start in range(0, len(documents), size):
+                window = documents[start : start + size]
+                sources = [(None, None)] * len(window)
+                if not run.cancel_event.is_set():
+                    try:
+                        sources = self.ingestor.check_sources(
+                            window, run.progress, download_pool.map
+                        )
+                    except Exception:
+                        logger.exception("Could not check sources, downloading all")
+                for index, document, (version, unchanged_hash) in zip(
+                    range(start, start + len(window)), window, sources
+                ):
+                    future = None
+                    if unchanged_hash is not None:
+                        future = Future()
+                        future.set_result((unchanged_hash, None))
+                    elif not run.cancel_event.is_set():
+                        future = download_pool.submit(
+                            self.ingestor.download_document,
+                            document,
+                            version,
+                            run.progress,
+                        )
+                    downloads.put((index, document, future))
+                    queued += 1
+        except Exception as exception:
+            logger.exception("Download stage failed, failing the remaining documents")
+            for index in range(queued, len(documents)):
+                run.abandon(index, documents[index], exception)
+        finally:
+            downloads.put(_DONE)
+
+    def _start_stage(
+        self, downloads: "queue.Queue", parsed: "queue.Queue", run: _Run
+    ) -> None:
+        started_hashes: Dict[str, int] = {}
+        settled: Set[int] = set()
+        batch: list = []
+        batches = self._ready_batches(downloads)
+        try:
+            for batch in batches:
+                self._start_batch(batch, started_hashes, settled, parsed, run)
+        except Exception as exception:
+            logger.exception("Start stage failed, failing the remaining documents")
+            for index, document, download in batch:
+                if (
+                    index not in settled
+                    and index not in run.duplicates
+                    and run.errors[index] is None
+                ):
+                    self._drop_download(download)
+                    run.abandon(index, document, exception)
+            for batch in batches:
+                for index, document, download in batch:
+                    self._drop_download(download)
+                    run.abandon(index, document, exception)
+        finally:
+            parsed.put(_DONE)
+
+    def _ready_batches(self, downloads: "queue.Queue") -> Iterator[list]:
+        """Yield queued downloads in input order, in batches of those already done.
+
+        A batch waits for its first download only, so a slow download never
+        holds back documents that are ready.
+        """
+        held = None
+        finished = False
+        while held is not None or not finished:
+            if held is not None:
+                batch, held = [held], None
+            else:
+                item = downloads.get()
+                if item is _DONE:
+                    return
+                batch = [item]
+            while len(batch) < self.config.dms_batch_size:
+                try:
+                    item = downloads.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _DONE:
+                    finished = True
+                    break
+                if item[2] is not None and not item[2].done():
+                    held = item
+                    break
+                batch.append(item)
+            yield batch
+
+    def _start_batch(
+        self,
+        batch: list,
+        started_hashes: Dict[str, int],
+        settled: Set[int],
+        parsed: "queue.Queue",
+        run: _Run,
+    ) -> None:
+        """Set PENDING for a batch of downloads and queue their parses.
+
+        Indexes of documents queued for parsing or skipped as COMPLETED are
+        added to `settled`; every other document ends failed, cancelled or
+        as a duplicate.
+        """
+        fetched = []
+        for index, document, download in batch:
+            if run.cancel_event.is_set():
+                if download is not None and not download.cancel():
+                    download.add_done_callback(self._release_download)
+                run.cancel(index, document)
+                continue
+            try:
+                doc_hash, file_path = download.result()
+            except FileNotFoundError:
+                logger.error(f"Error processing {document}: No documents!")
+                run.fail(index, document, NoDocumentsException())
+                continue
+            except Exception as exception:
+                run.fail(index, document, exception)
+                continue
+            if file_path is None:
+                continue
+            if doc_hash in started_hashes:
+                self._release(file_path)
+                run.report(
+                    document,
+                    IngestionStage.SKIPPED,
+                    f"⏭️ {document} has the same contents as another document "
+                    "in this batch.",
+                )
+                run.duplicates[index] = started_hashes[doc_hash]
+                continue
+            started_hashes[doc_hash] = index
+            fetched.append((index, document, doc_hash, file_path))
+        if not fetched:
+            return
+        outcomes = self.ingestor.start_documents(
+            [(document, doc_hash) for _, document, doc_hash, _ in fetched],
+            run.progress,
+        )
+        for (index, document, _, file_path), started in zip(fetched, outcomes):
+            if started is None or isinstance(started, Exception):
+                self._release(file_path)
+                if started is not None:
+                    run.fail(index, document, started)
+                else:
+                    settled.add(index)
+                continue
+            job = _Job(index, document, *started)
+            try:
+                run.report(
+                    document,
+                    IngestionStage.PARSING,
+                    f"✀ Splitting text to docs for {file_path}",
+                )
+                parse = self._submit_parse(file_path)
+            except Exception as exception:
+                self._release(file_path)
+                self._fail(job, exception, run)
+                continue
+            parse.add_done_callback(lambda _, path=file_path: self._release(path))
+            parsed.put((job, parse))
+            settled.add(index)
+
+    def _embed_stage(self, parsed: "queue.Queue", run: _Run) -> None:
+        pending: List[_Job] = []
+        try:
+            self._embed_parsed(parsed, pending, run)
+        except Exception as exception:
+            logger.exception("Embed stage failed, failing the remaining documents")
+            for job in pending:
+                if not job.completed and run.errors[job.index] is None:
+                    self._abandon(job, exception, run)
+            while (item := parsed.get()) is not _DONE:
+                job, parse = item
+                self._abandon(job, exception, run)
+
+    def _embed_parsed(
+        self, parsed: "queue.Queue", pending: List[_Job], run: _Run
+    ) -> None:
+        """Embed and write parsed documents until the start stage is done.
+
+        `pending` holds the jobs of the micro-batch being filled or flushed.
+        """
+        pending_chunks = 0
+        while True:
+            try:
+                # Never sit idle on an empty queue while holding parsed documents.
+                item = parsed.get(block=not pending)
+            except queue.Empty:
+                self._flush(pending, run)
+                pending.clear()
+                pending_chunks = 0
+                continue
+            if item is _DONE:
+                self._flush(pending, run)
+                pending.clear()
+                return
+            job, parse = item
+            if pending and not parse.done():
+                self._flush(pending, run)
+                pending.clear()
+                pending_chunks = 0
+            pending.append(job)
+            try:
+                job.chunks = parse.result()
+            except Exception as exception:
+                pending.pop()
+                self._fail(job, exception, run)
+                continue
+            if not job.chunks:
+                pending.pop()
+                logger.error(f"Error processing {job.document}: No documents!")
+                self._fail(job, NoDocumentsException(), run)
+                continue
+            pending_chunks += len(job.chunks)
+            if pending_chunks >= self.config.embed_batch_size:
+                self._flush(pending, run)
+                pending.clear()
+                pending_chunks = 0
+
+    def _flush(self, jobs: List[_Job], run: _Run) -> None:
+        """Embed the new chunks of several documents in one call, then write each document."""
+        if not jobs:
+            return
+        vector_store_builder = self.ingestor.vector_store_builder
+        planned = []
+        for job in jobs:
+            try:
+                plan = vector_store_builder.plan_document_write(
+                    job.doc_hash,
+                    job.document,
+                    job.chunks,
+                    sources_of=self.ingestor.sources_with_hash,
+                )
+            except Exception as exception:
+                self._fail(job, exception, run)
+                continue
+            planned.append((job, plan))
+            run.report(
+                job.document,
+                IngestionStage.EMBEDDING,
+                f"🧮 Embedding {len(plan.texts_to_embed)} of {len(job.chunks)} "
+                f"chunks from {job.document}.",
+                chunks=len(job.chunks),
+                embedded=len(plan.texts_to_embed),
+            )
+        texts = [text for _, plan in planned for text in plan.texts_to_embed]
+        try:
+            embeddings = vector_store_builder.embed_documents(texts) if texts else []
+        except Exception as exception:
+            if len(planned) > 1:
+                # Retry one document at a time so only the bad one fails.
+                for job, _ in planned:
+                    self._flush([job], run)
+            elif planned:
+                self._fail(planned[0][0], exception, run)
+            return
+        offset = 0
+        written = []
+        for job, plan in planned:
+            count = len(plan.texts_to_embed)
+            job_embeddings = embeddings[offset : offset + count]
+            offset += count
+            try:
+                run.report(
+                    job.document,
+                    IngestionStage.WRITING,
+                    f"🏭 Adding docs from {job.document} to vector store.",
+                    chunks=len(job.chunks),
+                    embedded=count,
+                )
+                vector_store_builder.write_document(plan, job_embeddings)
+            except Exception as exception:
+                self._fail(job, exception, run)
+                continue
+            logger.info(f"{job.document}: {plan.summary()}")
+            written.append((job, plan, count))
+        if not written:
+            return
+        errors = self.ingestor.complete_documents(
+            [
+                (job.doc_hash, job.doc_name, plan.replaced_doc_hashes)
+                for job, plan, _ in written
+            ]
+        )
+        for (job, _, count), error in zip(written, errors):
+            if error is not None:
+                self._fail(job, error, run)
+                continue
+            job.completed = True
+            run.report(
+                job.document,
+                IngestionStage.COMPLETED,
+                f"✅ Docs from {job.document} saved.",
+                chunks=len(job.chunks),
+                embedded=count,
+            )
+
+    def _release(self, file_path: str) -> None:
+        self.ingestor.file_loader.release_local_file(file_path)
+
+    def _release_download(self, download: Future) -> None:
+        """Delete the copy fetched by a download that finished after cancellation."""
+        if not download.cancelled() and download.exception() is None:
+            self._release(download.result()[1])
+
+    def _drop_download(self, download: Optional[Future]) -> None:
+        """Cancel a queued download, or delete its copy once it finishes."""
+        if download is not None and not download.cancel():
+            download.add_done_callback(self._release_download)
+
+    def _fail(self, job: _Job, exception: Exception, run: _Run) -> None:
+        self.ingestor.fail_document(job.doc_hash, job.doc_name, job.document, exception)
+        run.fail(job.index, job.document, exception)
+
+    def _abandon(self, job: _Job, exception: Exception, run: _Run) -> None:
+        """Set ERROR for a document left by a stage error, whatever else fails."""
+        try:
+            self.ingestor.fail_document(
+                job.doc_hash, job.doc_name, job.document, exception
+            )
+        except Exception:
+            logger.exception(f"Could not fail {job.document}")
+        run.abandon(job.index, job.document, exception)
+
+    def _submit_parse(self, file_path: str) -> Future:
+        vector_store_builder = self.ingestor.vector_store_builder
+        if self.config.parse_workers == 0:
+            future: Future = Future()
+            try:
+                future.set_result(parse_document(vector_store_builder, file_path))
+            except Exception as exception:
+                future.set_exception(exception)
+            return future
+        pool = self._get_parse_pool()
+        try:
+            return pool.submit(_parse_in_worker, file_path)
+        except BrokenProcessPool:
+            # A worker died, and a broken pool takes no more work.
+            logger.warning("Parse worker pool is broken, starting a new one")
+            self._discard_parse_pool(pool)
+            return self._get_parse_pool().submit(_parse_in_worker, file_path)
+
+    def _discard_parse_pool(self, pool: ProcessPoolExecutor) -> None:
+        """Drop a broken parse pool, so the next parse starts a new one."""
+        with self._parse_pool_lock:
+            if self._parse_pool is pool:
+                self._parse_pool = None
+        pool.shutdown(wait=False)
+
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        with self._parse_pool_lock:
+            if self._parse_pool is None:
+                # spawn, not fork: the ingestion process runs threads and torch.
+                # Each worker unpickles and warms the builder once, not per task.
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=self.config.parse_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_parse_worker,
+                    initargs=(self.ingestor.vector_store_builder,),
+                )
+            return self._parse_pool
@@ -5,7 +5,10 @@ import os
 
 from src.ingestion_service.document_ingestor import DocumentIngestor
 from src.ingestion_service.document_management_client import DocumentManagementClient
+from src.ingestion_service.embedding_cache import get_embedding_cache
 from src.ingestion_service.file_loader import FileLoader
+from src.ingestion_service.ingestion_jobs import IngestionJobManager
+from src.ingestion_service.source_index import get_source_index
 from src.ingestion_service.vector_store_builder import get_vector_store_builder
 from src.shared.env_loader import load_environment
 from src.shared.exceptions import (
@@ -24,7 +27,15 @@ async def lifespan(app):
     """Initialize and tear down ingestion service resources on application startup/shutdown."""
     # Startup
     print("Preparing vector store...")
-    app.state.vector_store_builder = get_vector_store_builder()
+    app.state.embedding_cache = get_embedding_cache()
+    app.state.vector_store_builder = get_vector_store_builder(
+        embedding_cache=app.state.embedding_cache
+    )
+    try:
+        app.state.vector_store_builder.warm_up()
+    except Exception:
+        # Not fatal: load_pdf_text retries and fails per document.
+        logger.exception("Could not warm up the vector store builder")
     try:
         app.state.file_loader = FileLoader()
     except Exception:
@@ -35,12 +46,15 @@ async def lifespan(app):
     if not DMS_URL:
         raise ServerSetupException("DMS_URL environment variable is required")
     dms_client = DocumentManagementClient(DMS_URL)
+    app.state.source_index = get_source_index()
     app.state.doc_ingestor = DocumentIngestor(
         dms_client,
         app.state.vector_store_builder,
         app.state.file_loader,
         print,
+        source_index=app.state.source_index,
     )
+    app.state.ingestion_jobs = IngestionJobManager(app.state.doc_ingestor)
     PDF_PATH = os.getenv("PDF_PATH")
     pdf_paths = (PDF_PATH or "").split(",")
     if PDF_PATH:
@@ -51,3 +65,10 @@ async def lifespan(app):
 
     # Shutdown
     print("Cleaning up...")
+    app.state.ingestion_jobs.shutdown()
+    app.state.doc_ingestor.close()
+    app.state.vector_store_builder.close()
+    if app.state.source_index is not None:
+        app.state.source_index.close()
+    if app.state.embedding_cache is not None:
+        app.state.embedding_cache.close()
@@ -1,16 +1,17 @@
 """FastAPI application for the ingestion service."""
 
-from typing import List
-from fastapi import FastAPI, HTTPException
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Response
 from requests import HTTPError
 
+from src.ingestion_service.ingestion_jobs import IngestionJob
 from src.ingestion_service.lifespan import lifespan
 from pydantic import BaseModel
 
 from src.shared.exceptions import NoDocumentsException
 import logging
 
-from src.shared.models import DMSDocument
+from src.shared.models import DocumentSummaryResponse
 
 logger = logging.getLogger(__name__)
 
@@ -37,21 +38,37 @@ class IngestionResponse(BaseModel):
     message: str
 
 
-class DocumentResult(BaseModel):
-    """Result for a single document within a batch ingestion."""
+class DocumentProgressResponse(BaseModel):
+    """Latest stage of one document within an ingestion job."""
 
     document: str
-    success: bool
-    error: str | None = None
+    stage: str
+    message: str
+    chunks: Optional[int] = None
+    embedded: Optional[int] = None
+    error: Optional[str] = None
+    updated_at: Optional[float] = None
 
 
-class BatchIngestionResponse(BaseModel):
-    """Response for a batch document ingestion operation."""
+class IngestionJobResponse(BaseModel):
+    """State, per-document progress and throughput of a batch ingestion job."""
 
+    job_id: str
+    status: str
+    error: Optional[str] = None
     total: int
     succeeded: int
     failed: int
-    results: List[DocumentResult]
+    cancelled: int
+    in_progress: int
+    chunks: int
+    embedded: int
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    elapsed_seconds: Optional[float] = None
+    chunks_per_second: Optional[float] = None
+    documents: List[DocumentProgressResponse]
 
 
 def get_vectordb_collection_count() -> int:
@@ -59,44 +76,89 @@ def get_vectordb_collection_count() -> int:
     return app.state.vector_store_builder.get_collection_count()
 
 
-def get_dms_documents() -> List[DMSDocument]:
-    """Fetch all documents registered in the Document Management Service."""
+def get_dms_summary() -> Optional[DocumentSummaryResponse]:
+    """Fetch the document count per status from the Document Management Service."""
     try:
-        documents = app.state.doc_ingestor.dms_client.get_documents()
-        return documents
+        return app.state.doc_ingestor.dms_client.get_summary()
     except Exception as e:
-        logger.error(f"Error getting documents from DMS: {e}")
-        return []
+        logger.error(f"Error getting document summary from DMS: {e}")
+        return None
 
 
 @app.get("/health")
 def health():
-    """Return service health status including vector store and DMS document counts."""
-    documents = [doc.model_dump() for doc in get_dms_documents()]
+    """Return service health status including vector store and DMS document counts.
+
+    Documents themselves are listed by the DMS (GET /documents/), a page at a time.
+    """
+    summary = get_dms_summary()
 
     return {
         "status": "ok",
         "documents_loaded_in_vector_store": f"{get_vectordb_collection_count()}",
-        "documents_loaded_in_dms": documents,
+        "documents_in_dms": (
+            {"total": summary.total, "counts": summary.counts}
+            if summary is not None
+            else None
+        ),
     }
 
 
-@app.post("/ingestion/documents/", response_model=BatchIngestionResponse)
-def ingest_documents(request: IngestionRequest):
-    """Ingest a batch of documents into the vector store via DMS."""
+@app.get("/metrics")
+def metrics():
+    """Return runtime counters for the ingestion service."""
+    vector_store_builder = app.state.vector_store_builder
+    embedding_cache = vector_store_builder.embedding_cache
+    return {
+        "embedding": vector_store_builder.embedding_throughput.get_stats(),
+        "embedding_cache": (
+            embedding_cache.get_stats() if embedding_cache is not None else None
+        ),
+    }
+
+
+def get_ingestion_job(job_id: str) -> IngestionJob:
+    """Return an ingestion job by ID, or raise a 404."""
+    job = app.state.ingestion_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return job
+
+
+@app.post(
+    "/ingestion/documents/",
+    response_model=IngestionJobResponse,
+    status_code=202,
+)
+def ingest_documents(request: IngestionRequest, response: Response):
+    """Queue a batch of documents for ingestion and return its job right away.
+
+    Poll GET /ingestion/jobs/{job_id}, given in the Location header, for progress.
+    """
     logger.info("Processing ingestion request...")
-    logger.info("Using DMS-enabled ingestion...")
-    results = app.state.doc_ingestor.ingest_documents(request.documents)
-    succeeded = sum(1 for r in results if r.success)
-    return BatchIngestionResponse(
-        total=len(results),
-        succeeded=succeeded,
-        failed=len(results) - succeeded,
-        results=[
-            DocumentResult(document=r.document, success=r.success, error=r.error)
-            for r in results
-        ],
-    )
+    job = app.state.ingestion_jobs.submit(request.documents)
+    logger.info(f"Queued ingestion job {job.job_id}")
+    response.headers["Location"] = f"/ingestion/jobs/{job.job_id}"
+    return job.snapshot()
+
+
+@app.get("/ingestion/jobs/{job_id}", response_model=IngestionJobResponse)
+def get_job(job_id: str):
+    """Return an ingestion job's status, per-document stages and throughput."""
+    return get_ingestion_job(job_id).snapshot()
+
+
+@app.post(
+    "/ingestion/jobs/{job_id}:cancel",
+    response_model=IngestionJobResponse,
+    status_code=202,
+)
+def cancel_job(job_id: str):
+    """Cancel an ingestion job; documents already being ingested are finished."""
+    job = get_ingestion_job(job_id)
+    if not job.cancel():
+        raise HTTPException(status_code=409, detail="Ingestion job already finished")
+    return job.snapshot()
 
 
 @app.post("/ingestion/document/", response_model=IngestionResponse)
@@ -0,0 +1,13 @@
+"""PDF page extraction run in LegacyVectorStoreBuilder's extract worker processes.
+
+Kept apart from vector_store_builder so spawned workers import only PyMuPDF,
+not torch and the embedding stack.
+"""
+
+import fitz
+
+
+def extract_page_range(path: str, start: int, stop: int) -> list[str]:
+    """Return the text of pages [start, stop) of a PDF."""
+    with fitz.open(path) as doc:
+        return [doc[page_number].get_text() for page_number in range(start, stop)]
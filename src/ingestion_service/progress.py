@@ -0,0 +1,54 @@
+"""Structured progress events emitted while documents are ingested."""
+
+from __future__ import annotations
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+
+class IngestionStage(str, Enum):
+    """Stage a document has reached in the ingestion pipeline."""
+
+    QUEUED = "queued"
+    DOWNLOADING = "downloading"
+    PARSING = "parsing"
+    EMBEDDING = "embedding"
+    WRITING = "writing"
+    COMPLETED = "completed"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINAL_STAGES = frozenset(
+    {
+        IngestionStage.COMPLETED,
+        IngestionStage.SKIPPED,
+        IngestionStage.FAILED,
+        IngestionStage.CANCELLED,
+    }
+)
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """One document entering a stage.
+
+    `chunks` is the number of chunks the document was split into and
+    `embedded` how many of them needed a new embedding, once known.
+    """
+
+    document: str
+    stage: IngestionStage
+    message: str
+    chunks: Optional[int] = None
+    embedded: Optional[int] = None
+    error: Optional[str] = None
+
+    def __str__(self) -> str:
+        """Return the human-readable message, so print still works as a callback."""
+        return self.message
+
+
+ProgressCallback = Callable[[ProgressEvent], None]
@@ -0,0 +1,85 @@
+"""Index of the content hash last seen at each document source."""
+
+import os
+import sqlite3
+import threading
+from typing import List, Optional
+
+from src.shared.env_loader import load_environment
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+load_environment()
+# Empty disables the index: every document is downloaded and hashed.
+INGESTION_SOURCE_INDEX_PATH = os.getenv(
+    "INGESTION_SOURCE_INDEX_PATH", "data/source_index.sqlite3"
+)
+
+
+class SourceIndex:
+    """Remembers, per source path or URL, its version tag and content hash.
+
+    The version tag is FileLoader.get_source_version: ETag and size for S3
+    objects, mtime and size for local files. While a source's tag is
+    unchanged its content hash is known without downloading it again.
+    """
+
+    def __init__(self, path: str = INGESTION_SOURCE_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS source_versions ("
+            "source TEXT PRIMARY KEY, "
+            "version TEXT NOT NULL, "
+            "doc_hash TEXT NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS source_versions_doc_hash "
+            "ON source_versions (doc_hash)"
+        )
+
+    def get(self, source: str, version: str) -> Optional[str]:
+        """Return the content hash recorded for source at this version, or None."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT doc_hash FROM source_versions WHERE source = ? AND version = ?",
+                (source, version),
+            ).fetchone()
+        return row[0] if row else None
+
+    def sources(self, doc_hash: str) -> List[str]:
+        """Return the sources whose last seen contents have this hash."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT source FROM source_versions WHERE doc_hash = ?", (doc_hash,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def put(self, source: str, version: str, doc_hash: str) -> None:
+        """Record the content hash of source at this version, replacing older ones."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO source_versions VALUES (?, ?, ?)",
+                (source, version, doc_hash),
+            )
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            self._connection.close()
+
+
+def get_source_index() -> Optional[SourceIndex]:
+    """Return the configured SourceIndex, or None if INGESTION_SOURCE_INDEX_PATH is empty."""
+    if not INGESTION_SOURCE_INDEX_PATH:
+        return None
+    return SourceIndex(INGESTION_SOURCE_INDEX_PATH)
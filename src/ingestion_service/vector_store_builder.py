@@ -1,14 +1,32 @@
 """Vector store builder implementations for ingesting documents into ChromaDB."""
 
+import bisect
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import hashlib
+import multiprocessing
 import os
 import re
+import threading
+from typing import Callable, Iterable, Iterator, Optional
 import chromadb
-from langchain_community.vectorstores import Chroma
+from docling.chunking import HybridChunker
+from docling.datamodel.base_models import InputFormat
+from docling.document_converter import DocumentConverter
 from langchain_docling.loader import DoclingLoader, ExportType
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 import fitz
+import torch
+from src.ingestion_service.embedding_cache import ChunkEmbeddingCache, encoder_id
+from src.ingestion_service.pdf_extraction import extract_page_range
+from src.ingestion_service.embedding_throughput import (
+    EmbeddingThroughput,
+    ThroughputTrackingEmbeddings,
+)
 from src.shared.exceptions import ChromaException, VectorStoreException
 import logging
 from src.shared.env_loader import load_environment
@@ -19,8 +37,17 @@ load_environment()
 EMBEDDING_MODEL = os.getenv(
     "EMBEDDING_MODEL", "sentence-transformers/paraphrase-MiniLM-L3-v2"
 )
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+# 0 keeps torch's default intra-op thread count.
+EMBEDDING_NUM_THREADS = int(os.getenv("EMBEDDING_NUM_THREADS", "0"))
+EMBEDDING_NORMALIZE = os.getenv("EMBEDDING_NORMALIZE", "false").lower() == "true"
 CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "500"))
 CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "50"))
+# 0 extracts PDF pages in the calling process.
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", "0"))
+PDF_EXTRACT_PAGES_PER_TASK = int(os.getenv("PDF_EXTRACT_PAGES_PER_TASK", "50"))
+# Text held by the legacy splitter at a time, in chunks of CHUNK_SIZE.
+SPLIT_WINDOW_CHUNKS = 8
 RAG_PREPROCESSOR = os.getenv("RAG_PREPROCESSOR", "legacy")
 DOCLING_EXPORT_TYPE = os.getenv("DOCLING_EXPORT_TYPE", "doc_chunks")
 CHROMA_HOST = os.getenv("CHROMA_HOST", "localhost")
@@ -28,13 +55,131 @@ CHROMA_PORT = int(os.getenv("CHROMA_PORT", "8001"))
 CHROMA_COLLECTION = os.getenv("CHROMA_COLLECTION", "rag_documents")
 
 
+def chunk_content_hash(text: str) -> str:
+    """Return the SHA-256 of a chunk's text."""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def chunk_id(doc_hash: str, chunk_index: int, content_hash: str) -> str:
+    """Return the stable Chroma ID of a document's chunk."""
+    return f"{doc_hash}-{chunk_index}-{content_hash[:16]}"
+
+
+def encode_options() -> dict:
+    """Return the sentence-transformers encode options from the EMBEDDING_* settings."""
+    return {
+        "batch_size": EMBEDDING_BATCH_SIZE,
+        "normalize_embeddings": EMBEDDING_NORMALIZE,
+    }
+
+
+@dataclass
+class ChunkWritePlan:
+    """Diff between a document's new chunks and the chunks Chroma already holds for it.
+
+    vectors[i] is the stored vector of chunk i when one exists from the same
+    encoder, either under the same ID (unchanged, not rewritten) or for the
+    same text under another ID (reused, rewritten without embedding); None
+    means chunk i must be embedded. stale_ids are stored chunks of the document or its source that
+    are no longer produced. replaced_doc_hashes are previous versions of the
+    source whose chunks are removed. retagged maps the chunks of a previous
+    version that another source still has to their metadata, with
+    doc_source moved to that source; they are kept.
+    """
+
+    ids: list[str]
+    docs: list[Document]
+    vectors: list[Optional[list[float]]]
+    unchanged_ids: set[str] = field(default_factory=set)
+    stale_ids: list[str] = field(default_factory=list)
+    replaced_doc_hashes: set[str] = field(default_factory=set)
+    retagged: dict[str, dict] = field(default_factory=dict)
+
+    @property
+    def texts_to_embed(self) -> list[str]:
+        """Texts of the chunks that have no stored vector, in chunk order."""
+        return [
+            doc.page_content
+            for doc, vector in zip(self.docs, self.vectors)
+            if vector is None
+        ]
+
+    def summary(self) -> str:
+        """One-line count of embedded, reused, unchanged and stale chunks."""
+        embedded = len(self.texts_to_embed)
+        unchanged = len(self.unchanged_ids)
+        reused = len(self.ids) - embedded - unchanged
+        return (
+            f"{embedded} chunks embedded, {reused} reused, "
+            f"{unchanged} unchanged, {len(self.stale_ids)} stale removed"
+        )
+
+
 class VectorStoreBuilder:
-    """Base class for building and populating a ChromaDB vector store from PDF documents."""
+    """Base class for building and populating a ChromaDB vector store from PDF documents.
 
-    def __init__(self, chroma_client=None):
+    The embedding model is loaded on first use and kept for the builder's
+    lifetime; encoding throughput is accumulated in embedding_throughput.
+    With an embedding_cache, chunks embedded before are not encoded again.
+    """
+
+    def __init__(
+        self,
+        chroma_client=None,
+        embedding_cache: Optional[ChunkEmbeddingCache] = None,
+    ):
         self.chroma_client = chroma_client or chromadb.HttpClient(
             host=CHROMA_HOST, port=CHROMA_PORT
         )
+        self.embedding_cache = embedding_cache
+        self.embedding_throughput = EmbeddingThroughput()
+        self._embeddings: dict[str, Embeddings] = {}
+        self._embeddings_lock = threading.Lock()
+
+    def get_embeddings(self, model_name: str = EMBEDDING_MODEL) -> Embeddings:
+        """Return the builder's embedding model, loading it on first use."""
+        with self._embeddings_lock:
+            if model_name not in self._embeddings:
+                logger.debug(f"👉 Loading embedding model {model_name}")
+                if EMBEDDING_NUM_THREADS > 0:
+                    torch.set_num_threads(EMBEDDING_NUM_THREADS)
+                embeddings = HuggingFaceEmbeddings(
+                    model_name=model_name,
+                    encode_kwargs=encode_options(),
+                )
+                self._embeddings[model_name] = ThroughputTrackingEmbeddings(
+                    embeddings, self.embedding_throughput
+                )
+            return self._embeddings[model_name]
+
+    def __getstate__(self):
+        """Pickle only the loading and splitting settings, for parse worker processes."""
+        # The Chroma client, model and lock stay in the ingestion process.
+        state = self.__dict__.copy()
+        for attribute in (
+            "chroma_client",
+            "embedding_cache",
+            "embedding_throughput",
+            "_embeddings",
+            "_embeddings_lock",
+        ):
+            state.pop(attribute, None)
+        return state
+
+    def __setstate__(self, state):
+        """Restore a builder that can load and split but has no Chroma client."""
+        self.__dict__.update(state)
+        self.chroma_client = None
+        self.embedding_cache = None
+        self.embedding_throughput = EmbeddingThroughput()
+        self._embeddings = {}
+        self._embeddings_lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """Load the models load_pdf_text needs; nothing to load by default."""
+
+    def close(self) -> None:
+        """Release worker processes held by the builder; nothing to release by default."""
 
     def collection_has_documents(self):
         """Return True if the ChromaDB collection contains at least one document."""
@@ -56,9 +201,13 @@ class VectorStoreBuilder:
         logger.error("No implementation for load_pdf_text")
         raise NotImplementedError
 
+    def iter_pdf_pages(self, path) -> Iterator[Document]:
+        """Yield a PDF's text documents one at a time; by default those of load_pdf_text."""
+        yield from self.load_pdf_text(path)
+
     def split_text_to_docs(
         self,
-        docs: list[Document],
+        docs: Iterable[Document],
         chunk_size: int = CHUNK_SIZE,
         chunk_overlap: int = CHUNK_OVERLAP,
     ) -> list[Document]:
@@ -66,105 +215,452 @@ class VectorStoreBuilder:
         logger.error("No implementation for split_text_to_docs")
         raise NotImplementedError
 
-    def add_documents_to_vector_store(
+    def embed_documents(
+        self, texts: list[str], model_name: str = EMBEDDING_MODEL
+    ) -> list[list[float]]:
+        """Embed chunk texts with the builder's model, e.g. a micro-batch spanning documents.
+
+        Texts found in the embedding cache are not encoded; new vectors are
+        added to it.
+        """
+        if self.embedding_cache is None:
+            return self._encode(texts, model_name)
+        encoder = encoder_id(model_name, encode_options())
+        vectors = self.embedding_cache.get_many(encoder, texts)
+        missing = [index for index, vector in enumerate(vectors) if vector is None]
+        if len(missing) < len(texts):
+            logger.info(
+                f"{len(texts) - len(missing)} of {len(texts)} embeddings "
+                "found in the embedding cache"
+            )
+        if missing:
+            missing_texts = [texts[index] for index in missing]
+            encoded = self._encode(missing_texts, model_name)
+            for index, vector in zip(missing, encoded):
+                vectors[index] = vector
+            try:
+                self.embedding_cache.put_many(encoder, missing_texts, encoded)
+            except Exception:
+                # The vectors are still written to Chroma; only the cache misses out.
+                logger.exception("Could not store embeddings in the embedding cache")
+        return vectors
+
+    def _encode(self, texts: list[str], model_name: str) -> list[list[float]]:
+        try:
+            return self.get_embeddings(model_name).embed_documents(texts)
+        except Exception as exception:
+            raise VectorStoreException(
+                f"Error embedding documents: {exception}"
+            ) from exception
+
+    def plan_document_write(
         self,
+        doc_hash: str,
+        source: str,
         docs: list[Document],
-        model_name: str = EMBEDDING_MODEL,
-    ) -> Chroma:
-        """Embed documents and persist them to the ChromaDB vector store."""
+        sources_of: Optional[Callable[[str], Iterable[str]]] = None,
+    ) -> ChunkWritePlan:
+        """Assign chunk IDs and diff them against what Chroma holds for the document.
+
+        Stored chunks are looked up by doc_hash (a retry of the same contents)
+        and by doc_source (a previous version of the same path or URL). Their
+        vectors are reused only if the chunk's `encoder` metadata matches the
+        current model and encode options. sources_of(doc_hash) returns the
+        sources whose contents currently hash to doc_hash: a previous version
+        another source still has is kept and moved to that source, not replaced.
+        """
+        encoder = encoder_id(EMBEDDING_MODEL, encode_options())
+        ids, chunks = [], []
+        for index, doc in enumerate(docs):
+            content_hash = chunk_content_hash(doc.page_content)
+            ids.append(chunk_id(doc_hash, index, content_hash))
+            chunks.append(
+                Document(
+                    page_content=doc.page_content,
+                    metadata={
+                        **(doc.metadata or {}),
+                        "doc_hash": doc_hash,
+                        "doc_source": source,
+                        "chunk_index": index,
+                        "content_hash": content_hash,
+                        "encoder": encoder,
+                    },
+                )
+            )
         try:
-            logger.debug("👉 Initializing HuggingFaceEmbeddings")
-            embeddings = HuggingFaceEmbeddings(model_name=model_name)
-            logger.debug(f"👉 Creating Chroma DB with {len(docs)} docs")
-            try:
-                vectordb = Chroma.from_documents(
-                    docs,
-                    embeddings,
-                    client=self.chroma_client,
-                    collection_name=CHROMA_COLLECTION,
+            stored = self._get_collection().get(
+                where={"$or": [{"doc_hash": doc_hash}, {"doc_source": source}]},
+                include=["embeddings", "metadatas"],
+            )
+        except Exception as exception:
+            raise VectorStoreException(
+                f"Error reading from Vector Store: {exception}"
+            ) from exception
+        stored_vectors = {}
+        stored_by_content = {}
+        stored_metadatas = {}
+        embeddings = stored.get("embeddings")
+        if embeddings is None:
+            embeddings = [None] * len(stored["ids"])
+        for stored_id, metadata, vector in zip(
+            stored["ids"], stored["metadatas"], embeddings
+        ):
+            metadata = metadata or {}
+            if metadata.get("encoder") != encoder:
+                # Embedded by another model or with other options: re-embed.
+                vector = None
+            if vector is not None and hasattr(vector, "tolist"):
+                vector = vector.tolist()
+            stored_vectors[stored_id] = vector
+            stored_metadatas[stored_id] = metadata
+            if vector is not None and metadata.get("content_hash"):
+                stored_by_content[metadata["content_hash"]] = vector
+        plan = ChunkWritePlan(ids=ids, docs=chunks, vectors=[])
+        for id_, chunk in zip(ids, chunks):
+            if stored_vectors.get(id_) is not None:
+                plan.unchanged_ids.add(id_)
+                plan.vectors.append(stored_vectors[id_])
+            else:
+                plan.vectors.append(
+                    stored_by_content.get(chunk.metadata["content_hash"])
+                )
+        new_ids = set(ids)
+        # Previous version -> another source that still has it, or None.
+        kept_for = {}
+        for id_, metadata in stored_metadatas.items():
+            if id_ in new_ids:
+                continue
+            stored_hash = metadata.get("doc_hash")
+            if not stored_hash or stored_hash == doc_hash:
+                plan.stale_ids.append(id_)
+                continue
+            if stored_hash not in kept_for:
+                others = sorted(
+                    other
+                    for other in (sources_of(stored_hash) if sources_of else ())
+                    if other != source
+                )
+                kept_for[stored_hash] = others[0] if others else None
+            if kept_for[stored_hash] is not None:
+                plan.retagged[id_] = {
+                    **metadata,
+                    "doc_source": kept_for[stored_hash],
+                }
+            else:
+                plan.stale_ids.append(id_)
+                plan.replaced_doc_hashes.add(stored_hash)
+        return plan
+
+    def write_document(
+        self, plan: ChunkWritePlan, embeddings: list[list[float]]
+    ) -> None:
+        """Upsert a document's new and changed chunks, then delete its stale ones.
+
+        embeddings are the vectors of plan.texts_to_embed, in order. Chunks
+        already stored under the same ID are not rewritten. Retagged chunks
+        only get their new metadata.
+        """
+        if len(embeddings) != len(plan.texts_to_embed):
+            raise VectorStoreException(
+                f"Got {len(embeddings)} embeddings for "
+                f"{len(plan.texts_to_embed)} documents"
+            )
+        new_embeddings = iter(embeddings)
+        ids, vectors, docs = [], [], []
+        for id_, doc, vector in zip(plan.ids, plan.docs, plan.vectors):
+            if vector is None:
+                vector = next(new_embeddings)
+            elif id_ in plan.unchanged_ids:
+                continue
+            ids.append(id_)
+            vectors.append(vector)
+            docs.append(doc)
+        try:
+            collection = self._get_collection()
+            if ids:
+                collection.upsert(
+                    ids=ids,
+                    embeddings=vectors,
+                    documents=[doc.page_content for doc in docs],
+                    metadatas=[doc.metadata for doc in docs],
+                )
+            if plan.retagged:
+                collection.update(
+                    ids=list(plan.retagged), metadatas=list(plan.retagged.values())
                 )
-                logger.debug("✅ Chroma.from_documents completed successfully")
-            except ValueError as exception:
-                raise ChromaException(
-                    f"Invalid documents for Chroma: {exception}"
-                ) from exception
-            except RuntimeError as exception:
-                raise ChromaException(
-                    f"Chroma creation failed: {exception}"
-                ) from exception
-            logger.debug("✅ Vector store creation successful")
-            return vectordb
-        except (ChromaException, VectorStoreException):
-            raise
+            # Delete after the upsert so the document is never missing.
+            if plan.stale_ids:
+                collection.delete(ids=plan.stale_ids)
+        except ValueError as exception:
+            raise ChromaException(
+                f"Invalid documents for Chroma: {exception}"
+            ) from exception
         except Exception as exception:
             raise VectorStoreException(
-                f"Error creating Vector Store: {exception}"
+                f"Error writing to Vector Store: {exception}"
             ) from exception
 
+    def upsert_document(
+        self,
+        doc_hash: str,
+        source: str,
+        docs: list[Document],
+        sources_of: Optional[Callable[[str], Iterable[str]]] = None,
+    ) -> ChunkWritePlan:
+        """Plan, embed only what has no stored vector, and write one document."""
+        plan = self.plan_document_write(doc_hash, source, docs, sources_of)
+        texts = plan.texts_to_embed
+        self.write_document(plan, self.embed_documents(texts) if texts else [])
+        return plan
+
+    def _get_collection(self):
+        """Return the collection; vectors are computed by the builder, not Chroma."""
+        return self.chroma_client.get_or_create_collection(
+            CHROMA_COLLECTION, embedding_function=None
+        )
+
 
 class LegacyVectorStoreBuilder(VectorStoreBuilder):
-    """Vector store builder using PyMuPDF (fitz) for PDF text extraction."""
+    """Vector store builder using PyMuPDF (fitz) for PDF text extraction.
 
-    def __init__(self, chroma_client=None):
-        super().__init__(chroma_client)
+    With `extract_workers` > 0, PDFs longer than `pages_per_task` pages are
+    extracted by a process pool, `pages_per_task` pages per task, and the
+    page texts are reassembled in order.
+    """
+
+    def __init__(
+        self,
+        chroma_client=None,
+        extract_workers: int = PDF_EXTRACT_WORKERS,
+        pages_per_task: int = PDF_EXTRACT_PAGES_PER_TASK,
+        embedding_cache: Optional[ChunkEmbeddingCache] = None,
+    ):
+        super().__init__(chroma_client, embedding_cache)
+        if extract_workers < 0:
+            raise ValueError("PDF_EXTRACT_WORKERS must not be negative")
+        if pages_per_task < 1:
+            raise ValueError("PDF_EXTRACT_PAGES_PER_TASK must be at least 1")
+        self.extract_workers = extract_workers
+        self.pages_per_task = pages_per_task
+        self._extract_pool: Optional[ProcessPoolExecutor] = None
+        self._extract_pool_lock = threading.Lock()
+
+    def __getstate__(self):
+        """Pickle without the extract worker pool, which stays in this process."""
+        state = super().__getstate__()
+        state.pop("_extract_pool", None)
+        state.pop("_extract_pool_lock", None)
+        return state
+
+    def __setstate__(self, state):
+        """Restore a builder that starts its own extract workers when needed."""
+        super().__setstate__(state)
+        self._extract_pool = None
+        self._extract_pool_lock = threading.Lock()
 
     def load_pdf_text(self, path: str) -> list[Document]:
         """Extract per-page text from a PDF using PyMuPDF."""
+        return list(self.iter_pdf_pages(path))
+
+    def iter_pdf_pages(self, path: str) -> Iterator[Document]:
+        """Yield a PDF's pages in order, with their 1-based number as `page` metadata."""
         try:
             with fitz.open(path) as doc:
-                texts = [Document(page.get_text()) for page in doc]
-            return texts
+                page_count = doc.page_count
+                if self.extract_workers == 0 or page_count <= self.pages_per_task:
+                    for number, page in enumerate(doc, start=1):
+                        yield Document(page.get_text(), metadata={"page": number})
+                    return
+            texts = self._extract_pages_in_workers(path, page_count)
+            for number, text in enumerate(texts, start=1):
+                yield Document(text, metadata={"page": number})
         except Exception as e:
             raise Exception(f"Error reading PDF file {path}: {str(e)}")
 
+    def close(self) -> None:
+        """Shut down the extract worker processes, if started."""
+        with self._extract_pool_lock:
+            if self._extract_pool is not None:
+                self._extract_pool.shutdown(cancel_futures=True)
+                self._extract_pool = None
+
+    def _extract_pages_in_workers(self, path: str, page_count: int) -> Iterator[str]:
+        """Yield page texts in order, with at most two tasks per worker in flight."""
+        pool = self._get_extract_pool()
+        in_flight = deque()
+        try:
+            for start in range(0, page_count, self.pages_per_task):
+                stop = min(start + self.pages_per_task, page_count)
+                in_flight.append(pool.submit(extract_page_range, path, start, stop))
+                if len(in_flight) >= 2 * self.extract_workers:
+                    yield from in_flight.popleft().result()
+            while in_flight:
+                yield from in_flight.popleft().result()
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    def _get_extract_pool(self) -> ProcessPoolExecutor:
+        with self._extract_pool_lock:
+            if self._extract_pool is None:
+                # spawn, not fork: the ingestion process runs threads and torch.
+                self._extract_pool = ProcessPoolExecutor(
+                    max_workers=self.extract_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._extract_pool
+
     def split_text_to_docs(
         self,
-        docs: list[Document],
+        docs: Iterable[Document],
         chunk_size: int = CHUNK_SIZE,
         chunk_overlap: int = CHUNK_OVERLAP,
     ) -> list[Document]:
-        """Split concatenated page text into overlapping chunks, filtering empties."""
+        """Split page text into overlapping chunks with page ranges, filtering empties."""
+        chunks = list(self.iter_split_docs(docs, chunk_size, chunk_overlap))
+        logger.debug(f"📄 Created {len(chunks)} documents")
+        return chunks
+
+    def iter_split_docs(
+        self,
+        pages: Iterable[Document],
+        chunk_size: int = CHUNK_SIZE,
+        chunk_overlap: int = CHUNK_OVERLAP,
+    ) -> Iterator[Document]:
+        """Yield the chunks of pages as they are read, never joining the whole text.
+
+        Pages are appended to a window of about SPLIT_WINDOW_CHUNKS chunks. The
+        window is split, chunks ending at least chunk_size characters before
+        its end are yielded, and the window restarts at the first chunk held
+        back, so chunks and their overlap run across page boundaries as if the
+        pages had been joined with newlines. Each chunk carries the numbers of
+        the pages it starts and ends on as `page_start` and `page_end`
+        metadata, from each page's `page` metadata or its position.
+        """
         splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size, chunk_overlap=chunk_overlap
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap, add_start_index=True
         )
-        full_text = "\n".join([doc.page_content for doc in docs])
-        chunks = splitter.split_text(full_text)
-
-        # Filter out empty chunks
-        valid_chunks = [chunk.strip() for chunk in chunks if chunk.strip()]
-        docs = [Document(page_content=chunk) for chunk in valid_chunks]
-
-        logger.debug(
-            f"📄 Created {len(docs)} documents from {len(valid_chunks)} valid chunks"
+        window = ""
+        # Window offset at which each page in the window starts, and its number.
+        page_offsets: list[int] = []
+        page_numbers: list[int] = []
+        for position, page in enumerate(pages, start=1):
+            if position > 1:
+                window += "\n"
+            page_offsets.append(len(window))
+            page_numbers.append((page.metadata or {}).get("page", position))
+            window += page.page_content
+            if len(window) < SPLIT_WINDOW_CHUNKS * chunk_size:
+                continue
+            chunks = splitter.create_documents([window])
+            ready_end = len(window) - chunk_size
+            restart = len(window)
+            for chunk in chunks:
+                start = chunk.metadata["start_index"]
+                if start + len(chunk.page_content) > ready_end:
+                    restart = start
+                    break
+                yield from self._page_chunk(chunk, page_offsets, page_numbers)
+            window = window[restart:]
+            first = bisect.bisect_right(page_offsets, restart) - 1
+            page_offsets = [max(offset - restart, 0) for offset in page_offsets[first:]]
+            page_numbers = page_numbers[first:]
+        if window:
+            for chunk in splitter.create_documents([window]):
+                yield from self._page_chunk(chunk, page_offsets, page_numbers)
+
+    @staticmethod
+    def _page_chunk(
+        chunk: Document, page_offsets: list[int], page_numbers: list[int]
+    ) -> Iterator[Document]:
+        """Yield the stripped chunk with its page range, unless it is blank."""
+        text = chunk.page_content.strip()
+        if not text:
+            return
+        start = chunk.metadata["start_index"]
+        end = start + max(len(chunk.page_content) - 1, 0)
+        yield Document(
+            page_content=text,
+            metadata={
+                "page_start": page_numbers[
+                    bisect.bisect_right(page_offsets, start) - 1
+                ],
+                "page_end": page_numbers[bisect.bisect_right(page_offsets, end) - 1],
+            },
         )
-        return docs
 
 
 class DoclingVectorStoreBuilder(VectorStoreBuilder):
-    """Vector store builder using Docling for structured PDF parsing."""
+    """Vector store builder using Docling for structured PDF parsing.
 
-    def __init__(self, chroma_client=None):
-        super().__init__(chroma_client)
+    One DocumentConverter, with Docling's layout and table models loaded, is
+    kept for the builder's lifetime and reused for every document.
+    """
+
+    def __init__(
+        self,
+        chroma_client=None,
+        embedding_cache: Optional[ChunkEmbeddingCache] = None,
+    ):
+        super().__init__(chroma_client, embedding_cache)
         self.EXPORT_TYPE = DOCLING_EXPORT_TYPE
         self.SECTION_HEADING_RE = re.compile(
             r"^(?P<num>\d+(?:\.\d+)*)(?:\s+)(?P<title>.+)$"
         )
+        self._converter: Optional[DocumentConverter] = None
+        self._chunker: Optional[HybridChunker] = None
+        self._converter_lock = threading.Lock()
+
+    def __getstate__(self):
+        """Pickle without the converter; each parse worker process warms its own."""
+        state = super().__getstate__()
+        for attribute in ("_converter", "_chunker", "_converter_lock"):
+            state.pop(attribute, None)
+        return state
+
+    def __setstate__(self, state):
+        """Restore a builder whose converter is created on first use."""
+        super().__setstate__(state)
+        self._converter = None
+        self._chunker = None
+        self._converter_lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """Create the Docling converter and load its PDF models ahead of the first document."""
+        self.get_converter()
+
+    def get_converter(self) -> DocumentConverter:
+        """Return the builder's Docling converter, loading its PDF pipeline on first use."""
+        with self._converter_lock:
+            if self._converter is None:
+                logger.debug("👉 Initializing Docling converter")
+                converter = DocumentConverter()
+                converter.initialize_pipeline(InputFormat.PDF)
+                if self.EXPORT_TYPE == ExportType.DOC_CHUNKS:
+                    self._chunker = HybridChunker()
+                self._converter = converter
+            return self._converter
 
     def load_pdf_text(self, path: str) -> list[Document]:
         """Load and parse a PDF with Docling, returning structured document chunks."""
         try:
+            converter = self.get_converter()
             loader = DoclingLoader(
                 file_path=path,
+                converter=converter,
                 export_type=self.EXPORT_TYPE,
+                chunker=self._chunker,
             )
-            docs = loader.load()
+            # One conversion at a time: the converter's models are shared.
+            with self._converter_lock:
+                docs = loader.load()
         except Exception as e:
             raise Exception(f"Error reading PDF file {path}: {str(e)}")
         return docs
 
     def split_text_to_docs(
         self,
-        docs: list[Document],
+        docs: Iterable[Document],
         chunk_size: int = CHUNK_SIZE,
         chunk_overlap: int = CHUNK_OVERLAP,
     ) -> list[Document]:
@@ -252,12 +748,14 @@ class DoclingVectorStoreBuilder(VectorStoreBuilder):
         return refined
 
 
-def get_vector_store_builder(chroma_client=None) -> VectorStoreBuilder:
+def get_vector_store_builder(
+    chroma_client=None, embedding_cache: Optional[ChunkEmbeddingCache] = None
+) -> VectorStoreBuilder:
     """Instantiate and return the appropriate VectorStoreBuilder based on RAG_PREPROCESSOR env var."""
     if RAG_PREPROCESSOR == "docling":
-        return DoclingVectorStoreBuilder(chroma_client)
+        return DoclingVectorStoreBuilder(chroma_client, embedding_cache=embedding_cache)
     if RAG_PREPROCESSOR == "legacy":
-        return LegacyVectorStoreBuilder(chroma_client)
+        return LegacyVectorStoreBuilder(chroma_client, embedding_cache=embedding_cache)
     else:
         logger.warning("RAG_PREPROCESSOR not defined! Defaulting to legacy.")
-        return LegacyVectorStoreBuilder(chroma_client)
+        return LegacyVectorStoreBuilder(chroma_client, embedding_cache=embedding_cache)
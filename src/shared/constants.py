@@ -16,6 +16,8 @@ class DocumentStatus(str, Enum):
     PENDING = "Document pending processing"
     COMPLETED = "Document processing completed"
     ERROR = "Error in document processing"
+    # Replaced by a newer version of the same document; not a failure.
+    SUPERSEDED = "Document superseded by a newer version"
 
 
 class SetDocumentResult(Enum):
@@ -23,3 +25,12 @@ class SetDocumentResult(Enum):
 
     CREATED = "created"
     UPDATED = "updated"
+    CONFLICT = "conflict"
+
+
+# Most documents a single DMS batch request may name.
+MAX_DOCUMENT_BATCH_SIZE = 1000
+# Most documents one page of GET /documents/ may return.
+MAX_DOCUMENT_PAGE_SIZE = 1000
+# Columns GET /documents/ can project with `fields=`.
+DOCUMENT_FIELDS = ("doc_hash", "doc_name", "status")
@@ -53,3 +53,7 @@ class DocumentHashConflictException(Exception):
     """Raised when doc_hash already exists with a different doc_name."""
 
     pass
+
+
+class IngestionCancelledException(Exception):
+    """Raised for documents not ingested because their ingestion job was cancelled."""
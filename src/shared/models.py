@@ -1,8 +1,15 @@
 """Shared Pydantic models used across multiple services."""
 
+from datetime import datetime
+from typing import Dict, List, Optional
+
 from pydantic import Field
 from pydantic import BaseModel
-from src.shared.constants import DocumentStatus
+from src.shared.constants import (
+    MAX_DOCUMENT_BATCH_SIZE,
+    DocumentStatus,
+    SetDocumentResult,
+)
 
 
 class DMSDocument(BaseModel):
@@ -18,6 +25,8 @@ class GetDocumentStatusResponse(BaseModel):
 
     doc_name: str = Field(..., min_length=1)
     status: DocumentStatus
+    version: Optional[int] = None
+    updated_at: Optional[datetime] = None
 
 
 class SetDocumentStatusRequest(BaseModel):
@@ -25,3 +34,49 @@ class SetDocumentStatusRequest(BaseModel):
 
     doc_name: str = Field(..., min_length=1)
     status: DocumentStatus
+
+
+class BatchGetDocumentStatusRequest(BaseModel):
+    """Request schema for the batch GET document status endpoint."""
+
+    doc_hashes: List[str] = Field(..., min_length=1, max_length=MAX_DOCUMENT_BATCH_SIZE)
+
+
+class BatchGetDocumentStatusResponse(BaseModel):
+    """Response schema for the batch GET document status endpoint; unknown hashes are left out."""
+
+    documents: List[DMSDocument]
+
+
+class BatchSetDocumentStatusRequest(BaseModel):
+    """Request schema for the batch PUT document status endpoint."""
+
+    documents: List[DMSDocument] = Field(
+        ..., min_length=1, max_length=MAX_DOCUMENT_BATCH_SIZE
+    )
+
+
+class SetDocumentStatusResult(BaseModel):
+    """Outcome of one document of a batch PUT document status request."""
+
+    doc_hash: str
+    result: SetDocumentResult
+
+
+class BatchSetDocumentStatusResponse(BaseModel):
+    """Response schema for the batch PUT document status endpoint, in request order."""
+
+    results: List[SetDocumentStatusResult]
+
+
+class DocumentSummaryResponse(BaseModel):
+    """Document counts per status, and a fingerprint of the COMPLETED documents.
+
+    completed_fingerprint changes whenever a document is COMPLETED, leaves
+    COMPLETED or is rewritten while COMPLETED, so callers can detect corpus
+    changes without listing documents.
+    """
+
+    total: int
+    counts: Dict[DocumentStatus, int]
+    completed_fingerprint: str
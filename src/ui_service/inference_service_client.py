@@ -1,9 +1,10 @@
 """HTTP client for the inference service, used by the Streamlit UI."""
 
+import json
 import logging
 from dataclasses import dataclass, field
 import os
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import requests
 
@@ -17,9 +18,13 @@ class NoDocumentsIngestedError(Exception):
     """Raised when the inference service reports no documents have been ingested."""
 
 
+class ChatStreamError(Exception):
+    """Raised when the inference service reports an error while streaming an answer."""
+
+
 @dataclass
 class DocumentInfo:
-    """Lightweight representation of a document entry returned by the health endpoint."""
+    """Lightweight representation of a document entry returned by the documents endpoint."""
 
     doc_hash: str
     doc_name: str
@@ -32,10 +37,19 @@ class HealthStatus:
 
     is_healthy: bool
     vector_store_count: int = 0
-    documents: List[DocumentInfo] = field(default_factory=list)
+    document_total: int = 0
+    document_counts: Dict[str, int] = field(default_factory=dict)
     error_message: Optional[str] = None
 
 
+@dataclass
+class DocumentPage:
+    """One page of documents; next_after fetches the next page, None on the last one."""
+
+    documents: List[DocumentInfo] = field(default_factory=list)
+    next_after: Optional[str] = None
+
+
 @dataclass
 class ChatResponse:
     """Response from the domain expert chat endpoint."""
@@ -45,6 +59,54 @@ class ChatResponse:
     system_message: Optional[str] = None
 
 
+def _iter_sse_events(lines: Iterator[str]) -> Iterator[Tuple[str, Dict]]:
+    """Parse Server-Sent Event lines into (event, JSON data) pairs."""
+    event, data_lines = "message", []
+    for line in lines:
+        if not line:
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:") :].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:") :].strip())
+    if data_lines:
+        yield event, json.loads("\n".join(data_lines))
+
+
+class ChatStream:
+    """Iterator over answer text streamed by the domain expert streaming endpoint.
+
+    session_id and system_message are set when the `session` event arrives;
+    answer is set once the stream completes.
+    """
+
+    def __init__(self, response: requests.Response):
+        self._response = response
+        self.session_id: Optional[str] = None
+        self.system_message: Optional[str] = None
+        self.answer: Optional[str] = None
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield answer text chunks; raise ChatStreamError on a server-side error event."""
+        try:
+            for event, data in _iter_sse_events(
+                self._response.iter_lines(decode_unicode=True)
+            ):
+                if event == "session":
+                    self.session_id = data["session_id"]
+                    self.system_message = data.get("system_message")
+                elif event == "token":
+                    yield data["text"]
+                elif event == "done":
+                    self.answer = data["answer"]
+                elif event == "error":
+                    raise ChatStreamError(data.get("detail", "Processing failed"))
+        finally:
+            self._response.close()
+
+
 class InferenceServiceClient:
     """Client for interacting with the inference service REST API."""
 
@@ -59,19 +121,13 @@ class InferenceServiceClient:
             )
             response.raise_for_status()
             data = response.json()
-            documents = [
-                DocumentInfo(
-                    doc_hash=doc["doc_hash"],
-                    doc_name=doc["doc_name"],
-                    status=doc["status"],
-                )
-                for doc in data.get("documents_loaded_in_dms", [])
-            ]
+            dms_documents = data.get("documents_in_dms") or {}
             return HealthStatus(
                 is_healthy=True,
                 # The API returns documents_loaded_in_vector_store as a string; cast to int.
                 vector_store_count=int(data.get("documents_loaded_in_vector_store", 0)),
-                documents=documents,
+                document_total=dms_documents.get("total", 0),
+                document_counts=dms_documents.get("counts", {}),
             )
         except requests.Timeout:
             return HealthStatus(is_healthy=False, error_message="Health check timeout")
@@ -83,6 +139,30 @@ class InferenceServiceClient:
             logger.error("Health check failed: %s", exc)
             return HealthStatus(is_healthy=False, error_message=str(exc))
 
+    def get_documents(
+        self, limit: int = 50, after: Optional[str] = None
+    ) -> DocumentPage:
+        """Fetch one page of DMS documents; pass next_after to get the following page."""
+        params: Dict[str, object] = {"limit": limit}
+        if after is not None:
+            params["after"] = after
+        response = requests.get(
+            f"{self.base_url}/documents", params=params, timeout=HEALTH_CHECK_TIMEOUT
+        )
+        response.raise_for_status()
+        data = response.json()
+        return DocumentPage(
+            documents=[
+                DocumentInfo(
+                    doc_hash=doc["doc_hash"],
+                    doc_name=doc["doc_name"],
+                    status=doc["status"],
+                )
+                for doc in data["documents"]
+            ],
+            next_after=data.get("next_after"),
+        )
+
     def ask_question(
         self, question: str, session_id: Optional[str] = None
     ) -> ChatResponse:
@@ -92,6 +172,30 @@ class InferenceServiceClient:
             json={"question": question, "session_id": session_id},
             timeout=CHAT_TIMEOUT,
         )
+        self._raise_for_chat_status(response)
+        data = response.json()
+        return ChatResponse(
+            answer=data["answer"],
+            session_id=data["session_id"],
+            system_message=data.get("system_message"),
+        )
+
+    def stream_question(
+        self, question: str, session_id: Optional[str] = None
+    ) -> ChatStream:
+        """Post a question to the streaming domain expert endpoint and return a ChatStream."""
+        response = requests.post(
+            f"{self.base_url}/chat/domain-expert/stream/",
+            json={"question": question, "session_id": session_id},
+            timeout=CHAT_TIMEOUT,
+            stream=True,
+        )
+        self._raise_for_chat_status(response)
+        return ChatStream(response)
+
+    @staticmethod
+    def _raise_for_chat_status(response: requests.Response) -> None:
+        """Raise NoDocumentsIngestedError for the no-documents 503, else raise_for_status."""
         if response.status_code == 503:
             try:
                 detail = response.json().get("detail", "Service unavailable.")
@@ -104,9 +208,3 @@ class InferenceServiceClient:
                 raise NoDocumentsIngestedError(detail)
             response.raise_for_status()
         response.raise_for_status()
-        data = response.json()
-        return ChatResponse(
-            answer=data["answer"],
-            session_id=data["session_id"],
-            system_message=data.get("system_message"),
-        )
@@ -7,6 +7,7 @@ import streamlit as st
 from src.ui_service.inference_service_client import InferenceServiceClient
 
 INFERENCE_SERVICE_URL = os.getenv("INFERENCE_SERVICE_URL", "http://localhost:8000")
+DOCUMENTS_PAGE_SIZE = 50
 
 
 def _get_status_icon(status: str) -> str:
@@ -16,6 +17,8 @@ def _get_status_icon(status: str) -> str:
         return "✅"
     if "pending" in status_lower:
         return "⏳"
+    if "superseded" in status_lower:
+        return "🔁"
     return "❌"
 
 
@@ -87,15 +90,39 @@ if health.is_healthy:
         unsafe_allow_html=True,
     )
 
-    if health.documents:
+    if health.document_total:
         st.subheader("Loaded Documents")
-        # Build HTML for documents list with data-testid
-        docs_html = '<div data-testid="loaded_documents_list">'
-        for doc in health.documents:
-            icon = _get_status_icon(doc.status)
-            docs_html += f"<p>{icon} <strong>{doc.doc_name}</strong> — {doc.status}</p>"
-        docs_html += "</div>"
-        st.markdown(docs_html, unsafe_allow_html=True)
+        st.caption(
+            " · ".join(
+                f"{_get_status_icon(status)} {status}: {count}"
+                for status, count in health.document_counts.items()
+            )
+        )
+        # Documents are fetched a page at a time; the cursor is the last hash shown.
+        cursors = st.session_state.setdefault("documents_page_cursors", [None])
+        try:
+            page = client.get_documents(DOCUMENTS_PAGE_SIZE, cursors[-1])
+        except Exception as exc:
+            st.error(f"Could not list documents: {exc}")
+        else:
+            # Build HTML for documents list with data-testid
+            docs_html = '<div data-testid="loaded_documents_list">'
+            for doc in page.documents:
+                icon = _get_status_icon(doc.status)
+                docs_html += (
+                    f"<p>{icon} <strong>{doc.doc_name}</strong> — {doc.status}</p>"
+                )
+            docs_html += "</div>"
+            st.markdown(docs_html, unsafe_allow_html=True)
+            previous_col, next_col = st.columns(2)
+            with previous_col:
+                if len(cursors) > 1 and st.button("Previous page"):
+                    cursors.pop()
+                    st.rerun()
+            with next_col:
+                if page.next_after and st.button("Next page"):
+                    cursors.append(page.next_after)
+                    st.rerun()
     else:
         st.info("No documents loaded yet")
 
@@ -1,5 +1,6 @@
 """Streamlit chat application for the RAG Chatbot UI service."""
 
+import itertools
 import os
 from pathlib import Path
 from typing import List
@@ -58,21 +59,30 @@ def _render_domain_expert() -> None:
         return
 
     st.session_state.domain_history.append({"role": "user", "content": prompt})
-    with st.spinner("Thinking..."):
-        try:
-            response = client.ask_question(prompt, st.session_state.domain_session_id)
-        except NoDocumentsIngestedError as exc:
-            st.warning(str(exc))
-            return
-        except Exception as exc:
-            st.error(f"Request failed: {exc}")
-            return
-
-    st.session_state.domain_session_id = response.session_id
-    if response.system_message:
-        st.session_state.domain_system_messages.append(response.system_message)
+    with st.chat_message("user", avatar=AVATAR_USER):
+        st.markdown(prompt)
+    try:
+        with st.chat_message("assistant", avatar=AVATAR_ASSISTANT):
+            # Keep the spinner up until the first token arrives, then stream the rest.
+            with st.spinner("Thinking..."):
+                stream = client.stream_question(
+                    prompt, st.session_state.domain_session_id
+                )
+                tokens = iter(stream)
+                first_token = next(tokens, "")
+            st.write_stream(itertools.chain([first_token], tokens))
+    except NoDocumentsIngestedError as exc:
+        st.warning(str(exc))
+        return
+    except Exception as exc:
+        st.error(f"Request failed: {exc}")
+        return
+
+    st.session_state.domain_session_id = stream.session_id
+    if stream.system_message:
+        st.session_state.domain_system_messages.append(stream.system_message)
     st.session_state.domain_history.append(
-        {"role": "assistant", "content": response.answer}
+        {"role": "assistant", "content": stream.answer or ""}
     )
     st.rerun()
 
@@ -11,7 +11,7 @@ from src.document_management_service.db_client import DBClient
 from src.document_management_service.main import app, get_db_client
 from src.shared.constants import DocumentStatus, SetDocumentResult
 from src.shared.exceptions import DocumentHashConflictException
-from src.shared.models import DMSDocument
+from src.shared.models import DMSDocument, GetDocumentStatusResponse
 
 sample_hash = "d41d8cd98f00b204e9800998ecf8427e"
 sample_doc_name = "Test doc name"
@@ -23,15 +23,16 @@ def given_document_has_status(
     parameters: dict[str, Any] | None, doc_name: str, status: DocumentStatus
 ) -> None:
     # mock database to have document in status
-    mock_db_client.get_document_name.return_value = doc_name
-    mock_db_client.get_document_status.return_value = status
+    mock_db_client.get_document.return_value = GetDocumentStatusResponse(
+        doc_name=doc_name, status=status, version=1
+    )
 
     return
 
 
 def given_document_not_found(parameters: dict[str, Any] | None) -> None:
     # mock database to have not have document
-    mock_db_client.get_document_name.return_value = None
+    mock_db_client.get_document.return_value = None
     return
 
 
@@ -59,6 +60,23 @@ def given_dms_has_multiple_documents() -> None:
         doc_hash="Doc Hash 3", doc_name="Doc Name 3", status=DocumentStatus.ERROR
     )
     mock_db_client.get_documents.return_value = [document_1, document_2, document_3]
+    mock_db_client.get_document_summary.return_value = (
+        {
+            DocumentStatus.PENDING: 1,
+            DocumentStatus.COMPLETED: 1,
+            DocumentStatus.ERROR: 1,
+        },
+        "fingerprint",
+    )
+
+
+def given_dms_pages_one_document() -> None:
+    # The endpoint asks for limit=1; a full page gets an X-Next-After header.
+    mock_db_client.get_documents.return_value = [
+        DMSDocument(
+            doc_hash="Doc Hash 1", doc_name="Doc Name 1", status=DocumentStatus.PENDING
+        )
+    ]
 
 
 def given_document_exists_with_name() -> None:
@@ -85,6 +103,22 @@ def given_document_does_not_exist() -> None:
     )
 
 
+def given_only_document_in_db() -> None:
+    document = DMSDocument(
+        doc_hash=sample_hash,
+        doc_name=sample_doc_name,
+        status=DocumentStatus.COMPLETED,
+    )
+    mock_db_client.get_documents_by_hash.return_value = [document]
+
+
+def given_document_exists_with_name_and_new_hash_does_not() -> None:
+    mock_db_client.set_document_statuses.return_value = [
+        SetDocumentResult.CONFLICT,
+        SetDocumentResult.CREATED,
+    ]
+
+
 @pytest.fixture(scope="session")
 def application():
     """Start up application for provider tests."""
@@ -125,13 +159,22 @@ class TestIngestion:
             doc_name=sample_doc_name,
             status=DocumentStatus.PENDING,
         ),
+        f'Document {sample_hash} is unchanged since ETag "1"': partial(
+            given_document_has_status,
+            doc_name=sample_doc_name,
+            status=DocumentStatus.COMPLETED,
+        ),
         f"DMS has no knowledge of document {sample_hash}": given_document_not_found,
         "DMS has no documents": given_dms_has_no_documents,
         "DMS has one document": given_dms_has_one_document,
         "DMS has multiple documents": given_dms_has_multiple_documents,
+        "DMS has multiple documents, paged one at a time": given_dms_pages_one_document,
         f"Document {sample_hash} exists in the db with doc_name {sample_doc_name}": given_document_exists_with_name,
         f"Document {sample_hash} already exists in the db": given_document_exists,
         f"Document {sample_hash} does not exist in the db": given_document_does_not_exist,
+        f"Document {sample_hash} is the only one in the db": given_only_document_in_db,
+        f"Document {sample_hash} exists in the db with doc_name {sample_doc_name}"
+        " and new-hash does not": given_document_exists_with_name_and_new_hash_does_not,
     }
 
     def test_provider_from_broker(self, application):
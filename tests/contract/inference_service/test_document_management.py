@@ -82,3 +82,51 @@ class TestDocumentManagement:
             dms_client = DocumentManagementClient(srv.url)
             result = dms_client.get_documents()
             assert result == [DMSDocument(**item) for item in response]
+
+    def test_get_documents_page_with_next_cursor(self, pact):
+        response = [
+            {
+                "doc_hash": "Doc Hash 1",
+                "doc_name": "Doc Name 1",
+                "status": DocumentStatus.PENDING,
+            },
+        ]
+        (
+            pact.upon_receiving("Get the first page of one document")
+            .given("DMS has multiple documents, paged one at a time")
+            .with_request("GET", "/documents/")
+            .with_query_parameter("limit", "1")
+            .will_respond_with(200)
+            .with_header("X-Next-After", "Doc Hash 1")
+            .with_body(response)
+        )
+
+        with pact.serve() as srv:
+            dms_client = DocumentManagementClient(srv.url)
+            documents, next_after = dms_client.get_documents_page(1)
+            assert documents == [DMSDocument(**item) for item in response]
+            assert next_after == "Doc Hash 1"
+
+    def test_get_summary(self, pact):
+        response = {
+            "total": 3,
+            "counts": {
+                DocumentStatus.PENDING: 1,
+                DocumentStatus.COMPLETED: 1,
+                DocumentStatus.ERROR: 1,
+            },
+            "completed_fingerprint": "fingerprint",
+        }
+        (
+            pact.upon_receiving("Get the document summary")
+            .given("DMS has multiple documents")
+            .with_request("GET", "/documents/summary")
+            .will_respond_with(200)
+            .with_body(response)
+        )
+
+        with pact.serve() as srv:
+            dms_client = DocumentManagementClient(srv.url)
+            summary = dms_client.get_summary()
+            assert summary.total == 3
+            assert summary.completed_fingerprint == "fingerprint"
@@ -9,6 +9,8 @@ import uvicorn
 from pact import Verifier
 
 from src.inference_service.main import app
+from src.shared.constants import DocumentStatus
+from src.shared.models import DMSDocument, DocumentSummaryResponse
 
 PACT_BROKER_URL = os.getenv("PACT_BROKER_URL", "http://localhost:9292/")
 
@@ -17,30 +19,40 @@ mock_vector_store_loader = Mock()
 mock_dms_client = Mock()
 
 
+def _summary(pending: int, completed: int) -> DocumentSummaryResponse:
+    return DocumentSummaryResponse(
+        total=pending + completed,
+        counts={
+            DocumentStatus.PENDING: pending,
+            DocumentStatus.COMPLETED: completed,
+            DocumentStatus.ERROR: 0,
+        },
+        completed_fingerprint="fingerprint",
+    )
+
+
 def given_has_documents_loaded(parameters: dict[str, Any] | None = None) -> None:
     mock_vector_store_loader.get_collection_count.return_value = 2
+    mock_dms_client.get_summary.return_value = _summary(pending=1, completed=1)
     mock_documents = [
-        Mock(
-            model_dump=lambda: {
-                "doc_hash": "abc123",
-                "doc_name": "doc1.pdf",
-                "status": "Document processing completed",
-            }
+        DMSDocument(
+            doc_hash="abc123",
+            doc_name="doc1.pdf",
+            status=DocumentStatus.COMPLETED,
         ),
-        Mock(
-            model_dump=lambda: {
-                "doc_hash": "def456",
-                "doc_name": "doc2.pdf",
-                "status": "Document pending processing",
-            }
+        DMSDocument(
+            doc_hash="def456",
+            doc_name="doc2.pdf",
+            status=DocumentStatus.PENDING,
         ),
     ]
-    mock_dms_client.get_documents.return_value = mock_documents
+    mock_dms_client.get_documents_page.return_value = (mock_documents, None)
 
 
 def given_has_no_documents(parameters: dict[str, Any] | None = None) -> None:
     mock_vector_store_loader.get_collection_count.return_value = 0
-    mock_dms_client.get_documents.return_value = []
+    mock_dms_client.get_summary.return_value = _summary(pending=0, completed=0)
+    mock_dms_client.get_documents_page.return_value = ([], None)
 
 
 def given_no_documents_ingested(parameters: dict[str, Any] | None = None) -> None:
@@ -65,7 +77,7 @@ def application():
 
         # Set default return values for the mocks
         mock_vector_store_loader.get_collection_count.return_value = 0
-        mock_dms_client.get_documents.return_value = []
+        mock_dms_client.get_summary.return_value = _summary(pending=0, completed=0)
 
         config = uvicorn.Config(app, host="0.0.0.0", port=8045)
         server = uvicorn.Server(config)
@@ -2,9 +2,9 @@ from typing import Generator
 import pytest
 from pact import Pact
 from src.ingestion_service.document_management_client import DocumentManagementClient
-from src.shared.constants import DocumentStatus
+from src.shared.constants import DocumentStatus, SetDocumentResult
 from src.shared.exceptions import DocumentHashConflictException
-from src.shared.models import DMSDocument
+from src.shared.models import GetDocumentStatusResponse
 
 sample_hash = "d41d8cd98f00b204e9800998ecf8427e"
 sample_doc_name = "Test doc name"
@@ -59,6 +59,30 @@ def test_get_document_status_document_pending(pact, status):
         assert response == status
 
 
+def test_get_document_status_unchanged_returns_304(pact):
+    (
+        pact.upon_receiving("Conditional get status for unchanged document")
+        .given(f'Document {sample_hash} is unchanged since ETag "1"')
+        .with_request("GET", f"/documents/{sample_hash}/status/")
+        .with_header("If-None-Match", '"1"')
+        .will_respond_with(304)
+        .with_header("ETag", '"1"')
+    )
+
+    with pact.serve() as srv:
+        dms_client = DocumentManagementClient(srv.url)
+        # As left by an earlier lookup that returned ETag "1".
+        dms_client._status_cache[sample_hash] = (
+            '"1"',
+            GetDocumentStatusResponse(
+                doc_name=sample_doc_name, status=DocumentStatus.COMPLETED
+            ),
+        )
+
+        response = dms_client.get_document_status(sample_hash)
+        assert response == DocumentStatus.COMPLETED
+
+
 @pytest.mark.parametrize(
     "status",
     [DocumentStatus.PENDING, DocumentStatus.COMPLETED, DocumentStatus.ERROR],
@@ -145,49 +169,104 @@ def test_update_document_status_mismatching_doc_name_returns_409(pact):
             )
 
 
-def test_get_ingested_documents_returns_list(pact):
-    response = [
-        {
-            "doc_hash": "Doc Hash 1",
-            "doc_name": "Doc Name 1",
-            "status": DocumentStatus.PENDING,
-        },
-        {
-            "doc_hash": "Doc Hash 2",
-            "doc_name": "Doc Name 2",
-            "status": DocumentStatus.COMPLETED,
-        },
-        {
-            "doc_hash": "Doc Hash 3",
-            "doc_name": "Doc Name 3",
-            "status": DocumentStatus.ERROR,
+def test_get_summary_returns_counts_per_status(pact):
+    response = {
+        "total": 3,
+        "counts": {
+            DocumentStatus.PENDING: 1,
+            DocumentStatus.COMPLETED: 1,
+            DocumentStatus.ERROR: 1,
         },
-    ]
+        "completed_fingerprint": "fingerprint",
+    }
     (
         pact.upon_receiving(
-            "Request to get processed documents and DMS has multiple documents"
+            "Request to get the document summary and DMS has multiple documents"
         )
         .given("DMS has multiple documents")
-        .with_request("GET", "/documents/")
+        .with_request("GET", "/documents/summary")
         .will_respond_with(200)
         .with_body(response)
     )
     with pact.serve() as srv:
         dms_client = DocumentManagementClient(srv.url)
 
-        assert dms_client.get_documents() == [DMSDocument(**item) for item in response]
+        summary = dms_client.get_summary()
+        assert summary.total == 3
+        assert summary.counts[DocumentStatus.ERROR] == 1
 
 
-def test_get_ingested_documents_returns_empty(pact):
+def test_get_documents_batch_returns_known_documents(pact):
+    request = {"doc_hashes": [sample_hash, "unknown-hash"]}
+    response = {
+        "documents": [
+            {
+                "doc_hash": sample_hash,
+                "doc_name": sample_doc_name,
+                "status": DocumentStatus.COMPLETED,
+            }
+        ]
+    }
     (
-        pact.upon_receiving(
-            "Request to get processed documents and DMS has no documents"
+        pact.upon_receiving("Batch request for the status of two documents")
+        .given(f"Document {sample_hash} is the only one in the db")
+        .with_request("POST", "/documents/status:batchGet")
+        .with_body(request)
+        .will_respond_with(200)
+        .with_body(response)
+    )
+    with pact.serve() as srv:
+        dms_client = DocumentManagementClient(srv.url)
+
+        documents = dms_client.get_documents_batch([sample_hash, "unknown-hash"])
+
+        assert list(documents) == [sample_hash]
+        assert documents[sample_hash].status == DocumentStatus.COMPLETED
+
+
+def test_update_document_statuses_returns_result_per_document(pact):
+    request = {
+        "documents": [
+            {
+                "doc_hash": sample_hash,
+                "doc_name": "doc_name_mismatch",
+                "status": DocumentStatus.PENDING,
+            },
+            {
+                "doc_hash": "new-hash",
+                "doc_name": "New doc",
+                "status": DocumentStatus.PENDING,
+            },
+        ]
+    }
+    response = {
+        "results": [
+            {"doc_hash": sample_hash, "result": SetDocumentResult.CONFLICT},
+            {"doc_hash": "new-hash", "result": SetDocumentResult.CREATED},
+        ]
+    }
+    (
+        pact.upon_receiving("Batch request to set the status of two documents")
+        .given(
+            f"Document {sample_hash} exists in the db with doc_name {sample_doc_name}"
+            " and new-hash does not"
         )
-        .given("DMS has no documents")
-        .with_request("GET", "/documents/")
-        .will_respond_with(204)
+        .with_request("PUT", "/documents/status:batch")
+        .with_body(request)
+        .will_respond_with(200)
+        .with_body(response)
     )
     with pact.serve() as srv:
         dms_client = DocumentManagementClient(srv.url)
 
-        assert dms_client.get_documents() == []
+        results = dms_client.update_document_statuses(
+            [
+                (sample_hash, "doc_name_mismatch", DocumentStatus.PENDING),
+                ("new-hash", "New doc", DocumentStatus.PENDING),
+            ]
+        )
+
+        assert results == {
+            sample_hash: SetDocumentResult.CONFLICT,
+            "new-hash": SetDocumentResult.CREATED,
+        }
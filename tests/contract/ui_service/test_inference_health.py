@@ -21,18 +21,15 @@ class TestInferenceHealth:
         response_body = {
             "status": "ok",
             "documents_loaded_in_vector_store": "2",
-            "documents_loaded_in_dms": [
-                {
-                    "doc_hash": "abc123",
-                    "doc_name": "doc1.pdf",
-                    "status": "Document processing completed",
-                },
-                {
-                    "doc_hash": "def456",
-                    "doc_name": "doc2.pdf",
-                    "status": "Document pending processing",
+            "documents_in_dms": {
+                "total": 2,
+                "counts": {
+                    "Document pending processing": 1,
+                    "Document processing completed": 1,
+                    "Error in document processing": 0,
+                    "Document superseded by a newer version": 0,
                 },
-            ],
+            },
         }
         (
             pact.upon_receiving(
@@ -50,15 +47,22 @@ class TestInferenceHealth:
 
         assert result.is_healthy is True
         assert result.vector_store_count == 2
-        assert len(result.documents) == 2
-        assert result.documents[0].doc_name == "doc1.pdf"
-        assert result.documents[1].doc_name == "doc2.pdf"
+        assert result.document_total == 2
+        assert result.document_counts["Document processing completed"] == 1
 
     def test_health_no_documents(self, pact):
         response_body = {
             "status": "ok",
             "documents_loaded_in_vector_store": "0",
-            "documents_loaded_in_dms": [],
+            "documents_in_dms": {
+                "total": 0,
+                "counts": {
+                    "Document pending processing": 0,
+                    "Document processing completed": 0,
+                    "Error in document processing": 0,
+                    "Document superseded by a newer version": 0,
+                },
+            },
         }
         (
             pact.upon_receiving("Get health when inference service has no documents")
@@ -74,7 +78,42 @@ class TestInferenceHealth:
 
         assert result.is_healthy is True
         assert result.vector_store_count == 0
-        assert result.documents == []
+        assert result.document_total == 0
+
+    def test_documents_first_page(self, pact):
+        response_body = {
+            "documents": [
+                {
+                    "doc_hash": "abc123",
+                    "doc_name": "doc1.pdf",
+                    "status": "Document processing completed",
+                },
+                {
+                    "doc_hash": "def456",
+                    "doc_name": "doc2.pdf",
+                    "status": "Document pending processing",
+                },
+            ],
+            "next_after": None,
+        }
+        (
+            pact.upon_receiving("Get the first page of documents")
+            .given("Inference service has documents loaded")
+            .with_request("GET", "/documents")
+            .with_query_parameter("limit", "50")
+            .will_respond_with(200)
+            .with_body(response_body)
+        )
+
+        with pact.serve() as srv:
+            client = InferenceServiceClient(srv.url)
+            page = client.get_documents(limit=50)
+
+        assert [document.doc_name for document in page.documents] == [
+            "doc1.pdf",
+            "doc2.pdf",
+        ]
+        assert page.next_after is None
 
 
 class TestInferenceChatNoDocuments:
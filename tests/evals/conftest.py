@@ -3,8 +3,8 @@ import os
 import chromadb
 import pytest
 from langchain_community.vectorstores import Chroma
-from langchain_huggingface import HuggingFaceEmbeddings
 
+from src.ingestion_service.embedding_cache import get_embedding_cache
 from src.ingestion_service.vector_store_builder import get_vector_store_builder
 from src.shared.env_loader import load_environment
 
@@ -19,22 +19,40 @@ EMBEDDING_MODEL = os.getenv(
 def eval_test_vectordb():
     """
     Build an in-memory Chroma database once per test session so eval tests run
-    against fresh embeddings and leave no artifacts behind.
+    against a fresh collection. Chunk embeddings are read from and written to
+    the on-disk embedding cache in EMBEDDING_CACHE_DIR, which outlives the
+    session so repeated runs only encode chunks that changed; set it empty to
+    leave no artifacts behind.
     """
     if not EVAL_PDF_PATH:
         pytest.skip("Evals skipped: set EVAL_PDF_PATH to run these tests.")
 
     chroma_client = chromadb.EphemeralClient()
+    embedding_cache = get_embedding_cache()
 
-    vector_store_builder = get_vector_store_builder(chroma_client)
-    texts = vector_store_builder.load_pdf_text(str(EVAL_PDF_PATH))
+    vector_store_builder = get_vector_store_builder(
+        chroma_client, embedding_cache=embedding_cache
+    )
+    texts = vector_store_builder.iter_pdf_pages(str(EVAL_PDF_PATH))
     docs = vector_store_builder.split_text_to_docs(texts)
 
-    embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
-    vectordb = Chroma.from_documents(
-        docs,
-        embeddings,
+    embeddings = vector_store_builder.get_embeddings(EMBEDDING_MODEL)
+    vectors = vector_store_builder.embed_documents(
+        [doc.page_content for doc in docs], EMBEDDING_MODEL
+    )
+    chroma_client.create_collection(
+        "eval_test_collection", embedding_function=None
+    ).add(
+        ids=[str(index) for index in range(len(docs))],
+        embeddings=vectors,
+        documents=[doc.page_content for doc in docs],
+        metadatas=[doc.metadata or None for doc in docs],
+    )
+    vectordb = Chroma(
+        embedding_function=embeddings,
         client=chroma_client,
         collection_name="eval_test_collection",
     )
     yield vectordb
+    if embedding_cache is not None:
+        embedding_cache.close()
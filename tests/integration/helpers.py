@@ -1,4 +1,6 @@
+import hashlib
 import os
+import time
 from urllib.parse import urlparse
 from langchain_core.documents import Document
 from langchain_huggingface import HuggingFaceEmbeddings
@@ -45,6 +47,24 @@ def seed_chromadb_documents(
     )
 
 
+def content_hash(path: str) -> str:
+    """SHA-256 of a file's contents, the ingestion service's document hash."""
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def wait_for_ingestion_job(client, response, timeout: float = 120) -> dict:
+    """Poll the job returned by POST /ingestion/documents/ until it finishes."""
+    assert response.status_code == 202
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(response.headers["Location"]).json()
+        if job["status"] in ("completed", "failed", "cancelled"):
+            return job
+        assert time.monotonic() < deadline, f"Ingestion job still {job['status']}"
+        time.sleep(0.1)
+
+
 def extract_doc_name(document: str) -> str:
     parsed = urlparse(document)
     path = parsed.path if parsed.scheme else document
@@ -60,3 +80,21 @@ def debug_requests_mock_calls(mock_dms: RequestsMock) -> None:
         print(f"  URL: {call.request.url}")
         print(f"  Body: {call.request.body}")
         print(f"  Response Status: {call.response.status_code}")
+
+
+def dms_summary(documents: list[dict]) -> dict:
+    """DMS GET /documents/summary body for the given documents."""
+    counts = {}
+    for document in documents:
+        counts[document["status"]] = counts.get(document["status"], 0) + 1
+    return {
+        "total": len(documents),
+        "counts": counts,
+        "completed_fingerprint": "fingerprint",
+    }
+
+
+def health_documents_in_dms(documents: list[dict]) -> dict:
+    """Ingestion /health documents_in_dms value for the given DMS documents."""
+    summary = dms_summary(documents)
+    return {"total": summary["total"], "counts": summary["counts"]}
@@ -1,4 +1,3 @@
-import hashlib
 import os
 import chromadb
 import responses
@@ -12,17 +11,21 @@ from fastapi.testclient import TestClient
 from src.ingestion_service.main import IngestionRequest, SingleIngestionRequest
 from src.shared.constants import DocumentStatus
 from tests.integration.helpers import (
+    content_hash,
+    dms_summary,
     extract_doc_name,
+    health_documents_in_dms,
     seed_chromadb_documents,
+    wait_for_ingestion_job,
 )
 
 document_path = "tests/data/pdf-test.pdf"
-doc_hash = hashlib.md5(document_path.encode()).hexdigest()
+doc_hash = content_hash(document_path)
 doc_name = extract_doc_name(document_path)
 document_request = SingleIngestionRequest(document=document_path)
 
 document_path_2 = "tests/data/pdf-test-2.pdf"
-doc_hash_2 = hashlib.md5(document_path_2.encode()).hexdigest()
+doc_hash_2 = content_hash(document_path_2)
 doc_name_2 = extract_doc_name(document_path_2)
 document_request_2 = SingleIngestionRequest(document=document_path_2)
 
@@ -50,7 +53,9 @@ def make_status_callback(pending_response, terminal_status):
     return callback
 
 
-doc_hash_non_existing = hashlib.md5(document_path_non_existing.encode()).hexdigest()
+# A missing file has no contents to hash and is never registered in DMS; this
+# hash only labels the ERROR record the mocked DMS listing reports.
+doc_hash_non_existing = "0" * 64
 doc_name_non_existing = extract_doc_name(document_path_non_existing)
 document_request_non_existing = SingleIngestionRequest(
     document=document_path_non_existing
@@ -198,8 +203,8 @@ class TestIngestionService:
         #
         mock_dms.add(
             responses.GET,
-            "http://localhost:8004/documents/",
-            json=[],  # No documents
+            "http://localhost:8004/documents/summary",
+            json=dms_summary([]),  # No documents
             status=200,
         )
 
@@ -215,7 +220,7 @@ class TestIngestionService:
         data = response.json()
         assert data["status"] == "ok"
         assert data["documents_loaded_in_vector_store"] == "0"
-        assert data["documents_loaded_in_dms"] == []
+        assert data["documents_in_dms"] == health_documents_in_dms([])
 
     def test_health_check_with_documents(
         self, client, mock_dms, chromadb_client, integration_env
@@ -239,8 +244,8 @@ class TestIngestionService:
         ]
         mock_dms.add(
             responses.GET,
-            "http://localhost:8004/documents/",
-            json=dms_documents,
+            "http://localhost:8004/documents/summary",
+            json=dms_summary(dms_documents),
             status=200,
         )
 
@@ -256,7 +261,7 @@ class TestIngestionService:
         data = response.json()
         assert data["status"] == "ok"
         assert data["documents_loaded_in_vector_store"] == "1"
-        assert data["documents_loaded_in_dms"] == dms_documents
+        assert data["documents_in_dms"] == health_documents_in_dms(dms_documents)
 
     def test_ingestion_1_document(self, client, mock_dms, integration_env):
         #
@@ -293,8 +298,8 @@ class TestIngestionService:
         # After document has been added, return document - used by health check for assertion
         mock_dms.add(
             responses.GET,
-            "http://localhost:8004/documents/",
-            json=dms_documents_completed,
+            "http://localhost:8004/documents/summary",
+            json=dms_summary(dms_documents_completed),
             status=200,
         )
 
@@ -315,7 +320,9 @@ class TestIngestionService:
         data = response.json()
         assert data["status"] == "ok"
         assert data["documents_loaded_in_vector_store"] == "1"
-        assert data["documents_loaded_in_dms"] == dms_documents_completed
+        assert data["documents_in_dms"] == health_documents_in_dms(
+            dms_documents_completed
+        )
 
     def test_ingestion_2_documents(self, client, mock_dms, integration_env):
         #
@@ -380,8 +387,8 @@ class TestIngestionService:
         # After document has been added, return documents - used by health check for assertion
         mock_dms.add(
             responses.GET,
-            "http://localhost:8004/documents/",
-            json=dms_documents_completed + dms_documents_completed_2,
+            "http://localhost:8004/documents/summary",
+            json=dms_summary(dms_documents_completed + dms_documents_completed_2),
             status=200,
         )
 
@@ -389,22 +396,23 @@ class TestIngestionService:
         # Act - Request multiple document ingestion
         #
         response = client.post(
-            "/ingestion/documents",
+            "/ingestion/documents/",
             json=documents_request.model_dump(),
         )
+        job = wait_for_ingestion_job(client, response)
 
         #
         # Assert
         #
-        assert response.status_code == 200
+        assert job["status"] == "completed"
+        assert job["succeeded"] == 2
         response = client.get("/health")
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "ok"
         assert data["documents_loaded_in_vector_store"] == "2"
-        assert (
-            data["documents_loaded_in_dms"]
-            == dms_documents_completed + dms_documents_completed_2
+        assert data["documents_in_dms"] == health_documents_in_dms(
+            dms_documents_completed + dms_documents_completed_2
         )
 
     def test_ingestion_2_documents_1_error(self, client, mock_dms, integration_env):
@@ -470,8 +478,10 @@ class TestIngestionService:
         # After document has been added, return documents - used by health check for assertion
         mock_dms.add(
             responses.GET,
-            "http://localhost:8004/documents/",
-            json=dms_documents_completed_2 + dms_documents_error_non_existing,
+            "http://localhost:8004/documents/summary",
+            json=dms_summary(
+                dms_documents_completed_2 + dms_documents_error_non_existing
+            ),
             status=200,
         )
 
@@ -482,21 +492,23 @@ class TestIngestionService:
             documents=[document_path_non_existing, document_path_2]
         )
         response = client.post(
-            "/ingestion/documents",
+            "/ingestion/documents/",
             json=documents_request.model_dump(),
         )
+        job = wait_for_ingestion_job(client, response)
 
         #
         # Assert
         #
+        assert job["succeeded"] == 1
+        assert job["failed"] == 1
         response = client.get("/health")
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "ok"
         assert data["documents_loaded_in_vector_store"] == "1"
-        assert (
-            data["documents_loaded_in_dms"]
-            == dms_documents_completed_2 + dms_documents_error_non_existing
+        assert data["documents_in_dms"] == health_documents_in_dms(
+            dms_documents_completed_2 + dms_documents_error_non_existing
         )
 
     def test_ingestion_1_document_DMS_unavailable(
@@ -513,7 +525,7 @@ class TestIngestionService:
 
         mock_dms.add(
             responses.GET,
-            "http://localhost:8004/documents/",
+            "http://localhost:8004/documents/summary",
             status=503,
         )
 
@@ -534,11 +546,11 @@ class TestIngestionService:
         data = response.json()
         assert data["status"] == "ok"
         assert data["documents_loaded_in_vector_store"] == "0"
-        assert data["documents_loaded_in_dms"] == []
+        assert data["documents_in_dms"] is None
 
     def test_ingestion_s3_document(self, client, mock_dms, integration_env, s3_client):
         s3_document_path = "s3://sample-bucket/pdf-test.pdf"
-        s3_doc_hash = hashlib.md5(s3_document_path.encode()).hexdigest()
+        s3_doc_hash = content_hash("tests/data/pdf-test.pdf")  # the uploaded file
         s3_doc_name = extract_doc_name(s3_document_path)
         s3_document_request = SingleIngestionRequest(document=s3_document_path)
         #
@@ -575,8 +587,8 @@ class TestIngestionService:
         # After document has been added, return document - used by health check for assertion
         mock_dms.add(
             responses.GET,
-            "http://localhost:8004/documents/",
-            json=s3_dms_documents_completed,
+            "http://localhost:8004/documents/summary",
+            json=dms_summary(s3_dms_documents_completed),
             status=200,
         )
 
@@ -596,7 +608,9 @@ class TestIngestionService:
         data = response.json()
         assert data["status"] == "ok"
         assert data["documents_loaded_in_vector_store"] == "1"
-        assert data["documents_loaded_in_dms"] == s3_dms_documents_completed
+        assert data["documents_in_dms"] == health_documents_in_dms(
+            s3_dms_documents_completed
+        )
 
     def test_ingestion_1_document_vector_store_unavailable(
         self,
@@ -638,8 +652,8 @@ class TestIngestionService:
 
         mock_dms.add(
             responses.GET,
-            "http://localhost:8004/documents/",
-            json=dms_documents_error,
+            "http://localhost:8004/documents/summary",
+            json=dms_summary(dms_documents_error),
             status=200,
         )
 
@@ -663,7 +677,9 @@ class TestIngestionService:
             data = response.json()
             assert data["status"] == "ok"
             assert data["documents_loaded_in_vector_store"] == "0"
-            assert data["documents_loaded_in_dms"] == dms_documents_error
+            assert data["documents_in_dms"] == health_documents_in_dms(
+                dms_documents_error
+            )
         finally:
             # Restart container for subsequent tests
             chroma_container.start()
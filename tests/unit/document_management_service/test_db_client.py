@@ -1,7 +1,17 @@
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from unittest.mock import patch
+
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import sessionmaker
-from src.document_management_service.db_client import DBClient
+from src.document_management_service.db_client import (
+    DBClient,
+    completed_documents_fingerprint,
+    upsert_documents_statement,
+)
 from src.document_management_service.models import Base, DBDMSDocument
 from src.shared.constants import DocumentStatus, SetDocumentResult
 from src.shared.exceptions import DocumentHashConflictException
@@ -22,6 +32,8 @@ class TestDBClient:
         Session = sessionmaker(bind=engine)
         session = Session()
         yield DBClient(session)
+        session.close()
+        engine.dispose()
 
     def test_get_document_name_success(self, db_client):
         # Seed db with DMSDocument
@@ -66,7 +78,8 @@ class TestDBClient:
         db_client.session.add(DBDMSDocument(**document_1.model_dump()))
         db_client.session.add(DBDMSDocument(**document_2.model_dump()))
         result = db_client.get_documents()
-        assert result == [document_1, document_2]
+        # Ordered by hash, for keyset pagination.
+        assert result == [document_2, document_1]
 
     def test_get_documents_no_documents(self, db_client):
         # No document in the db
@@ -115,3 +128,304 @@ class TestDBClient:
             document, result = db_client.set_document_status(
                 sample_hash, "test_name_2", DocumentStatus.COMPLETED
             )
+
+    def test_get_documents_by_hash_returns_known_documents(self, db_client):
+        db_client.session.add_all(
+            [
+                DBDMSDocument(
+                    doc_hash="hash-1", doc_name="a.pdf", status=sample_status
+                ),
+                DBDMSDocument(
+                    doc_hash="hash-2", doc_name="b.pdf", status=sample_status
+                ),
+            ]
+        )
+
+        documents = db_client.get_documents_by_hash(["hash-1", "unknown", "hash-1"])
+
+        assert documents == [
+            DMSDocument(doc_hash="hash-1", doc_name="a.pdf", status=sample_status)
+        ]
+
+    def test_set_document_statuses_creates_updates_and_reports_conflicts(
+        self, db_client
+    ):
+        db_client.session.add_all(
+            [
+                DBDMSDocument(
+                    doc_hash="hash-1", doc_name="a.pdf", status=sample_status
+                ),
+                DBDMSDocument(
+                    doc_hash="hash-2", doc_name="b.pdf", status=sample_status
+                ),
+            ]
+        )
+        db_client.session.commit()
+
+        results = db_client.set_document_statuses(
+            [
+                DMSDocument(
+                    doc_hash="hash-1",
+                    doc_name="a.pdf",
+                    status=DocumentStatus.COMPLETED,
+                ),
+                DMSDocument(
+                    doc_hash="hash-2",
+                    doc_name="other.pdf",
+                    status=DocumentStatus.COMPLETED,
+                ),
+                DMSDocument(
+                    doc_hash="hash-3", doc_name="c.pdf", status=DocumentStatus.PENDING
+                ),
+                DMSDocument(
+                    doc_hash="hash-3", doc_name="c.pdf", status=DocumentStatus.ERROR
+                ),
+            ]
+        )
+
+        assert results == [
+            SetDocumentResult.UPDATED,
+            SetDocumentResult.CONFLICT,
+            SetDocumentResult.CREATED,
+            SetDocumentResult.UPDATED,
+        ]
+        statuses = {
+            document.doc_hash: (document.doc_name, document.status)
+            for document in db_client.get_documents()
+        }
+        assert statuses == {
+            "hash-1": ("a.pdf", DocumentStatus.COMPLETED),
+            "hash-2": ("b.pdf", DocumentStatus.PENDING),
+            "hash-3": ("c.pdf", DocumentStatus.ERROR),
+        }
+
+    def test_get_documents_filters_by_status_and_pages_by_hash(self, db_client):
+        db_client.session.add_all(
+            [
+                DBDMSDocument(
+                    doc_hash=f"hash-{i}",
+                    doc_name=f"{i}.pdf",
+                    status=DocumentStatus.COMPLETED if i % 2 else sample_status,
+                )
+                for i in range(5)
+            ]
+        )
+
+        first = db_client.get_documents(limit=2)
+        second = db_client.get_documents(after=first[-1].doc_hash, limit=2)
+        completed = db_client.get_documents(status=DocumentStatus.COMPLETED)
+
+        assert [d.doc_hash for d in first] == ["hash-0", "hash-1"]
+        assert [d.doc_hash for d in second] == ["hash-2", "hash-3"]
+        assert [d.doc_hash for d in completed] == ["hash-1", "hash-3"]
+        assert db_client.get_documents(after="hash-4") is None
+
+    def test_get_document_rows_returns_only_requested_fields(self, db_client):
+        db_client.session.add(
+            DBDMSDocument(doc_hash="hash-1", doc_name="a.pdf", status=sample_status)
+        )
+
+        rows = db_client.get_document_rows(["doc_name"])
+
+        assert rows == [{"doc_name": "a.pdf"}]
+
+    def test_get_document_summary_counts_statuses(self, db_client):
+        db_client.session.add_all(
+            [
+                DBDMSDocument(doc_hash="a", doc_name="a.pdf", status=sample_status),
+                DBDMSDocument(
+                    doc_hash="b",
+                    doc_name="b.pdf",
+                    status=DocumentStatus.COMPLETED,
+                    version=3,
+                    updated_at=datetime(2026, 1, 2),
+                ),
+                DBDMSDocument(
+                    doc_hash="c",
+                    doc_name="c.pdf",
+                    status=DocumentStatus.COMPLETED,
+                    version=1,
+                    updated_at=datetime(2026, 1, 1),
+                ),
+                DBDMSDocument(
+                    doc_hash="d", doc_name="c.pdf", status=DocumentStatus.SUPERSEDED
+                ),
+            ]
+        )
+
+        counts, fingerprint = db_client.get_document_summary()
+
+        assert counts == {
+            DocumentStatus.PENDING: 1,
+            DocumentStatus.COMPLETED: 2,
+            DocumentStatus.SUPERSEDED: 1,
+        }
+        assert fingerprint == completed_documents_fingerprint(
+            2, datetime(2026, 1, 2), 4
+        )
+
+    def test_completed_fingerprint_changes_when_a_document_completes(self, db_client):
+        db_client.session.add_all(
+            [
+                DBDMSDocument(
+                    doc_hash="a", doc_name="a.pdf", status=DocumentStatus.COMPLETED
+                ),
+                DBDMSDocument(doc_hash="b", doc_name="b.pdf", status=sample_status),
+            ]
+        )
+        _, before = db_client.get_document_summary()
+
+        db_client.set_document_status("b", "b.pdf", DocumentStatus.COMPLETED)
+        _, after = db_client.get_document_summary()
+
+        assert before != after
+
+    def test_completed_fingerprint_changes_when_one_document_replaces_another(
+        self, db_client
+    ):
+        db_client.set_document_status("a", "a.pdf", DocumentStatus.COMPLETED)
+        db_client.set_document_status("b", "a.pdf", DocumentStatus.PENDING)
+        _, before = db_client.get_document_summary()
+
+        db_client.set_document_status("b", "a.pdf", DocumentStatus.COMPLETED)
+        db_client.set_document_status("a", "a.pdf", DocumentStatus.SUPERSEDED)
+        counts, after = db_client.get_document_summary()
+
+        assert counts[DocumentStatus.COMPLETED] == 1
+        assert before != after
+
+    def test_get_document_returns_name_status_and_version(self, db_client):
+        db_client.set_document_status(sample_hash, sample_doc_name, sample_status)
+
+        document = db_client.get_document(sample_hash)
+
+        assert (document.doc_name, document.status, document.version) == (
+            sample_doc_name,
+            sample_status,
+            1,
+        )
+        assert document.updated_at is not None
+
+    def test_get_document_not_found(self, db_client):
+        assert db_client.get_document(sample_hash) is None
+
+    def test_status_writes_bump_the_version(self, db_client):
+        db_client.set_document_status(sample_hash, sample_doc_name, sample_status)
+        db_client.set_document_status(
+            sample_hash, sample_doc_name, DocumentStatus.COMPLETED
+        )
+        db_client.set_document_statuses(
+            [
+                DMSDocument(
+                    doc_hash=sample_hash,
+                    doc_name=sample_doc_name,
+                    status=DocumentStatus.ERROR,
+                )
+            ]
+        )
+
+        document = db_client.get_document(sample_hash)
+
+        assert (document.status, document.version) == (DocumentStatus.ERROR, 3)
+
+    def test_set_document_statuses_repeat_under_another_name_conflicts(self, db_client):
+        results = db_client.set_document_statuses(
+            [
+                DMSDocument(doc_hash="hash-1", doc_name="a.pdf", status=sample_status),
+                DMSDocument(
+                    doc_hash="hash-1", doc_name="b.pdf", status=DocumentStatus.ERROR
+                ),
+            ]
+        )
+
+        assert results == [SetDocumentResult.CREATED, SetDocumentResult.CONFLICT]
+        document = db_client.get_document("hash-1")
+        assert (document.doc_name, document.status) == ("a.pdf", sample_status)
+
+    def test_set_document_status_without_upsert_support_looks_up_first(self, db_client):
+        with patch.object(DBClient, "_dialect_name", return_value="mysql"):
+            _, created = db_client.set_document_status(
+                sample_hash, sample_doc_name, sample_status
+            )
+            _, updated = db_client.set_document_status(
+                sample_hash, sample_doc_name, DocumentStatus.COMPLETED
+            )
+            with pytest.raises(DocumentHashConflictException):
+                db_client.set_document_status(sample_hash, "other.pdf", sample_status)
+
+        assert (created, updated) == (
+            SetDocumentResult.CREATED,
+            SetDocumentResult.UPDATED,
+        )
+        assert db_client.get_document(sample_hash).version == 2
+
+    def test_upsert_statement_for_postgresql(self):
+        statement = upsert_documents_statement(
+            "postgresql",
+            [
+                DMSDocument(
+                    doc_hash=sample_hash, doc_name=sample_doc_name, status=sample_status
+                )
+            ],
+        )
+
+        sql = " ".join(str(statement.compile(dialect=postgresql.dialect())).split())
+
+        assert "ON CONFLICT (doc_hash) DO UPDATE SET status = excluded.status" in sql
+        assert "WHERE documents.doc_name = excluded.doc_name" in sql
+        assert sql.endswith("RETURNING documents.doc_hash, documents.version")
+
+
+class TestDBClientConcurrency:
+    WRITERS = 8
+
+    @pytest.fixture()
+    def session_factory(self, tmp_path):
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'dms.db'}", connect_args={"timeout": 30}
+        )
+        Base.metadata.create_all(engine)
+        yield sessionmaker(bind=engine)
+        engine.dispose()
+
+    def _write_in_parallel(self, session_factory, names):
+        barrier = threading.Barrier(len(names))
+
+        def write(name):
+            session = session_factory()
+            try:
+                barrier.wait()
+                return DBClient(session).set_document_status(
+                    sample_hash, name, DocumentStatus.COMPLETED
+                )[1]
+            except DocumentHashConflictException:
+                return SetDocumentResult.CONFLICT
+            finally:
+                session.close()
+
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            return list(executor.map(write, names))
+
+    def test_parallel_writers_create_once_and_update_the_rest(self, session_factory):
+        results = self._write_in_parallel(
+            session_factory, [sample_doc_name] * self.WRITERS
+        )
+
+        assert results.count(SetDocumentResult.CREATED) == 1
+        assert results.count(SetDocumentResult.UPDATED) == self.WRITERS - 1
+        session = session_factory()
+        assert DBClient(session).get_document(sample_hash).version == self.WRITERS
+        session.close()
+
+    def test_parallel_writers_with_another_name_conflict(self, session_factory):
+        names = ["a.pdf", "b.pdf"] * (self.WRITERS // 2)
+
+        results = self._write_in_parallel(session_factory, names)
+
+        session = session_factory()
+        winner = DBClient(session).get_document(sample_hash).doc_name
+        session.close()
+        assert results.count(SetDocumentResult.CREATED) == 1
+        assert [result == SetDocumentResult.CONFLICT for result in results] == [
+            name != winner for name in names
+        ]
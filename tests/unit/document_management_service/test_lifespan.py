@@ -0,0 +1,123 @@
+import asyncio
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+import httpx
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from src.document_management_service.db_client import DBClient
+from src.document_management_service.lifespan import (
+    async_database_url,
+    engine_options,
+    lifespan,
+    upgrade_schema,
+)
+from src.document_management_service.main import app
+from src.shared.constants import DocumentStatus
+from src.shared.exceptions import ConfigurationException
+
+
+def test_upgrade_schema_adds_new_columns_to_existing_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'dms.db'}")
+    with engine.begin() as connection:
+        # The documents table as created before version and updated_at existed.
+        connection.execute(
+            text(
+                "CREATE TABLE documents (doc_hash VARCHAR PRIMARY KEY, "
+                "doc_name VARCHAR NOT NULL, status VARCHAR(9) NOT NULL)"
+            )
+        )
+        connection.execute(
+            text("INSERT INTO documents VALUES ('hash-1', 'a.pdf', 'COMPLETED')")
+        )
+
+    for _ in range(2):
+        with engine.begin() as connection:
+            upgrade_schema(connection)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("documents")}
+    assert {"version", "updated_at"} <= columns
+    session = sessionmaker(bind=engine)()
+    document = DBClient(session).get_document("hash-1")
+    assert (document.status, document.version, document.updated_at) == (
+        DocumentStatus.COMPLETED,
+        1,
+        None,
+    )
+    DBClient(session).set_document_status("hash-1", "a.pdf", DocumentStatus.SUPERSEDED)
+    assert DBClient(session).get_document("hash-1").status == DocumentStatus.SUPERSEDED
+    session.close()
+    engine.dispose()
+
+
+def test_engine_options_size_the_pool_except_for_in_memory_sqlite():
+    assert "pool_size" in engine_options("postgresql://dms:dms@db:5432/dms")
+    assert "pool_size" in engine_options("sqlite:///data/dms.db")
+    options = engine_options("sqlite:///:memory:")
+    assert "pool_size" not in options
+    assert options["pool_pre_ping"] is True
+
+
+def test_async_database_url_picks_the_async_driver():
+    assert (
+        async_database_url("postgresql://dms:dms@db:5432/dms").drivername
+        == "postgresql+asyncpg"
+    )
+    assert (
+        async_database_url("postgresql+psycopg2://db/dms").drivername
+        == "postgresql+asyncpg"
+    )
+    assert async_database_url("sqlite:///dms.db").drivername == "sqlite+aiosqlite"
+    with pytest.raises(ConfigurationException):
+        async_database_url("mysql://db/dms")
+
+
+@pytest.mark.parametrize("async_engine", [False, True])
+def test_status_round_trip_with_sync_and_async_engines(tmp_path, async_engine):
+    status_url = "/documents/hash-1/status/"
+    with patch(
+        "src.document_management_service.lifespan.DMS_DATABASE_URL",
+        f"sqlite:///{tmp_path / 'dms.db'}",
+    ), patch(
+        "src.document_management_service.lifespan.DMS_ASYNC_ENGINE", async_engine
+    ), TestClient(
+        app
+    ) as client:
+        body = {"doc_name": "a.pdf", "status": DocumentStatus.PENDING}
+        assert client.put(status_url, json=body).status_code == 201
+        assert client.put(status_url, json=body).status_code == 204
+        conflict = {"doc_name": "b.pdf", "status": DocumentStatus.PENDING}
+        assert client.put(status_url, json=conflict).status_code == 409
+        response = client.get(status_url)
+        assert (response.json()["version"], response.json()["status"]) == (
+            2,
+            DocumentStatus.PENDING,
+        )
+        summary = client.get("/documents/summary").json()
+        assert summary["total"] == 1
+
+
+def test_sync_engine_serves_more_requests_than_connections(tmp_path):
+    # More concurrent requests than threadpool workers, over one connection.
+    async def get_statuses():
+        async with lifespan(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://dms"
+            ) as client:
+                responses = await asyncio.gather(
+                    *(client.get(f"/documents/hash-{i}/status/") for i in range(60))
+                )
+        return [response.status_code for response in responses]
+
+    with patch.multiple(
+        "src.document_management_service.lifespan",
+        DMS_DATABASE_URL=f"sqlite:///{tmp_path / 'dms.db'}",
+        DMS_ASYNC_ENGINE=False,
+        DMS_DB_POOL_SIZE=1,
+        DMS_DB_MAX_OVERFLOW=0,
+        DMS_DB_POOL_TIMEOUT=2,
+    ):
+        assert asyncio.run(get_statuses()) == [404] * 60
@@ -1,3 +1,5 @@
+import asyncio
+import json
 from unittest.mock import Mock
 from fastapi import HTTPException
 from pydantic import ValidationError
@@ -6,12 +8,21 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from src.document_management_service.db_client import DBClient
 from src.document_management_service.main import (
+    batch_get_document_status,
+    batch_put_document_status,
     get_document_status,
     get_documents,
+    get_documents_summary,
     put_document_status,
 )
-from src.shared.constants import DocumentStatus
+from src.shared.constants import DocumentStatus, SetDocumentResult
 from src.shared.exceptions import DocumentHashConflictException
+from src.shared.models import (
+    BatchGetDocumentStatusRequest,
+    BatchSetDocumentStatusRequest,
+    DMSDocument,
+    GetDocumentStatusResponse,
+)
 
 sample_hash = "d41d8cd98f00b204e9800998ecf8427e"
 sample_doc_name = "Test doc name"
@@ -23,31 +34,65 @@ class TestMain:
     def db_client(self):
         return Mock(spec=DBClient)
 
-    def test_get_document_status_db_error_get_document_name(self, db_client):
-        db_client.get_document_name.side_effect = SQLAlchemyError()
+    def test_get_document_status_db_error_get_document(self, db_client):
+        db_client.get_document.side_effect = SQLAlchemyError()
         with pytest.raises(HTTPException) as exc_info:
-            get_document_status(sample_hash, db_client)
+            asyncio.run(get_document_status(sample_hash, db_client))
         assert exc_info.value.status_code == 503
 
-    def test_get_document_status_db_error_get_document_status(self, db_client):
-        db_client.get_document_name.return_value = sample_doc_name
-        db_client.get_document_status.side_effect = SQLAlchemyError()
+    def test_get_document_status_not_found(self, db_client):
+        db_client.get_document.return_value = None
         with pytest.raises(HTTPException) as exc_info:
-            get_document_status(sample_hash, db_client)
-        assert exc_info.value.status_code == 503
+            asyncio.run(get_document_status(sample_hash, db_client))
+        assert exc_info.value.status_code == 404
+
+    def test_get_document_status_returns_etag(self, db_client):
+        db_client.get_document.return_value = GetDocumentStatusResponse(
+            doc_name=sample_doc_name, status=sample_status, version=3
+        )
+
+        response = asyncio.run(get_document_status(sample_hash, db_client))
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] == '"3"'
+        assert json.loads(response.body)["status"] == sample_status
+        db_client.get_document.assert_called_once_with(sample_hash)
+
+    @pytest.mark.parametrize("if_none_match", ['"3"', 'W/"3"', '"2", "3"', "*"])
+    def test_get_document_status_not_modified(self, db_client, if_none_match):
+        db_client.get_document.return_value = GetDocumentStatusResponse(
+            doc_name=sample_doc_name, status=sample_status, version=3
+        )
+
+        response = asyncio.run(
+            get_document_status(sample_hash, db_client, if_none_match)
+        )
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["ETag"] == '"3"'
+
+    def test_get_document_status_stale_etag_returns_document(self, db_client):
+        db_client.get_document.return_value = GetDocumentStatusResponse(
+            doc_name=sample_doc_name, status=sample_status, version=3
+        )
+
+        response = asyncio.run(get_document_status(sample_hash, db_client, '"2"'))
+
+        assert response.status_code == 200
 
     def test_put_document_status_conflict_error_set_document_status(self, db_client):
         db_client.set_document_status.side_effect = DocumentHashConflictException()
         mock_request = Mock()
         with pytest.raises(HTTPException) as exc_info:
-            put_document_status(sample_hash, mock_request, db_client)
+            asyncio.run(put_document_status(sample_hash, mock_request, db_client))
         assert exc_info.value.status_code == 409
 
     def test_put_document_status_db_error_set_document_status(self, db_client):
         db_client.set_document_status.side_effect = SQLAlchemyError()
         mock_request = Mock()
         with pytest.raises(HTTPException) as exc_info:
-            put_document_status(sample_hash, mock_request, db_client)
+            asyncio.run(put_document_status(sample_hash, mock_request, db_client))
         assert exc_info.value.status_code == 503
 
     def test_put_document_status_validation_error_set_document_status(self, db_client):
@@ -56,13 +101,13 @@ class TestMain:
         )
         mock_request = Mock()
         with pytest.raises(HTTPException) as exc_info:
-            put_document_status(sample_hash, mock_request, db_client)
+            asyncio.run(put_document_status(sample_hash, mock_request, db_client))
         assert exc_info.value.status_code == 503
 
     def test_get_documents_db_error(self, db_client):
         db_client.get_documents.side_effect = SQLAlchemyError()
         with pytest.raises(HTTPException) as exc_info:
-            get_documents(db_client)
+            asyncio.run(get_documents(db_client))
         assert exc_info.value.status_code == 503
 
     def test_get_documents_validation_error(self, db_client):
@@ -70,5 +115,94 @@ class TestMain:
             title="DMSDocument", line_errors=[]
         )
         with pytest.raises(HTTPException) as exc_info:
-            get_documents(db_client)
+            asyncio.run(get_documents(db_client))
+        assert exc_info.value.status_code == 503
+
+    def test_batch_get_document_status_db_error(self, db_client):
+        db_client.get_documents_by_hash.side_effect = SQLAlchemyError()
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(
+                batch_get_document_status(
+                    BatchGetDocumentStatusRequest(doc_hashes=[sample_hash]), db_client
+                )
+            )
+        assert exc_info.value.status_code == 503
+
+    def test_batch_put_document_status_returns_results_in_request_order(
+        self, db_client
+    ):
+        db_client.set_document_statuses.return_value = [
+            SetDocumentResult.CONFLICT,
+            SetDocumentResult.CREATED,
+        ]
+        request = BatchSetDocumentStatusRequest(
+            documents=[
+                DMSDocument(doc_hash="hash-1", doc_name="a.pdf", status=sample_status),
+                DMSDocument(doc_hash="hash-2", doc_name="b.pdf", status=sample_status),
+            ]
+        )
+
+        response = asyncio.run(batch_put_document_status(request, db_client))
+
+        assert [(r.doc_hash, r.result) for r in response.results] == [
+            ("hash-1", SetDocumentResult.CONFLICT),
+            ("hash-2", SetDocumentResult.CREATED),
+        ]
+
+    def test_batch_put_document_status_db_error(self, db_client):
+        db_client.set_document_statuses.side_effect = SQLAlchemyError()
+        request = BatchSetDocumentStatusRequest(
+            documents=[
+                DMSDocument(
+                    doc_hash=sample_hash, doc_name=sample_doc_name, status=sample_status
+                )
+            ]
+        )
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(batch_put_document_status(request, db_client))
+        assert exc_info.value.status_code == 503
+
+    def test_get_documents_rejects_unknown_fields(self, db_client):
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(get_documents(db_client, fields="doc_name,size"))
+        assert exc_info.value.status_code == 422
+        db_client.get_document_rows.assert_not_called()
+
+    def test_get_documents_full_page_sets_next_cursor(self, db_client):
+        db_client.get_document_rows.return_value = [
+            {"doc_hash": "hash-1", "doc_name": "a.pdf"},
+            {"doc_hash": "hash-2", "doc_name": "b.pdf"},
+        ]
+
+        response = asyncio.run(get_documents(db_client, limit=2, fields="doc_name"))
+
+        assert response.headers["X-Next-After"] == "hash-2"
+        assert json.loads(response.body) == [
+            {"doc_name": "a.pdf"},
+            {"doc_name": "b.pdf"},
+        ]
+        db_client.get_document_rows.assert_called_once_with(
+            ["doc_name", "doc_hash"], None, None, 2
+        )
+
+    def test_get_documents_summary_fills_missing_statuses(self, db_client):
+        db_client.get_document_summary.return_value = (
+            {DocumentStatus.COMPLETED: 3},
+            "fingerprint",
+        )
+
+        summary = asyncio.run(get_documents_summary(db_client))
+
+        assert summary.total == 3
+        assert summary.counts == {
+            DocumentStatus.PENDING: 0,
+            DocumentStatus.COMPLETED: 3,
+            DocumentStatus.ERROR: 0,
+            DocumentStatus.SUPERSEDED: 0,
+        }
+
+    def test_get_documents_summary_db_error(self, db_client):
+        db_client.get_document_summary.side_effect = SQLAlchemyError()
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(get_documents_summary(db_client))
         assert exc_info.value.status_code == 503
@@ -0,0 +1,94 @@
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from src.inference_service.core.answer_cache import SemanticAnswerCache
+
+VECTORS = {
+    "What is RAG?": [1.0, 0.0, 0.0],
+    "what's rag": [0.99, 0.1, 0.0],
+    "What is an LLM?": [0.0, 1.0, 0.0],
+    "Unrelated": [0.0, 0.0, 1.0],
+}
+
+
+@pytest.fixture
+def embeddings():
+    return Mock(embed_query=Mock(side_effect=lambda text: VECTORS[text]))
+
+
+class TestSemanticAnswerCache:
+    def test_similar_question_hits(self, embeddings):
+        cache = SemanticAnswerCache(embeddings, similarity_threshold=0.95)
+        cache.store(cache.embed("What is RAG?"), "RAG answer", latency_seconds=2.0)
+
+        answer, _ = cache.lookup(cache.embed("what's rag"))
+
+        assert answer == "RAG answer"
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["hit_rate"] == 1.0
+        assert stats["saved_latency_seconds"] == 2.0
+
+    def test_dissimilar_question_misses(self, embeddings):
+        cache = SemanticAnswerCache(embeddings, similarity_threshold=0.95)
+        cache.store(cache.embed("What is RAG?"), "RAG answer", latency_seconds=2.0)
+
+        assert cache.lookup(cache.embed("What is an LLM?")) == (None, None)
+        assert cache.get_stats()["misses"] == 1
+
+    def test_empty_cache_misses(self, embeddings):
+        cache = SemanticAnswerCache(embeddings)
+
+        assert cache.lookup(cache.embed("What is RAG?")) == (None, None)
+
+    def test_oldest_entry_is_overwritten_when_full(self, embeddings):
+        cache = SemanticAnswerCache(embeddings, max_entries=2)
+        cache.store(cache.embed("What is RAG?"), "RAG answer", 1.0)
+        cache.store(cache.embed("What is an LLM?"), "LLM answer", 1.0)
+
+        cache.store(cache.embed("Unrelated"), "Other answer", 1.0)
+
+        assert cache.lookup(cache.embed("What is RAG?")) == (None, None)
+        assert cache.lookup(cache.embed("What is an LLM?")) == ("LLM answer", None)
+        assert cache.get_stats()["entries"] == 2
+
+    def test_corpus_change_invalidates_entries(self, embeddings):
+        corpus_version = Mock(side_effect=["v1", "v1", "v2"])
+        cache = SemanticAnswerCache(embeddings, corpus_version_fn=corpus_version)
+        embedding = cache.embed("What is RAG?")
+        _, version = cache.lookup(embedding)
+        cache.store(embedding, "RAG answer", 1.0, version)
+
+        assert cache.lookup(embedding) == ("RAG answer", "v1")
+        assert cache.lookup(embedding) == (None, "v2")
+        assert cache.get_stats()["invalidations"] == 1
+
+    def test_answer_generated_against_old_corpus_is_dropped(self, embeddings):
+        corpus_version = Mock(side_effect=["v1", "v2", "v2"])
+        cache = SemanticAnswerCache(embeddings, corpus_version_fn=corpus_version)
+        embedding = cache.embed("What is RAG?")
+        _, version = cache.lookup(embedding)
+        # Ingestion finishes while the answer is being generated.
+        cache.lookup(cache.embed("What is an LLM?"))
+
+        cache.store(embedding, "Stale RAG answer", 1.0, version)
+
+        assert cache.lookup(embedding) == (None, "v2")
+        assert cache.get_stats()["entries"] == 0
+
+    def test_unknown_corpus_version_clears_cache(self, embeddings):
+        corpus_version = Mock(side_effect=["v1", None])
+        cache = SemanticAnswerCache(embeddings, corpus_version_fn=corpus_version)
+        embedding = cache.embed("What is RAG?")
+        _, version = cache.lookup(embedding)
+        cache.store(embedding, "RAG answer", 1.0, version)
+
+        assert cache.lookup(embedding) == (None, None)
+
+    def test_embed_normalizes(self, embeddings):
+        embeddings.embed_query = Mock(return_value=[3.0, 4.0])
+        cache = SemanticAnswerCache(embeddings)
+
+        assert np.allclose(cache.embed("question"), [0.6, 0.8])
@@ -1,11 +1,16 @@
+import asyncio
+import threading
+import time
 from contextlib import asynccontextmanager, contextmanager
-from unittest.mock import Mock
+from unittest.mock import ANY, AsyncMock, Mock
 
 from fastapi.testclient import TestClient
 
 from src.inference_service import main as api_main
+from src.inference_service.core.llm_limiter import LLMConcurrencyLimiter
+from src.inference_service.readiness import ReadinessMonitor
 from src.shared.constants import DocumentStatus
-from src.shared.models import DMSDocument
+from src.shared.models import DMSDocument, DocumentSummaryResponse
 
 
 @asynccontextmanager
@@ -24,53 +29,43 @@ def _build_client_no_lifespan():
         api_main.app.router.lifespan_context = original_lifespan
 
 
-def test_health_check_one_document():
-    vector_store_loader = Mock()
-    vector_store_loader.get_collection_count.return_value = 1
-    api_main.app.state.vector_store_loader = vector_store_loader
+def _summary(**counts):
+    counts = {status: counts.get(status.name.lower(), 0) for status in DocumentStatus}
+    return DocumentSummaryResponse(
+        total=sum(counts.values()), counts=counts, completed_fingerprint="fp"
+    )
 
-    dms_client = Mock()
-    dms_response = [
-        DMSDocument(
-            doc_hash="Doc Hash 1",
-            doc_name="Doc Name 1",
-            status=DocumentStatus.PENDING,
-        )
-    ]
-    dms_client.get_documents.return_value = dms_response
-    api_main.app.state.dms_client = dms_client
 
-    with _build_client_no_lifespan() as client:
-        response = client.get("/health")
+def _set_readiness(vector_store_loader, dms_client=None, refreshed_at=1000.0):
+    dms_client = dms_client or Mock(get_summary=Mock(return_value=_summary()))
+    clock = Mock(return_value=refreshed_at)
+    readiness = ReadinessMonitor(
+        vector_store_loader.get_collection_count,
+        dms_client.get_summary,
+        refresh_seconds=5,
+        clock=clock,
+    )
+    readiness.refresh()
+    api_main.app.state.readiness = readiness
+    return readiness, clock
 
-        assert response.status_code == 200
-        assert response.json() == {
-            "status": "ok",
-            "documents_loaded_in_vector_store": "1",
-            "documents_loaded_in_dms": [doc.model_dump() for doc in dms_response],
-        }
 
+FRESH_READINESS = {
+    "refreshed_at": "1970-01-01T00:16:40+00:00",
+    "age_seconds": 0.0,
+    "stale": False,
+    "refresh_interval_seconds": 5,
+    "errors": {},
+}
 
-def test_health_check_two_documents():
+
+def test_health_check_reports_dms_counts():
     vector_store_loader = Mock()
     vector_store_loader.get_collection_count.return_value = 2
-    api_main.app.state.vector_store_loader = vector_store_loader
 
     dms_client = Mock()
-    dms_response = [
-        DMSDocument(
-            doc_hash="Doc Hash 1",
-            doc_name="Doc Name 1",
-            status=DocumentStatus.PENDING,
-        ),
-        DMSDocument(
-            doc_hash="Doc Hash 2",
-            doc_name="Doc Name 2",
-            status=DocumentStatus.ERROR,
-        ),
-    ]
-    dms_client.get_documents.return_value = dms_response
-    api_main.app.state.dms_client = dms_client
+    dms_client.get_summary.return_value = _summary(pending=1, error=1)
+    _set_readiness(vector_store_loader, dms_client)
 
     with _build_client_no_lifespan() as client:
         response = client.get("/health")
@@ -79,41 +74,114 @@ def test_health_check_two_documents():
         assert response.json() == {
             "status": "ok",
             "documents_loaded_in_vector_store": "2",
-            "documents_loaded_in_dms": [doc.model_dump() for doc in dms_response],
+            "documents_in_dms": {
+                "total": 2,
+                "counts": {
+                    DocumentStatus.PENDING.value: 1,
+                    DocumentStatus.COMPLETED.value: 0,
+                    DocumentStatus.ERROR.value: 1,
+                    DocumentStatus.SUPERSEDED.value: 0,
+                },
+            },
+            "readiness": FRESH_READINESS,
         }
 
 
 def test_health_check_no_documents():
     vector_store_loader = Mock()
     vector_store_loader.get_collection_count.return_value = 0
-    api_main.app.state.vector_store_loader = vector_store_loader
+    _set_readiness(vector_store_loader)
 
-    dms_client = Mock()
-    dms_response = []
-    dms_client.get_documents.return_value = dms_response
-    api_main.app.state.dms_client = dms_client
+    with _build_client_no_lifespan() as client:
+        response = client.get("/health")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["documents_loaded_in_vector_store"] == "0"
+        assert body["documents_in_dms"]["total"] == 0
+
+
+def test_health_check_reads_snapshot_without_contacting_backends():
+    vector_store_loader = Mock()
+    vector_store_loader.get_collection_count.return_value = 3
+    dms_client = Mock(get_summary=Mock(return_value=_summary()))
+    _set_readiness(vector_store_loader, dms_client)
+
+    with _build_client_no_lifespan() as client:
+        for _ in range(3):
+            assert client.get("/health").status_code == 200
+
+        vector_store_loader.get_collection_count.assert_called_once_with()
+        dms_client.get_summary.assert_called_once_with()
+        dms_client.get_documents.assert_not_called()
+
+
+def test_health_check_reports_stale_readiness():
+    vector_store_loader = Mock()
+    vector_store_loader.get_collection_count.return_value = 3
+    dms_client = Mock(get_summary=Mock(return_value=_summary()))
+    readiness, clock = _set_readiness(vector_store_loader, dms_client)
+    dms_client.get_summary.side_effect = Exception("DMS down")
+    clock.return_value = 1002.0
+    readiness.refresh()
+    clock.return_value = 1013.5
 
     with _build_client_no_lifespan() as client:
         response = client.get("/health")
 
+        assert response.status_code == 200
+        body = response.json()
+        assert body["documents_loaded_in_vector_store"] == "3"
+        assert body["readiness"]["age_seconds"] == 11.5
+        assert body["readiness"]["stale"] is True
+        assert body["readiness"]["errors"] == {"dms": "DMS down"}
+
+
+def test_documents_endpoint_returns_one_page():
+    page = [
+        DMSDocument(
+            doc_hash="Doc Hash 1",
+            doc_name="Doc Name 1",
+            status=DocumentStatus.PENDING,
+        )
+    ]
+    api_main.app.state.dms_client = Mock(
+        get_documents_page=Mock(return_value=(page, "Doc Hash 1"))
+    )
+
+    with _build_client_no_lifespan() as client:
+        response = client.get("/documents", params={"limit": 1, "after": "a"})
+
         assert response.status_code == 200
         assert response.json() == {
-            "status": "ok",
-            "documents_loaded_in_vector_store": "0",
-            "documents_loaded_in_dms": [],
+            "documents": [doc.model_dump() for doc in page],
+            "next_after": "Doc Hash 1",
         }
+        api_main.app.state.dms_client.get_documents_page.assert_called_once_with(
+            1, "a", None
+        )
+
+
+def test_documents_endpoint_dms_unavailable():
+    api_main.app.state.dms_client = Mock(
+        get_documents_page=Mock(side_effect=Exception("DMS down"))
+    )
+
+    with _build_client_no_lifespan() as client:
+        assert client.get("/documents").status_code == 503
 
 
 def test_domain_expert_chat_endpoint():
     session_manager = Mock()
     session = Mock()
     session.session_id = "session-1"
-    session.domain_expert_core.ask_question.return_value = "answer"
+    session.aask_question = AsyncMock(return_value="answer")
     session_manager.get_domain_expert_session.return_value = (session, None)
     api_main.app.state.session_manager = session_manager
+    api_main.app.state.llm_limiter = LLMConcurrencyLimiter()
     vector_store_loader = Mock()
     vector_store_loader.get_collection_count.return_value = 5
-    api_main.app.state.vector_store_loader = vector_store_loader
+    _set_readiness(vector_store_loader)
 
     with _build_client_no_lifespan() as client:
         response = client.post(
@@ -124,15 +192,167 @@ def test_domain_expert_chat_endpoint():
         assert response.status_code == 200
         assert response.json() == {"answer": "answer", "session_id": "session-1"}
         session_manager.get_domain_expert_session.assert_called_once_with("existing")
-        session.domain_expert_core.ask_question.assert_called_once_with("What is RAG?")
+        session.aask_question.assert_awaited_once_with("What is RAG?")
 
 
 def test_domain_expert_request_validation_error():
     vector_store_loader = Mock()
     vector_store_loader.get_collection_count.return_value = 5
-    api_main.app.state.vector_store_loader = vector_store_loader
+    _set_readiness(vector_store_loader)
 
     with _build_client_no_lifespan() as client:
         response = client.post("/chat/domain-expert/", json={"question": ""})
 
         assert response.status_code == 422
+
+
+def test_domain_expert_stream_endpoint():
+    session_manager = Mock()
+    session = Mock()
+    session.session_id = "session-1"
+    session.stream_question.return_value = iter(["Hello", " world"])
+    session_manager.get_domain_expert_session.return_value = (
+        session,
+        "Session id not found",
+    )
+    api_main.app.state.session_manager = session_manager
+    api_main.app.state.llm_limiter = LLMConcurrencyLimiter()
+    vector_store_loader = Mock()
+    vector_store_loader.get_collection_count.return_value = 5
+    _set_readiness(vector_store_loader)
+
+    with _build_client_no_lifespan() as client:
+        response = client.post(
+            "/chat/domain-expert/stream/",
+            json={"question": "What is RAG?", "session_id": "stale"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text == (
+            "event: session\n"
+            'data: {"session_id": "session-1", "system_message": "Session id not found"}\n\n'
+            "event: token\n"
+            'data: {"text": "Hello"}\n\n'
+            "event: token\n"
+            'data: {"text": " world"}\n\n'
+            "event: done\n"
+            'data: {"answer": "Hello world"}\n\n'
+        )
+        session.stream_question.assert_called_once_with(
+            "What is RAG?", cancellation=ANY
+        )
+
+
+def test_domain_expert_stream_endpoint_error_event():
+    def _failing_stream(question, cancellation=None):
+        yield "Partial"
+        raise Exception("LLM down")
+
+    session_manager = Mock()
+    session = Mock()
+    session.session_id = "session-1"
+    session.stream_question.side_effect = _failing_stream
+    session_manager.get_domain_expert_session.return_value = (session, None)
+    api_main.app.state.session_manager = session_manager
+    api_main.app.state.llm_limiter = LLMConcurrencyLimiter()
+    vector_store_loader = Mock()
+    vector_store_loader.get_collection_count.return_value = 5
+    _set_readiness(vector_store_loader)
+
+    with _build_client_no_lifespan() as client:
+        response = client.post(
+            "/chat/domain-expert/stream/", json={"question": "What is RAG?"}
+        )
+
+        assert response.status_code == 200
+        assert response.text.endswith(
+            'event: error\ndata: {"detail": "Processing failed"}\n\n'
+        )
+
+
+def test_domain_expert_stream_disconnect_holds_limiter_until_producer_ends():
+    limiter = LLMConcurrencyLimiter()
+    in_flight_when_producer_ended = []
+
+    def _stream(question, cancellation):
+        def _produce():
+            while not cancellation.cancelled:
+                time.sleep(0.01)
+            in_flight_when_producer_ended.append(limiter.get_stats()["in_flight"])
+            cancellation.finish()
+
+        cancellation.start()
+        threading.Thread(target=_produce, daemon=True).start()
+        yield "Hello"
+        yield " world"
+
+    session = Mock(session_id="session-1")
+    session.stream_question.side_effect = _stream
+    api_main.app.state.session_manager = Mock(
+        get_domain_expert_session=Mock(return_value=(session, None))
+    )
+    api_main.app.state.llm_limiter = limiter
+
+    async def _disconnect_after_first_token():
+        response = await api_main.stream_question(
+            api_main.DomainExpertRequest(question="What is RAG?")
+        )
+        events = response.body_iterator
+        await events.__anext__()
+        assert (await events.__anext__()).startswith("event: token")
+        await events.aclose()
+
+    asyncio.run(_disconnect_after_first_token())
+
+    assert in_flight_when_producer_ended == [1]
+    assert limiter.get_stats()["in_flight"] == 0
+
+
+def test_domain_expert_stream_endpoint_no_documents():
+    vector_store_loader = Mock()
+    vector_store_loader.get_collection_count.return_value = 0
+    _set_readiness(vector_store_loader)
+
+    with _build_client_no_lifespan() as client:
+        response = client.post(
+            "/chat/domain-expert/stream/", json={"question": "What is RAG?"}
+        )
+
+        assert response.status_code == 503
+
+
+def test_metrics_reports_llm_concurrency_and_sessions():
+    api_main.app.state.llm_limiter = LLMConcurrencyLimiter(max_concurrent=3)
+    session_stats = {
+        "live_sessions": 2,
+        "max_sessions": 1000,
+        "history_chars": 42,
+        "max_history_chars": 20000000,
+        "evictions": {"idle_ttl": 1, "max_sessions": 0, "max_history": 0},
+    }
+    api_main.app.state.session_manager = Mock(
+        get_stats=Mock(return_value=session_stats)
+    )
+    condense_policy = (
+        api_main.app.state.session_manager.domain_expert_core.condense_policy
+    )
+    condense_policy.get_stats.return_value = {"performed": 2}
+    api_main.app.state.answer_cache = Mock(get_stats=Mock(return_value={"hits": 1}))
+    api_main.app.state.retrieval_cache = Mock(get_stats=Mock(return_value={"hits": 3}))
+
+    with _build_client_no_lifespan() as client:
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["llm_concurrency"] == {
+            "max_concurrent": 3,
+            "in_flight": 0,
+            "queued": 0,
+        }
+        assert body["sessions"] == session_stats
+        assert body["answer_cache"] == {"hits": 1}
+        assert body["condense"] == {"performed": 2}
+        assert body["retrieval_cache"] == {"hits": 3}
+        assert {"hits", "misses", "bytes"} <= body["query_embedding_cache"].keys()
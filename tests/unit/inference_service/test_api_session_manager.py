@@ -1,10 +1,13 @@
+import asyncio
+import time
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from src.inference_service.session_manager import (
     SessionManager,
     DomainExpertSession,
 )
+from src.inference_service.session_store import InMemorySessionStore
 
 
 class TestSessionManager:
@@ -22,8 +25,10 @@ class TestSessionManager:
 
         assert isinstance(session, DomainExpertSession)
         assert system_message is None
-        assert session.session_id in manager.sessions
-        mock_domain_expert_core.assert_called_once_with(mock_vectordb)
+        assert session.session_id in manager.session_store
+        mock_domain_expert_core.assert_called_once_with(
+            mock_vectordb, answer_cache=None, retrieval_cache=None
+        )
 
     @patch("src.inference_service.session_manager.DomainExpertCore")
     def test_get_domain_expert_session_stale_id_creates_new(
@@ -37,16 +42,118 @@ class TestSessionManager:
         assert system_message == (
             "Session id not found. Creating new Domain Expert session. Chat history will be lost"
         )
-        assert session.session_id in manager.sessions
-        mock_domain_expert_core.assert_called_once_with(mock_vectordb)
+        assert session.session_id in manager.session_store
+        mock_domain_expert_core.assert_called_once_with(
+            mock_vectordb, answer_cache=None, retrieval_cache=None
+        )
 
     @patch("src.inference_service.session_manager.DomainExpertCore")
     def test_remove_and_get_session_by_id(self, mock_domain_expert_core, mock_vectordb):
         manager = SessionManager(mock_vectordb)
         session = manager.create_domain_expert_session()
 
-        assert manager.get_session_by_id(session.session_id) == session
+        assert manager.get_session_by_id(session.session_id).session_id == (
+            session.session_id
+        )
 
         manager.remove_session_by_id(session.session_id)
 
         assert manager.get_session_by_id(session.session_id) is None
+
+    @patch("src.inference_service.session_manager.DomainExpertCore")
+    def test_sessions_share_domain_expert_core(
+        self, mock_domain_expert_core, mock_vectordb
+    ):
+        manager = SessionManager(mock_vectordb)
+
+        first = manager.create_domain_expert_session()
+        second = manager.create_domain_expert_session()
+
+        assert first.domain_expert_core is second.domain_expert_core
+        mock_domain_expert_core.assert_called_once_with(
+            mock_vectordb, answer_cache=None, retrieval_cache=None
+        )
+
+    @patch("src.inference_service.session_manager.DomainExpertCore")
+    def test_session_ask_question_records_history(
+        self, mock_domain_expert_core, mock_vectordb
+    ):
+        core = mock_domain_expert_core.return_value
+        core.ask_question.side_effect = ["first answer", "second answer"]
+        manager = SessionManager(mock_vectordb)
+        session = manager.create_domain_expert_session()
+        other_session = manager.create_domain_expert_session()
+
+        session.ask_question("first question")
+        answer = session.ask_question("second question")
+
+        assert answer == "second answer"
+        assert session.chat_history == [
+            ("first question", "first answer"),
+            ("second question", "second answer"),
+        ]
+        assert other_session.chat_history == []
+
+    @patch("src.inference_service.session_manager.DomainExpertCore")
+    def test_session_stream_question_records_history(
+        self, mock_domain_expert_core, mock_vectordb
+    ):
+        core = mock_domain_expert_core.return_value
+        core.stream_question.return_value = iter(["Hello", " world"])
+        manager = SessionManager(mock_vectordb)
+        session = manager.create_domain_expert_session()
+
+        tokens = list(session.stream_question("Greet me"))
+
+        assert tokens == ["Hello", " world"]
+        assert session.chat_history == [("Greet me", "Hello world")]
+
+    @patch("src.inference_service.session_manager.DomainExpertCore")
+    def test_session_aask_question_records_history(
+        self, mock_domain_expert_core, mock_vectordb
+    ):
+        core = mock_domain_expert_core.return_value
+        core.aask_question = AsyncMock(return_value="async answer")
+        manager = SessionManager(mock_vectordb)
+        session = manager.create_domain_expert_session()
+
+        answer = asyncio.run(session.aask_question("async question"))
+
+        assert answer == "async answer"
+        assert session.chat_history == [("async question", "async answer")]
+
+    @patch("src.inference_service.session_manager.DomainExpertCore")
+    def test_history_is_persisted_in_session_store(
+        self, mock_domain_expert_core, mock_vectordb
+    ):
+        mock_domain_expert_core.return_value.ask_question.return_value = "answer"
+        manager = SessionManager(mock_vectordb, InMemorySessionStore())
+        session = manager.create_domain_expert_session()
+
+        session.ask_question("question")
+        reloaded, system_message = manager.get_domain_expert_session(session.session_id)
+
+        assert system_message is None
+        assert reloaded.session_id == session.session_id
+        assert reloaded.chat_history == [("question", "answer")]
+
+    @patch("src.inference_service.session_manager.DomainExpertCore")
+    def test_sweeper_expires_idle_sessions_in_background(
+        self, mock_domain_expert_core, mock_vectordb
+    ):
+        manager = SessionManager(
+            mock_vectordb, InMemorySessionStore(idle_ttl_seconds=0)
+        )
+        manager.create_domain_expert_session()
+
+        manager.start_sweeper(interval_seconds=0.01)
+        try:
+            for _ in range(100):
+                if not manager.get_stats()["live_sessions"]:
+                    break
+                time.sleep(0.01)
+        finally:
+            manager.close()
+
+        assert manager.get_stats()["live_sessions"] == 0
+        assert manager.get_stats()["evictions"]["idle_ttl"] == 1
@@ -1,12 +1,59 @@
+import asyncio
+import threading
+from typing import Any
 import pytest
 from src.inference_service.core.chain_manager import ChainManager
+from src.inference_service.core.response_stream import StreamCancellation
 from langchain_community.vectorstores import Chroma
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from langchain_classic.chains import RetrievalQA
+from langchain_core.documents import Document
 from langchain_core.language_models.llms import LLM
+from langchain_core.retrievers import BaseRetriever
 from src.shared.prompts import domain_expert_prompt, domain_expert_condense_prompt
 
 
+class _TokenStreamingLLM(LLM):
+    """Fake LLM that reports each character through the streaming callbacks."""
+
+    responses: list
+
+    @property
+    def _llm_type(self) -> str:
+        return "token-streaming-fake"
+
+    def _call(self, prompt, stop=None, run_manager=None, **kwargs):
+        response = self.responses.pop(0)
+        for char in response:
+            if run_manager:
+                run_manager.on_llm_new_token(char)
+        return response
+
+
+class _GatedLLM(LLM):
+    """Fake LLM that streams one token, then waits on a gate before the rest."""
+
+    gate: Any
+    emitted: list = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "gated-fake"
+
+    def _call(self, prompt, stop=None, run_manager=None, **kwargs):
+        for index, token in enumerate(["Hello", " world", "!"]):
+            if index == 1:
+                self.gate.wait(5)
+            run_manager.on_llm_new_token(token)
+            self.emitted.append(token)
+        return "Hello world!"
+
+
+class _StaticRetriever(BaseRetriever):
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        return [Document(page_content="RAG means retrieval augmented generation.")]
+
+
 class TestChainManager:
     @pytest.fixture
     def mock_vectordb(self):
@@ -174,6 +221,147 @@ class TestChainManager:
         # Assert
         assert answer == "This is the answer"
 
+    def test_ask_question_with_chat_history(self, chain_manager):
+        # Arrange
+        chat_history = [("Previous question", "Previous answer")]
+        mock_chain = Mock()
+        mock_chain.invoke.return_value = {"answer": "This is the answer"}
+
+        # Act
+        answer = chain_manager.ask_question("Follow up", mock_chain, chat_history)
+
+        # Assert
+        assert answer == "This is the answer"
+        mock_chain.invoke.assert_called_once_with(
+            {"question": "Follow up", "chat_history": chat_history}
+        )
+
+    @patch("src.inference_service.core.chain_manager.ConversationalRetrievalChain")
+    @patch("src.inference_service.core.chain_manager.ConversationBufferMemory")
+    def test_get_conversationalRetrievalChain_without_memory(
+        self, mock_conversation_buffer_memory, mock_chain_class, chain_manager
+    ):
+        # Act
+        chain_manager.get_conversationalRetrievalChain(
+            Mock(spec=LLM), {"prompt": domain_expert_prompt}, use_memory=False
+        )
+
+        # Assert
+        mock_conversation_buffer_memory.assert_not_called()
+        assert "memory" not in mock_chain_class.from_llm.call_args.kwargs
+
+    def test_aask_question_with_chat_history(self, chain_manager):
+        # Arrange
+        chat_history = [("Previous question", "Previous answer")]
+        mock_chain = Mock()
+        mock_chain.ainvoke = AsyncMock(return_value={"answer": "Async answer"})
+
+        # Act
+        answer = asyncio.run(
+            chain_manager.aask_question("Follow up", mock_chain, chat_history)
+        )
+
+        # Assert
+        assert answer == "Async answer"
+        mock_chain.ainvoke.assert_awaited_once_with(
+            {"question": "Follow up", "chat_history": chat_history}
+        )
+
+    def test_aask_question_failure(self, chain_manager):
+        mock_chain = Mock()
+        mock_chain.ainvoke = AsyncMock(
+            side_effect=Exception("Exception getting answer")
+        )
+
+        with pytest.raises(Exception, match="Error invoking LLM:"):
+            asyncio.run(chain_manager.aask_question("question", mock_chain, []))
+
+    def test_stream_question_streams_only_cleaned_answer(self, chain_manager):
+        # Arrange
+        chain_manager.retriever = _StaticRetriever()
+        llm = _TokenStreamingLLM(
+            responses=[
+                "What does RAG stand for?",
+                "<think>hmm</think>RAG is retrieval augmented generation.\n### CONTEXT",
+            ]
+        )
+        chain = chain_manager.get_conversationalRetrievalChain(
+            llm,
+            {"prompt": domain_expert_prompt},
+            condense_question_prompt=domain_expert_condense_prompt,
+            use_memory=False,
+        )
+
+        # Act
+        tokens = list(
+            chain_manager.stream_question(
+                "And RAG?", chain, [("What is an LLM?", "A language model.")]
+            )
+        )
+
+        # Assert
+        assert len(tokens) > 1
+        assert "".join(tokens) == "RAG is retrieval augmented generation."
+
+    def test_stream_question_cancellation_stops_producer(self, chain_manager):
+        chain_manager.retriever = _StaticRetriever()
+        gate = threading.Event()
+        llm = _GatedLLM(gate=gate, emitted=[])
+        chain = chain_manager.get_conversationalRetrievalChain(
+            llm, {"prompt": domain_expert_prompt}, use_memory=False
+        )
+        cancellation = StreamCancellation()
+
+        stream = chain_manager.stream_question("What is RAG?", chain, [], cancellation)
+        assert next(stream) == "Hello"
+        cancellation.cancel()
+        gate.set()
+
+        assert cancellation.wait_finished(timeout=5)
+        assert llm.emitted == ["Hello"]
+
+    def test_condense_question_without_history_skips_llm(self, chain_manager):
+        mock_chain = Mock()
+
+        question = chain_manager.condense_question("What is RAG?", mock_chain, [])
+
+        assert question == "What is RAG?"
+        mock_chain.question_generator.invoke.assert_not_called()
+
+    def test_condense_question_with_history(self, chain_manager):
+        chain_manager.retriever = _StaticRetriever()
+        llm = _TokenStreamingLLM(responses=[" What does RAG stand for? "])
+        chain = chain_manager.get_conversationalRetrievalChain(
+            llm,
+            {"prompt": domain_expert_prompt},
+            condense_question_prompt=domain_expert_condense_prompt,
+            use_memory=False,
+        )
+
+        question = chain_manager.condense_question(
+            "And RAG?", chain, [("What is an LLM?", "A language model.")]
+        )
+
+        assert question == "What does RAG stand for?"
+
+    def test_acondense_question_failure(self, chain_manager):
+        mock_chain = Mock(get_chat_history=None)
+        mock_chain.question_generator.ainvoke = AsyncMock(
+            side_effect=Exception("LLM down")
+        )
+
+        with pytest.raises(Exception, match="Error invoking LLM:"):
+            asyncio.run(
+                chain_manager.acondense_question("And RAG?", mock_chain, [("q", "a")])
+            )
+
+    def test_stream_question_failure(self, chain_manager):
+        mock_chain = Mock()
+        mock_chain.invoke.side_effect = Exception("Exception getting answer")
+
+        with pytest.raises(Exception, match="Error invoking LLM:"):
+            list(chain_manager.stream_question("question", mock_chain, []))
+
     def test_ask_question_retrieval_qa(self, chain_manager):
         # Arrange
         question = "This is the question"
@@ -0,0 +1,79 @@
+import pytest
+
+from src.inference_service.core.condense_policy import (
+    CondensePolicy,
+    is_self_contained,
+)
+
+HISTORY = [("What is RAG?", "Retrieval augmented generation.")]
+
+
+class TestIsSelfContained:
+    @pytest.mark.parametrize(
+        "question",
+        [
+            "What is retrieval augmented generation?",
+            "How do vector databases index embeddings?",
+            "List the main phases of the software testing lifecycle.",
+        ],
+    )
+    def test_self_contained_questions(self, question):
+        assert is_self_contained(question)
+
+    @pytest.mark.parametrize(
+        "question",
+        [
+            "Why?",
+            "Give examples",
+            "How does it work?",
+            "What are the drawbacks of that approach?",
+            "And what about vector databases?",
+            "Tell me more about chunking strategies",
+            "Can you compare these two techniques?",
+        ],
+    )
+    def test_follow_ups_need_condensing(self, question):
+        assert not is_self_contained(question)
+
+
+class TestCondensePolicy:
+    def test_empty_history_is_skipped(self):
+        policy = CondensePolicy()
+
+        assert policy.history_for_turn("How does it work?", []) == []
+        assert policy.get_stats()["skipped_empty_history"] == 1
+
+    def test_self_contained_question_drops_history(self):
+        policy = CondensePolicy()
+
+        history = policy.history_for_turn(
+            "What is retrieval augmented generation?", HISTORY
+        )
+
+        assert history == []
+        assert policy.get_stats()["skipped_self_contained"] == 1
+
+    def test_follow_up_keeps_history(self):
+        policy = CondensePolicy()
+
+        assert policy.history_for_turn("How does it work?", HISTORY) == HISTORY
+        assert policy.get_stats()["performed"] == 1
+
+    def test_heuristic_can_be_disabled(self):
+        policy = CondensePolicy(heuristic_enabled=False)
+
+        history = policy.history_for_turn(
+            "What is retrieval augmented generation?", HISTORY
+        )
+
+        assert history == HISTORY
+
+    def test_stats_report_turns_and_skip_rate(self):
+        policy = CondensePolicy()
+        policy.history_for_turn("What is retrieval augmented generation?", [])
+        policy.history_for_turn("How does it work?", HISTORY)
+
+        stats = policy.get_stats()
+
+        assert stats["turns"] == 2
+        assert stats["skip_rate"] == 0.5
@@ -0,0 +1,9 @@
+from src.inference_service.core.corpus_version import corpus_version
+
+
+class TestCorpusVersion:
+    def test_corpus_version_includes_collection_count(self):
+        assert corpus_version(10, "fingerprint") != corpus_version(12, "fingerprint")
+
+    def test_corpus_version_includes_completed_fingerprint(self):
+        assert corpus_version(10, "before") != corpus_version(10, "after")
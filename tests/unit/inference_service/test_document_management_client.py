@@ -56,3 +56,44 @@ class TestDocumentManagementClient:
         mock_requests.get.side_effect = requests.ConnectionError("Connection refused")
         with pytest.raises(Exception):
             dms_client.get_documents()
+
+    @patch("src.inference_service.document_management_client.requests")
+    def test_get_documents_page_returns_next_cursor(self, mock_requests, dms_client):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [
+            {
+                "doc_hash": "Doc Hash 1",
+                "doc_name": "Doc Name 1",
+                "status": DocumentStatus.PENDING,
+            },
+        ]
+        mock_response.headers = {"X-Next-After": "Doc Hash 1"}
+        mock_requests.get.return_value = mock_response
+
+        documents, next_after = dms_client.get_documents_page(
+            1, status=DocumentStatus.PENDING
+        )
+
+        assert [document.doc_hash for document in documents] == ["Doc Hash 1"]
+        assert next_after == "Doc Hash 1"
+        mock_requests.get.assert_called_once_with(
+            "test_url/documents/",
+            params={"limit": 1, "status": DocumentStatus.PENDING.value},
+            timeout=5,
+        )
+
+    @patch("src.inference_service.document_management_client.requests")
+    def test_get_summary(self, mock_requests, dms_client):
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "total": 1,
+            "counts": {DocumentStatus.COMPLETED.value: 1},
+            "completed_fingerprint": "fp",
+        }
+        mock_requests.get.return_value = mock_response
+
+        summary = dms_client.get_summary()
+
+        assert summary.counts == {DocumentStatus.COMPLETED: 1}
+        assert summary.completed_fingerprint == "fp"
@@ -1,8 +1,10 @@
+import asyncio
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from langchain_community.vectorstores import Chroma
 from src.inference_service.core.domain_expert_core import DomainExpertCore
 from src.inference_service.core.chain_manager import ChainManager
+from src.inference_service.core.response_stream import StreamCancellation
 from src.shared.exceptions import DomainExpertSetupException
 from src.shared.prompts import domain_expert_condense_prompt, domain_expert_prompt
 
@@ -37,12 +39,15 @@ class TestDomainExpertCore:
         )
 
         # Assert
-        mock_chain_manager_class.assert_called_once_with(mock_vectordb)
+        mock_chain_manager_class.assert_called_once_with(
+            mock_vectordb, retrieval_cache=None
+        )
         mock_chain_manager.get_llm.assert_called_once()
         mock_chain_manager.get_conversationalRetrievalChain.assert_called_once_with(
             mock_chain_manager.get_llm.return_value,
             {"prompt": domain_expert_prompt},
             condense_question_prompt=domain_expert_condense_prompt,
+            use_memory=False,
         )
         assert core.chain_manager == mock_chain_manager
         assert (
@@ -117,7 +122,28 @@ class TestDomainExpertCore:
         # Assert
         assert answer == "This is the answer"
         mock_chain_manager.ask_question.assert_called_once_with(
-            "This is the question", core.qa_chain
+            "This is the question", core.qa_chain, []
+        )
+
+    @patch("src.inference_service.core.domain_expert_core.ChainManager")
+    def test_ask_question_passes_chat_history(
+        self,
+        mock_chain_manager_class,
+        mock_vectordb,
+        mock_chain_manager,
+    ):
+        # Arrange
+        core = self._build_core(
+            mock_chain_manager_class, mock_chain_manager, mock_vectordb
+        )
+        chat_history = [("Previous question", "Previous answer")]
+
+        # Act
+        core.ask_question("Follow up", chat_history)
+
+        # Assert
+        mock_chain_manager.ask_question.assert_called_once_with(
+            "Follow up", core.qa_chain, chat_history
         )
 
     @patch("src.inference_service.core.domain_expert_core.ChainManager")
@@ -138,3 +164,180 @@ class TestDomainExpertCore:
         # Act
         with pytest.raises(DomainExpertSetupException):
             core.ask_question("This is the question")
+
+    @patch("src.inference_service.core.domain_expert_core.ChainManager")
+    def test_stream_question_success(
+        self,
+        mock_chain_manager_class,
+        mock_vectordb,
+        mock_chain_manager,
+    ):
+        # Arrange
+        core = self._build_core(
+            mock_chain_manager_class, mock_chain_manager, mock_vectordb
+        )
+        mock_chain_manager.stream_question.return_value = iter(["An", " answer"])
+        cancellation = StreamCancellation()
+
+        # Act
+        tokens = list(
+            core.stream_question("This is the question", cancellation=cancellation)
+        )
+
+        # Assert
+        assert tokens == ["An", " answer"]
+        mock_chain_manager.stream_question.assert_called_once_with(
+            "This is the question", core.qa_chain, [], cancellation
+        )
+
+    @patch("src.inference_service.core.domain_expert_core.ChainManager")
+    def test_stream_question_failure(
+        self,
+        mock_chain_manager_class,
+        mock_vectordb,
+        mock_chain_manager,
+    ):
+        # Arrange
+        core = self._build_core(
+            mock_chain_manager_class, mock_chain_manager, mock_vectordb
+        )
+        mock_chain_manager.stream_question.side_effect = Exception(
+            "Exception getting answer"
+        )
+
+        # Act
+        with pytest.raises(DomainExpertSetupException):
+            list(core.stream_question("This is the question"))
+
+    @patch("src.inference_service.core.domain_expert_core.ChainManager")
+    def test_aask_question_success(
+        self,
+        mock_chain_manager_class,
+        mock_vectordb,
+        mock_chain_manager,
+    ):
+        # Arrange
+        core = self._build_core(
+            mock_chain_manager_class, mock_chain_manager, mock_vectordb
+        )
+        mock_chain_manager.aask_question = AsyncMock(return_value="Async answer")
+        chat_history = [("Previous question", "Previous answer")]
+
+        # Act
+        answer = asyncio.run(core.aask_question("This is the question", chat_history))
+
+        # Assert
+        assert answer == "Async answer"
+        mock_chain_manager.aask_question.assert_awaited_once_with(
+            "This is the question", core.qa_chain, chat_history
+        )
+
+    @patch("src.inference_service.core.domain_expert_core.ChainManager")
+    def test_aask_question_failure(
+        self,
+        mock_chain_manager_class,
+        mock_vectordb,
+        mock_chain_manager,
+    ):
+        # Arrange
+        core = self._build_core(
+            mock_chain_manager_class, mock_chain_manager, mock_vectordb
+        )
+        mock_chain_manager.aask_question = AsyncMock(
+            side_effect=Exception("Exception getting answer")
+        )
+
+        # Act
+        with pytest.raises(DomainExpertSetupException):
+            asyncio.run(core.aask_question("This is the question"))
+
+
+class TestDomainExpertCoreAnswerCache:
+    @pytest.fixture
+    def answer_cache(self):
+        cache = Mock()
+        cache.embed.return_value = "embedding"
+        cache.lookup.return_value = (None, "v1")
+        return cache
+
+    @pytest.fixture
+    def core(self, answer_cache):
+        with patch(
+            "src.inference_service.core.domain_expert_core.ChainManager"
+        ) as mock_chain_manager_class:
+            chain_manager = mock_chain_manager_class.return_value
+            chain_manager.condense_question.return_value = "Standalone question"
+            chain_manager.ask_question.return_value = "Fresh answer"
+            yield DomainExpertCore(Mock(spec=Chroma), answer_cache=answer_cache)
+
+    def test_cache_hit_skips_chain(self, core, answer_cache):
+        answer_cache.lookup.return_value = ("Cached answer", "v1")
+        chat_history = [("Previous question", "Previous answer")]
+
+        answer = core.ask_question("Follow up?", chat_history)
+
+        assert answer == "Cached answer"
+        core.chain_manager.condense_question.assert_called_once_with(
+            "Follow up?", core.qa_chain, chat_history
+        )
+        answer_cache.embed.assert_called_once_with("Standalone question")
+        core.chain_manager.ask_question.assert_not_called()
+
+    def test_cache_miss_answers_standalone_question_and_stores(
+        self, core, answer_cache
+    ):
+        answer = core.ask_question("Follow up?", [("Previous", "Answer")])
+
+        assert answer == "Fresh answer"
+        core.chain_manager.ask_question.assert_called_once_with(
+            "Standalone question", core.qa_chain, []
+        )
+        embedding, stored_answer, latency, version = answer_cache.store.call_args.args
+        assert (embedding, stored_answer, version) == (
+            "embedding",
+            "Fresh answer",
+            "v1",
+        )
+        assert latency >= 0
+
+    def test_aask_question_cache_miss(self, core, answer_cache):
+        core.chain_manager.acondense_question = AsyncMock(
+            return_value="Standalone question"
+        )
+        core.chain_manager.aask_question = AsyncMock(return_value="Async answer")
+
+        answer = asyncio.run(core.aask_question("Question"))
+
+        assert answer == "Async answer"
+        core.chain_manager.aask_question.assert_awaited_once_with(
+            "Standalone question", core.qa_chain, []
+        )
+        answer_cache.store.assert_called_once()
+
+    def test_stream_question_cache_hit_yields_cached_answer(self, core, answer_cache):
+        answer_cache.lookup.return_value = ("Cached answer", "v1")
+
+        tokens = list(core.stream_question("Question"))
+
+        assert tokens == ["Cached answer"]
+        core.chain_manager.stream_question.assert_not_called()
+
+    def test_stream_question_cache_miss_stores_full_answer(self, core, answer_cache):
+        core.chain_manager.stream_question.return_value = iter(["Hello", " world"])
+
+        tokens = list(core.stream_question("Question"))
+
+        assert tokens == ["Hello", " world"]
+        assert answer_cache.store.call_args.args[1] == "Hello world"
+
+    def test_self_contained_follow_up_skips_condense_history(self, core):
+        core.answer_cache = None
+
+        core.ask_question(
+            "What is retrieval augmented generation?", [("Previous", "Answer")]
+        )
+
+        core.chain_manager.ask_question.assert_called_once_with(
+            "What is retrieval augmented generation?", core.qa_chain, []
+        )
+        assert core.condense_policy.get_stats()["skipped_self_contained"] == 1
@@ -0,0 +1,97 @@
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from src.inference_service.core.embedding_cache import (
+    CachedQueryEmbeddings,
+    QueryEmbeddingCache,
+    get_query_embedding_cache,
+    normalize_query,
+)
+from src.inference_service.core.vector_store_loader import VectorStoreLoader
+
+
+def _embeddings():
+    return Mock(embed_query=Mock(side_effect=lambda text: [float(len(text)), 1.0]))
+
+
+class TestQueryEmbeddingCache:
+    def test_lru_eviction_by_bytes(self):
+        vector = np.zeros(8, dtype=np.float32)
+        entry_bytes = QueryEmbeddingCache._entry_bytes(("m", "q1"), vector)
+        cache = QueryEmbeddingCache(max_bytes=2 * entry_bytes)
+        cache.put("m", "q1", vector)
+        cache.put("m", "q2", vector)
+
+        cache.get("m", "q1")
+        cache.put("m", "q3", vector)
+
+        assert cache.get("m", "q1") is not None
+        assert cache.get("m", "q2") is None
+        assert cache.get("m", "q3") is not None
+        assert cache.get_stats()["evictions"] == 1
+        assert cache.get_stats()["bytes"] <= cache.max_bytes
+
+    def test_model_name_is_part_of_key(self):
+        cache = QueryEmbeddingCache()
+        cache.put("model-a", "query", np.ones(2, dtype=np.float32))
+
+        assert cache.get("model-b", "query") is None
+
+    def test_entry_larger_than_bound_is_not_cached(self):
+        cache = QueryEmbeddingCache(max_bytes=10)
+
+        cache.put("m", "q", np.zeros(100, dtype=np.float32))
+
+        assert cache.get_stats()["entries"] == 0
+
+
+class TestCachedQueryEmbeddings:
+    def test_repeated_query_is_encoded_once(self):
+        embeddings = _embeddings()
+        cached = CachedQueryEmbeddings(embeddings, "model", QueryEmbeddingCache())
+
+        first = cached.embed_query("What is RAG?")
+        second = cached.embed_query("  What is   RAG? ")
+
+        assert first == second == [12.0, 1.0]
+        embeddings.embed_query.assert_called_once_with("What is RAG?")
+        assert cached.cache.get_stats()["hits"] == 1
+        assert cached.cache.get_stats()["hit_rate"] == 0.5
+
+    def test_embed_documents_passes_through(self):
+        embeddings = _embeddings()
+        embeddings.embed_documents.return_value = [[1.0]]
+        cached = CachedQueryEmbeddings(embeddings, "model", QueryEmbeddingCache())
+
+        assert cached.embed_documents(["doc"]) == [[1.0]]
+        assert cached.cache.get_stats()["entries"] == 0
+
+    def test_defaults_to_process_wide_cache(self):
+        first = CachedQueryEmbeddings(_embeddings(), "model")
+        second = CachedQueryEmbeddings(_embeddings(), "model")
+
+        assert first.cache is second.cache is get_query_embedding_cache()
+
+    def test_normalize_query_preserves_case(self):
+        assert normalize_query(" What\tis\nRAG ") == "What is RAG"
+
+
+class TestVectorStoreLoaderEmbeddings:
+    @patch("src.inference_service.core.vector_store_loader.Chroma")
+    @patch("src.inference_service.core.vector_store_loader.HuggingFaceEmbeddings")
+    def test_load_vector_store_wraps_embeddings_in_cache(
+        self, mock_hf_embeddings, mock_chroma
+    ):
+        loader = VectorStoreLoader(chroma_client=Mock())
+
+        loader.load_vector_store(model_name="test-model")
+
+        embeddings = mock_chroma.call_args.kwargs["embedding_function"]
+        assert isinstance(embeddings, CachedQueryEmbeddings)
+        assert embeddings.embeddings is mock_hf_embeddings.return_value
+        assert embeddings.model_name == "test-model"
+        mock_hf_embeddings.assert_called_once_with(
+            model_name="test-model",
+            encode_kwargs={"normalize_embeddings": False},
+        )
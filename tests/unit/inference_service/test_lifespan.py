@@ -28,6 +28,17 @@ class TestLifespan:
         with patch("src.inference_service.lifespan.mlflow.set_experiment") as mock:
             yield mock
 
+    @pytest.fixture(autouse=True)
+    def mock_mlflow_autolog(self):
+        # Real autologging would trace every later LangChain call in the session.
+        with patch("src.inference_service.lifespan.mlflow.langchain.autolog") as mock:
+            yield mock
+
+    @pytest.fixture(autouse=True)
+    def mock_readiness_monitor(self):
+        with patch("src.inference_service.lifespan.ReadinessMonitor") as mock:
+            yield mock
+
     @patch("src.inference_service.lifespan.SessionManager")
     @patch("src.inference_service.lifespan.prepare_vector_store")
     @patch("src.inference_service.lifespan.get_vector_store_loader")
@@ -37,6 +48,7 @@ class TestLifespan:
         mock_get_vector_store_loader,
         mock_prepare_vector_store,
         mock_session_manager,
+        mock_readiness_monitor,
     ):
         app = SimpleNamespace(state=SimpleNamespace())
         vectordb = Mock()
@@ -48,7 +60,17 @@ class TestLifespan:
             vector_store_loader=mock_get_vector_store_loader.return_value,
             progress_callback=print,
         )
-        mock_session_manager.assert_called_once_with(vectordb)
+        mock_session_manager.assert_called_once_with(
+            vectordb,
+            answer_cache=app.state.answer_cache,
+            retrieval_cache=app.state.retrieval_cache,
+        )
+        mock_session_manager.return_value.start_sweeper.assert_called_once_with()
+        mock_session_manager.return_value.close.assert_called_once_with()
+        readiness = mock_readiness_monitor.return_value
+        readiness.refresh.assert_called_once_with()
+        readiness.start.assert_called_once_with()
+        readiness.stop.assert_called_once_with()
 
     @patch("src.inference_service.lifespan.SessionManager")
     @patch("src.inference_service.lifespan.prepare_vector_store")
@@ -74,7 +96,11 @@ class TestLifespan:
             vector_store_loader=mock_get_vector_store_loader.return_value,
             progress_callback=print,
         )
-        mock_session_manager.assert_called_once_with(vectordb)
+        mock_session_manager.assert_called_once_with(
+            vectordb,
+            answer_cache=app.state.answer_cache,
+            retrieval_cache=app.state.retrieval_cache,
+        )
 
     @pytest.mark.parametrize(
         "exception",
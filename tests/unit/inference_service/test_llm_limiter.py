@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from src.inference_service.core.llm_limiter import LLMConcurrencyLimiter
+
+
+class TestLLMConcurrencyLimiter:
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            LLMConcurrencyLimiter(max_concurrent=0)
+
+    def test_limits_in_flight_and_reports_queue_depth(self):
+        limiter = LLMConcurrencyLimiter(max_concurrent=2)
+        release = asyncio.Event()
+        peak_in_flight = 0
+
+        async def _call():
+            nonlocal peak_in_flight
+            async with limiter:
+                peak_in_flight = max(peak_in_flight, limiter.in_flight)
+                await release.wait()
+
+        async def _runner():
+            tasks = [asyncio.create_task(_call()) for _ in range(5)]
+            await asyncio.sleep(0)
+            stats = limiter.get_stats()
+            release.set()
+            await asyncio.gather(*tasks)
+            return stats
+
+        stats = asyncio.run(_runner())
+
+        assert stats == {"max_concurrent": 2, "in_flight": 2, "queued": 3}
+        assert peak_in_flight == 2
+        assert limiter.get_stats() == {
+            "max_concurrent": 2,
+            "in_flight": 0,
+            "queued": 0,
+        }
+
+    def test_releases_slot_on_exception(self):
+        limiter = LLMConcurrencyLimiter(max_concurrent=1)
+
+        async def _failing_call():
+            async with limiter:
+                raise RuntimeError("LLM down")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(_failing_call())
+
+        assert limiter.in_flight == 0
+        assert limiter.queued == 0
@@ -0,0 +1,87 @@
+import threading
+from unittest.mock import Mock
+
+from src.inference_service.core.corpus_version import corpus_version
+from src.inference_service.readiness import ReadinessMonitor
+from src.shared.constants import DocumentStatus
+from src.shared.models import DocumentSummaryResponse
+
+SUMMARY = DocumentSummaryResponse(
+    total=1, counts={DocumentStatus.COMPLETED: 1}, completed_fingerprint="fp"
+)
+
+
+def _monitor(count_fn=None, dms_summary_fn=None, now=100.0):
+    clock = Mock(return_value=now)
+    monitor = ReadinessMonitor(
+        count_fn or Mock(return_value=4),
+        dms_summary_fn or Mock(return_value=SUMMARY),
+        refresh_seconds=5,
+        clock=clock,
+    )
+    return monitor, clock
+
+
+class TestReadinessMonitor:
+    def test_snapshot_before_first_refresh_is_unknown_and_stale(self):
+        monitor, _ = _monitor()
+
+        assert monitor.snapshot().collection_count is None
+        assert monitor.snapshot().corpus_version() is None
+        assert monitor.get_status()["stale"] is True
+
+    def test_refresh_publishes_counts_and_corpus_version(self):
+        monitor, _ = _monitor()
+
+        snapshot = monitor.refresh()
+
+        assert snapshot.collection_count == 4
+        assert snapshot.dms_summary == SUMMARY
+        assert snapshot.corpus_version() == corpus_version(4, "fp")
+        assert monitor.get_status()["stale"] is False
+
+    def test_failed_refresh_keeps_last_values_and_marks_stale(self):
+        count_fn = Mock(side_effect=[4, Exception("Chroma down")])
+        monitor, _ = _monitor(count_fn=count_fn)
+        monitor.refresh()
+
+        snapshot = monitor.refresh()
+
+        assert snapshot.collection_count == 4
+        assert snapshot.errors == {"vector_store": "Chroma down"}
+        assert snapshot.corpus_version() is None
+        assert monitor.get_status()["stale"] is True
+
+    def test_snapshot_becomes_stale_after_two_intervals(self):
+        monitor, clock = _monitor()
+        monitor.refresh()
+
+        clock.return_value = 110.0
+        assert monitor.get_status()["stale"] is False
+        clock.return_value = 110.5
+        assert monitor.get_status() == {
+            "refreshed_at": "1970-01-01T00:01:40+00:00",
+            "age_seconds": 10.5,
+            "stale": True,
+            "refresh_interval_seconds": 5,
+            "errors": {},
+        }
+
+    def test_background_thread_refreshes_until_stopped(self):
+        refreshed = threading.Event()
+
+        def count():
+            refreshed.set()
+            return 4
+
+        monitor = ReadinessMonitor(
+            count, Mock(return_value=SUMMARY), refresh_seconds=0.01
+        )
+        monitor.start()
+        try:
+            assert refreshed.wait(timeout=5)
+        finally:
+            monitor.stop()
+
+        assert monitor.snapshot().collection_count == 4
+        assert monitor._refresher is None
@@ -0,0 +1,127 @@
+from uuid import uuid4
+
+import pytest
+from langchain_core.outputs import Generation, LLMResult
+
+from src.inference_service.core.chain_manager import ChainManager
+from src.inference_service.core.response_stream import (
+    ANSWER_TAG,
+    AnswerStreamHandler,
+    StreamCancellation,
+    StreamCancelled,
+    StreamingResponseCleaner,
+)
+
+
+RAW_RESPONSES = [
+    "Clean answer.",
+    "Good answer.\n<invoke>\n<val>junk</val>\n</invoke>",
+    "Answer text\n### CONTEXT ###\nmore stuff",
+    "Answer\n\n\n\ntrailing garbage",
+    "<think>\nLet me reason about this...\n</think>\n\nThe actual answer.",
+    "<think>reasoning</think>Answer.<invoke>junk</invoke>",
+    "The answer is here.\n</think>\n\nThe answer is here again.",
+    "Use a < b comparison.\n#hashtag is fine\n## Header\nignored",
+    "Unclosed start <think> never ends",
+]
+
+
+class TestStreamingResponseCleaner:
+    @pytest.mark.parametrize("raw", RAW_RESPONSES)
+    def test_char_by_char_matches_clean_response(self, raw):
+        cleaner = StreamingResponseCleaner()
+        emitted = ""
+        for char in raw:
+            emitted += cleaner.feed(char)
+            # Everything emitted so far must survive the final cleanup.
+            assert ChainManager._clean_response(raw).startswith(emitted)
+        emitted += cleaner.finish()
+
+        assert emitted == ChainManager._clean_response(raw)
+        assert cleaner.text == emitted
+
+    def test_emits_before_stream_ends(self):
+        cleaner = StreamingResponseCleaner()
+
+        assert cleaner.feed("The first ") == "The first"
+        assert cleaner.feed("sentence.") == " sentence."
+
+    def test_holds_back_think_block_until_closed(self):
+        cleaner = StreamingResponseCleaner()
+
+        assert cleaner.feed("<think>pondering") == ""
+        assert cleaner.feed("</think>Answer") == "Answer"
+
+
+class TestAnswerStreamHandler:
+    def test_streams_only_answer_branch_tokens(self):
+        handler = AnswerStreamHandler()
+        condense_chain, condense_llm = uuid4(), uuid4()
+        answer_chain, llm_chain, answer_llm = uuid4(), uuid4(), uuid4()
+
+        handler.on_chain_start({}, {}, run_id=condense_chain)
+        handler.on_llm_start({}, [], run_id=condense_llm, parent_run_id=condense_chain)
+        handler.on_llm_new_token("Standalone?", run_id=condense_llm)
+        handler.on_chain_start({}, {}, run_id=answer_chain, tags=[ANSWER_TAG])
+        handler.on_chain_start({}, {}, run_id=llm_chain, parent_run_id=answer_chain)
+        handler.on_llm_start({}, [], run_id=answer_llm, parent_run_id=llm_chain)
+        handler.on_llm_new_token("Hello", run_id=answer_llm)
+        handler.on_llm_new_token(" world", run_id=answer_llm)
+        handler.on_llm_end(
+            LLMResult(generations=[[Generation(text="Hello world")]]),
+            run_id=answer_llm,
+        )
+        handler.close()
+
+        assert list(handler) == ["Hello", " world"]
+
+    def test_non_streaming_llm_emits_full_generation(self):
+        handler = AnswerStreamHandler()
+        answer_chain, answer_llm = uuid4(), uuid4()
+
+        handler.on_chain_start({}, {}, run_id=answer_chain, tags=[ANSWER_TAG])
+        handler.on_llm_start({}, [], run_id=answer_llm, parent_run_id=answer_chain)
+        handler.on_llm_end(
+            LLMResult(generations=[[Generation(text="Whole answer")]]),
+            run_id=answer_llm,
+        )
+        handler.close()
+
+        assert list(handler) == ["Whole answer"]
+
+    def test_failure_is_raised_to_consumer(self):
+        handler = AnswerStreamHandler()
+        handler.fail(RuntimeError("LLM down"))
+
+        with pytest.raises(RuntimeError, match="LLM down"):
+            list(handler)
+
+    def test_cancellation_aborts_at_next_token(self):
+        cancellation = StreamCancellation()
+        handler = AnswerStreamHandler(cancellation)
+        answer_chain, answer_llm = uuid4(), uuid4()
+        handler.on_chain_start({}, {}, run_id=answer_chain, tags=[ANSWER_TAG])
+        handler.on_llm_start({}, [], run_id=answer_llm, parent_run_id=answer_chain)
+        handler.on_llm_new_token("Hello", run_id=answer_llm)
+
+        cancellation.cancel()
+
+        with pytest.raises(StreamCancelled):
+            handler.on_llm_new_token(" world", run_id=answer_llm)
+
+
+class TestStreamCancellation:
+    def test_producer_cannot_start_after_cancel(self):
+        cancellation = StreamCancellation()
+        cancellation.cancel()
+
+        assert cancellation.start() is False
+        assert cancellation.wait_finished(timeout=0)
+
+    def test_wait_finished_blocks_until_producer_finishes(self):
+        cancellation = StreamCancellation()
+        assert cancellation.start() is True
+
+        assert cancellation.wait_finished(timeout=0) is False
+        cancellation.finish()
+        assert cancellation.wait_finished(timeout=0) is True
@@ -0,0 +1,87 @@
+import asyncio
+from unittest.mock import Mock
+
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStoreRetriever
+
+from src.inference_service.core.retrieval_cache import CachingRetriever, RetrievalCache
+
+
+class _CountingRetriever(BaseRetriever):
+    calls: int = 0
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        self.calls += 1
+        return [Document(page_content=f"chunk for {query}")]
+
+
+def _retriever(corpus_version_fn, max_entries=8):
+    base = _CountingRetriever()
+    cache = RetrievalCache(corpus_version_fn, max_entries=max_entries)
+    return base, CachingRetriever(retriever=base, cache=cache)
+
+
+class TestCachingRetriever:
+    def test_repeated_query_hits_cache(self):
+        base, retriever = _retriever(Mock(return_value="v1"))
+
+        first = retriever.invoke("What is RAG?")
+        second = retriever.invoke("What  is RAG? ")
+
+        assert first == second
+        assert base.calls == 1
+        assert retriever.cache.get_stats()["hits"] == 1
+
+    def test_cached_documents_are_copies(self):
+        base, retriever = _retriever(Mock(return_value="v1"))
+        retriever.invoke("What is RAG?")[0].metadata["mutated"] = True
+
+        assert "mutated" not in retriever.invoke("What is RAG?")[0].metadata
+
+    def test_corpus_version_change_invalidates(self):
+        versions = Mock(side_effect=["v1", "v1", "v2"])
+        base, retriever = _retriever(versions)
+
+        retriever.invoke("What is RAG?")
+        retriever.invoke("What is RAG?")
+        retriever.invoke("What is RAG?")
+
+        assert base.calls == 2
+        assert retriever.cache.get_stats()["invalidations"] == 1
+
+    def test_unknown_corpus_version_bypasses_cache(self):
+        base, retriever = _retriever(Mock(return_value=None))
+
+        retriever.invoke("What is RAG?")
+        retriever.invoke("What is RAG?")
+
+        assert base.calls == 2
+        assert retriever.cache.get_stats()["entries"] == 0
+
+    def test_lru_bound(self):
+        base, retriever = _retriever(Mock(return_value="v1"), max_entries=1)
+
+        retriever.invoke("first")
+        retriever.invoke("second")
+        retriever.invoke("first")
+
+        assert base.calls == 3
+
+    def test_async_lookup_uses_cache(self):
+        base, retriever = _retriever(Mock(return_value="v1"))
+
+        asyncio.run(retriever.ainvoke("What is RAG?"))
+        asyncio.run(retriever.ainvoke("What is RAG?"))
+
+        assert base.calls == 1
+
+    def test_cache_key_includes_k(self):
+        vectorstore_retriever = Mock(spec=VectorStoreRetriever)
+        vectorstore_retriever.search_kwargs = {"k": 4}
+        cache = RetrievalCache(Mock(return_value="v1"))
+        retriever = CachingRetriever.model_construct(
+            retriever=vectorstore_retriever, cache=cache
+        )
+
+        assert retriever._cache_key(" What  is RAG? ") == ("What is RAG?", 4)
@@ -0,0 +1,266 @@
+import multiprocessing
+import os
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from src.inference_service.session_manager import SessionManager
+from src.inference_service.session_store import (
+    InMemorySessionStore,
+    SQLiteSessionStore,
+    get_session_store,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path, clock):
+    stores = []
+
+    def _make(**kwargs):
+        if request.param == "memory":
+            store = InMemorySessionStore(clock=clock, **kwargs)
+        else:
+            store = SQLiteSessionStore(
+                str(tmp_path / "sessions.sqlite3"), clock=clock, **kwargs
+            )
+        stores.append(store)
+        return store
+
+    yield _make
+    for store in stores:
+        store.close()
+
+
+class TestSessionStore:
+    def test_history_round_trip(self, make_store):
+        store = make_store()
+        store.create_session("s1")
+
+        store.append_exchange("s1", "question", "answer")
+
+        assert store.get_history("s1") == [("question", "answer")]
+        assert store.get_history("missing") is None
+
+    def test_max_sessions_evicts_least_recently_used(self, make_store, clock):
+        store = make_store(max_sessions=2)
+        store.create_session("first")
+        clock.now += 1
+        store.create_session("second")
+        clock.now += 1
+
+        store.get_history("first")
+        clock.now += 1
+        store.create_session("third")
+
+        assert "first" in store
+        assert "second" not in store
+        assert "third" in store
+        assert store.get_stats()["evictions"]["max_sessions"] == 1
+
+    def test_idle_session_expires_on_access(self, make_store, clock):
+        store = make_store(idle_ttl_seconds=60)
+        store.create_session("s1")
+
+        clock.now += 61
+
+        assert store.get_history("s1") is None
+        assert store.get_stats()["evictions"]["idle_ttl"] == 1
+        assert store.get_stats()["live_sessions"] == 0
+
+    def test_expire_idle_sessions_keeps_active(self, make_store, clock):
+        store = make_store(idle_ttl_seconds=60)
+        store.create_session("stale")
+        clock.now += 50
+        store.create_session("active")
+
+        clock.now += 20
+        expired = store.expire_idle_sessions()
+
+        assert expired == 1
+        assert "stale" not in store
+        assert "active" in store
+
+    def test_history_cap_evicts_other_sessions_first(self, make_store, clock):
+        store = make_store(max_history_chars=25)
+        store.create_session("idle")
+        store.create_session("active")
+        clock.now += 1
+
+        store.append_exchange("idle", "q" * 10, "a" * 10)
+        clock.now += 1
+        store.append_exchange("active", "q" * 10, "a" * 10)
+
+        assert "idle" not in store
+        assert store.get_history("active") == [("q" * 10, "a" * 10)]
+        assert store.get_stats()["history_chars"] == 20
+        assert store.get_stats()["evictions"]["max_history"] == 1
+
+    def test_history_cap_trims_oldest_turns_of_only_session(self, make_store):
+        store = make_store(max_history_chars=25)
+        store.create_session("s1")
+
+        store.append_exchange("s1", "q" * 5, "a" * 10)
+        store.append_exchange("s1", "r" * 5, "b" * 10)
+
+        assert store.get_history("s1") == [("r" * 5, "b" * 10)]
+        assert store.get_stats()["history_chars"] == 15
+
+    def test_append_to_evicted_session_is_ignored(self, make_store):
+        store = make_store()
+
+        store.append_exchange("gone", "question", "answer")
+
+        assert "gone" not in store
+        assert store.get_stats()["history_chars"] == 0
+
+    def test_delete_session_releases_history(self, make_store):
+        store = make_store()
+        store.create_session("s1")
+        store.append_exchange("s1", "question", "answer")
+
+        store.delete_session("s1")
+
+        assert store.get_stats()["live_sessions"] == 0
+        assert store.get_stats()["history_chars"] == 0
+
+
+class TestSQLiteSessionStore:
+    def test_history_total_tracks_every_write(self, tmp_path, clock):
+        store = SQLiteSessionStore(
+            str(tmp_path / "sessions.sqlite3"), clock=clock, max_history_chars=50
+        )
+        store.create_session("s1")
+        store.create_session("s2")
+        store.append_exchange("s1", "q" * 10, "a" * 10)
+        store.append_exchange("s2", "q" * 10, "a" * 10)
+        store.append_exchange("s2", "r" * 10, "b" * 10)
+        store.create_session("s2")
+        clock.now += store.idle_ttl_seconds + 1
+        store.create_session("s3")
+        store.append_exchange("s3", "question", "answer")
+
+        (row_total,) = store._connection.execute(
+            "SELECT SUM(history_chars) FROM chat_sessions"
+        ).fetchone()
+        assert store.get_stats()["history_chars"] == row_total == 14
+        store.close()
+
+    def test_history_total_is_seeded_from_existing_rows(self, tmp_path):
+        path = str(tmp_path / "sessions.sqlite3")
+        connection = sqlite3.connect(path)
+        connection.execute(
+            "CREATE TABLE chat_sessions (session_id TEXT PRIMARY KEY, "
+            "history TEXT NOT NULL, history_chars INTEGER NOT NULL, "
+            "last_access REAL NOT NULL)"
+        )
+        connection.execute(
+            "INSERT INTO chat_sessions VALUES ('old', '[[\"q\",\"a\"]]', 2, 0)"
+        )
+        connection.commit()
+        connection.close()
+
+        store = SQLiteSessionStore(path)
+
+        assert store.get_stats()["history_chars"] == 2
+        store.close()
+
+
+class TestGetSessionStore:
+    def test_memory_backend(self):
+        assert isinstance(get_session_store("memory"), InMemorySessionStore)
+
+    def test_sqlite_backend(self, tmp_path):
+        path = str(tmp_path / "sessions.sqlite3")
+        with patch("src.inference_service.session_store.SESSION_STORE_PATH", path):
+            store = get_session_store("sqlite")
+
+        assert isinstance(store, SQLiteSessionStore)
+        assert store.path == path
+        store.close()
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError, match="Unsupported SESSION_STORE"):
+            get_session_store("redis")
+
+
+class EchoCore:
+    """Stand-in DomainExpertCore reporting how much history it received."""
+
+    def __init__(self, vectordb, **caches):
+        pass
+
+    def ask_question(self, question, chat_history=None):
+        return f"{question} after {len(chat_history)} turn(s)"
+
+
+def _worker(db_path, requests, responses):
+    """Serve chat turns like one uvicorn worker with its own SessionManager."""
+    with patch("src.inference_service.session_manager.DomainExpertCore", EchoCore):
+        manager = SessionManager(None, SQLiteSessionStore(db_path))
+    for session_id, question in iter(requests.get, None):
+        session, system_message = manager.get_domain_expert_session(session_id)
+        answer = session.ask_question(question)
+        responses.put((os.getpid(), session.session_id, system_message, answer))
+    manager.close()
+
+
+class TestMultiWorkerSessions:
+    def test_history_survives_requests_moving_between_workers(self, tmp_path):
+        context = multiprocessing.get_context("fork")
+        db_path = str(tmp_path / "sessions.sqlite3")
+        responses = context.Queue()
+        workers = []
+        for _ in range(2):
+            requests = context.Queue()
+            process = context.Process(
+                target=_worker, args=(db_path, requests, responses)
+            )
+            process.start()
+            workers.append((process, requests))
+
+        try:
+            session_id = None
+            results = []
+            for turn in range(4):
+                _, requests = workers[turn % 2]
+                requests.put((session_id, f"q{turn}"))
+                result = responses.get(timeout=30)
+                session_id = result[1]
+                results.append(result)
+        finally:
+            for process, requests in workers:
+                requests.put(None)
+                process.join(timeout=30)
+
+        pids = {pid for pid, _, _, _ in results}
+        assert len(pids) == 2
+        assert {sid for _, sid, _, _ in results} == {session_id}
+        assert [message for _, _, message, _ in results] == [None] * 4
+        assert [answer for _, _, _, answer in results] == [
+            "q0 after 0 turn(s)",
+            "q1 after 1 turn(s)",
+            "q2 after 2 turn(s)",
+            "q3 after 3 turn(s)",
+        ]
+        store = SQLiteSessionStore(db_path)
+        assert [question for question, _ in store.get_history(session_id)] == [
+            "q0",
+            "q1",
+            "q2",
+            "q3",
+        ]
+        store.close()
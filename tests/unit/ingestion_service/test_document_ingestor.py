@@ -1,68 +1,129 @@
-from unittest.mock import ANY, Mock, call, patch
+from unittest.mock import ANY, Mock, call
 from pytest import fixture, mark
 import pytest
 from requests import HTTPError
 from src.ingestion_service.document_management_client import DocumentManagementClient
 from src.ingestion_service.document_ingestor import DocumentIngestor
 from src.ingestion_service.file_loader import FileLoader
-from src.ingestion_service.vector_store_builder import VectorStoreBuilder
-from src.shared.constants import DocumentStatus
+from src.ingestion_service.ingestion_pipeline import PipelineConfig
+from src.ingestion_service.source_index import SourceIndex
+from src.ingestion_service.vector_store_builder import (
+    ChunkWritePlan,
+    VectorStoreBuilder,
+)
+from src.shared.constants import DocumentStatus, SetDocumentResult
 from src.shared.exceptions import DocumentHashConflictException, NoDocumentsException
+from src.shared.models import GetDocumentStatusResponse
+from langchain_core.documents import Document
+
+# Mocks can't be pickled into parse worker processes, so parse in-process.
+PIPELINE_CONFIG = PipelineConfig(parse_workers=0)
+
+
+def _status_calls_by_document(mock_dms_client):
+    statuses = {}
+    for status_call in mock_dms_client.update_document_status.call_args_list:
+        doc_hash, doc_name, status = status_call.args
+        statuses.setdefault(doc_name, []).append(status)
+    return statuses
+
+
+def _plan(doc_hash, source, docs, sources_of=None):
+    return ChunkWritePlan(
+        ids=[f"{doc_hash}-{i}" for i in range(len(docs))],
+        docs=docs,
+        vectors=[None] * len(docs),
+    )
+
+
+def _record(status, doc_name="document.pdf"):
+    if status is None:
+        return None
+    return GetDocumentStatusResponse(doc_name=doc_name, status=status)
 
 
 class TestDocumentIngestor:
     @fixture
     def mock_dms_client(self):
-        return Mock(spec=DocumentManagementClient)
+        dms_client = Mock(spec=DocumentManagementClient)
+
+        # The batch calls go through the per-document mocks.
+        def get_documents_batch(doc_hashes):
+            records = {h: dms_client.get_document(h) for h in doc_hashes}
+            return {h: record for h, record in records.items() if record is not None}
+
+        def update_document_statuses(updates):
+            for doc_hash, doc_name, status in updates:
+                dms_client.update_document_status(doc_hash, doc_name, status)
+            return {}
+
+        dms_client.get_documents_batch.side_effect = get_documents_batch
+        dms_client.update_document_statuses.side_effect = update_document_statuses
+        return dms_client
 
     @fixture
     def mock_vector_store_builder(self):
-        return Mock(spec=VectorStoreBuilder)
+        builder = Mock(spec=VectorStoreBuilder)
+        builder.iter_pdf_pages.return_value = [Document(page_content="page")]
+        builder.split_text_to_docs.return_value = [Document(page_content="chunk")]
+        builder.embed_documents.side_effect = lambda texts: [[0.0]] * len(texts)
+        builder.plan_document_write.side_effect = _plan
+        builder.upsert_document.side_effect = _plan
+        return builder
 
     @fixture
     def mock_file_loader(self):
-        return Mock(spec=FileLoader)
+        file_loader = Mock(spec=FileLoader)
+        file_loader.load_pdf_file_hashed.side_effect = lambda document: (
+            f"/tmp/{document}",
+            f"hash-of-{document}",
+        )
+        return file_loader
 
-    @patch("src.ingestion_service.document_ingestor.process_document")
     def test_ingest_document_skips_completed_document(
         self,
-        mock_process_document,
         mock_file_loader,
         mock_vector_store_builder,
         mock_dms_client,
     ):
         doc_ingestor = DocumentIngestor(
-            mock_dms_client, mock_vector_store_builder, mock_file_loader, print
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
         )
         document = "document_already_in_DMS"
-        mock_dms_client.get_document_status.return_value = DocumentStatus.COMPLETED
+        mock_dms_client.get_document.return_value = _record(DocumentStatus.COMPLETED)
         doc_ingestor.ingest_document(document)
 
-        mock_dms_client.get_document_status.assert_called_once()
+        mock_dms_client.get_document.assert_called_once()
         mock_dms_client.update_document_status.assert_not_called()
-        mock_process_document.assert_not_called()
-        mock_vector_store_builder.add_documents_to_vector_store.assert_not_called()
+        mock_vector_store_builder.upsert_document.assert_not_called()
+        mock_file_loader.release_local_file.assert_called_once_with(f"/tmp/{document}")
 
     @pytest.mark.parametrize(
         "status", [DocumentStatus.PENDING, DocumentStatus.ERROR, None]
     )
-    @patch("src.ingestion_service.document_ingestor.process_document")
     def test_ingest_document_processes_document(
         self,
-        mock_process_document,
         mock_file_loader,
         mock_vector_store_builder,
         mock_dms_client,
         status,
     ):
         doc_ingestor = DocumentIngestor(
-            mock_dms_client, mock_vector_store_builder, mock_file_loader, print
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
         )
         document = f"Document in {status} status"
-        mock_dms_client.get_document_status.return_value = status
+        mock_dms_client.get_document.return_value = _record(status)
         doc_ingestor.ingest_document(document)
 
-        mock_dms_client.get_document_status.assert_called_once()
+        mock_dms_client.get_document.assert_called_once()
         assert mock_dms_client.update_document_status.call_count == 2
         mock_dms_client.update_document_status.assert_has_calls(
             [
@@ -70,28 +131,30 @@ class TestDocumentIngestor:
                 call(ANY, ANY, DocumentStatus.COMPLETED),
             ]
         )
-        mock_process_document.assert_called_once()
-        mock_vector_store_builder.add_documents_to_vector_store.assert_called_once()
+        mock_vector_store_builder.iter_pdf_pages.assert_called_once()
+        mock_vector_store_builder.upsert_document.assert_called_once()
 
-    @patch("src.ingestion_service.document_ingestor.process_document")
     def test_ingest_document_process_document_error(
         self,
-        mock_process_document,
         mock_file_loader,
         mock_vector_store_builder,
         mock_dms_client,
     ):
         doc_ingestor = DocumentIngestor(
-            mock_dms_client, mock_vector_store_builder, mock_file_loader, print
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
         )
         document = "Document in PENDING status"
-        mock_dms_client.get_document_status.return_value = DocumentStatus.PENDING
-        mock_process_document.return_value = None  # FileNotFound
+        mock_dms_client.get_document.return_value = _record(DocumentStatus.PENDING)
+        mock_vector_store_builder.split_text_to_docs.return_value = []
 
         with pytest.raises(NoDocumentsException):
             doc_ingestor.ingest_document(document)
 
-        mock_dms_client.get_document_status.assert_called_once()
+        mock_dms_client.get_document.assert_called_once()
         assert mock_dms_client.update_document_status.call_count == 2
         mock_dms_client.update_document_status.assert_has_calls(
             [
@@ -99,30 +162,229 @@ class TestDocumentIngestor:
                 call(ANY, ANY, DocumentStatus.ERROR),
             ]
         )
-        mock_process_document.assert_called_once()
-        mock_vector_store_builder.add_documents_to_vector_store.assert_not_called()
+        mock_vector_store_builder.iter_pdf_pages.assert_called_once()
+        mock_vector_store_builder.upsert_document.assert_not_called()
+        mock_file_loader.release_local_file.assert_called_once_with(f"/tmp/{document}")
+
+    def test_ingest_document_missing_file_is_not_registered(
+        self,
+        mock_file_loader,
+        mock_vector_store_builder,
+        mock_dms_client,
+    ):
+        doc_ingestor = DocumentIngestor(
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
+        )
+        mock_file_loader.load_pdf_file_hashed.side_effect = FileNotFoundError()
+
+        with pytest.raises(NoDocumentsException):
+            doc_ingestor.ingest_document("missing.pdf")
+
+        # Without contents there is no document hash to track in DMS.
+        mock_dms_client.get_document.assert_not_called()
+        mock_dms_client.update_document_status.assert_not_called()
+
+    def test_ingest_document_identifies_document_by_contents(
+        self,
+        mock_file_loader,
+        mock_vector_store_builder,
+        mock_dms_client,
+    ):
+        doc_ingestor = DocumentIngestor(
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
+        )
+        mock_file_loader.load_pdf_file_hashed.side_effect = None
+        mock_file_loader.load_pdf_file_hashed.return_value = ("/tmp/a.pdf", "sha")
+        mock_dms_client.get_document.return_value = None
+
+        doc_ingestor.ingest_document("s3://bucket/a.pdf")
+
+        mock_dms_client.get_document.assert_called_once_with("sha")
+        mock_dms_client.update_document_status.assert_has_calls(
+            [
+                call("sha", "a.pdf", DocumentStatus.PENDING),
+                call("sha", "a.pdf", DocumentStatus.COMPLETED),
+            ]
+        )
+        mock_vector_store_builder.iter_pdf_pages.assert_called_once_with("/tmp/a.pdf")
+
+    def test_ingest_document_skips_same_contents_under_another_name(
+        self,
+        mock_file_loader,
+        mock_vector_store_builder,
+        mock_dms_client,
+    ):
+        doc_ingestor = DocumentIngestor(
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
+        )
+        mock_dms_client.get_document.return_value = _record(
+            DocumentStatus.COMPLETED, doc_name="original.pdf"
+        )
+
+        doc_ingestor.ingest_document("s3://other-bucket/copy.pdf")
+
+        mock_dms_client.update_document_status.assert_not_called()
+        mock_vector_store_builder.iter_pdf_pages.assert_not_called()
+
+    def test_ingest_document_keeps_registered_name_for_known_contents(
+        self,
+        mock_file_loader,
+        mock_vector_store_builder,
+        mock_dms_client,
+    ):
+        doc_ingestor = DocumentIngestor(
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
+        )
+        mock_dms_client.get_document.return_value = _record(
+            DocumentStatus.ERROR, doc_name="original.pdf"
+        )
+
+        doc_ingestor.ingest_document("copy.pdf")
+
+        mock_dms_client.update_document_status.assert_has_calls(
+            [
+                call(ANY, "original.pdf", DocumentStatus.PENDING),
+                call(ANY, "original.pdf", DocumentStatus.COMPLETED),
+            ]
+        )
+
+    def test_ingest_document_unchanged_source_is_not_downloaded(
+        self,
+        mock_file_loader,
+        mock_vector_store_builder,
+        mock_dms_client,
+    ):
+        source_index = Mock(spec=SourceIndex)
+        source_index.get.return_value = "known-sha"
+        doc_ingestor = DocumentIngestor(
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
+            source_index=source_index,
+        )
+        mock_file_loader.get_source_version.return_value = "etag=abc;size=10"
+        mock_dms_client.get_document_status.return_value = DocumentStatus.COMPLETED
+
+        doc_ingestor.ingest_document("s3://bucket/a.pdf")
+
+        source_index.get.assert_called_once_with(
+            "s3://bucket/a.pdf", "etag=abc;size=10"
+        )
+        mock_dms_client.get_document_status.assert_called_once_with("known-sha")
+        mock_file_loader.load_pdf_file_hashed.assert_not_called()
+        mock_dms_client.update_document_status.assert_not_called()
+
+    def test_ingest_document_changed_source_is_downloaded_and_recorded(
+        self,
+        mock_file_loader,
+        mock_vector_store_builder,
+        mock_dms_client,
+    ):
+        source_index = Mock(spec=SourceIndex)
+        source_index.get.return_value = None
+        doc_ingestor = DocumentIngestor(
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
+            source_index=source_index,
+        )
+        mock_file_loader.get_source_version.return_value = "etag=new;size=12"
+        mock_dms_client.get_document.return_value = None
+
+        doc_ingestor.ingest_document("a.pdf")
+
+        mock_file_loader.load_pdf_file_hashed.assert_called_once_with("a.pdf")
+        source_index.put.assert_called_once_with(
+            "a.pdf", "etag=new;size=12", "hash-of-a.pdf"
+        )
+        mock_dms_client.update_document_status.assert_has_calls(
+            [
+                call("hash-of-a.pdf", "a.pdf", DocumentStatus.PENDING),
+                call("hash-of-a.pdf", "a.pdf", DocumentStatus.COMPLETED),
+            ]
+        )
+
+    def test_ingest_document_retires_replaced_version(
+        self,
+        mock_file_loader,
+        mock_vector_store_builder,
+        mock_dms_client,
+    ):
+        doc_ingestor = DocumentIngestor(
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
+        )
+
+        def upsert_replacing_old_version(doc_hash, source, docs, sources_of=None):
+            plan = _plan(doc_hash, source, docs)
+            plan.replaced_doc_hashes = {"old-sha"}
+            return plan
+
+        mock_vector_store_builder.upsert_document.side_effect = (
+            upsert_replacing_old_version
+        )
+        mock_dms_client.get_document.side_effect = [
+            None,
+            _record(DocumentStatus.COMPLETED, doc_name="a.pdf"),
+        ]
+
+        doc_ingestor.ingest_document("a.pdf")
+
+        mock_vector_store_builder.upsert_document.assert_called_once_with(
+            "hash-of-a.pdf", "a.pdf", ANY, sources_of=doc_ingestor.sources_with_hash
+        )
+        assert mock_dms_client.update_document_status.call_args_list == [
+            call("hash-of-a.pdf", "a.pdf", DocumentStatus.PENDING),
+            call("hash-of-a.pdf", "a.pdf", DocumentStatus.COMPLETED),
+            call("old-sha", "a.pdf", DocumentStatus.SUPERSEDED),
+        ]
 
-    @patch("src.ingestion_service.document_ingestor.process_document")
     def test_ingest_document_vector_store_error(
         self,
-        mock_process_document,
         mock_file_loader,
         mock_vector_store_builder,
         mock_dms_client,
     ):
         doc_ingestor = DocumentIngestor(
-            mock_dms_client, mock_vector_store_builder, mock_file_loader, print
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
         )
         document = "Document in PENDING status"
-        mock_dms_client.get_document_status.return_value = DocumentStatus.PENDING
-        mock_vector_store_builder.add_documents_to_vector_store.side_effect = (
-            RuntimeError("Runtime error")
+        mock_dms_client.get_document.return_value = _record(DocumentStatus.PENDING)
+        mock_vector_store_builder.upsert_document.side_effect = RuntimeError(
+            "Runtime error"
         )
 
         with pytest.raises(RuntimeError):
             doc_ingestor.ingest_document(document)
 
-        mock_dms_client.get_document_status.assert_called_once()
+        mock_dms_client.get_document.assert_called_once()
         assert mock_dms_client.update_document_status.call_count == 2
         mock_dms_client.update_document_status.assert_has_calls(
             [
@@ -130,92 +392,97 @@ class TestDocumentIngestor:
                 call(ANY, ANY, DocumentStatus.ERROR),
             ]
         )
-        mock_process_document.assert_called_once()
-        mock_vector_store_builder.add_documents_to_vector_store.assert_called_once()
+        mock_vector_store_builder.iter_pdf_pages.assert_called_once()
+        mock_vector_store_builder.upsert_document.assert_called_once()
 
-    @patch("src.ingestion_service.document_ingestor.process_document")
     def test_ingest_document_dms_error_updating_status(
         self,
-        mock_process_document,
         mock_file_loader,
         mock_vector_store_builder,
         mock_dms_client,
     ):
         doc_ingestor = DocumentIngestor(
-            mock_dms_client, mock_vector_store_builder, mock_file_loader, print
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
         )
         document = "Document in PENDING status"
-        mock_dms_client.get_document_status.return_value = DocumentStatus.PENDING
+        mock_dms_client.get_document.return_value = _record(DocumentStatus.PENDING)
         mock_dms_client.update_document_status.side_effect = HTTPError("DMS exception")
 
         with pytest.raises(HTTPError):
             doc_ingestor.ingest_document(document)
 
-        mock_dms_client.get_document_status.assert_called_once()
+        mock_dms_client.get_document.assert_called_once()
         mock_dms_client.update_document_status.assert_has_calls(
             [
                 call(ANY, ANY, DocumentStatus.PENDING),
                 call(ANY, ANY, DocumentStatus.ERROR),  # Called by _try_set_error_status
             ]
         )
-        mock_process_document.assert_not_called()
-        mock_vector_store_builder.add_documents_to_vector_store.assert_not_called()
+        mock_vector_store_builder.upsert_document.assert_not_called()
 
-    @patch("src.ingestion_service.document_ingestor.process_document")
     def test_ingest_document_dms_error_getting_status(
         self,
-        mock_process_document,
         mock_file_loader,
         mock_vector_store_builder,
         mock_dms_client,
     ):
         doc_ingestor = DocumentIngestor(
-            mock_dms_client, mock_vector_store_builder, mock_file_loader, print
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
         )
         document = "Document in PENDING status"
-        mock_dms_client.get_document_status.side_effect = HTTPError("DMS exception")
+        mock_dms_client.get_document.side_effect = HTTPError("DMS exception")
 
         with pytest.raises(HTTPError):
             doc_ingestor.ingest_document(document)
 
-        mock_dms_client.get_document_status.assert_called_once()
+        mock_dms_client.get_document.assert_called_once()
         mock_dms_client.update_document_status.assert_not_called()
-        mock_process_document.assert_not_called()
-        mock_vector_store_builder.add_documents_to_vector_store.assert_not_called()
+        mock_vector_store_builder.upsert_document.assert_not_called()
 
-    @patch("src.ingestion_service.document_ingestor.process_document")
     def test_ingest_documents_empty_list(
         self,
-        mock_process_document,
         mock_file_loader,
         mock_vector_store_builder,
         mock_dms_client,
     ):
         doc_ingestor = DocumentIngestor(
-            mock_dms_client, mock_vector_store_builder, mock_file_loader, print
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
         )
         documents = []
         results = doc_ingestor.ingest_documents(documents)
 
         assert results == []
-        mock_dms_client.get_document_status.assert_not_called()
+        mock_dms_client.get_document.assert_not_called()
         mock_dms_client.update_document_status.assert_not_called()
-        mock_process_document.assert_not_called()
-        mock_vector_store_builder.add_documents_to_vector_store.assert_not_called()
+        mock_vector_store_builder.upsert_document.assert_not_called()
 
-    @patch("src.ingestion_service.document_ingestor.process_document")
     def test_ingest_documents_completed_document(
         self,
-        mock_process_document,
         mock_file_loader,
         mock_vector_store_builder,
         mock_dms_client,
     ):
         doc_ingestor = DocumentIngestor(
-            mock_dms_client, mock_vector_store_builder, mock_file_loader, print
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
         )
         documents = ["completed_document"]
-        mock_dms_client.get_document_status.return_value = DocumentStatus.COMPLETED
+        mock_dms_client.get_document.return_value = _record(DocumentStatus.COMPLETED)
 
         results = doc_ingestor.ingest_documents(documents)
 
@@ -223,24 +490,25 @@ class TestDocumentIngestor:
         assert results[0].document == "completed_document"
         assert results[0].success is True
         assert results[0].error is None
-        mock_dms_client.get_document_status.assert_called_once()
+        mock_dms_client.get_document.assert_called_once()
         mock_dms_client.update_document_status.assert_not_called()
-        mock_process_document.assert_not_called()
-        mock_vector_store_builder.add_documents_to_vector_store.assert_not_called()
+        mock_vector_store_builder.upsert_document.assert_not_called()
 
-    @patch("src.ingestion_service.document_ingestor.process_document")
     def test_ingest_documents_new_document(
         self,
-        mock_process_document,
         mock_file_loader,
         mock_vector_store_builder,
         mock_dms_client,
     ):
         doc_ingestor = DocumentIngestor(
-            mock_dms_client, mock_vector_store_builder, mock_file_loader, print
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
         )
         documents = ["new_document"]
-        mock_dms_client.get_document_status.return_value = None
+        mock_dms_client.get_document.return_value = _record(None)
 
         results = doc_ingestor.ingest_documents(documents)
 
@@ -248,7 +516,7 @@ class TestDocumentIngestor:
         assert results[0].document == "new_document"
         assert results[0].success is True
         assert results[0].error is None
-        mock_dms_client.get_document_status.assert_called_once()
+        mock_dms_client.get_document.assert_called_once()
         assert mock_dms_client.update_document_status.call_count == 2
         mock_dms_client.update_document_status.assert_has_calls(
             [
@@ -256,24 +524,28 @@ class TestDocumentIngestor:
                 call(ANY, ANY, DocumentStatus.COMPLETED),
             ]
         )
-        mock_process_document.assert_called_once()
-        mock_vector_store_builder.add_documents_to_vector_store.assert_called_once()
+        mock_file_loader.load_pdf_file_hashed.assert_called_once_with("new_document")
+        mock_vector_store_builder.write_document.assert_called_once_with(ANY, [[0.0]])
+        plan = mock_vector_store_builder.write_document.call_args.args[0]
+        assert plan.docs == [Document(page_content="chunk")]
 
-    @patch("src.ingestion_service.document_ingestor.process_document")
     def test_ingest_documents_only_process_one_document(
         self,
-        mock_process_document,
         mock_file_loader,
         mock_vector_store_builder,
         mock_dms_client,
     ):
         doc_ingestor = DocumentIngestor(
-            mock_dms_client, mock_vector_store_builder, mock_file_loader, print
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
         )
         documents = ["new_document", "completed_document"]
-        mock_dms_client.get_document_status.side_effect = [
+        mock_dms_client.get_document.side_effect = [
             None,
-            DocumentStatus.COMPLETED,
+            _record(DocumentStatus.COMPLETED),
         ]
 
         results = doc_ingestor.ingest_documents(documents)
@@ -283,7 +555,7 @@ class TestDocumentIngestor:
         assert results[0].success is True
         assert results[1].document == "completed_document"
         assert results[1].success is True
-        assert mock_dms_client.get_document_status.call_count == 2
+        assert mock_dms_client.get_document.call_count == 2
         assert mock_dms_client.update_document_status.call_count == 2
         mock_dms_client.update_document_status.assert_has_calls(
             [
@@ -291,26 +563,33 @@ class TestDocumentIngestor:
                 call(ANY, ANY, DocumentStatus.COMPLETED),
             ]
         )
-        mock_process_document.assert_called_once()
-        mock_vector_store_builder.add_documents_to_vector_store.assert_called_once()
+        # Both are downloaded to learn their content hash; only one is parsed.
+        assert mock_file_loader.load_pdf_file_hashed.call_count == 2
+        mock_vector_store_builder.iter_pdf_pages.assert_called_once_with(
+            "/tmp/new_document"
+        )
+        mock_vector_store_builder.write_document.assert_called_once()
 
-    @patch("src.ingestion_service.document_ingestor.process_document")
     def test_ingest_documents_one_doc_error_rest_processed(
         self,
-        mock_process_document,
         mock_file_loader,
         mock_vector_store_builder,
         mock_dms_client,
     ):
         doc_ingestor = DocumentIngestor(
-            mock_dms_client, mock_vector_store_builder, mock_file_loader, print
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
         )
         documents = ["new_document", "vector_store_error", "new_document2"]
-        mock_dms_client.get_document_status.return_value = None
-        mock_vector_store_builder.add_documents_to_vector_store.side_effect = [
-            Mock(),
+        mock_dms_client.get_document.return_value = _record(None)
+        # Writes happen in input order even though earlier stages overlap.
+        mock_vector_store_builder.write_document.side_effect = [
+            None,
             RuntimeError("Runtime error"),
-            Mock(),
+            None,
         ]
 
         results = doc_ingestor.ingest_documents(documents)
@@ -325,32 +604,89 @@ class TestDocumentIngestor:
         assert results[2].document == "new_document2"
         assert results[2].success is True
         assert results[2].error is None
-        assert mock_dms_client.get_document_status.call_count == 3
+        assert mock_dms_client.get_document.call_count == 3
         assert mock_dms_client.update_document_status.call_count == 6
-        mock_dms_client.update_document_status.assert_has_calls(
-            [
-                call(ANY, ANY, DocumentStatus.PENDING),
-                call(ANY, ANY, DocumentStatus.COMPLETED),
-                call(ANY, ANY, DocumentStatus.PENDING),
-                call(ANY, ANY, DocumentStatus.ERROR),
-                call(ANY, ANY, DocumentStatus.PENDING),
-                call(ANY, ANY, DocumentStatus.COMPLETED),
-            ]
+        # Stages overlap, so transitions interleave across documents.
+        assert _status_calls_by_document(mock_dms_client) == {
+            "new_document": [DocumentStatus.PENDING, DocumentStatus.COMPLETED],
+            "vector_store_error": [DocumentStatus.PENDING, DocumentStatus.ERROR],
+            "new_document2": [DocumentStatus.PENDING, DocumentStatus.COMPLETED],
+        }
+        assert mock_file_loader.load_pdf_file_hashed.call_count == 3
+        assert mock_vector_store_builder.write_document.call_count == 3
+
+    def test_ingest_documents_deduplicates_same_contents_in_batch(
+        self,
+        mock_file_loader,
+        mock_vector_store_builder,
+        mock_dms_client,
+    ):
+        doc_ingestor = DocumentIngestor(
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
+        )
+        mock_file_loader.load_pdf_file_hashed.side_effect = lambda document: (
+            f"/tmp/{document}",
+            "same-sha",
+        )
+        mock_dms_client.get_document.return_value = None
+
+        results = doc_ingestor.ingest_documents(
+            ["s3://a/report.pdf", "s3://b/report-copy.pdf"]
+        )
+
+        assert [result.success for result in results] == [True, True]
+        mock_dms_client.get_document.assert_called_once_with("same-sha")
+        assert _status_calls_by_document(mock_dms_client) == {
+            "report.pdf": [DocumentStatus.PENDING, DocumentStatus.COMPLETED]
+        }
+        mock_vector_store_builder.write_document.assert_called_once()
+
+    def test_ingest_documents_duplicate_shares_original_failure(
+        self,
+        mock_file_loader,
+        mock_vector_store_builder,
+        mock_dms_client,
+    ):
+        doc_ingestor = DocumentIngestor(
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
+        )
+        mock_file_loader.load_pdf_file_hashed.side_effect = lambda document: (
+            f"/tmp/{document}",
+            "same-sha",
         )
-        assert mock_process_document.call_count == 3
-        assert mock_vector_store_builder.add_documents_to_vector_store.call_count == 3
+        mock_dms_client.get_document.return_value = None
+        mock_vector_store_builder.write_document.side_effect = RuntimeError(
+            "Runtime error"
+        )
+
+        results = doc_ingestor.ingest_documents(["a.pdf", "b.pdf"])
+
+        assert [result.error for result in results] == [
+            "Runtime error",
+            "Runtime error",
+        ]
 
-    @patch("src.ingestion_service.document_ingestor.process_document")
     def test_ingest_document_hash_conflict_does_not_set_error_status(
         self,
-        mock_process_document,
         mock_file_loader,
         mock_vector_store_builder,
         mock_dms_client,
     ):
         """When DocumentHashConflictException is raised, do not set ERROR status."""
         doc_ingestor = DocumentIngestor(
-            mock_dms_client, mock_vector_store_builder, mock_file_loader, print
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
         )
         document = "Document"
         mock_dms_client.update_document_status.side_effect = (
@@ -360,14 +696,127 @@ class TestDocumentIngestor:
         with pytest.raises(DocumentHashConflictException):
             doc_ingestor.ingest_document(document)
 
-        mock_dms_client.get_document_status.assert_called_once()
+        mock_dms_client.get_document.assert_called_once()
         # Only called once (PENDING) - no ERROR status should be set
         mock_dms_client.update_document_status.assert_called_once_with(
             ANY, ANY, DocumentStatus.PENDING
         )
         # Processing should not happen
-        mock_process_document.assert_not_called()
-        mock_vector_store_builder.add_documents_to_vector_store.assert_not_called()
+        mock_vector_store_builder.upsert_document.assert_not_called()
+
+    def test_start_documents_uses_two_dms_requests(
+        self,
+        mock_file_loader,
+        mock_vector_store_builder,
+        mock_dms_client,
+    ):
+        doc_ingestor = DocumentIngestor(
+            mock_dms_client, mock_vector_store_builder, mock_file_loader, print
+        )
+        mock_dms_client.get_documents_batch.side_effect = None
+        mock_dms_client.get_documents_batch.return_value = {
+            "hash-a": GetDocumentStatusResponse(
+                doc_hash="hash-a", doc_name="a.pdf", status=DocumentStatus.COMPLETED
+            ),
+            "hash-b": GetDocumentStatusResponse(
+                doc_hash="hash-b", doc_name="old-b.pdf", status=DocumentStatus.ERROR
+            ),
+        }
+        mock_dms_client.update_document_statuses.side_effect = None
+        mock_dms_client.update_document_statuses.return_value = {
+            "hash-b": SetDocumentResult.UPDATED,
+            "hash-c": SetDocumentResult.CONFLICT,
+        }
+
+        outcomes = doc_ingestor.start_documents(
+            [("a.pdf", "hash-a"), ("b.pdf", "hash-b"), ("c.pdf", "hash-c")]
+        )
+
+        assert outcomes[0] is None
+        assert outcomes[1] == ("hash-b", "old-b.pdf")
+        assert isinstance(outcomes[2], DocumentHashConflictException)
+        updates = list(mock_dms_client.update_document_statuses.call_args.args[0])
+        assert updates == [
+            ("hash-b", "old-b.pdf", DocumentStatus.PENDING),
+            ("hash-c", "c.pdf", DocumentStatus.PENDING),
+        ]
+        mock_dms_client.get_document.assert_not_called()
+        mock_dms_client.update_document_status.assert_not_called()
+
+    def test_start_documents_falls_back_to_one_by_one(
+        self,
+        mock_file_loader,
+        mock_vector_store_builder,
+        mock_dms_client,
+    ):
+        doc_ingestor = DocumentIngestor(
+            mock_dms_client, mock_vector_store_builder, mock_file_loader, print
+        )
+        mock_dms_client.get_documents_batch.side_effect = HTTPError("404")
+        mock_dms_client.get_document.side_effect = [HTTPError("DMS down"), None]
+
+        outcomes = doc_ingestor.start_documents(
+            [("a.pdf", "hash-a"), ("b.pdf", "hash-b")]
+        )
+
+        assert isinstance(outcomes[0], HTTPError)
+        assert outcomes[1] == ("hash-b", "b.pdf")
+        mock_dms_client.update_document_status.assert_called_once_with(
+            "hash-b", "b.pdf", DocumentStatus.PENDING
+        )
+
+    def test_complete_documents_retires_replaced_versions_together(
+        self,
+        mock_file_loader,
+        mock_vector_store_builder,
+        mock_dms_client,
+    ):
+        doc_ingestor = DocumentIngestor(
+            mock_dms_client, mock_vector_store_builder, mock_file_loader, print
+        )
+        mock_dms_client.get_document.side_effect = lambda doc_hash: (
+            GetDocumentStatusResponse(
+                doc_hash=doc_hash, doc_name="old.pdf", status=DocumentStatus.COMPLETED
+            )
+        )
+
+        errors = doc_ingestor.complete_documents(
+            [("hash-a", "a.pdf", ["old-a"]), ("hash-b", "b.pdf", ["old-b"])]
+        )
+
+        assert errors == [None, None]
+        assert mock_dms_client.update_document_statuses.call_count == 2
+        mock_dms_client.get_documents_batch.assert_called_once()
+        mock_dms_client.update_document_status.assert_any_call(
+            "old-b", "old.pdf", DocumentStatus.SUPERSEDED
+        )
+
+    def test_check_sources_skips_unchanged_with_one_lookup(
+        self,
+        mock_file_loader,
+        mock_vector_store_builder,
+        mock_dms_client,
+    ):
+        source_index = Mock(spec=SourceIndex)
+        source_index.get.side_effect = lambda document, version: (
+            "known-hash" if document == "a.pdf" else None
+        )
+        mock_file_loader.get_source_version.side_effect = ["v1", "v2", None]
+        mock_dms_client.get_document.return_value = GetDocumentStatusResponse(
+            doc_hash="known-hash", doc_name="a.pdf", status=DocumentStatus.COMPLETED
+        )
+        doc_ingestor = DocumentIngestor(
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            source_index=source_index,
+        )
+
+        sources = doc_ingestor.check_sources(["a.pdf", "b.pdf", "c.pdf"])
+
+        assert sources == [("v1", "known-hash"), ("v2", None), (None, None)]
+        mock_dms_client.get_documents_batch.assert_called_once()
 
     @mark.parametrize(
         "document_path,expected_name",
@@ -394,7 +843,11 @@ class TestDocumentIngestor:
     ):
         """Test that doc_name is correctly extracted from various path formats."""
         doc_ingestor = DocumentIngestor(
-            mock_dms_client, mock_vector_store_builder, mock_file_loader, print
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            print,
+            PIPELINE_CONFIG,
         )
 
         result = doc_ingestor._extract_doc_name(document_path)
@@ -0,0 +1,81 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.ingestion_service.document_management_client import DocumentManagementClient
+from src.shared.constants import DocumentStatus
+
+sample_hash = "d41d8cd98f00b204e9800998ecf8427e"
+sample_doc_name = "Test doc name"
+
+
+def _response(status_code, body=None, etag=None):
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = body
+    response.headers = {"ETag": etag} if etag else {}
+    return response
+
+
+class TestDocumentManagementClient:
+    @pytest.fixture()
+    def dms_client(self):
+        return DocumentManagementClient("test_url")
+
+    @patch("src.ingestion_service.document_management_client.requests")
+    def test_get_document_revalidates_with_etag(self, mock_requests, dms_client):
+        body = {"doc_name": sample_doc_name, "status": DocumentStatus.PENDING}
+        mock_requests.get.side_effect = [
+            _response(200, body, etag='"1"'),
+            _response(304, etag='"1"'),
+        ]
+
+        first = dms_client.get_document(sample_hash)
+        second = dms_client.get_document(sample_hash)
+
+        assert second == first
+        assert second.status == DocumentStatus.PENDING
+        assert mock_requests.get.call_args_list[0].kwargs["headers"] == {}
+        assert mock_requests.get.call_args_list[1].kwargs["headers"] == {
+            "If-None-Match": '"1"'
+        }
+
+    @patch("src.ingestion_service.document_management_client.requests")
+    def test_get_document_replaces_changed_status(self, mock_requests, dms_client):
+        mock_requests.get.side_effect = [
+            _response(
+                200,
+                {"doc_name": sample_doc_name, "status": DocumentStatus.PENDING},
+                etag='"1"',
+            ),
+            _response(
+                200,
+                {"doc_name": sample_doc_name, "status": DocumentStatus.COMPLETED},
+                etag='"2"',
+            ),
+            _response(304, etag='"2"'),
+        ]
+
+        dms_client.get_document(sample_hash)
+        dms_client.get_document(sample_hash)
+
+        assert dms_client.get_document_status(sample_hash) == DocumentStatus.COMPLETED
+        assert mock_requests.get.call_args.kwargs["headers"] == {"If-None-Match": '"2"'}
+
+    @patch("src.ingestion_service.document_management_client.requests")
+    def test_get_document_cache_keeps_most_recent(self, mock_requests, dms_client):
+        dms_client.STATUS_CACHE_SIZE = 1
+        mock_requests.get.side_effect = [
+            _response(
+                200,
+                {"doc_name": name, "status": DocumentStatus.PENDING},
+                etag='"1"',
+            )
+            for name in ("a.pdf", "b.pdf", "a.pdf")
+        ]
+
+        dms_client.get_document("hash-a")
+        dms_client.get_document("hash-b")
+        dms_client.get_document("hash-a")
+
+        assert mock_requests.get.call_args.kwargs["headers"] == {}
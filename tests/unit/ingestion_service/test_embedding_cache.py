@@ -0,0 +1,106 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.ingestion_service import embedding_cache as embedding_cache_module
+from src.ingestion_service.embedding_cache import (
+    ChunkEmbeddingCache,
+    encoder_id,
+    get_embedding_cache,
+)
+
+MODEL = "sentence-transformers/paraphrase-MiniLM-L3-v2"
+
+
+class TestChunkEmbeddingCache:
+    def test_returns_stored_vectors_by_model_and_text(self, tmp_path):
+        cache = ChunkEmbeddingCache(str(tmp_path))
+        cache.put_many(MODEL, ["alpha", "beta"], [[1.0, 2.0], [3.0, 4.0]])
+
+        vectors = cache.get_many(MODEL, ["beta", "gamma", "alpha"])
+
+        assert vectors == [[3.0, 4.0], None, [1.0, 2.0]]
+        assert cache.get_many("other-model", ["alpha"]) == [None]
+        assert cache.get_stats() == {"hits": 2, "misses": 2, "evictions": 0}
+
+    def test_encode_options_that_change_vectors_get_their_own_entries(self, tmp_path):
+        cache = ChunkEmbeddingCache(str(tmp_path))
+        plain = encoder_id(MODEL, {"batch_size": 32, "normalize_embeddings": False})
+        normalized = encoder_id(MODEL, {"batch_size": 32, "normalize_embeddings": True})
+        cache.put_many(plain, ["alpha"], [[3.0, 4.0]])
+
+        assert cache.get_many(normalized, ["alpha"]) == [None]
+        assert cache.get_many(
+            encoder_id(MODEL, {"batch_size": 64, "normalize_embeddings": False}),
+            ["alpha"],
+        ) == [[3.0, 4.0]]
+        assert cache._path(plain) != cache._path(normalized)
+
+    def test_persists_across_instances(self, tmp_path):
+        directory = str(tmp_path / "nested")
+        first = ChunkEmbeddingCache(directory)
+        first.put_many(MODEL, ["alpha"], [[0.5, -0.25]])
+        first.close()
+
+        assert ChunkEmbeddingCache(directory).get_many(MODEL, ["alpha"]) == [
+            [0.5, -0.25]
+        ]
+
+    def test_float16_halves_the_vector_file(self, tmp_path):
+        cache = ChunkEmbeddingCache(str(tmp_path), dtype="float16")
+        vector = np.linspace(-1, 1, 384).tolist()
+
+        cache.put_many(MODEL, ["alpha"], [vector])
+
+        assert os.path.getsize(cache._path(MODEL)) == 384 * 2
+        assert cache.get_many(MODEL, ["alpha"])[0] == pytest.approx(vector, abs=1e-3)
+
+    def test_evicts_least_recently_used_at_the_size_cap(self, tmp_path):
+        # Room for three 2-dimensional float32 vectors.
+        cache = ChunkEmbeddingCache(str(tmp_path), max_bytes=3 * 2 * 4)
+        cache.put_many(MODEL, ["a", "b", "c"], [[1.0, 1.0], [2.0, 2.0], [3.0, 3.0]])
+        cache.get_many(MODEL, ["a"])
+
+        cache.put_many(MODEL, ["d"], [[4.0, 4.0]])
+
+        assert cache.get_many(MODEL, ["a", "b", "c", "d"]) == [
+            [1.0, 1.0],
+            None,
+            [3.0, 3.0],
+            [4.0, 4.0],
+        ]
+        assert os.path.getsize(cache._path(MODEL)) == 3 * 2 * 4
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_lowering_the_size_cap_drops_rows_past_it(self, tmp_path):
+        directory = str(tmp_path)
+        ChunkEmbeddingCache(directory).put_many(
+            MODEL, ["a", "b", "c"], [[1.0], [2.0], [3.0]]
+        )
+        cache = ChunkEmbeddingCache(directory, max_bytes=2 * 4)
+
+        cache.put_many(MODEL, ["d"], [[4.0]])
+
+        assert os.path.getsize(cache._path(MODEL)) == 2 * 4
+        assert cache.get_many(MODEL, ["d"]) == [[4.0]]
+        assert cache.get_many(MODEL, ["a", "b", "c"]).count(None) == 2
+
+    def test_new_dimension_starts_the_model_over(self, tmp_path):
+        cache = ChunkEmbeddingCache(str(tmp_path))
+        cache.put_many(MODEL, ["alpha"], [[1.0, 2.0]])
+
+        cache.put_many(MODEL, ["beta"], [[1.0, 2.0, 3.0]])
+
+        assert cache.get_many(MODEL, ["alpha", "beta"]) == [None, [1.0, 2.0, 3.0]]
+
+    def test_rejects_mismatched_vectors_and_dtypes(self, tmp_path):
+        with pytest.raises(ValueError):
+            ChunkEmbeddingCache(str(tmp_path), dtype="int8")
+        with pytest.raises(ValueError):
+            ChunkEmbeddingCache(str(tmp_path)).put_many(MODEL, ["a", "b"], [[1.0]])
+
+    def test_empty_dir_disables_the_cache(self, monkeypatch):
+        monkeypatch.setattr(embedding_cache_module, "EMBEDDING_CACHE_DIR", "")
+
+        assert get_embedding_cache() is None
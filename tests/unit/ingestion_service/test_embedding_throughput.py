@@ -0,0 +1,42 @@
+from unittest.mock import Mock
+
+from src.ingestion_service.embedding_throughput import (
+    EmbeddingThroughput,
+    count_tokens,
+)
+
+
+class TestEmbeddingThroughput:
+    def test_rates_accumulate_across_batches(self):
+        throughput = EmbeddingThroughput()
+
+        throughput.record(chunks=10, tokens=1000, seconds=2.0)
+        batch = throughput.record(chunks=30, tokens=3000, seconds=2.0)
+
+        assert batch["chunks_per_second"] == 15.0
+        stats = throughput.get_stats()
+        assert stats["chunks"] == 40
+        assert stats["chunks_per_second"] == 10.0
+        assert stats["tokens_per_second"] == 1000.0
+        assert stats["last_batch"] == batch
+
+    def test_empty_stats_have_zero_rates(self):
+        stats = EmbeddingThroughput().get_stats()
+
+        assert stats["chunks_per_second"] == 0.0
+        assert stats["tokens_per_second"] == 0.0
+
+
+class TestCountTokens:
+    def test_uses_model_tokenizer_when_available(self):
+        embeddings = Mock()
+        embeddings._client.tokenizer.return_value = {
+            "input_ids": [[101, 7, 102], [101, 8, 9, 102]]
+        }
+
+        assert count_tokens(embeddings, ["a", "b c"]) == 7
+
+    def test_falls_back_to_word_count(self):
+        embeddings = Mock(spec=["embed_documents"])
+
+        assert count_tokens(embeddings, ["one two", "three"]) == 3
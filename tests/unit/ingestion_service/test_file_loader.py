@@ -1,5 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
+
+import boto3
+from moto import mock_aws
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 
 from src.ingestion_service import file_loader as file_loader_module
 from src.shared.exceptions import ConfigurationException
@@ -129,7 +135,169 @@ class TestFileLoader:
         out = loader._download_file_from_s3("s3://bucket/k/a.pdf")
 
         assert out == "/tmp/aws-temp/r.pdf"
-        mock_makedirs.assert_called_once_with("/tmp/aws-temp")
+        mock_makedirs.assert_called_once_with("/tmp/aws-temp", exist_ok=True)
         s3_client.download_file.assert_called_once_with(
-            "bucket", "k/a.pdf", "/tmp/aws-temp/r.pdf"
+            "bucket", "k/a.pdf", "/tmp/aws-temp/r.pdf", Config=loader.transfer_config
+        )
+
+    def test_load_pdf_file_hashed_hashes_local_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(file_loader_module, "AWS_TEMP_FOLDER", str(tmp_path / "s3"))
+        monkeypatch.setattr(file_loader_module, "HASH_BLOCK_SIZE", 4)
+        pdf = tmp_path / "a.pdf"
+        pdf.write_bytes(b"%PDF-1.4 contents")
+        loader = FileLoader()
+
+        path, doc_hash = loader.load_pdf_file_hashed(str(pdf))
+
+        assert path == str(pdf)
+        assert doc_hash == hashlib.sha256(b"%PDF-1.4 contents").hexdigest()
+
+    @patch("src.ingestion_service.file_loader.boto3.client")
+    def test_load_pdf_file_hashed_hashes_s3_object_while_downloading(
+        self, mock_boto_client, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(file_loader_module, "AWS_TEMP_FOLDER", str(tmp_path / "s3"))
+        s3_client = mock_boto_client.return_value
+
+        def download_fileobj(bucket, key, fileobj, Config):
+            assert not hasattr(fileobj, "seek")  # parts must arrive in order
+            for part in (b"%PDF", b"-1.4 ", b"contents"):
+                fileobj.write(part)
+
+        s3_client.download_fileobj.side_effect = download_fileobj
+        loader = FileLoader()
+
+        path, doc_hash = loader.load_pdf_file_hashed("s3://bucket/k/a.pdf")
+
+        assert doc_hash == hashlib.sha256(b"%PDF-1.4 contents").hexdigest()
+        with open(path, "rb") as downloaded:
+            assert downloaded.read() == b"%PDF-1.4 contents"
+        s3_client.download_fileobj.assert_called_once_with(
+            "bucket", "k/a.pdf", ANY, Config=loader.transfer_config
+        )
+
+    def test_get_source_version_changes_with_local_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(file_loader_module, "AWS_TEMP_FOLDER", str(tmp_path / "s3"))
+        pdf = tmp_path / "a.pdf"
+        pdf.write_bytes(b"one")
+        loader = FileLoader()
+        before = loader.get_source_version(str(pdf))
+
+        pdf.write_bytes(b"three")
+
+        assert loader.get_source_version(str(pdf)) != before
+
+    def test_get_source_version_raises_for_missing_local_file(
+        self, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(file_loader_module, "AWS_TEMP_FOLDER", str(tmp_path / "s3"))
+        loader = FileLoader()
+
+        with pytest.raises(FileNotFoundError, match="File not found"):
+            loader.get_source_version(str(tmp_path / "missing.pdf"))
+
+    @patch("src.ingestion_service.file_loader.boto3.client")
+    def test_get_source_version_uses_s3_etag_and_size(
+        self, mock_boto_client, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(file_loader_module, "AWS_TEMP_FOLDER", str(tmp_path / "s3"))
+        s3_client = mock_boto_client.return_value
+        s3_client.head_object.return_value = {"ETag": '"abc"', "ContentLength": 10}
+        loader = FileLoader()
+
+        version = loader.get_source_version("s3://bucket/k/a.pdf")
+
+        assert version == 'etag="abc";size=10'
+        s3_client.head_object.assert_called_once_with(Bucket="bucket", Key="k/a.pdf")
+        s3_client.download_fileobj.assert_not_called()
+
+    @patch("src.ingestion_service.file_loader.boto3.client")
+    def test_get_source_version_is_none_when_s3_head_fails(
+        self, mock_boto_client, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(file_loader_module, "AWS_TEMP_FOLDER", str(tmp_path / "s3"))
+        mock_boto_client.return_value.head_object.side_effect = Exception("403")
+        loader = FileLoader()
+
+        assert loader.get_source_version("s3://bucket/k/a.pdf") is None
+
+
+@pytest.fixture
+def s3_loader(tmp_path, monkeypatch):
+    """A FileLoader whose S3 client talks to moto's in-memory S3."""
+    monkeypatch.setattr(file_loader_module, "AWS_TEMP_FOLDER", str(tmp_path / "s3"))
+    monkeypatch.setattr(file_loader_module, "AWS_REGION", "us-east-1")
+    monkeypatch.setattr(file_loader_module, "AWS_ENDPOINT_URL", None)
+    monkeypatch.setattr(file_loader_module, "AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setattr(file_loader_module, "AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="docs")
+        yield FileLoader()
+
+
+def _put_object(key, body):
+    boto3.client("s3", region_name="us-east-1").put_object(
+        Bucket="docs", Key=key, Body=body
+    )
+
+
+class TestFileLoaderS3:
+    def test_concurrent_downloads_share_one_client(self, s3_loader):
+        bodies = {f"k/{index}.pdf": os.urandom(2048) for index in range(8)}
+        for key, body in bodies.items():
+            _put_object(key, body)
+
+        with patch(
+            "src.ingestion_service.file_loader.boto3.client", wraps=boto3.client
+        ) as client_factory, ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(
+                pool.map(
+                    s3_loader.load_pdf_file_hashed,
+                    [f"s3://docs/{key}" for key in bodies],
+                )
+            )
+
+        client_factory.assert_called_once()
+        for (path, doc_hash), body in zip(results, bodies.values()):
+            assert doc_hash == hashlib.sha256(body).hexdigest()
+            with open(path, "rb") as downloaded:
+                assert downloaded.read() == body
+
+    def test_large_object_downloads_in_ranged_parts(self, s3_loader):
+        body = os.urandom(10 * 1024)
+        _put_object("k/big.pdf", body)
+        s3_loader.transfer_config.multipart_threshold = 1024
+        s3_loader.transfer_config.multipart_chunksize = 1024
+        ranges = []
+        s3_loader._create_s3_client().meta.events.register(
+            "before-call.s3.GetObject",
+            lambda params, **_: ranges.append(params.get("Range")),
         )
+
+        path, doc_hash = s3_loader.load_pdf_file_hashed("s3://docs/k/big.pdf")
+
+        assert len(ranges) == 10
+        assert doc_hash == hashlib.sha256(body).hexdigest()
+        with open(path, "rb") as downloaded:
+            assert downloaded.read() == body
+
+    def test_release_local_file_deletes_only_downloaded_copies(
+        self, s3_loader, tmp_path
+    ):
+        _put_object("k/a.pdf", b"%PDF-1.4")
+        downloaded, _ = s3_loader.load_pdf_file_hashed("s3://docs/k/a.pdf")
+        source = tmp_path / "source.pdf"
+        source.write_bytes(b"%PDF-1.4")
+
+        s3_loader.release_local_file(downloaded)
+        s3_loader.release_local_file(str(source))
+        s3_loader.release_local_file(downloaded)
+
+        assert not os.path.exists(downloaded)
+        assert source.exists()
+
+    def test_failed_download_leaves_no_temp_file(self, s3_loader):
+        with pytest.raises(Exception, match="Error downloading file from S3"):
+            s3_loader.load_pdf_file_hashed("s3://docs/k/missing.pdf")
+
+        assert os.listdir(file_loader_module.AWS_TEMP_FOLDER) == []
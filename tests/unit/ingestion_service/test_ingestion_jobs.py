@@ -0,0 +1,172 @@
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.ingestion_service.document_ingestor import DocumentIngestionResult
+from src.ingestion_service.ingestion_jobs import (
+    IngestionJob,
+    IngestionJobManager,
+    JobStatus,
+)
+from src.ingestion_service.progress import IngestionStage, ProgressEvent
+
+
+def _wait_until_finished(job, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not job.finished:
+        assert time.monotonic() < deadline, f"Job still {job.status}"
+        time.sleep(0.01)
+
+
+class TestIngestionJob:
+    def test_events_update_document_progress_and_are_forwarded(self):
+        forwarded = Mock()
+        job = IngestionJob(["a.pdf", "b.pdf"], forwarded)
+        event = ProgressEvent(
+            "a.pdf", IngestionStage.COMPLETED, "saved", chunks=10, embedded=4
+        )
+
+        job.record(event)
+        job.record(ProgressEvent("b.pdf", IngestionStage.PARSING, "parsing"))
+
+        snapshot = job.snapshot()
+        assert snapshot["documents"][0]["stage"] == "completed"
+        assert snapshot["documents"][1]["stage"] == "parsing"
+        assert snapshot["succeeded"] == 1
+        assert snapshot["in_progress"] == 1
+        assert (snapshot["chunks"], snapshot["embedded"]) == (10, 4)
+        forwarded.assert_any_call(event)
+
+    def test_throughput_counts_completed_chunks(self):
+        job = IngestionJob(["a.pdf"])
+        job.start()
+        job.record(
+            ProgressEvent("a.pdf", IngestionStage.COMPLETED, "saved", chunks=100)
+        )
+        job.finish([DocumentIngestionResult(document="a.pdf", success=True)])
+
+        snapshot = job.snapshot()
+
+        assert snapshot["status"] == "completed"
+        assert snapshot["chunks_per_second"] == pytest.approx(
+            100 / snapshot["elapsed_seconds"]
+        )
+
+    def test_finish_marks_duplicates_of_failed_documents_failed(self):
+        job = IngestionJob(["a.pdf", "copy-of-a.pdf"])
+        job.start()
+        job.record(ProgressEvent("copy-of-a.pdf", IngestionStage.SKIPPED, "same"))
+
+        job.finish(
+            [
+                DocumentIngestionResult(document="a.pdf", success=False, error="x"),
+                DocumentIngestionResult(
+                    document="copy-of-a.pdf", success=False, error="x"
+                ),
+            ]
+        )
+
+        snapshot = job.snapshot()
+        assert [d["stage"] for d in snapshot["documents"]] == ["failed", "failed"]
+        assert snapshot["failed"] == 2
+
+    def test_cancel_queued_job_finishes_it(self):
+        job = IngestionJob(["a.pdf"])
+
+        assert job.cancel() is True
+
+        assert job.status == JobStatus.CANCELLED
+        assert job.start() is False
+        assert job.cancel() is False
+
+
+class TestIngestionJobManager:
+    def test_submit_returns_before_the_job_runs(self):
+        release = threading.Event()
+        doc_ingestor = Mock()
+        doc_ingestor.ingest_documents.side_effect = lambda documents, *_: (
+            release.wait(5)
+            and [DocumentIngestionResult(document=d, success=True) for d in documents]
+        )
+        manager = IngestionJobManager(doc_ingestor)
+
+        job = manager.submit([" a.pdf ", "", "a.pdf", "b.pdf"])
+
+        assert job.status in (JobStatus.QUEUED, JobStatus.RUNNING)
+        assert manager.get(job.job_id) is job
+        release.set()
+        _wait_until_finished(job)
+        assert job.status == JobStatus.COMPLETED
+        doc_ingestor.ingest_documents.assert_called_once_with(
+            ["a.pdf", "b.pdf"], job.record, job.cancel_event
+        )
+        manager.shutdown()
+
+    def test_batch_error_fails_the_job(self):
+        doc_ingestor = Mock()
+        doc_ingestor.ingest_documents.side_effect = Exception("Vector store down")
+        manager = IngestionJobManager(doc_ingestor)
+
+        job = manager.submit(["a.pdf"])
+
+        _wait_until_finished(job)
+        assert job.status == JobStatus.FAILED
+        assert job.snapshot()["error"] == "Vector store down"
+        manager.shutdown()
+
+    def test_jobs_run_one_at_a_time_and_queued_ones_can_be_cancelled(self):
+        release = threading.Event()
+        doc_ingestor = Mock()
+        doc_ingestor.ingest_documents.side_effect = lambda documents, *_: (
+            release.wait(5) and []
+        )
+        manager = IngestionJobManager(doc_ingestor, workers=1)
+        running = manager.submit(["a.pdf"])
+        queued = manager.submit(["b.pdf"])
+
+        assert queued.cancel() is True
+
+        release.set()
+        _wait_until_finished(running)
+        manager.shutdown()
+        assert queued.status == JobStatus.CANCELLED
+        doc_ingestor.ingest_documents.assert_called_once()
+
+    def test_only_recent_finished_jobs_are_kept(self):
+        doc_ingestor = Mock()
+        doc_ingestor.ingest_documents.return_value = []
+        manager = IngestionJobManager(doc_ingestor, history=1)
+        first = manager.submit(["a.pdf"])
+        _wait_until_finished(first)
+        second = manager.submit(["b.pdf"])
+        _wait_until_finished(second)
+
+        manager.submit(["c.pdf"])
+
+        assert manager.get(first.job_id) is None
+        assert manager.get(second.job_id) is second
+        manager.shutdown()
+
+    def test_shutdown_cancels_running_jobs(self):
+        started = threading.Event()
+
+        def ingest_documents(documents, progress, cancel_event):
+            started.set()
+            assert cancel_event.wait(5)
+            return []
+
+        doc_ingestor = Mock()
+        doc_ingestor.ingest_documents.side_effect = ingest_documents
+        manager = IngestionJobManager(doc_ingestor)
+        job = manager.submit(["a.pdf"])
+        assert started.wait(5)
+
+        manager.shutdown()
+
+        assert job.status == JobStatus.CANCELLED
+
+    def test_rejects_invalid_worker_count(self):
+        with pytest.raises(ValueError):
+            IngestionJobManager(Mock(), workers=0)
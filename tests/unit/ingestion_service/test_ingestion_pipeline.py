@@ -0,0 +1,579 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+import pickle
+import queue
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+from langchain_core.documents import Document
+
+from src.ingestion_service.document_ingestor import DocumentIngestor
+from src.ingestion_service.document_management_client import DocumentManagementClient
+from src.ingestion_service.file_loader import FileLoader
+from src.ingestion_service.ingestion_pipeline import (
+    IngestionPipeline,
+    PipelineConfig,
+    _DONE,
+    _Job,
+    _Run,
+    _init_parse_worker,
+    _parse_in_worker,
+    parse_document,
+)
+from src.ingestion_service.progress import IngestionStage
+from src.ingestion_service.vector_store_builder import (
+    ChunkWritePlan,
+    LegacyVectorStoreBuilder,
+    VectorStoreBuilder,
+)
+from src.shared.constants import DocumentStatus, SetDocumentResult
+from src.shared.exceptions import (
+    DocumentHashConflictException,
+    IngestionCancelledException,
+    NoDocumentsException,
+)
+
+TEST_PDF = "tests/data/pdf-test.pdf"
+
+
+def _chunks(document, count=2):
+    return [Document(page_content=f"{document} chunk {i}") for i in range(count)]
+
+
+def _plan(doc_hash, source, docs, sources_of=None):
+    return ChunkWritePlan(
+        ids=[f"{doc_hash}-{i}" for i in range(len(docs))],
+        docs=docs,
+        vectors=[None] * len(docs),
+    )
+
+
+@pytest.fixture
+def mock_dms_client():
+    dms_client = Mock(spec=DocumentManagementClient)
+    dms_client.get_document.return_value = None
+
+    # The batch calls go through the per-document mocks.
+    def get_documents_batch(doc_hashes):
+        records = {
+            doc_hash: dms_client.get_document(doc_hash) for doc_hash in doc_hashes
+        }
+        return {doc_hash: r for doc_hash, r in records.items() if r is not None}
+
+    def update_document_statuses(updates):
+        results = {}
+        for doc_hash, doc_name, status in updates:
+            dms_client.update_document_status(doc_hash, doc_name, status)
+            results[doc_hash] = SetDocumentResult.UPDATED
+        return results
+
+    dms_client.get_documents_batch.side_effect = get_documents_batch
+    dms_client.update_document_statuses.side_effect = update_document_statuses
+    return dms_client
+
+
+@pytest.fixture
+def mock_file_loader():
+    file_loader = Mock(spec=FileLoader)
+    file_loader.load_pdf_file_hashed.side_effect = lambda document: (
+        f"/tmp/{document}",
+        f"hash-of-{document}",
+    )
+    return file_loader
+
+
+@pytest.fixture
+def mock_vector_store_builder():
+    builder = Mock(spec=VectorStoreBuilder)
+    builder.iter_pdf_pages.side_effect = lambda path: [Document(page_content=path)]
+    builder.split_text_to_docs.side_effect = lambda texts: _chunks(
+        texts[0].page_content
+    )
+    builder.embed_documents.side_effect = lambda texts: [[float(len(t))] for t in texts]
+    builder.plan_document_write.side_effect = _plan
+    return builder
+
+
+def _run(count):
+    return _Run(progress=Mock(), cancel_event=threading.Event(), errors=[None] * count)
+
+
+def _run_with_timeout(pipeline, documents):
+    results = []
+    runner = threading.Thread(
+        target=lambda: results.extend(pipeline.run(documents)), daemon=True
+    )
+    runner.start()
+    runner.join(timeout=10)
+    assert not runner.is_alive(), "pipeline did not finish"
+    return results
+
+
+def _ingestor(dms_client, builder, file_loader, **config):
+    config.setdefault("parse_workers", 0)
+    return DocumentIngestor(
+        dms_client, builder, file_loader, Mock(), PipelineConfig(**config)
+    )
+
+
+class TestIngestionPipeline:
+    def test_results_keep_input_order_when_downloads_finish_out_of_order(
+        self, mock_dms_client, mock_file_loader, mock_vector_store_builder
+    ):
+        second_downloaded = threading.Event()
+
+        def load_pdf_file_hashed(document):
+            if document == "first.pdf":
+                assert second_downloaded.wait(timeout=5)
+            else:
+                second_downloaded.set()
+            return f"/tmp/{document}", f"hash-of-{document}"
+
+        mock_file_loader.load_pdf_file_hashed.side_effect = load_pdf_file_hashed
+        ingestor = _ingestor(
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            download_workers=2,
+        )
+
+        results = ingestor.ingest_documents(["first.pdf", "second.pdf"])
+
+        assert [result.document for result in results] == ["first.pdf", "second.pdf"]
+        assert all(result.success for result in results)
+        written = [
+            write.args[0].docs[0].page_content
+            for write in mock_vector_store_builder.write_document.call_args_list
+        ]
+        assert written == ["/tmp/first.pdf chunk 0", "/tmp/second.pdf chunk 0"]
+
+    def test_download_not_found_fails_without_dms_record(
+        self, mock_dms_client, mock_file_loader, mock_vector_store_builder
+    ):
+        mock_file_loader.load_pdf_file_hashed.side_effect = [
+            FileNotFoundError("missing"),
+            ("/tmp/ok.pdf", "hash-of-ok"),
+        ]
+        ingestor = _ingestor(
+            mock_dms_client, mock_vector_store_builder, mock_file_loader
+        )
+
+        results = ingestor.ingest_documents(["missing.pdf", "ok.pdf"])
+
+        assert results[0].success is False
+        assert results[0].error == str(NoDocumentsException())
+        assert results[1].success is True
+        mock_dms_client.get_document.assert_called_once_with("hash-of-ok")
+
+    def test_document_without_chunks_fails(
+        self, mock_dms_client, mock_file_loader, mock_vector_store_builder
+    ):
+        mock_vector_store_builder.split_text_to_docs.side_effect = None
+        mock_vector_store_builder.split_text_to_docs.return_value = []
+        ingestor = _ingestor(
+            mock_dms_client, mock_vector_store_builder, mock_file_loader
+        )
+
+        results = ingestor.ingest_documents(["empty.pdf"])
+
+        assert results[0].success is False
+        mock_vector_store_builder.embed_documents.assert_not_called()
+
+    def test_status_lookup_failure_fails_only_that_document(
+        self, mock_dms_client, mock_file_loader, mock_vector_store_builder
+    ):
+        # The batch lookup fails, so each document is looked up on its own.
+        mock_dms_client.get_documents_batch.side_effect = Exception("DMS down")
+        mock_dms_client.get_document.side_effect = [Exception("DMS down"), None]
+        ingestor = _ingestor(
+            mock_dms_client, mock_vector_store_builder, mock_file_loader
+        )
+
+        results = ingestor.ingest_documents(["a.pdf", "b.pdf"])
+
+        assert results[0].success is False
+        assert results[0].error == "DMS down"
+        assert results[1].success is True
+        mock_vector_store_builder.iter_pdf_pages.assert_called_once_with("/tmp/b.pdf")
+
+    def test_downloaded_copies_are_released_once_parsed_or_dropped(
+        self, mock_dms_client, mock_file_loader, mock_vector_store_builder
+    ):
+        # b.pdf has the contents of a.pdf; c.pdf is already COMPLETED.
+        mock_file_loader.load_pdf_file_hashed.side_effect = lambda document: (
+            f"/tmp/{document}",
+            "hash-of-c" if document == "c.pdf" else "hash-of-a",
+        )
+        mock_dms_client.get_document.side_effect = lambda doc_hash: (
+            Mock(status=DocumentStatus.COMPLETED, doc_name="c.pdf")
+            if doc_hash == "hash-of-c"
+            else None
+        )
+        ingestor = _ingestor(
+            mock_dms_client, mock_vector_store_builder, mock_file_loader
+        )
+
+        results = ingestor.ingest_documents(["a.pdf", "b.pdf", "c.pdf"])
+
+        assert all(result.success for result in results)
+        released = [
+            call.args[0] for call in mock_file_loader.release_local_file.call_args_list
+        ]
+        assert sorted(released) == ["/tmp/a.pdf", "/tmp/b.pdf", "/tmp/c.pdf"]
+
+    def test_reports_each_stage_as_progress_events(
+        self, mock_dms_client, mock_file_loader, mock_vector_store_builder
+    ):
+        ingestor = _ingestor(
+            mock_dms_client, mock_vector_store_builder, mock_file_loader
+        )
+        events = []
+
+        ingestor.ingest_documents(["a.pdf"], progress=events.append)
+
+        assert [event.stage for event in events] == [
+            IngestionStage.DOWNLOADING,
+            IngestionStage.PARSING,
+            IngestionStage.EMBEDDING,
+            IngestionStage.WRITING,
+            IngestionStage.COMPLETED,
+        ]
+        assert (events[-1].chunks, events[-1].embedded) == (2, 2)
+        ingestor.progress.assert_not_called()
+
+    def test_cancel_stops_documents_not_started(
+        self, mock_dms_client, mock_file_loader, mock_vector_store_builder
+    ):
+        cancel_event = threading.Event()
+
+        def start_and_cancel(doc_hash):
+            cancel_event.set()
+            return None
+
+        mock_dms_client.get_document.side_effect = start_and_cancel
+        ingestor = _ingestor(
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            dms_batch_size=1,
+        )
+        events = []
+
+        results = ingestor.ingest_documents(
+            ["a.pdf", "b.pdf", "c.pdf"], events.append, cancel_event
+        )
+
+        assert results[0].success is True
+        assert [result.success for result in results[1:]] == [False, False]
+        assert isinstance(
+            ingestor.pipeline.run(["d.pdf"], events.append, cancel_event)[0],
+            IngestionCancelledException,
+        )
+        mock_dms_client.get_document.assert_called_once_with("hash-of-a.pdf")
+        cancelled = [e.document for e in events if e.stage == IngestionStage.CANCELLED]
+        assert cancelled == ["b.pdf", "c.pdf", "d.pdf"]
+
+    def test_ready_downloads_are_started_with_two_dms_requests(
+        self, mock_dms_client, mock_file_loader, mock_vector_store_builder
+    ):
+        ingestor = _ingestor(
+            mock_dms_client, mock_vector_store_builder, mock_file_loader
+        )
+        downloads: "queue.Queue" = queue.Queue()
+        parsed: "queue.Queue" = queue.Queue()
+        for index, document in enumerate(["a.pdf", "b.pdf", "c.pdf"]):
+            download = Future()
+            download.set_result((f"hash-of-{document}", f"/tmp/{document}"))
+            downloads.put((index, document, download))
+        downloads.put(_DONE)
+
+        ingestor.pipeline._start_stage(downloads, parsed, _run(3))
+
+        mock_dms_client.get_documents_batch.assert_called_once()
+        mock_dms_client.update_document_statuses.assert_called_once()
+        started = [parsed.get()[0].document for _ in range(3)]
+        assert started == ["a.pdf", "b.pdf", "c.pdf"]
+        assert parsed.get() is _DONE
+
+    def test_batches_never_wait_for_a_download_behind_a_ready_one(self):
+        pipeline = IngestionPipeline(Mock(), PipelineConfig(dms_batch_size=2))
+        downloads: "queue.Queue" = queue.Queue()
+        ready, slow = Future(), Future()
+        ready.set_result(("hash", "/tmp/a.pdf"))
+        for item in [(0, "a", ready), (1, "b", ready), (2, "c", ready)]:
+            downloads.put(item)
+        downloads.put((3, "d", slow))
+        downloads.put((4, "e", ready))
+        downloads.put(_DONE)
+
+        batches = pipeline._ready_batches(downloads)
+
+        assert [item[1] for item in next(batches)] == ["a", "b"]
+        assert [item[1] for item in next(batches)] == ["c"]
+        slow.set_result(("hash", "/tmp/d.pdf"))
+        assert [item[1] for item in next(batches)] == ["d", "e"]
+        assert next(batches, None) is None
+
+    def test_unchanged_sources_are_checked_per_window(
+        self, mock_dms_client, mock_file_loader, mock_vector_store_builder
+    ):
+        source_index = Mock()
+        source_index.get.side_effect = lambda document, version: f"hash-of-{document}"
+        mock_file_loader.get_source_version.return_value = "v1"
+        mock_dms_client.get_document.return_value = Mock(
+            status=DocumentStatus.COMPLETED
+        )
+        ingestor = DocumentIngestor(
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            Mock(),
+            PipelineConfig(parse_workers=0, dms_batch_size=2),
+            source_index,
+        )
+
+        results = ingestor.ingest_documents(["a.pdf", "b.pdf", "c.pdf"])
+
+        assert all(result.success for result in results)
+        assert mock_dms_client.get_documents_batch.call_count == 2
+        mock_file_loader.load_pdf_file_hashed.assert_not_called()
+
+    def test_start_stage_error_fails_the_rest_without_blocking_downloads(
+        self, mock_dms_client, mock_file_loader, mock_vector_store_builder
+    ):
+        ingestor = _ingestor(
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            queue_size=1,
+            dms_batch_size=1,
+        )
+        ingestor.start_documents = Mock(side_effect=RuntimeError("start failed"))
+        documents = [f"{name}.pdf" for name in "abcdef"]
+
+        errors = _run_with_timeout(ingestor.pipeline, documents)
+
+        assert [str(error) for error in errors] == ["start failed"] * 6
+        mock_vector_store_builder.write_document.assert_not_called()
+
+    def test_embed_stage_error_sets_error_for_the_rest(
+        self, mock_dms_client, mock_file_loader, mock_vector_store_builder
+    ):
+        ingestor = _ingestor(
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            queue_size=1,
+            dms_batch_size=1,
+            embed_batch_size=1,
+        )
+        ingestor.complete_documents = Mock(side_effect=RuntimeError("DMS lost"))
+        documents = [f"{name}.pdf" for name in "abcdef"]
+
+        errors = _run_with_timeout(ingestor.pipeline, documents)
+
+        assert [str(error) for error in errors] == ["DMS lost"] * 6
+        for document in documents:
+            mock_dms_client.update_document_status.assert_any_call(
+                f"hash-of-{document}", document, DocumentStatus.ERROR
+            )
+
+
+class TestMicroBatchFlush:
+    def _jobs(self):
+        return [
+            _Job(0, "a.pdf", "hash-a", "a.pdf", _chunks("a", 2)),
+            _Job(1, "b.pdf", "hash-b", "b.pdf", _chunks("b", 3)),
+        ]
+
+    def test_embeds_documents_together_and_writes_each(
+        self, mock_dms_client, mock_file_loader, mock_vector_store_builder
+    ):
+        ingestor = _ingestor(
+            mock_dms_client, mock_vector_store_builder, mock_file_loader
+        )
+        run = _run(2)
+
+        ingestor.pipeline._flush(self._jobs(), run)
+
+        mock_vector_store_builder.embed_documents.assert_called_once()
+        assert len(mock_vector_store_builder.embed_documents.call_args.args[0]) == 5
+        writes = mock_vector_store_builder.write_document.call_args_list
+        assert [len(write.args[0].ids) for write in writes] == [2, 3]
+        assert [len(write.args[1]) for write in writes] == [2, 3]
+        assert run.errors == [None, None]
+        mock_dms_client.update_document_statuses.assert_called_once()
+        mock_dms_client.update_document_status.assert_any_call(
+            "hash-b", "b.pdf", DocumentStatus.COMPLETED
+        )
+
+    def test_conflicting_document_fails_and_others_complete(
+        self, mock_dms_client, mock_file_loader, mock_vector_store_builder
+    ):
+        mock_dms_client.update_document_statuses.side_effect = lambda updates: {
+            doc_hash: (
+                SetDocumentResult.CONFLICT
+                if doc_hash == "hash-b"
+                else SetDocumentResult.UPDATED
+            )
+            for doc_hash, _, _ in updates
+        }
+        ingestor = _ingestor(
+            mock_dms_client, mock_vector_store_builder, mock_file_loader
+        )
+        run = _run(2)
+
+        ingestor.pipeline._flush(self._jobs(), run)
+
+        assert run.errors[0] is None
+        assert isinstance(run.errors[1], DocumentHashConflictException)
+        mock_dms_client.update_document_status.assert_not_called()
+
+    def test_only_chunks_without_stored_vectors_are_embedded(
+        self, mock_dms_client, mock_file_loader, mock_vector_store_builder
+    ):
+        def plan_with_stored_first_chunk(doc_hash, source, docs, sources_of=None):
+            plan = _plan(doc_hash, source, docs)
+            plan.vectors[0] = [9.0]
+            return plan
+
+        mock_vector_store_builder.plan_document_write.side_effect = (
+            plan_with_stored_first_chunk
+        )
+        ingestor = _ingestor(
+            mock_dms_client, mock_vector_store_builder, mock_file_loader
+        )
+        run = _run(2)
+
+        ingestor.pipeline._flush(self._jobs(), run)
+
+        mock_vector_store_builder.embed_documents.assert_called_once_with(
+            ["a chunk 1", "b chunk 1", "b chunk 2"]
+        )
+        writes = mock_vector_store_builder.write_document.call_args_list
+        assert [len(write.args[1]) for write in writes] == [1, 2]
+
+    def test_batch_failure_is_isolated_to_the_bad_document(
+        self, mock_dms_client, mock_file_loader, mock_vector_store_builder
+    ):
+        def embed(texts):
+            if any(text.startswith("b") for text in texts):
+                raise ValueError("bad chunk")
+            return [[0.0]] * len(texts)
+
+        mock_vector_store_builder.embed_documents.side_effect = embed
+        ingestor = _ingestor(
+            mock_dms_client, mock_vector_store_builder, mock_file_loader
+        )
+        run = _run(2)
+
+        ingestor.pipeline._flush(self._jobs(), run)
+
+        assert run.errors[0] is None
+        assert str(run.errors[1]) == "bad chunk"
+        mock_dms_client.update_document_status.assert_any_call(
+            "hash-a", "a.pdf", DocumentStatus.COMPLETED
+        )
+        mock_dms_client.update_document_status.assert_any_call(
+            "hash-b", "b.pdf", DocumentStatus.ERROR
+        )
+
+
+class TestParseWorkers:
+    def test_builder_pickles_for_parse_workers(self):
+        builder = LegacyVectorStoreBuilder(chroma_client=Mock())
+        builder._embeddings["model"] = Mock()  # a loaded model is not shipped
+
+        restored = pickle.loads(pickle.dumps(builder, protocol=pickle.HIGHEST_PROTOCOL))
+        chunks = parse_document(restored, TEST_PDF)
+
+        assert restored.chroma_client is None
+        assert restored._embeddings == {}
+        assert "Congratulations" in "".join(chunk.page_content for chunk in chunks)
+
+    def test_parse_worker_warms_its_builder_once(self, mock_vector_store_builder):
+        _init_parse_worker(mock_vector_store_builder)
+
+        _parse_in_worker("/tmp/a.pdf")
+        _parse_in_worker("/tmp/b.pdf")
+
+        mock_vector_store_builder.warm_up.assert_called_once()
+        assert mock_vector_store_builder.iter_pdf_pages.call_count == 2
+
+    def test_parse_worker_starts_when_warm_up_fails(self, mock_vector_store_builder):
+        mock_vector_store_builder.warm_up.side_effect = Exception("models missing")
+
+        _init_parse_worker(mock_vector_store_builder)
+
+        assert len(_parse_in_worker("/tmp/a.pdf")) == 2
+
+    def test_inline_parse_when_no_workers(self, mock_vector_store_builder):
+        pipeline = IngestionPipeline(
+            Mock(vector_store_builder=mock_vector_store_builder),
+            PipelineConfig(parse_workers=0),
+        )
+
+        chunks = pipeline._submit_parse("/tmp/a.pdf").result()
+
+        assert [chunk.page_content for chunk in chunks] == [
+            "/tmp/a.pdf chunk 0",
+            "/tmp/a.pdf chunk 1",
+        ]
+        assert pipeline._parse_pool is None
+
+    def test_broken_parse_pool_fails_its_documents_and_is_replaced(
+        self, mock_dms_client, mock_file_loader, mock_vector_store_builder
+    ):
+        broken = Mock()
+        broken.submit.side_effect = BrokenProcessPool("worker died")
+        working = Mock()
+
+        def submit(function, file_path):
+            future = Future()
+            future.set_result(parse_document(mock_vector_store_builder, file_path))
+            return future
+
+        working.submit.side_effect = submit
+        ingestor = _ingestor(
+            mock_dms_client,
+            mock_vector_store_builder,
+            mock_file_loader,
+            parse_workers=2,
+            queue_size=1,
+            dms_batch_size=1,
+        )
+        documents = [f"{name}.pdf" for name in "abcdef"]
+
+        # Every pool is broken: each document fails instead of passing unparsed.
+        with patch(
+            "src.ingestion_service.ingestion_pipeline.ProcessPoolExecutor",
+            return_value=broken,
+        ):
+            errors = _run_with_timeout(ingestor.pipeline, documents)
+
+        assert all(isinstance(error, BrokenProcessPool) for error in errors)
+        mock_dms_client.update_document_status.assert_any_call(
+            "hash-of-f.pdf", "f.pdf", DocumentStatus.ERROR
+        )
+        mock_vector_store_builder.write_document.assert_not_called()
+
+        # A broken pool is dropped, and the next parse gets a new one.
+        ingestor.pipeline._parse_pool = broken
+        with patch(
+            "src.ingestion_service.ingestion_pipeline.ProcessPoolExecutor",
+            return_value=working,
+        ):
+            errors = _run_with_timeout(ingestor.pipeline, ["g.pdf"])
+
+        assert errors == [None]
+        broken.shutdown.assert_called_with(wait=False)
+        assert ingestor.pipeline._parse_pool is working
+
+    def test_config_rejects_invalid_values(self):
+        with pytest.raises(ValueError):
+            PipelineConfig(download_workers=0)
+        with pytest.raises(ValueError):
+            PipelineConfig(parse_workers=-1)
+        with pytest.raises(ValueError):
+            PipelineConfig(dms_batch_size=0)
@@ -16,6 +16,18 @@ def run_lifespan(app):
     asyncio.run(_runner())
 
 
+@pytest.fixture(autouse=True)
+def mock_get_source_index():
+    with patch("src.ingestion_service.lifespan.get_source_index") as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def mock_get_embedding_cache():
+    with patch("src.ingestion_service.lifespan.get_embedding_cache") as mock:
+        yield mock
+
+
 class TestLifespan:
     @patch("src.ingestion_service.lifespan.get_vector_store_builder")
     @patch("src.ingestion_service.lifespan.FileLoader")
@@ -31,7 +43,14 @@ class TestLifespan:
 
         run_lifespan(app)
 
-        mock_get_vector_store_builder.assert_called_once()
+        mock_get_vector_store_builder.assert_called_once_with(
+            embedding_cache=app.state.embedding_cache
+        )
+        app.state.embedding_cache.close.assert_called_once()
+        assert app.state.doc_ingestor.source_index is app.state.source_index
+        app.state.source_index.close.assert_called_once()
+        assert app.state.ingestion_jobs.doc_ingestor is app.state.doc_ingestor
+        assert app.state.ingestion_jobs._executor._shutdown
 
     @patch("src.ingestion_service.lifespan.get_vector_store_builder")
     @patch("src.ingestion_service.lifespan.FileLoader")
@@ -1,14 +1,18 @@
 from contextlib import asynccontextmanager, contextmanager
+import threading
+import time
 
 from fastapi.testclient import TestClient
 from requests import HTTPError
 from src.ingestion_service.document_ingestor import DocumentIngestionResult
+from src.ingestion_service.ingestion_jobs import IngestionJobManager
 from src.ingestion_service.main import IngestionRequest, SingleIngestionRequest, health
+from src.ingestion_service.progress import IngestionStage, ProgressEvent
 from unittest.mock import Mock, patch
 
 from src.shared.constants import DocumentStatus
 from src.shared.exceptions import NoDocumentsException
-from src.shared.models import DMSDocument
+from src.shared.models import DocumentSummaryResponse
 
 from src.ingestion_service import main as api_main
 
@@ -31,48 +35,83 @@ def _build_client_no_lifespan():
         api_main.app.router.lifespan_context = original_lifespan
 
 
+def _set_ingestion_jobs(doc_ingestor):
+    api_main.app.state.doc_ingestor = doc_ingestor
+    api_main.app.state.ingestion_jobs = IngestionJobManager(doc_ingestor)
+
+
+def _wait_for_job(client, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/ingestion/jobs/{job_id}").json()
+        if job["status"] in ("completed", "failed", "cancelled"):
+            return job
+        assert time.monotonic() < deadline, f"Job still {job['status']}"
+        time.sleep(0.01)
+
+
 class TestMain:
     @patch("src.ingestion_service.main.get_vectordb_collection_count")
-    @patch("src.ingestion_service.main.get_dms_documents")
+    @patch("src.ingestion_service.main.get_dms_summary")
     def test_health(
         self,
-        mock_get_dms_documents,
+        mock_get_dms_summary,
         mock_get_vectordb_collection_count,
     ):
         mock_get_vectordb_collection_count.return_value = 2
-        dms_response = [
-            DMSDocument(
-                doc_hash="Doc Hash 1",
-                doc_name="Doc Name 1",
-                status=DocumentStatus.PENDING,
-            ),
-            DMSDocument(
-                doc_hash="Doc Hash 2",
-                doc_name="Doc Name 2",
-                status=DocumentStatus.ERROR,
-            ),
-        ]
-        mock_get_dms_documents.return_value = dms_response
+        counts = {status: 0 for status in DocumentStatus}
+        counts.update({DocumentStatus.PENDING: 1, DocumentStatus.ERROR: 1})
+        mock_get_dms_summary.return_value = DocumentSummaryResponse(
+            total=2, counts=counts, completed_fingerprint="fingerprint"
+        )
         result = health()
         assert result["status"] == "ok"
         assert result["documents_loaded_in_vector_store"] == "2"
-        assert result["documents_loaded_in_dms"] == [
-            doc.model_dump() for doc in dms_response
-        ]
+        assert result["documents_in_dms"] == {"total": 2, "counts": counts}
 
     @patch("src.ingestion_service.main.get_vectordb_collection_count")
-    @patch("src.ingestion_service.main.get_dms_documents")
-    def test_health_no_documents(
+    @patch("src.ingestion_service.main.get_dms_summary")
+    def test_health_dms_unavailable(
         self,
-        mock_get_dms_documents,
+        mock_get_dms_summary,
         mock_get_vectordb_collection_count,
     ):
         mock_get_vectordb_collection_count.return_value = 0
-        mock_get_dms_documents.return_value = []
+        mock_get_dms_summary.return_value = None
         result = health()
         assert result["status"] == "ok"
         assert result["documents_loaded_in_vector_store"] == "0"
-        assert result["documents_loaded_in_dms"] == []
+        assert result["documents_in_dms"] is None
+
+    def test_get_dms_summary_returns_none_on_error(self):
+        api_main.app.state.doc_ingestor = Mock()
+        api_main.app.state.doc_ingestor.dms_client.get_summary.side_effect = HTTPError(
+            "503"
+        )
+
+        assert api_main.get_dms_summary() is None
+
+    def test_metrics_reports_embedding_throughput(self):
+        vector_store_builder = Mock()
+        vector_store_builder.embedding_throughput.get_stats.return_value = {
+            "chunks": 10,
+            "chunks_per_second": 50.0,
+        }
+        vector_store_builder.embedding_cache.get_stats.return_value = {
+            "hits": 7,
+            "misses": 3,
+            "evictions": 0,
+        }
+        api_main.app.state.vector_store_builder = vector_store_builder
+
+        with _build_client_no_lifespan() as client:
+            response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "embedding": {"chunks": 10, "chunks_per_second": 50.0},
+            "embedding_cache": {"hits": 7, "misses": 3, "evictions": 0},
+        }
 
     def test_ingest_document_404_no_document_found(self):
         mock_doc_ingestor = Mock()
@@ -137,30 +176,29 @@ class TestMain:
             DocumentIngestionResult(document="test3", success=True),
         ]
         mock_doc_ingestor = Mock()
-        api_main.app.state.doc_ingestor = mock_doc_ingestor
-        api_main.app.state.doc_ingestor.ingest_documents.return_value = (
+        mock_doc_ingestor.ingest_documents.return_value = (
             batch_ingestion_ingestor_result
         )
+        _set_ingestion_jobs(mock_doc_ingestor)
         with _build_client_no_lifespan() as client:
             response = client.post(
                 "/ingestion/documents/", json=batch_ingestion_request.model_dump()
             )
 
-            assert response.json()["total"] == 3
-            assert response.json()["succeeded"] == 3
-            assert response.json()["failed"] == 0
-            assert (
-                DocumentIngestionResult(**response.json()["results"][0])
-                == batch_ingestion_ingestor_result[0]
-            )
-            assert (
-                DocumentIngestionResult(**response.json()["results"][1])
-                == batch_ingestion_ingestor_result[1]
-            )
-            assert (
-                DocumentIngestionResult(**response.json()["results"][2])
-                == batch_ingestion_ingestor_result[2]
-            )
+            assert response.status_code == 202
+            job_id = response.json()["job_id"]
+            assert response.headers["Location"] == f"/ingestion/jobs/{job_id}"
+            job = _wait_for_job(client, job_id)
+            assert job["status"] == "completed"
+            assert job["total"] == 3
+            assert job["succeeded"] == 3
+            assert job["failed"] == 0
+            assert [d["document"] for d in job["documents"]] == [
+                "test1",
+                "test2",
+                "test3",
+            ]
+            assert all(d["stage"] == "completed" for d in job["documents"])
 
     def test_ingest_documents_2_failed_1_success(self):
         batch_ingestion_request = IngestionRequest(
@@ -174,27 +212,91 @@ class TestMain:
             ),
         ]
         mock_doc_ingestor = Mock()
-        api_main.app.state.doc_ingestor = mock_doc_ingestor
-        api_main.app.state.doc_ingestor.ingest_documents.return_value = (
+        mock_doc_ingestor.ingest_documents.return_value = (
             batch_ingestion_ingestor_result
         )
+        _set_ingestion_jobs(mock_doc_ingestor)
         with _build_client_no_lifespan() as client:
             response = client.post(
                 "/ingestion/documents/", json=batch_ingestion_request.model_dump()
             )
 
-            assert response.json()["total"] == 3
-            assert response.json()["succeeded"] == 1
-            assert response.json()["failed"] == 2
-            assert (
-                DocumentIngestionResult(**response.json()["results"][0])
-                == batch_ingestion_ingestor_result[0]
-            )
-            assert (
-                DocumentIngestionResult(**response.json()["results"][1])
-                == batch_ingestion_ingestor_result[1]
-            )
-            assert (
-                DocumentIngestionResult(**response.json()["results"][2])
-                == batch_ingestion_ingestor_result[2]
+            job = _wait_for_job(client, response.json()["job_id"])
+            assert job["status"] == "completed"
+            assert job["total"] == 3
+            assert job["succeeded"] == 1
+            assert job["failed"] == 2
+            assert [(d["stage"], d["error"]) for d in job["documents"]] == [
+                ("failed", "Bad file"),
+                ("completed", None),
+                ("failed", "Wrong type"),
+            ]
+
+    def test_get_job_reports_progress_events(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def ingest_documents(documents, progress, cancel_event):
+            progress(
+                ProgressEvent(
+                    "test1",
+                    IngestionStage.EMBEDDING,
+                    "Embedding",
+                    chunks=5,
+                    embedded=3,
+                )
             )
+            started.set()
+            release.wait(5)
+            return [DocumentIngestionResult(document="test1", success=True)]
+
+        mock_doc_ingestor = Mock()
+        mock_doc_ingestor.ingest_documents.side_effect = ingest_documents
+        _set_ingestion_jobs(mock_doc_ingestor)
+        with _build_client_no_lifespan() as client:
+            job_id = client.post(
+                "/ingestion/documents/", json={"documents": ["test1"]}
+            ).json()["job_id"]
+            assert started.wait(5)
+
+            response = client.get(f"/ingestion/jobs/{job_id}")
+
+            release.set()
+            assert response.status_code == 200
+            job = response.json()
+            assert job["status"] == "running"
+            assert job["in_progress"] == 1
+            assert job["documents"][0]["stage"] == "embedding"
+            assert job["documents"][0]["chunks"] == 5
+            assert job["documents"][0]["embedded"] == 3
+
+    def test_get_unknown_job_returns_404(self):
+        _set_ingestion_jobs(Mock())
+        with _build_client_no_lifespan() as client:
+            response = client.get("/ingestion/jobs/unknown")
+
+            assert response.status_code == 404
+
+    def test_cancel_job(self):
+        started = threading.Event()
+
+        def ingest_documents(documents, progress, cancel_event):
+            started.set()
+            cancel_event.wait(5)
+            return [DocumentIngestionResult(document="test1", success=True)]
+
+        mock_doc_ingestor = Mock()
+        mock_doc_ingestor.ingest_documents.side_effect = ingest_documents
+        _set_ingestion_jobs(mock_doc_ingestor)
+        with _build_client_no_lifespan() as client:
+            job_id = client.post(
+                "/ingestion/documents/", json={"documents": ["test1"]}
+            ).json()["job_id"]
+            assert started.wait(5)
+
+            response = client.post(f"/ingestion/jobs/{job_id}:cancel")
+
+            assert response.status_code == 202
+            assert _wait_for_job(client, job_id)["status"] == "cancelled"
+            response = client.post(f"/ingestion/jobs/{job_id}:cancel")
+            assert response.status_code == 409
@@ -0,0 +1,44 @@
+from src.ingestion_service import source_index as source_index_module
+from src.ingestion_service.source_index import SourceIndex, get_source_index
+
+
+class TestSourceIndex:
+    def test_returns_hash_only_for_the_recorded_version(self, tmp_path):
+        index = SourceIndex(str(tmp_path / "index.sqlite3"))
+        index.put("s3://bucket/a.pdf", "etag=1;size=10", "sha-1")
+
+        assert index.get("s3://bucket/a.pdf", "etag=1;size=10") == "sha-1"
+        assert index.get("s3://bucket/a.pdf", "etag=2;size=10") is None
+        assert index.get("s3://bucket/b.pdf", "etag=1;size=10") is None
+
+    def test_new_version_replaces_the_old_one(self, tmp_path):
+        index = SourceIndex(str(tmp_path / "index.sqlite3"))
+        index.put("a.pdf", "v1", "sha-1")
+
+        index.put("a.pdf", "v2", "sha-2")
+
+        assert index.get("a.pdf", "v1") is None
+        assert index.get("a.pdf", "v2") == "sha-2"
+
+    def test_sources_lists_every_source_last_seen_with_a_hash(self, tmp_path):
+        index = SourceIndex(str(tmp_path / "index.sqlite3"))
+        index.put("a.pdf", "v1", "sha-1")
+        index.put("b.pdf", "v1", "sha-1")
+        index.put("a.pdf", "v2", "sha-2")
+
+        assert index.sources("sha-1") == ["b.pdf"]
+        assert index.sources("sha-2") == ["a.pdf"]
+        assert index.sources("sha-3") == []
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "nested" / "index.sqlite3")
+        first = SourceIndex(path)
+        first.put("a.pdf", "v1", "sha-1")
+        first.close()
+
+        assert SourceIndex(path).get("a.pdf", "v1") == "sha-1"
+
+    def test_empty_path_disables_the_index(self, monkeypatch):
+        monkeypatch.setattr(source_index_module, "INGESTION_SOURCE_INDEX_PATH", "")
+
+        assert get_source_index() is None
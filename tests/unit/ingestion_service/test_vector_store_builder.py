@@ -1,13 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor
+import pickle
+import uuid
+
+import chromadb
+import fitz
 import pytest
 from unittest.mock import Mock, patch
 from src.ingestion_service import vector_store_builder as vector_store_builder_module
+from src.ingestion_service.embedding_cache import ChunkEmbeddingCache, encoder_id
 from src.ingestion_service.vector_store_builder import (
     DoclingVectorStoreBuilder,
     LegacyVectorStoreBuilder,
     VectorStoreBuilder,
+    chunk_content_hash,
+    chunk_id,
+    encode_options,
 )
+from src.shared.exceptions import ChromaException, VectorStoreException
 from langchain_core.documents import Document
-from langchain_community.vectorstores import Chroma
 
 TEST_PDF = "tests/data/pdf-test.pdf"
 STRING_LIST = ["test", "string", "for", "testing"]
@@ -53,6 +63,69 @@ class TestVectorStoreBuilder:
         full_text = "".join(doc.page_content for doc in docs)
         assert "Congratulations" in full_text
 
+    @pytest.fixture
+    def seven_page_pdf(self, tmp_path):
+        path = tmp_path / "seven-pages.pdf"
+        with fitz.open() as pdf:
+            for page_number in range(7):
+                pdf.new_page().insert_text((72, 72), f"Page number {page_number}")
+            pdf.save(path)
+        return str(path)
+
+    def test_load_pdf_text_in_workers_keeps_page_order(
+        self, mock_chroma_client, seven_page_pdf
+    ):
+        builder = LegacyVectorStoreBuilder(extract_workers=2, pages_per_task=2)
+        with ThreadPoolExecutor(max_workers=2) as pool, patch.object(
+            builder, "_get_extract_pool", return_value=pool
+        ):
+            docs = builder.load_pdf_text(seven_page_pdf)
+
+        serial_docs = LegacyVectorStoreBuilder().load_pdf_text(seven_page_pdf)
+        assert [doc.page_content for doc in docs] == [
+            doc.page_content for doc in serial_docs
+        ]
+        assert [doc.page_content.strip() for doc in docs] == [
+            f"Page number {page_number}" for page_number in range(7)
+        ]
+
+    def test_load_pdf_text_short_pdf_stays_in_process(
+        self, mock_chroma_client, seven_page_pdf
+    ):
+        builder = LegacyVectorStoreBuilder(extract_workers=2, pages_per_task=7)
+        with patch.object(builder, "_get_extract_pool") as mock_get_extract_pool:
+            docs = builder.load_pdf_text(seven_page_pdf)
+
+        assert len(docs) == 7
+        mock_get_extract_pool.assert_not_called()
+
+    @patch("src.ingestion_service.vector_store_builder.extract_page_range")
+    def test_load_pdf_text_wraps_worker_errors(
+        self, mock_extract_page_range, mock_chroma_client, seven_page_pdf
+    ):
+        mock_extract_page_range.side_effect = RuntimeError("corrupt page")
+        builder = LegacyVectorStoreBuilder(extract_workers=1, pages_per_task=2)
+        with ThreadPoolExecutor(max_workers=1) as pool, patch.object(
+            builder, "_get_extract_pool", return_value=pool
+        ):
+            with pytest.raises(Exception, match="corrupt page"):
+                builder.load_pdf_text(seven_page_pdf)
+
+    def test_builder_pickles_without_extract_pool(self, mock_chroma_client):
+        builder = LegacyVectorStoreBuilder(extract_workers=2, pages_per_task=5)
+        builder._extract_pool = Mock()
+
+        restored = pickle.loads(pickle.dumps(builder))
+
+        assert restored._extract_pool is None
+        assert (restored.extract_workers, restored.pages_per_task) == (2, 5)
+
+    def test_rejects_invalid_extract_settings(self, mock_chroma_client):
+        with pytest.raises(ValueError):
+            LegacyVectorStoreBuilder(extract_workers=-1)
+        with pytest.raises(ValueError):
+            LegacyVectorStoreBuilder(pages_per_task=0)
+
     def test_split_text_to_docs_success(self, vector_store_builder):
         documents = vector_store_builder.split_text_to_docs(
             [Document(page_content=item) for item in STRING_LIST]
@@ -72,76 +145,366 @@ class TestVectorStoreBuilder:
         )
         assert all(document.page_content.strip() for document in documents)
 
+    def test_split_text_to_docs_tracks_page_ranges(self, vector_store_builder):
+        pages = [
+            Document(page_content=f"p{number} " * 60, metadata={"page": number})
+            for number in range(3, 13)
+        ]
+
+        documents = vector_store_builder.split_text_to_docs(
+            pages, chunk_size=500, chunk_overlap=50
+        )
+
+        assert documents[0].metadata["page_start"] == 3
+        assert documents[-1].metadata["page_end"] == 12
+        for document in documents:
+            numbers = {int(word[1:]) for word in document.page_content.split()}
+            assert document.metadata["page_start"] == min(numbers)
+            assert document.metadata["page_end"] == max(numbers)
+        assert any(
+            document.metadata["page_start"] < document.metadata["page_end"]
+            for document in documents
+        )
+
+    def test_split_text_to_docs_streams_pages(self, vector_store_builder):
+        consumed = []
+
+        def pages():
+            for number in range(1, 101):
+                consumed.append(number)
+                yield Document(page_content=f"word{number} " * 50)
+
+        chunks = vector_store_builder.iter_split_docs(
+            pages(), chunk_size=100, chunk_overlap=10
+        )
+        first = next(chunks)
+        rest = list(chunks)
+
+        assert first.page_content.startswith("word1 ")
+        assert len(consumed) == 100
+        assert len(rest) > 0
+        assert max(len(chunk.page_content) for chunk in [first, *rest]) <= 100
+
+    def test_split_text_to_docs_streamed_text_is_complete(self, vector_store_builder):
+        pages = [
+            Document(
+                page_content="\n\n".join(
+                    " ".join(f"p{page}w{word}" for word in range(line, line + 15))
+                    for line in range(0, 120, 15)
+                )
+            )
+            for page in range(40)
+        ]
+
+        documents = vector_store_builder.split_text_to_docs(
+            pages, chunk_size=200, chunk_overlap=40
+        )
+
+        words = {
+            word for document in documents for word in document.page_content.split()
+        }
+        expected = {word for page in pages for word in page.page_content.split()}
+        assert words == expected
+        assert all(len(document.page_content) <= 200 for document in documents)
+
+    def test_iter_pdf_pages_numbers_pages(self, vector_store_builder, seven_page_pdf):
+        pages = list(vector_store_builder.iter_pdf_pages(seven_page_pdf))
+
+        assert [page.metadata["page"] for page in pages] == list(range(1, 8))
+
+    @pytest.fixture
+    def chroma_builder(self, monkeypatch):
+        monkeypatch.setattr(
+            vector_store_builder_module, "CHROMA_COLLECTION", f"test-{uuid.uuid4()}"
+        )
+        builder = LegacyVectorStoreBuilder(chroma_client=chromadb.EphemeralClient())
+        model = Mock(spec=["embed_documents", "embed_query"])
+        model.embed_documents.side_effect = lambda texts: [
+            [float(len(text)), 1.0] for text in texts
+        ]
+        builder._embeddings[vector_store_builder_module.EMBEDDING_MODEL] = model
+        return builder, model
+
+    def _stored(self, builder):
+        return builder._get_collection().get(include=["metadatas"])
+
     @patch("src.ingestion_service.vector_store_builder.HuggingFaceEmbeddings")
-    def test_add_documents_to_vector_store_throws_exception_mocked_HuggingFaceEmbeddings(
+    def test_embed_documents_wraps_model_errors(
         self, mock_huggingFaceEmbeddings, vector_store_builder
     ):
         # Arrange
         mock_huggingFaceEmbeddings.side_effect = Exception("Error creating embeddings")
-        documents = [Document(page_content=PAGE_CONTENT)]
 
         # Act & Assert
-        with pytest.raises(Exception, match="Error creating embeddings"):
-            vector_store_builder.add_documents_to_vector_store(docs=documents)
+        with pytest.raises(VectorStoreException, match="Error creating embeddings"):
+            vector_store_builder.embed_documents([PAGE_CONTENT])
 
-    @patch("src.ingestion_service.vector_store_builder.HuggingFaceEmbeddings")
-    @patch("src.ingestion_service.vector_store_builder.Chroma")
-    def test_add_documents_to_vector_store_throws_value_error_mocked_Chroma_from_documents(
-        self, mock_chroma, mock_huggingFaceEmbeddings, vector_store_builder
+    def test_upsert_document_writes_deterministic_ids_and_metadata(
+        self, chroma_builder
     ):
         # Arrange
-        mock_huggingFaceEmbeddings.return_value = None
-        mock_chroma.from_documents.side_effect = ValueError("Wrong Documents")
-        documents = [Document(page_content=PAGE_CONTENT)]
+        builder, _ = chroma_builder
+        docs = [Document(page_content="alpha"), Document(page_content="beta")]
+
+        # Act
+        plan = builder.upsert_document("sha", "s3://bucket/a.pdf", docs)
+
+        # Assert
+        stored = self._stored(builder)
+        assert sorted(stored["ids"]) == sorted(plan.ids)
+        assert plan.ids[0] == chunk_id("sha", 0, chunk_content_hash("alpha"))
+        metadata = stored["metadatas"][stored["ids"].index(plan.ids[1])]
+        assert metadata == {
+            "doc_hash": "sha",
+            "doc_source": "s3://bucket/a.pdf",
+            "chunk_index": 1,
+            "content_hash": chunk_content_hash("beta"),
+            "encoder": encoder_id(
+                vector_store_builder_module.EMBEDDING_MODEL, encode_options()
+            ),
+        }
+
+    def test_upsert_document_again_embeds_and_writes_nothing(self, chroma_builder):
+        # Arrange
+        builder, model = chroma_builder
+        docs = [Document(page_content="alpha"), Document(page_content="beta")]
+        builder.upsert_document("sha", "a.pdf", docs)
+        model.embed_documents.reset_mock()
+
+        # Act
+        plan = builder.upsert_document("sha", "a.pdf", docs)
+
+        # Assert
+        model.embed_documents.assert_not_called()
+        assert plan.unchanged_ids == set(plan.ids)
+        assert plan.stale_ids == []
+        assert builder.get_collection_count() == 2
+
+    def test_upsert_document_retry_embeds_only_missing_chunks(self, chroma_builder):
+        # Arrange - a previous attempt stored only the first chunk
+        builder, model = chroma_builder
+        docs = [Document(page_content="alpha"), Document(page_content="beta")]
+        builder.upsert_document("sha", "a.pdf", docs[:1])
+        model.embed_documents.reset_mock()
+
+        # Act
+        builder.upsert_document("sha", "a.pdf", docs)
+
+        # Assert
+        model.embed_documents.assert_called_once_with(["beta"])
+        assert builder.get_collection_count() == 2
+
+    def test_upsert_changed_document_replaces_only_stale_chunks(self, chroma_builder):
+        # Arrange
+        builder, model = chroma_builder
+        builder.upsert_document(
+            "old-sha",
+            "a.pdf",
+            [Document(page_content="intro"), Document(page_content="old body")],
+        )
+        model.embed_documents.reset_mock()
+
+        # Act - the new version inserts a chunk before the unchanged intro
+        plan = builder.upsert_document(
+            "new-sha",
+            "a.pdf",
+            [
+                Document(page_content="preface"),
+                Document(page_content="intro"),
+                Document(page_content="new body"),
+            ],
+        )
+
+        # Assert - "intro" moved but keeps its stored vector
+        model.embed_documents.assert_called_once_with(["preface", "new body"])
+        assert plan.replaced_doc_hashes == {"old-sha"}
+        stored = self._stored(builder)
+        assert sorted(stored["ids"]) == sorted(plan.ids)
+        assert {metadata["doc_hash"] for metadata in stored["metadatas"]} == {"new-sha"}
+
+    def test_changed_source_keeps_contents_another_source_still_has(
+        self, chroma_builder
+    ):
+        # Arrange - b.pdf had the same contents as a.pdf, so it shares its chunks
+        builder, _ = chroma_builder
+        builder.upsert_document("sha-x", "a.pdf", [Document(page_content="X")])
+        sources = {"sha-x": ["b.pdf"]}
+
+        # Act - a.pdf changes
+        plan = builder.upsert_document(
+            "sha-y",
+            "a.pdf",
+            [Document(page_content="Y")],
+            sources_of=lambda doc_hash: sources.get(doc_hash, []),
+        )
+
+        # Assert - the shared contents stay, now under b.pdf
+        assert plan.stale_ids == []
+        assert plan.replaced_doc_hashes == set()
+        stored = self._stored(builder)
+        assert sorted(
+            (metadata["doc_hash"], metadata["doc_source"])
+            for metadata in stored["metadatas"]
+        ) == [("sha-x", "b.pdf"), ("sha-y", "a.pdf")]
+
+        # Act - b.pdf changes too, and nothing else has the old contents
+        plan = builder.upsert_document(
+            "sha-z",
+            "b.pdf",
+            [Document(page_content="Z")],
+            sources_of=lambda doc_hash: [],
+        )
+
+        # Assert
+        assert plan.replaced_doc_hashes == {"sha-x"}
+        stored = self._stored(builder)
+        assert sorted(metadata["doc_hash"] for metadata in stored["metadatas"]) == [
+            "sha-y",
+            "sha-z",
+        ]
+
+    def test_upsert_after_collection_wipe_reads_embedding_cache(
+        self, chroma_builder, tmp_path
+    ):
+        # Arrange - the chunks were embedded once, then the collection was lost
+        builder, model = chroma_builder
+        builder.embedding_cache = ChunkEmbeddingCache(str(tmp_path))
+        docs = [Document(page_content="alpha"), Document(page_content="beta")]
+        builder.upsert_document("sha", "a.pdf", docs)
+        builder.chroma_client.delete_collection(
+            vector_store_builder_module.CHROMA_COLLECTION
+        )
+        model.embed_documents.reset_mock()
+
+        # Act
+        builder.upsert_document("sha", "a.pdf", docs + [Document(page_content="new")])
+
+        # Assert
+        model.embed_documents.assert_called_once_with(["new"])
+        assert builder.get_collection_count() == 3
+        assert builder.embedding_cache.get_stats()["hits"] == 2
+
+    def test_changing_normalization_misses_cache_and_stored_vectors(
+        self, chroma_builder, tmp_path, monkeypatch
+    ):
+        # Arrange - the chunks were embedded without normalization
+        builder, model = chroma_builder
+        builder.embedding_cache = ChunkEmbeddingCache(str(tmp_path))
+        docs = [Document(page_content="alpha"), Document(page_content="beta")]
+        builder.upsert_document("sha", "a.pdf", docs)
+        model.embed_documents.reset_mock()
+        monkeypatch.setattr(vector_store_builder_module, "EMBEDDING_NORMALIZE", True)
+
+        # Act
+        plan = builder.upsert_document("sha", "a.pdf", docs)
+
+        # Assert - neither Chroma's nor the cache's vectors are reused
+        model.embed_documents.assert_called_once_with(["alpha", "beta"])
+        assert plan.unchanged_ids == set()
+        assert builder.embedding_cache.get_stats()["hits"] == 0
+
+    def test_embed_documents_still_returns_vectors_if_cache_write_fails(
+        self, chroma_builder
+    ):
+        # Arrange
+        builder, _ = chroma_builder
+        builder.embedding_cache = Mock(spec=ChunkEmbeddingCache)
+        builder.embedding_cache.get_many.return_value = [None, [9.0, 9.0]]
+        builder.embedding_cache.put_many.side_effect = OSError("disk full")
+
+        # Act
+        vectors = builder.embed_documents(["alpha", "cached"])
+
+        # Assert
+        assert vectors == [[5.0, 1.0], [9.0, 9.0]]
+
+    def test_write_document_maps_value_error_to_chroma_exception(
+        self, vector_store_builder, mock_chroma_client
+    ):
+        # Arrange
+        collection = mock_chroma_client.get_or_create_collection.return_value
+        collection.get.return_value = {"ids": [], "metadatas": [], "embeddings": []}
+        collection.upsert.side_effect = ValueError("Wrong Documents")
+        plan = vector_store_builder.plan_document_write(
+            "sha", "a.pdf", [Document(page_content=PAGE_CONTENT)]
+        )
 
         # Act & Assert
-        with pytest.raises(Exception, match="Wrong Documents"):
-            vector_store_builder.add_documents_to_vector_store(docs=documents)
+        with pytest.raises(ChromaException, match="Wrong Documents"):
+            vector_store_builder.write_document(plan, [[0.1]])
 
-    @patch("src.ingestion_service.vector_store_builder.HuggingFaceEmbeddings")
-    @patch("src.ingestion_service.vector_store_builder.Chroma")
-    def test_add_documents_to_vector_store_throws_runtime_error_mocked_Chroma_from_documents(
-        self, mock_chroma, mock_huggingFaceEmbeddings, vector_store_builder
+    def test_write_document_rejects_embedding_count_mismatch(
+        self, vector_store_builder, mock_chroma_client
     ):
         # Arrange
-        mock_huggingFaceEmbeddings.return_value = None
-        mock_chroma.from_documents.side_effect = RuntimeError("Runtime error")
-        documents = [Document(page_content=PAGE_CONTENT)]
+        collection = mock_chroma_client.get_or_create_collection.return_value
+        collection.get.return_value = {"ids": [], "metadatas": [], "embeddings": []}
+        plan = vector_store_builder.plan_document_write(
+            "sha", "a.pdf", [Document(page_content=PAGE_CONTENT)]
+        )
 
         # Act & Assert
-        with pytest.raises(Exception, match="Runtime error"):
-            vector_store_builder.add_documents_to_vector_store(docs=documents)
+        with pytest.raises(VectorStoreException, match="Got 0 embeddings"):
+            vector_store_builder.write_document(plan, [])
+        collection.upsert.assert_not_called()
 
     @patch("src.ingestion_service.vector_store_builder.HuggingFaceEmbeddings")
-    @patch("src.ingestion_service.vector_store_builder.Chroma")
-    def test_add_documents_to_vector_store_success(
+    def test_embed_documents_loads_model_once(
+        self, mock_huggingFaceEmbeddings, vector_store_builder
+    ):
+        # Act
+        for _ in range(3):
+            vector_store_builder.embed_documents(
+                [PAGE_CONTENT], model_name=EMBEDDING_MODEL
+            )
+
+        # Assert
+        mock_huggingFaceEmbeddings.assert_called_once()
+
+    @patch("src.ingestion_service.vector_store_builder.torch.set_num_threads")
+    @patch("src.ingestion_service.vector_store_builder.HuggingFaceEmbeddings")
+    def test_get_embeddings_applies_encode_settings(
         self,
-        mock_chroma,
         mock_huggingFaceEmbeddings,
+        mock_set_num_threads,
         vector_store_builder,
-        mock_chroma_client,
+        monkeypatch,
     ):
         # Arrange
-        mock_embeddings = Mock()
-        mock_huggingFaceEmbeddings.return_value = mock_embeddings
-        mock_vectordb_instance = Mock(spec=Chroma)
-        mock_chroma.from_documents.return_value = mock_vectordb_instance
-        documents = [Document(page_content=PAGE_CONTENT)]
+        monkeypatch.setattr(vector_store_builder_module, "EMBEDDING_BATCH_SIZE", 128)
+        monkeypatch.setattr(vector_store_builder_module, "EMBEDDING_NUM_THREADS", 4)
+        monkeypatch.setattr(vector_store_builder_module, "EMBEDDING_NORMALIZE", True)
 
         # Act
-        vectordb = vector_store_builder.add_documents_to_vector_store(
-            docs=documents, model_name=EMBEDDING_MODEL
+        vector_store_builder.get_embeddings(EMBEDDING_MODEL)
+
+        # Assert
+        mock_set_num_threads.assert_called_once_with(4)
+        mock_huggingFaceEmbeddings.assert_called_once_with(
+            model_name=EMBEDDING_MODEL,
+            encode_kwargs={"batch_size": 128, "normalize_embeddings": True},
         )
 
-        # Assert - make sure the correct embedding model was used
-        mock_huggingFaceEmbeddings.assert_called_once_with(model_name=EMBEDDING_MODEL)
-        mock_chroma.from_documents.assert_called_once_with(
-            documents,
-            mock_embeddings,
-            client=mock_chroma_client,
-            collection_name=CHROMA_COLLECTION,
+    @patch("src.ingestion_service.vector_store_builder.HuggingFaceEmbeddings")
+    def test_embed_documents_records_throughput(
+        self, mock_huggingFaceEmbeddings, vector_store_builder
+    ):
+        # Arrange - no tokenizer, so tokens are counted as words
+        model = Mock(spec=["embed_documents", "embed_query"])
+        model.embed_documents.return_value = [[0.1], [0.2]]
+        mock_huggingFaceEmbeddings.return_value = model
+
+        # Act
+        vectors = vector_store_builder.get_embeddings().embed_documents(
+            ["one two three", "four five"]
         )
-        assert vectordb is mock_vectordb_instance
+
+        # Assert
+        assert vectors == [[0.1], [0.2]]
+        stats = vector_store_builder.embedding_throughput.get_stats()
+        assert stats["chunks"] == 2
+        assert stats["tokens"] == 5
+        assert stats["last_batch"]["chunks"] == 2
 
     def test_get_vector_store_builder_legacy(self, monkeypatch, mock_chroma_client):
         monkeypatch.setattr(vector_store_builder_module, "RAG_PREPROCESSOR", "legacy")
@@ -161,6 +524,52 @@ class TestVectorStoreBuilder:
         assert isinstance(builder, LegacyVectorStoreBuilder)
         assert "Defaulting to legacy" in caplog.text
 
+    @patch("src.ingestion_service.vector_store_builder.HybridChunker")
+    @patch("src.ingestion_service.vector_store_builder.DocumentConverter")
+    @patch("src.ingestion_service.vector_store_builder.DoclingLoader")
+    def test_docling_reuses_one_warm_converter(
+        self,
+        mock_docling_loader,
+        mock_document_converter,
+        mock_hybrid_chunker,
+        mock_chroma_client,
+    ):
+        builder = DoclingVectorStoreBuilder()
+        builder.EXPORT_TYPE = "doc_chunks"
+        mock_docling_loader.return_value.load.return_value = [Document("text")]
+
+        builder.warm_up()
+        builder.load_pdf_text("a.pdf")
+        builder.load_pdf_text("b.pdf")
+
+        mock_document_converter.assert_called_once()
+        mock_document_converter.return_value.initialize_pipeline.assert_called_once()
+        mock_hybrid_chunker.assert_called_once()
+        for loader_call in mock_docling_loader.call_args_list:
+            assert loader_call.kwargs["converter"] is (
+                mock_document_converter.return_value
+            )
+            assert loader_call.kwargs["chunker"] is mock_hybrid_chunker.return_value
+
+    @patch("src.ingestion_service.vector_store_builder.DocumentConverter")
+    def test_docling_converter_errors_are_reported_per_document(
+        self, mock_document_converter, mock_chroma_client
+    ):
+        mock_document_converter.side_effect = OSError("models not downloaded")
+        builder = DoclingVectorStoreBuilder()
+
+        with pytest.raises(Exception, match="Error reading PDF file a.pdf"):
+            builder.load_pdf_text("a.pdf")
+
+    def test_docling_builder_pickles_without_converter(self, mock_chroma_client):
+        builder = DoclingVectorStoreBuilder()
+        builder._converter = Mock()
+
+        restored = pickle.loads(pickle.dumps(builder))
+
+        assert restored._converter is None
+        assert restored.EXPORT_TYPE == builder.EXPORT_TYPE
+
     def test_docling_split_by_numbered_headings(self, mock_chroma_client):
         builder = DoclingVectorStoreBuilder()
         text = "1 Intro\nFirst line\n1.1 Details\nSecond line"
@@ -6,8 +6,10 @@ import requests
 
 from src.ui_service.inference_service_client import (
     ChatResponse,
+    ChatStreamError,
     DocumentInfo,
     InferenceServiceClient,
+    NoDocumentsIngestedError,
 )
 
 
@@ -22,18 +24,13 @@ class TestGetHealth:
         mock_response.json.return_value = {
             "status": "ok",
             "documents_loaded_in_vector_store": "2",
-            "documents_loaded_in_dms": [
-                {
-                    "doc_hash": "abc123",
-                    "doc_name": "doc1.pdf",
-                    "status": "Document processing completed",
-                },
-                {
-                    "doc_hash": "def456",
-                    "doc_name": "doc2.pdf",
-                    "status": "Document pending processing",
+            "documents_in_dms": {
+                "total": 2,
+                "counts": {
+                    "Document processing completed": 1,
+                    "Document pending processing": 1,
                 },
-            ],
+            },
         }
         mock_response.raise_for_status = Mock()
 
@@ -42,17 +39,11 @@ class TestGetHealth:
 
         assert result.is_healthy is True
         assert result.vector_store_count == 2
-        assert len(result.documents) == 2
-        assert result.documents[0] == DocumentInfo(
-            doc_hash="abc123",
-            doc_name="doc1.pdf",
-            status="Document processing completed",
-        )
-        assert result.documents[1] == DocumentInfo(
-            doc_hash="def456",
-            doc_name="doc2.pdf",
-            status="Document pending processing",
-        )
+        assert result.document_total == 2
+        assert result.document_counts == {
+            "Document processing completed": 1,
+            "Document pending processing": 1,
+        }
 
     def test_get_health_connection_error(self, client):
         with patch("requests.get", side_effect=requests.ConnectionError()):
@@ -83,7 +74,7 @@ class TestGetHealth:
         mock_response.json.return_value = {
             "status": "ok",
             "documents_loaded_in_vector_store": "0",
-            "documents_loaded_in_dms": [],
+            "documents_in_dms": {"total": 0, "counts": {}},
         }
         mock_response.raise_for_status = Mock()
 
@@ -92,7 +83,40 @@ class TestGetHealth:
 
         assert result.is_healthy is True
         assert result.vector_store_count == 0
-        assert result.documents == []
+        assert result.document_total == 0
+
+
+class TestGetDocuments:
+    def test_get_documents_returns_page_and_cursor(self, client):
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "documents": [
+                {
+                    "doc_hash": "abc123",
+                    "doc_name": "doc1.pdf",
+                    "status": "Document processing completed",
+                }
+            ],
+            "next_after": "abc123",
+        }
+        mock_response.raise_for_status = Mock()
+
+        with patch("requests.get", return_value=mock_response) as mock_get:
+            page = client.get_documents(limit=1, after="000")
+
+        assert page.documents == [
+            DocumentInfo(
+                doc_hash="abc123",
+                doc_name="doc1.pdf",
+                status="Document processing completed",
+            )
+        ]
+        assert page.next_after == "abc123"
+        mock_get.assert_called_once_with(
+            "http://localhost:8000/documents",
+            params={"limit": 1, "after": "000"},
+            timeout=5,
+        )
 
 
 class TestAskQuestion:
@@ -140,3 +164,75 @@ class TestAskQuestion:
         ):
             with pytest.raises(requests.RequestException):
                 client.ask_question("What is the capital?")
+
+
+def _sse_response(lines):
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.raise_for_status = Mock()
+    mock_response.iter_lines.return_value = iter(lines)
+    return mock_response
+
+
+class TestStreamQuestion:
+    def test_stream_question_success(self, client):
+        mock_response = _sse_response(
+            [
+                "event: session",
+                'data: {"session_id": "session-123", "system_message": "Resumed"}',
+                "",
+                "event: token",
+                'data: {"text": "Par"}',
+                "",
+                "event: token",
+                'data: {"text": "is"}',
+                "",
+                "event: done",
+                'data: {"answer": "Paris"}',
+                "",
+            ]
+        )
+
+        with patch("requests.post", return_value=mock_response) as mock_post:
+            stream = client.stream_question("What is the capital?", "session-123")
+            tokens = list(stream)
+
+        assert tokens == ["Par", "is"]
+        assert stream.session_id == "session-123"
+        assert stream.system_message == "Resumed"
+        assert stream.answer == "Paris"
+        mock_response.close.assert_called_once()
+        mock_post.assert_called_once_with(
+            "http://localhost:8000/chat/domain-expert/stream/",
+            json={"question": "What is the capital?", "session_id": "session-123"},
+            timeout=CHAT_TIMEOUT,
+            stream=True,
+        )
+
+    def test_stream_question_error_event(self, client):
+        mock_response = _sse_response(
+            [
+                "event: session",
+                'data: {"session_id": "session-123"}',
+                "",
+                "event: error",
+                'data: {"detail": "Processing failed"}',
+                "",
+            ]
+        )
+
+        with patch("requests.post", return_value=mock_response):
+            stream = client.stream_question("What is the capital?")
+            with pytest.raises(ChatStreamError, match="Processing failed"):
+                list(stream)
+
+    def test_stream_question_no_documents(self, client):
+        mock_response = Mock()
+        mock_response.status_code = 503
+        mock_response.json.return_value = {
+            "detail": "No documents have been ingested yet."
+        }
+
+        with patch("requests.post", return_value=mock_response):
+            with pytest.raises(NoDocumentsIngestedError):
+                client.stream_question("What is the capital?")
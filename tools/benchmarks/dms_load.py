@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+DMS status endpoint load test: sync engine on the threadpool vs async engine.
+
+Replays the status calls ingestion makes per document (PUT PENDING, GET the
+status, PUT COMPLETED) for N documents, --concurrency documents at a time,
+in-process (httpx ASGITransport, no network) against:
+  sync   — create_engine with the DMS_DB_POOL_* settings; each query runs
+           on Starlette's threadpool (40 workers by default)
+  async  — DMS_ASYNC_ENGINE, the same queries through asyncpg/aiosqlite on
+           the event loop
+
+--database-url defaults to a fresh SQLite file per run as a stand-in;
+pass a PostgreSQL URL to measure against a real server. Reports wall
+time, requests per second, latency percentiles and failed requests.
+
+Usage:
+  dms_load.py [-n DOCUMENTS] [--concurrency N] [--database-url URL]
+              [--pool-size N] [--max-overflow N]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import httpx  # noqa: E402
+
+from src.document_management_service import lifespan as dms_lifespan  # noqa: E402
+from src.document_management_service.main import app  # noqa: E402
+from src.shared.constants import DocumentStatus  # noqa: E402
+
+
+async def _run(label: str, documents: int, concurrency: int) -> None:
+    latencies = []
+    failures = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    prefix = uuid.uuid4().hex[:8]
+
+    async def _request(client: httpx.AsyncClient, method: str, url: str, **kwargs):
+        nonlocal failures
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            failures += 1
+
+    async def _document(client: httpx.AsyncClient, index: int):
+        url = f"/documents/{prefix}-{index}/status/"
+        name = f"doc-{index}.pdf"
+        async with semaphore:
+            await _request(
+                client,
+                "PUT",
+                url,
+                json={"doc_name": name, "status": DocumentStatus.PENDING},
+            )
+            await _request(client, "GET", url)
+            await _request(
+                client,
+                "PUT",
+                url,
+                json={"doc_name": name, "status": DocumentStatus.COMPLETED},
+            )
+
+    async with dms_lifespan.lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", timeout=None
+        ) as client:
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(_document(client, index) for index in range(documents))
+            )
+            elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(
+        f"{label:<6} wall={elapsed:6.2f} s  "
+        f"throughput={len(latencies) / elapsed:7.1f} req/s  "
+        f"mean={statistics.mean(latencies) * 1000:7.1f} ms  "
+        f"p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:7.1f} ms  "
+        f"failed={failures}"
+    )
+
+
+def main() -> None:
+    """Run the same status workload with the sync and the async engine."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", "--documents", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--pool-size", type=int, default=dms_lifespan.DMS_DB_POOL_SIZE)
+    parser.add_argument(
+        "--max-overflow", type=int, default=dms_lifespan.DMS_DB_MAX_OVERFLOW
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(
+            f"{args.documents} documents x 3 requests, concurrency "
+            f"{args.concurrency}, pool {args.pool_size}+{args.max_overflow}, "
+            f"{args.database_url or 'SQLite file'}"
+        )
+        for label, async_engine in (("sync", False), ("async", True)):
+            database_url = args.database_url or (
+                f"sqlite:///{os.path.join(directory, f'{label}.db')}"
+            )
+            with patch.multiple(
+                dms_lifespan,
+                DMS_DATABASE_URL=database_url,
+                DMS_ASYNC_ENGINE=async_engine,
+                DMS_DB_POOL_SIZE=args.pool_size,
+                DMS_DB_MAX_OVERFLOW=args.max_overflow,
+            ):
+                asyncio.run(_run(label, args.documents, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
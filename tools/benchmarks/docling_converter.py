@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Docling per-document overhead: a new DoclingLoader per file vs a warm converter.
+
+Parses N generated PDFs with:
+  cold  — the previous behaviour, a DoclingLoader with its own DocumentConverter
+          (and HybridChunker) per file, re-initializing Docling's models
+  warm  — DoclingVectorStoreBuilder.load_pdf_text with the builder's converter,
+          initialized once by warm_up() (reported separately)
+
+Reports the mean seconds per document for each. Needs Docling's layout and
+table models, downloaded from Hugging Face on first use.
+
+Usage:
+  docling_converter.py [-n DOCUMENTS] [--pages N] [--export-type doc_chunks|markdown]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import chromadb  # noqa: E402
+import fitz  # noqa: E402
+from langchain_docling.loader import DoclingLoader  # noqa: E402
+
+from src.ingestion_service.vector_store_builder import (  # noqa: E402
+    DoclingVectorStoreBuilder,
+)
+
+
+def _generate_pdfs(directory: str, documents: int, pages: int) -> List[str]:
+    paragraph = (
+        "Retrieval augmented generation combines a retriever with a language "
+        "model so answers are grounded in source documents. "
+    ) * 8
+    paths = []
+    for index in range(documents):
+        path = os.path.join(directory, f"doc-{index}.pdf")
+        with fitz.open() as pdf:
+            for page_number in range(pages):
+                page = pdf.new_page()
+                page.insert_text((72, 72), f"{page_number + 1} Section {page_number}")
+                page.insert_textbox(fitz.Rect(72, 96, 540, 760), paragraph, fontsize=10)
+            pdf.save(path)
+        paths.append(path)
+    return paths
+
+
+def main() -> None:
+    """Parse the same generated PDFs with cold loaders and with a warm builder."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", "--documents", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--export-type", default="doc_chunks")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = _generate_pdfs(directory, args.documents, args.pages)
+        print(
+            f"{args.documents} documents x {args.pages} pages, "
+            f"export_type={args.export_type}"
+        )
+
+        start = time.perf_counter()
+        for path in paths:
+            DoclingLoader(file_path=path, export_type=args.export_type).load()
+        cold = (time.perf_counter() - start) / len(paths)
+
+        builder = DoclingVectorStoreBuilder(chromadb.EphemeralClient())
+        builder.EXPORT_TYPE = args.export_type
+        start = time.perf_counter()
+        builder.warm_up()
+        warm_up = time.perf_counter() - start
+        start = time.perf_counter()
+        for path in paths:
+            builder.load_pdf_text(path)
+        warm = (time.perf_counter() - start) / len(paths)
+
+        print(f"cold   {cold:6.2f} s/document")
+        print(f"warm   {warm:6.2f} s/document  (one-time warm_up {warm_up:.2f} s)")
+        print(f"saved  {cold - warm:6.2f} s/document")
+
+
+if __name__ == "__main__":
+    main()
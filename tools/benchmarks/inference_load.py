@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Inference chat endpoint load test with a fixed-latency fake LLM.
+
+Fires N concurrent POST /chat/domain-expert/ requests in-process (httpx
+ASGITransport, no network) against:
+  sync   — the previous `def` handler calling the chain with invoke(), which
+           runs on Starlette's threadpool (40 workers by default)
+  async  — the current `async def` handler using ainvoke() behind the
+           LLMConcurrencyLimiter
+
+Each request performs retrieval against a static retriever and one LLM call
+that sleeps for --latency seconds (time.sleep for invoke, asyncio.sleep for
+ainvoke). Reports wall time, throughput and peak queue depth.
+
+Usage:
+  inference_load.py [-n REQUESTS] [--latency SECONDS] [--max-concurrent N]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+os.environ["LLM_PROVIDER"] = "together"
+os.environ.setdefault("TOGETHER_API_KEY", "benchmark-key")
+
+import chromadb  # noqa: E402
+import httpx  # noqa: E402
+from langchain_community.embeddings import FakeEmbeddings  # noqa: E402
+from langchain_community.vectorstores import Chroma  # noqa: E402
+from langchain_core.documents import Document  # noqa: E402
+from langchain_core.language_models.llms import LLM  # noqa: E402
+from langchain_core.retrievers import BaseRetriever  # noqa: E402
+
+from src.inference_service import main as api_main  # noqa: E402
+from src.inference_service.core.llm_limiter import LLMConcurrencyLimiter  # noqa: E402
+from src.inference_service.readiness import ReadinessSnapshot  # noqa: E402
+from src.inference_service.session_manager import SessionManager  # noqa: E402
+from src.shared.prompts import domain_expert_prompt  # noqa: E402
+
+
+class FixedLatencyLLM(LLM):
+    """Fake LLM that answers after a fixed delay."""
+
+    latency: float
+
+    @property
+    def _llm_type(self) -> str:
+        return "fixed-latency-fake"
+
+    def _call(self, prompt, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        return "A fixed answer."
+
+    async def _acall(self, prompt, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        return "A fixed answer."
+
+
+class StaticRetriever(BaseRetriever):
+    """Retriever returning one fixed chunk."""
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        return [Document(page_content="Benchmark context.")]
+
+
+def _build_session_manager(latency: float) -> SessionManager:
+    vectordb = Chroma(
+        embedding_function=FakeEmbeddings(size=384),
+        client=chromadb.EphemeralClient(),
+        collection_name="inference_load_benchmark",
+    )
+    session_manager = SessionManager(vectordb)
+    core = session_manager.domain_expert_core
+    core.chain_manager.retriever = StaticRetriever()
+    core.qa_chain = core.chain_manager.get_conversationalRetrievalChain(
+        FixedLatencyLLM(latency=latency),
+        {"prompt": domain_expert_prompt},
+        use_memory=False,
+    )
+    return session_manager
+
+
+@api_main.app.post("/benchmark/sync-chat/")
+def sync_ask_question(request: api_main.DomainExpertRequest):
+    """Reproduce the previous synchronous chat handler for comparison."""
+    session, _ = api_main.app.state.session_manager.get_domain_expert_session(
+        request.session_id
+    )
+    return {"answer": session.ask_question(request.question)}
+
+
+async def _run(path: str, requests: int, limiter: LLMConcurrencyLimiter) -> None:
+    peak_queued = 0
+    latencies = []
+
+    async def _one(client: httpx.AsyncClient):
+        start = time.perf_counter()
+        response = await client.post(path, json={"question": "What is RAG?"})
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+    async def _sample_queue():
+        nonlocal peak_queued
+        while True:
+            peak_queued = max(peak_queued, limiter.queued)
+            await asyncio.sleep(0.01)
+
+    transport = httpx.ASGITransport(app=api_main.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark", timeout=None
+    ) as client:
+        sampler = asyncio.create_task(_sample_queue())
+        start = time.perf_counter()
+        await asyncio.gather(*(_one(client) for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+        sampler.cancel()
+
+    latencies.sort()
+    print(
+        f"{path:<24} wall={elapsed:6.2f} s  "
+        f"throughput={requests / elapsed:7.1f} req/s  "
+        f"mean={statistics.mean(latencies):6.2f} s  "
+        f"p95={latencies[int(len(latencies) * 0.95) - 1]:6.2f} s  "
+        f"peak_queued={peak_queued}"
+    )
+
+
+def main() -> None:
+    """Run the sync and async handlers under the same load."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", "--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--max-concurrent", type=int, default=64)
+    args = parser.parse_args()
+
+    limiter = LLMConcurrencyLimiter(args.max_concurrent)
+    api_main.app.state.session_manager = _build_session_manager(args.latency)
+    api_main.app.state.llm_limiter = limiter
+    api_main.app.state.readiness = Mock(
+        snapshot=Mock(return_value=ReadinessSnapshot(collection_count=1))
+    )
+
+    print(
+        f"{args.requests} concurrent requests, LLM latency {args.latency}s, "
+        f"MAX_CONCURRENT_LLM_CALLS={args.max_concurrent}"
+    )
+    asyncio.run(_run("/benchmark/sync-chat/", args.requests, limiter))
+    asyncio.run(_run("/chat/domain-expert/", args.requests, limiter))
+
+
+if __name__ == "__main__":
+    main()
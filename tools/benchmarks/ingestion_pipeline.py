@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Ingestion throughput: serial per-document loop vs the staged IngestionPipeline.
+
+Ingests N generated multi-page PDFs into an in-memory Chroma collection with:
+  serial    — the previous behaviour, DocumentIngestor.ingest_document in a loop
+              (download → parse → split → embed → write, one document at a time)
+  pipeline  — DocumentIngestor.ingest_documents (download threads, parse
+              processes, cross-document embedding micro-batches)
+
+Downloads sleep for --download-latency seconds (simulated S3). Parsing is real
+PyMuPDF work. Embedding is a fake model costing --embed-call-overhead seconds
+per call plus --embed-per-chunk seconds per chunk, so batching matters as it
+does for a real model. DMS is an in-memory fake.
+
+Usage:
+  ingestion_pipeline.py [-n DOCUMENTS] [--pages N] [--download-latency S]
+                        [--download-workers N] [--parse-workers N]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import chromadb  # noqa: E402
+import fitz  # noqa: E402
+from langchain_core.embeddings import Embeddings  # noqa: E402
+
+from src.ingestion_service.document_ingestor import DocumentIngestor  # noqa: E402
+from src.ingestion_service.ingestion_pipeline import PipelineConfig  # noqa: E402
+from src.ingestion_service.vector_store_builder import (  # noqa: E402
+    LegacyVectorStoreBuilder,
+)
+from src.shared.models import GetDocumentStatusResponse  # noqa: E402
+
+EMBED_CALL_OVERHEAD = 0.02
+EMBED_PER_CHUNK = 0.0005
+
+
+class CostedFakeEmbeddings(Embeddings):
+    """Fake embedding model with a fixed per-call and per-chunk cost."""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(EMBED_CALL_OVERHEAD + EMBED_PER_CHUNK * len(texts))
+        return [[float(len(text) % 7), 1.0, 0.5] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+class BenchmarkVectorStoreBuilder(LegacyVectorStoreBuilder):
+    """Legacy builder whose embedding model is the costed fake."""
+
+    def get_embeddings(self, model_name: str = "fake") -> Embeddings:
+        return CostedFakeEmbeddings()
+
+
+class InMemoryDMS:
+    """Minimal stand-in for the DMS client."""
+
+    def __init__(self):
+        self.documents = {}
+
+    def get_document(self, doc_hash):
+        return self.documents.get(doc_hash)
+
+    def get_document_status(self, doc_hash):
+        document = self.documents.get(doc_hash)
+        return document.status if document else None
+
+    def update_document_status(self, doc_hash, doc_name, status):
+        self.documents[doc_hash] = GetDocumentStatusResponse(
+            doc_name=doc_name, status=status
+        )
+
+
+class SlowFileLoader:
+    """Resolves document names to generated PDFs after a simulated download delay."""
+
+    def __init__(self, directory: str, latency: float):
+        self.directory = directory
+        self.latency = latency
+
+    def load_pdf_file_hashed(self, document: str) -> Tuple[str, str]:
+        time.sleep(self.latency)
+        path = os.path.join(self.directory, document)
+        with open(path, "rb") as file:
+            return path, hashlib.sha256(file.read()).hexdigest()
+
+
+def _generate_pdfs(directory: str, documents: int, pages: int) -> List[str]:
+    paragraph = (
+        "Retrieval augmented generation combines a retriever with a language "
+        "model so answers are grounded in source documents. "
+    ) * 12
+    names = []
+    for index in range(documents):
+        name = f"doc-{index}.pdf"
+        with fitz.open() as pdf:
+            for page_number in range(pages):
+                page = pdf.new_page()
+                page.insert_textbox(
+                    fitz.Rect(36, 36, 576, 806),
+                    f"Document {index} page {page_number}. {paragraph}",
+                    fontsize=9,
+                )
+            pdf.save(os.path.join(directory, name))
+        names.append(name)
+    return names
+
+
+def _run(label, ingest, names, chroma_client) -> None:
+    start = time.perf_counter()
+    ingest(names)
+    elapsed = time.perf_counter() - start
+    chunks = chroma_client.get_collection("rag_documents").count()
+    print(
+        f"{label:<10} wall={elapsed:6.2f} s  "
+        f"throughput={len(names) / elapsed:5.2f} docs/s  chunks={chunks}"
+    )
+    chroma_client.delete_collection("rag_documents")
+
+
+def main() -> None:
+    """Ingest the same generated documents serially and through the pipeline."""
+    global EMBED_CALL_OVERHEAD, EMBED_PER_CHUNK
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", "--documents", type=int, default=24)
+    parser.add_argument("--pages", type=int, default=30)
+    parser.add_argument("--download-latency", type=float, default=0.3)
+    parser.add_argument("--embed-call-overhead", type=float, default=0.02)
+    parser.add_argument("--embed-per-chunk", type=float, default=0.0005)
+    parser.add_argument("--download-workers", type=int, default=4)
+    parser.add_argument("--parse-workers", type=int, default=2)
+    parser.add_argument("--embed-batch-size", type=int, default=256)
+    args = parser.parse_args()
+    EMBED_CALL_OVERHEAD = args.embed_call_overhead
+    EMBED_PER_CHUNK = args.embed_per_chunk
+
+    with tempfile.TemporaryDirectory() as directory:
+        names = _generate_pdfs(directory, args.documents, args.pages)
+        chroma_client = chromadb.EphemeralClient()
+        file_loader = SlowFileLoader(directory, args.download_latency)
+        config = PipelineConfig(
+            download_workers=args.download_workers,
+            parse_workers=args.parse_workers,
+            embed_batch_size=args.embed_batch_size,
+        )
+        print(
+            f"{args.documents} documents x {args.pages} pages, "
+            f"download {args.download_latency}s, "
+            f"download_workers={config.download_workers} "
+            f"parse_workers={config.parse_workers} "
+            f"embed_batch_size={config.embed_batch_size}"
+        )
+
+        def serial(documents):
+            ingestor = DocumentIngestor(
+                InMemoryDMS(),
+                BenchmarkVectorStoreBuilder(chroma_client),
+                file_loader,
+                lambda message: None,
+                config,
+            )
+            for document in documents:
+                ingestor.ingest_document(document)
+
+        ingestor = DocumentIngestor(
+            InMemoryDMS(),
+            BenchmarkVectorStoreBuilder(chroma_client),
+            file_loader,
+            lambda message: None,
+            config,
+        )
+        # Start the parse workers outside the timed run.
+        ingestor.pipeline._get_parse_pool().submit(int).result()
+        try:
+            _run("serial", serial, names, chroma_client)
+            _run("pipeline", ingestor.ingest_documents, names, chroma_client)
+        finally:
+            ingestor.close()
+
+
+if __name__ == "__main__":
+    main()
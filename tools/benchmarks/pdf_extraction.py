@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+PDF text extraction: LegacyVectorStoreBuilder.load_pdf_text by worker count.
+
+Generates one text-dense PDF of --pages pages and extracts it with
+extract_workers=0 (in process, the previous behaviour) and with each worker
+count in --workers, pages_per_task pages per task. Each configuration warms
+its process pool with one untimed run, then reports the best of --repeats
+runs and the speedup over in-process extraction. Every run must return the
+same page texts as the in-process run.
+
+Speedup is bounded by the cores available: on a single core, workers only
+add inter-process overhead.
+
+Usage:
+  pdf_extraction.py [--pages N] [--workers 1,2,4] [--pages-per-task N]
+                    [--repeats N]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _generate_pdf(path: str, pages: int) -> None:
+    paragraph = (
+        "Retrieval augmented generation combines a retriever with a language "
+        "model so answers are grounded in source documents. "
+    ) * 20
+    with fitz.open() as pdf:
+        for page_number in range(pages):
+            page = pdf.new_page()
+            page.insert_textbox(
+                fitz.Rect(36, 36, 576, 806),
+                f"Page {page_number}. {paragraph}",
+                fontsize=8,
+            )
+        pdf.save(path)
+
+
+def _best_time(builder, path: str, repeats: int):
+    builder.load_pdf_text(path)
+    best, texts = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        docs = builder.load_pdf_text(path)
+        best = min(best, time.perf_counter() - start)
+        texts = [doc.page_content for doc in docs]
+    return best, texts
+
+
+def main() -> None:
+    """Extract the same generated PDF in process and with each worker count."""
+    # Imported here: spawned workers re-import this script and should only
+    # need PyMuPDF, as they do under the ingestion service.
+    import chromadb
+    from src.ingestion_service.vector_store_builder import LegacyVectorStoreBuilder
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=600)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--pages-per-task", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    worker_counts = [int(count) for count in args.workers.split(",")]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "manual.pdf")
+        _generate_pdf(path, args.pages)
+        chroma_client = chromadb.EphemeralClient()
+        print(
+            f"{args.pages} pages, pages_per_task={args.pages_per_task}, "
+            f"{os.cpu_count()} CPUs, best of {args.repeats}"
+        )
+        baseline, expected = _best_time(
+            LegacyVectorStoreBuilder(chroma_client, extract_workers=0),
+            path,
+            args.repeats,
+        )
+        print(
+            f"workers=0  wall={baseline:6.3f} s  "
+            f"pages/s={args.pages / baseline:8.1f}  speedup=1.00x"
+        )
+        for workers in worker_counts:
+            builder = LegacyVectorStoreBuilder(
+                chroma_client,
+                extract_workers=workers,
+                pages_per_task=args.pages_per_task,
+            )
+            try:
+                elapsed, texts = _best_time(builder, path, args.repeats)
+            finally:
+                builder.close()
+            assert texts == expected, "page texts differ from in-process extraction"
+            print(
+                f"workers={workers:<2} wall={elapsed:6.3f} s  "
+                f"pages/s={args.pages / elapsed:8.1f}  "
+                f"speedup={baseline / elapsed:4.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Session creation benchmark for the inference service.
+
+Compares two strategies for creating N domain expert sessions:
+  per-session — one DomainExpertCore (ChainManager, LLM client, chain) per session
+  shared      — one DomainExpertCore shared by all sessions (SessionManager)
+
+Reports mean/p95 creation latency and the memory retained per session
+(tracemalloc) plus the process RSS growth. No network calls are made: the
+Together client is only constructed, and Chroma runs in-memory with fake
+embeddings.
+
+Usage:
+  session_creation.py [-n SESSIONS]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+os.environ["LLM_PROVIDER"] = "together"
+os.environ.setdefault("TOGETHER_API_KEY", "benchmark-key")
+
+import chromadb  # noqa: E402
+from langchain_community.embeddings import FakeEmbeddings  # noqa: E402
+from langchain_community.vectorstores import Chroma  # noqa: E402
+
+from src.inference_service.core.domain_expert_core import DomainExpertCore  # noqa: E402
+from src.inference_service.session_manager import SessionManager  # noqa: E402
+
+
+def _rss_bytes() -> int:
+    """Return the current resident set size, or 0 where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _build_vectordb() -> Chroma:
+    return Chroma(
+        embedding_function=FakeEmbeddings(size=384),
+        client=chromadb.EphemeralClient(),
+        collection_name="session_benchmark",
+    )
+
+
+def _run(label: str, create_session, sessions: int) -> None:
+    retained = []
+    latencies = []
+    gc.collect()
+    rss_before = _rss_bytes()
+    tracemalloc.start()
+    for _ in range(sessions):
+        start = time.perf_counter()
+        retained.append(create_session())
+        latencies.append(time.perf_counter() - start)
+    traced_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = _rss_bytes()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{label:<12} mean={statistics.mean(latencies) * 1000:8.3f} ms  "
+        f"p95={p95 * 1000:8.3f} ms  "
+        f"traced/session={traced_bytes / sessions / 1024:8.1f} KiB  "
+        f"rss/session={(rss_after - rss_before) / sessions / 1024:8.1f} KiB"
+    )
+
+
+def main() -> None:
+    """Run both strategies and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", "--sessions", type=int, default=200)
+    args = parser.parse_args()
+
+    vectordb = _build_vectordb()
+    # Warm imports and lazy clients so neither strategy pays one-off costs.
+    DomainExpertCore(vectordb)
+
+    _run("per-session", lambda: DomainExpertCore(vectordb), args.sessions)
+    session_manager = SessionManager(vectordb)
+    _run("shared", session_manager.create_domain_expert_session, args.sessions)
+
+
+if __name__ == "__main__":
+    main()